@@ -0,0 +1,53 @@
+"""
+Fixtures shared by the benchmark suites.
+
+The size of the synthetic glossary is set by environment variables, so CI can run the suites
+on a small input and a laptop on a realistic one:
+
+    BENCHMARK_SYSTEMS, BENCHMARK_GROUPS_PER_SYSTEM, BENCHMARK_ENTRIES_PER_GROUP
+
+The sharded input suites split the glossary into ``BENCHMARK_SHARDS`` files, 8 by default.
+"""
+import os
+from typing import List
+
+import pytest
+
+import glossary_generator
+
+
+@pytest.fixture(scope='session')
+def glossary_spec() -> glossary_generator.GlossarySpec:
+    return glossary_generator.GlossarySpec(
+        systems=int(os.environ.get('BENCHMARK_SYSTEMS', 5)),
+        groups_per_system=int(os.environ.get('BENCHMARK_GROUPS_PER_SYSTEM', 20)),
+        entries_per_group=int(os.environ.get('BENCHMARK_ENTRIES_PER_GROUP', 100)))
+
+
+@pytest.fixture(scope='session')
+def csv_file_path(glossary_spec, tmp_path_factory) -> str:
+    file_path = str(tmp_path_factory.mktemp('glossary') / 'glossary.csv')
+    glossary_generator.write_csv_file(file_path, glossary_spec)
+    return file_path
+
+
+@pytest.fixture(scope='session')
+def csv_shard_file_paths(glossary_spec, tmp_path_factory) -> List[str]:
+    return glossary_generator.write_csv_shards(str(tmp_path_factory.mktemp('glossary-shards')),
+                                               glossary_spec,
+                                               int(os.environ.get('BENCHMARK_SHARDS', 8)))
+
+
+@pytest.fixture(scope='session')
+def json_file_path(glossary_spec, tmp_path_factory) -> str:
+    file_path = str(tmp_path_factory.mktemp('glossary') / 'glossary.json')
+    glossary_generator.write_json_file(file_path, glossary_spec)
+    return file_path
+
+
+@pytest.fixture(scope='session')
+def parquet_file_path(glossary_spec, tmp_path_factory) -> str:
+    pytest.importorskip('pyarrow')
+    file_path = str(tmp_path_factory.mktemp('glossary') / 'glossary.parquet')
+    glossary_generator.write_parquet_file(file_path, glossary_spec)
+    return file_path
@@ -0,0 +1,92 @@
+"""
+Benchmark the CSV reader on a synthetic Custom Entries file.
+
+Usage:
+    python benchmarks/csv_reader_benchmark.py [--rows 1000000] [--groups 10000] [--baseline]
+
+The ``--baseline`` flag also times the previous implementation, which sliced the
+dataframe with ``.loc`` and dropped the copied rows once per system and group.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from datacatalog_custom_entries_manager import constant, custom_entries_csv_reader
+
+import glossary_generator
+
+_SYSTEMS_COUNT = 10
+
+
+def generate_csv_file(file_path: str, rows_count: int, groups_count: int) -> None:
+    glossary_generator.write_csv_file(
+        file_path,
+        glossary_generator.GlossarySpec(systems=_SYSTEMS_COUNT,
+                                        groups_per_system=max(groups_count // _SYSTEMS_COUNT, 1),
+                                        entries_per_group=max(rows_count // groups_count, 1),
+                                        empty_descriptions=0.5))
+
+
+def read_file_baseline(file_path: str):
+    dataframe = pd.read_csv(file_path)
+    ordered_df = dataframe.reindex(columns=constant.ENTRIES_DS_COLUMNS_ORDER, copy=False)
+    filled_subset = ordered_df[constant.ENTRIES_DS_FILLABLE_COLUMNS].fillna(method='pad')
+    normalized_df = pd.concat(
+        [filled_subset, ordered_df[constant.ENTRIES_DS_NON_FILLABLE_COLUMNS]], axis=1)
+    normalized_df.set_index(constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL, inplace=True)
+
+    assembled_entry_groups = []
+    for system in normalized_df.index.unique().tolist():
+        systems_subset = normalized_df.loc[[system], constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL:]
+        normalized_df.drop(system, inplace=True)
+        systems_subset.set_index(constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL, inplace=True)
+
+        entry_groups = []
+        for group_id in systems_subset.index.unique().tolist():
+            entries_subset = \
+                systems_subset.loc[[group_id], constant.ENTRIES_DS_DISPLAY_NAME_COLUMN_LABEL:]
+            systems_subset.drop(group_id, inplace=True)
+            entry_groups.append({
+                'id': group_id,
+                'entries': entries_subset.to_dict(orient='records')
+            })
+
+        assembled_entry_groups.append((system, entry_groups))
+
+    return assembled_entry_groups
+
+
+def time_call(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Number of CSV rows')
+    parser.add_argument('--groups', type=int, default=10000, help='Number of Entry Groups')
+    parser.add_argument('--baseline',
+                        action='store_true',
+                        help='Also time the previous loc/drop based implementation')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'entries.csv')
+        generate_csv_file(file_path, args.rows, args.groups)
+        print(f'Synthetic file: {args.rows} rows, {args.groups} Entry Groups')
+
+        elapsed = time_call(custom_entries_csv_reader.CustomEntriesCSVReader.read_file, file_path)
+        print(f'read_file: {elapsed:.2f}s')
+
+        if args.baseline:
+            baseline_elapsed = time_call(read_file_baseline, file_path)
+            print(f'baseline:  {baseline_elapsed:.2f}s ({baseline_elapsed / elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import pytest
+
+from datacatalog_custom_entries_manager import custom_entries_csv_reader, \
+    custom_entries_json_reader, datacatalog_entry_factory
+
+
+@pytest.fixture(scope='module')
+def column_entry_groups(csv_file_path):
+    return _flatten(custom_entries_csv_reader.CustomEntriesCSVReader.read_file(csv_file_path))
+
+
+@pytest.fixture(scope='module')
+def record_entry_groups(json_file_path):
+    return _flatten(custom_entries_json_reader.CustomEntriesJSONReader.read_file(json_file_path))
+
+
+@pytest.fixture(scope='module')
+def entry_factory():
+    return datacatalog_entry_factory.DataCatalogEntryFactory('bench-project', 'us')
+
+
+def test_make_entry_from_dict(benchmark, entry_factory, record_entry_groups):
+    entry_group = record_entry_groups[0]
+
+    entries = benchmark(lambda: [
+        entry_factory.make_entry_from_dict(entry_group['id'], entry)
+        for entry in entry_group['entries']
+    ])
+
+    assert len(entries) == len(entry_group['entries'])
+
+
+def test_make_entries_from_dicts(benchmark, entry_factory, record_entry_groups):
+    _benchmark_make_entries(benchmark, entry_factory.make_entries_from_dicts, record_entry_groups)
+
+
+def test_make_entries_from_columns(benchmark, entry_factory, column_entry_groups):
+    _benchmark_make_entries(benchmark, entry_factory.make_entries_from_columns,
+                            column_entry_groups)
+
+
+def _benchmark_make_entries(benchmark, make_entries, entry_groups):
+    entries = benchmark(lambda: [
+        entry for entry_group in entry_groups
+        for entry in make_entries(entry_group['id'], entry_group['entries'])
+    ])
+
+    assert len(entries) == sum(len(entry_group['entries']) for entry_group in entry_groups)
+
+
+def _flatten(assembled_entry_groups):
+    return [
+        entry_group for _, system_entry_groups in assembled_entry_groups
+        for entry_group in system_entry_groups
+    ]
@@ -0,0 +1,220 @@
+"""
+Generate synthetic business glossaries in the input formats of ``sample-input``.
+
+Usage:
+    python benchmarks/glossary_generator.py FILE_PATH [--systems 5] [--groups-per-system 20]
+        [--entries-per-group 100] [--description-length 200] [--empty-descriptions 0.1]
+        [--fill-values] [--seed 42]
+
+The file format is picked by its extension: ``.csv``, ``.json``, or ``.parquet``, which requires
+pyarrow and has a row group per system. CSV files leave the ``user_specified_system`` and
+``group_id`` columns empty after the first row of each Entry Group, as in
+``business-glossary-opt-2-empty-values.csv``, unless ``--fill-values`` is set, which repeats
+them in every row, as in ``business-glossary-opt-1-all-metadata.csv``.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from datacatalog_custom_entries_manager import constant
+
+_WORDS = ('personal', 'information', 'data', 'customer', 'identifier', 'account', 'payment',
+          'consent', 'retention', 'policy', 'processing', 'record', 'sensitive', 'address',
+          'transfer', 'subject', 'request', 'controller', 'category', 'term')
+_TYPES = ('business_glossary', 'glossary_category', 'glossary_term')
+
+
+class GlossarySpec(NamedTuple):
+    systems: int = 5
+    groups_per_system: int = 20
+    entries_per_group: int = 100
+    description_length: int = 200
+    # Share of the Entries with no description.
+    empty_descriptions: float = 0.1
+    seed: int = 42
+
+    @property
+    def entries_count(self) -> int:
+        return self.systems * self.groups_per_system * self.entries_per_group
+
+
+_DEFAULT_SPEC = GlossarySpec()
+
+
+def generate_entry_groups(spec: GlossarySpec) \
+        -> Iterator[Tuple[str, str, List[Dict[str, str]]]]:
+    """
+    Generate the Entries of a synthetic glossary, Entry Group by Entry Group. The same spec
+    always generates the same glossary.
+
+    :param spec: The glossary shape.
+    :return: An iterator of ``(system, group_id, entries)`` tuples, whose Entries are dicts
+        keyed by the CSV column labels.
+    """
+    randomizer = random.Random(spec.seed)
+    for system_index in range(spec.systems):
+        system = f'GlossaryManager{system_index}'
+        for group_index in range(spec.groups_per_system):
+            group_id = f'glossary_{system_index}_{group_index}'
+            yield system, group_id, [
+                _make_entry(randomizer, spec, group_id, entry_index)
+                for entry_index in range(spec.entries_per_group)
+            ]
+
+
+def write_csv_file(file_path: str, spec: GlossarySpec, fill_values: bool = False):
+    with open(file_path, 'w', newline='') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=constant.ENTRIES_DS_COLUMNS_ORDER)
+        writer.writeheader()
+        for system, group_id, entries in generate_entry_groups(spec):
+            for entry_index, entry in enumerate(entries):
+                first_in_group = fill_values or entry_index == 0
+                writer.writerow({
+                    constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL:
+                    system if first_in_group else '',
+                    constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL:
+                    group_id if first_in_group else '',
+                    **entry
+                })
+
+
+def write_csv_shards(dir_path: str, spec: GlossarySpec, shards: int) -> List[str]:
+    """
+    Write the glossary as CSV files of about the same number of rows, as sharded exports are,
+    so the Entry Groups at the shard boundaries are split across files. Each shard repeats the
+    system and group ID in every row, since CSV files do not take them from a previous file.
+
+    :return: The shard file paths, in order.
+    """
+    rows = [{
+        constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL: system,
+        constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL: group_id,
+        **entry
+    } for system, group_id, entries in generate_entry_groups(spec) for entry in entries]
+    rows_per_shard = -(-len(rows) // shards)
+
+    file_paths = []
+    for shard_index in range(shards):
+        file_path = os.path.join(dir_path, f'glossary-{shard_index:04d}.csv')
+        with open(file_path, 'w', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=constant.ENTRIES_DS_COLUMNS_ORDER)
+            writer.writeheader()
+            writer.writerows(
+                itertools.islice(rows, shard_index * rows_per_shard,
+                                 (shard_index + 1) * rows_per_shard))
+        file_paths.append(file_path)
+    return file_paths
+
+
+def write_json_file(file_path: str, spec: GlossarySpec):
+    systems = {}
+    for system, group_id, entries in generate_entry_groups(spec):
+        systems.setdefault(system, []).append({
+            'id':
+            group_id,
+            'entries': [{
+                'linkedResource': entry[constant.ENTRIES_DS_LINKED_RESOURCE_COLUMN_LABEL],
+                'displayName': entry[constant.ENTRIES_DS_DISPLAY_NAME_COLUMN_LABEL],
+                'description': entry[constant.ENTRIES_DS_DESCRIPTION_COLUMN_LABEL],
+                'type': entry[constant.ENTRIES_DS_USER_SPECIFIED_TYPE_COLUMN_LABEL],
+                'createdAt': entry[constant.ENTRIES_DS_CREATED_AT_COLUMN_LABEL],
+                'updatedAt': entry[constant.ENTRIES_DS_UPDATED_AT_COLUMN_LABEL],
+            } for entry in entries]
+        })
+
+    with open(file_path, 'w') as json_file:
+        json.dump(
+            {
+                'userSpecifiedSystems': [{
+                    'name': system,
+                    'entryGroups': entry_groups
+                } for system, entry_groups in systems.items()]
+            },
+            json_file,
+            indent=2)
+
+
+def write_parquet_file(file_path: str, spec: GlossarySpec):
+    from pyarrow import parquet
+    import pyarrow
+
+    rows_by_system = {}
+    for system, group_id, entries in generate_entry_groups(spec):
+        rows_by_system.setdefault(system, []).extend(
+            {
+                constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL: system,
+                constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL: group_id,
+                **entry
+            } for entry in entries)
+
+    writer = None
+    try:
+        for rows in rows_by_system.values():
+            # Table.from_pylist requires pyarrow 7, which does not support Python 3.6.
+            table = pyarrow.table({column: [row[column] for row in rows] for column in rows[0]})
+            if not writer:
+                writer = parquet.ParquetWriter(file_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer:
+            writer.close()
+
+
+def _make_entry(randomizer: random.Random, spec: GlossarySpec, group_id: str,
+                entry_index: int) -> Dict[str, str]:
+
+    description = ''
+    if randomizer.random() >= spec.empty_descriptions:
+        words = []
+        while sum(len(word) + 1 for word in words) < spec.description_length:
+            words.append(randomizer.choice(_WORDS))
+        description = ' '.join(words).capitalize()[:spec.description_length]
+
+    minute = entry_index % 60
+    return {
+        constant.ENTRIES_DS_LINKED_RESOURCE_COLUMN_LABEL:
+        f'//glossary-manager/glossaries/{group_id}/terms/term-{entry_index}',
+        constant.ENTRIES_DS_DISPLAY_NAME_COLUMN_LABEL: f'Term {entry_index} of {group_id}',
+        constant.ENTRIES_DS_DESCRIPTION_COLUMN_LABEL: description,
+        constant.ENTRIES_DS_USER_SPECIFIED_TYPE_COLUMN_LABEL: _TYPES[entry_index % len(_TYPES)],
+        constant.ENTRIES_DS_CREATED_AT_COLUMN_LABEL: f'2020-09-04T16:{minute:02d}:43-0300',
+        constant.ENTRIES_DS_UPDATED_AT_COLUMN_LABEL: f'2020-09-05T16:{minute:02d}:26-0300',
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('file_path', help='Path of the generated CSV, JSON, or Parquet file')
+    parser.add_argument('--systems', type=int, default=_DEFAULT_SPEC.systems)
+    parser.add_argument('--groups-per-system', type=int, default=_DEFAULT_SPEC.groups_per_system)
+    parser.add_argument('--entries-per-group', type=int, default=_DEFAULT_SPEC.entries_per_group)
+    parser.add_argument('--description-length', type=int, default=_DEFAULT_SPEC.description_length)
+    parser.add_argument('--empty-descriptions',
+                        type=float,
+                        default=_DEFAULT_SPEC.empty_descriptions,
+                        help='Share of the Entries with no description')
+    parser.add_argument('--fill-values',
+                        action='store_true',
+                        help='Repeat the system and group ID in every CSV row')
+    parser.add_argument('--seed', type=int, default=_DEFAULT_SPEC.seed)
+    args = parser.parse_args()
+
+    spec = GlossarySpec(args.systems, args.groups_per_system, args.entries_per_group,
+                        args.description_length, args.empty_descriptions, args.seed)
+    if args.file_path.endswith('.json'):
+        write_json_file(args.file_path, spec)
+    elif args.file_path.endswith('.parquet'):
+        write_parquet_file(args.file_path, spec)
+    else:
+        write_csv_file(args.file_path, spec, args.fill_values)
+
+    print(f'{args.file_path}: {spec.entries_count} Entries')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Memory held by the Entries read from the input files.
+
+The CSV reader slices ``CustomEntryColumns`` from the parsed file, and the JSON reader makes a
+``CustomEntryRecord`` per Entry. Each test reads the whole synthetic glossary under
+``tracemalloc`` and records, in the ``extra_info`` of the benchmark results, the bytes held per
+Entry, along with the bytes the same Entries would take as the per-Entry ``dicts`` the readers
+used to make: the same strings, held by a ``dict`` instead of the columns or records. The
+strings spared by interning the system and type of each Entry are not counted, as the readers
+used to share some of them already.
+"""
+import sys
+import tracemalloc
+
+from datacatalog_custom_entries_manager import custom_entries_csv_reader, \
+    custom_entries_json_reader, custom_entries_record
+
+
+def test_csv_read_file_memory(benchmark, csv_file_path, glossary_spec):
+    _benchmark_read_file_memory(benchmark, custom_entries_csv_reader.CustomEntriesCSVReader,
+                                csv_file_path, glossary_spec)
+
+
+def test_json_read_file_memory(benchmark, json_file_path, glossary_spec):
+    _benchmark_read_file_memory(benchmark, custom_entries_json_reader.CustomEntriesJSONReader,
+                                json_file_path, glossary_spec)
+
+
+def _benchmark_read_file_memory(benchmark, reader, file_path, glossary_spec):
+    entry_groups, held_bytes = benchmark.pedantic(_measure_held_bytes,
+                                                  args=(reader.read_file, file_path),
+                                                  rounds=1)
+
+    entries = [
+        entry for _, system_entry_groups in entry_groups for entry_group in system_entry_groups
+        for entry in entry_group['entries']
+    ]
+    assert len(entries) == glossary_spec.entries_count
+
+    container_bytes = sum(
+        _get_container_bytes(entry_group['entries']) for _, system_entry_groups in entry_groups
+        for entry_group in system_entry_groups)
+    dict_bytes = sum(sys.getsizeof(dict(entry)) for entry in entries)
+    dict_held_bytes = held_bytes - container_bytes + dict_bytes
+
+    benchmark.extra_info['bytes_per_entry'] = held_bytes / len(entries)
+    benchmark.extra_info['dict_bytes_per_entry'] = dict_held_bytes / len(entries)
+    assert held_bytes < dict_held_bytes
+
+
+def _measure_held_bytes(read_file, file_path):
+    tracemalloc.start()
+    try:
+        entry_groups = read_file(file_path)
+        held_bytes, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return entry_groups, held_bytes
+
+
+def _get_container_bytes(entries) -> int:
+    if isinstance(entries, custom_entries_record.CustomEntryColumns):
+        return sum(
+            getattr(entries, column).nbytes
+            for column in custom_entries_record.CustomEntryColumns.COLUMNS)
+    return sum(sys.getsizeof(entry) for entry in entries)
@@ -0,0 +1,101 @@
+import pytest
+
+from datacatalog_custom_entries_manager import custom_entries_csv_reader, custom_entries_filter, \
+    custom_entries_json_reader, custom_entries_multi_file_reader, custom_entries_parquet_reader
+
+# A targeted re-sync of a single Entry Group.
+_ONE_GROUP_FILTER = custom_entries_filter.CustomEntriesFilter(
+    include_systems=('GlossaryManager0', ), include_groups=('glossary_0_0', ))
+
+
+def test_csv_read_file(benchmark, csv_file_path, glossary_spec):
+    entry_groups = benchmark(custom_entries_csv_reader.CustomEntriesCSVReader.read_file,
+                             csv_file_path)
+
+    assert _count_entries(entry_groups) == glossary_spec.entries_count
+
+
+@pytest.mark.parametrize('max_workers', [1, None], ids=['one-worker', 'all-cpus'])
+def test_csv_read_files(benchmark, csv_shard_file_paths, glossary_spec, max_workers):
+    # A single worker parses the shards in-process: the baseline of the scaling with the CPUs.
+    entry_groups = benchmark(
+        custom_entries_multi_file_reader.CustomEntriesMultiFileReader.read_files,
+        custom_entries_csv_reader.CustomEntriesCSVReader,
+        csv_shard_file_paths,
+        max_workers=max_workers)
+
+    assert _count_entries(entry_groups) == glossary_spec.entries_count
+    assert sum(len(groups) for _, groups in entry_groups) == \
+        glossary_spec.systems * glossary_spec.groups_per_system
+
+
+def test_csv_stream_file(benchmark, csv_file_path, glossary_spec):
+    entries_count = benchmark(lambda: _count_entries(
+        custom_entries_csv_reader.CustomEntriesCSVReader.stream_file(csv_file_path)))
+
+    assert entries_count == glossary_spec.entries_count
+
+
+def test_json_read_file(benchmark, json_file_path, glossary_spec):
+    entry_groups = benchmark(custom_entries_json_reader.CustomEntriesJSONReader.read_file,
+                             json_file_path)
+
+    assert _count_entries(entry_groups) == glossary_spec.entries_count
+
+
+def test_json_stream_file(benchmark, json_file_path, glossary_spec):
+    entries_count = benchmark(lambda: _count_entries(
+        custom_entries_json_reader.CustomEntriesJSONReader.stream_file(json_file_path)))
+
+    assert entries_count == glossary_spec.entries_count
+
+
+def test_parquet_read_file(benchmark, parquet_file_path, glossary_spec):
+    entry_groups = benchmark(custom_entries_parquet_reader.CustomEntriesParquetReader.read_file,
+                             parquet_file_path)
+
+    assert _count_entries(entry_groups) == glossary_spec.entries_count
+
+
+def test_parquet_read_file_one_system(benchmark, parquet_file_path, glossary_spec):
+    # The row groups of the other systems are skipped by their statistics.
+    entry_groups = benchmark(
+        custom_entries_parquet_reader.CustomEntriesParquetReader.read_file, parquet_file_path,
+        custom_entries_filter.CustomEntriesFilter(include_systems=('GlossaryManager0', )))
+
+    assert _count_entries(entry_groups) == \
+        glossary_spec.groups_per_system * glossary_spec.entries_per_group
+
+
+def test_parquet_stream_file(benchmark, parquet_file_path, glossary_spec):
+    entries_count = benchmark(lambda: _count_entries(
+        custom_entries_parquet_reader.CustomEntriesParquetReader.stream_file(parquet_file_path)))
+
+    assert entries_count == glossary_spec.entries_count
+
+
+def test_csv_read_file_one_group(benchmark, csv_file_path, glossary_spec):
+    entry_groups = benchmark(custom_entries_csv_reader.CustomEntriesCSVReader.read_file,
+                             csv_file_path, _ONE_GROUP_FILTER)
+
+    assert _count_entries(entry_groups) == glossary_spec.entries_per_group
+
+
+def test_json_read_file_one_group(benchmark, json_file_path, glossary_spec):
+    entry_groups = benchmark(custom_entries_json_reader.CustomEntriesJSONReader.read_file,
+                             json_file_path, _ONE_GROUP_FILTER)
+
+    assert _count_entries(entry_groups) == glossary_spec.entries_per_group
+
+
+def test_parquet_read_file_one_group(benchmark, parquet_file_path, glossary_spec):
+    entry_groups = benchmark(custom_entries_parquet_reader.CustomEntriesParquetReader.read_file,
+                             parquet_file_path, _ONE_GROUP_FILTER)
+
+    assert _count_entries(entry_groups) == glossary_spec.entries_per_group
+
+
+def _count_entries(entry_groups) -> int:
+    return sum(
+        len(entry_group['entries']) for _, system_entry_groups in entry_groups
+        for entry_group in system_entry_groups)
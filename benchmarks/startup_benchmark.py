@@ -0,0 +1,69 @@
+"""
+Startup time of the CLI, paid by every scheduled invocation, measured in fresh interpreters.
+
+Besides being timed, the package import must stay under a budget, measured by
+``python -X importtime`` and set in milliseconds by the ``BENCHMARK_IMPORT_BUDGET_MS``
+environment variable. Heavy dependencies, such as pandas and the Data Catalog client, are only
+imported by the commands that need them, so they do not count against it.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import datacatalog_custom_entries_manager
+
+_PACKAGE_NAME = datacatalog_custom_entries_manager.__name__
+
+
+@pytest.fixture(scope='module')
+def python_env():
+    package_dir = os.path.dirname(os.path.dirname(datacatalog_custom_entries_manager.__file__))
+    python_path = os.environ.get('PYTHONPATH')
+    return {
+        **os.environ, 'PYTHONPATH':
+        os.pathsep.join([package_dir, python_path]) if python_path else package_dir
+    }
+
+
+def test_import_package(benchmark, python_env):
+    benchmark.pedantic(_run_python, args=(python_env, f'import {_PACKAGE_NAME}'), rounds=5)
+
+    budget_ms = float(os.environ.get('BENCHMARK_IMPORT_BUDGET_MS', 100))
+    import_ms = _measure_import_ms(python_env)
+    assert import_ms <= budget_ms, \
+        f'Importing {_PACKAGE_NAME} took {import_ms:.1f} ms, over the {budget_ms} ms budget.'
+
+
+def test_cli_help(benchmark, python_env):
+    benchmark.pedantic(_run_python,
+                       args=(python_env, f'import {_PACKAGE_NAME}; {_PACKAGE_NAME}.main()',
+                             '--help'),
+                       rounds=5)
+
+
+def _run_python(env, code, *args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-c', code, *args],
+                          env=env,
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE,
+                          check=True)
+
+
+def _measure_import_ms(env) -> float:
+    completed_process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {_PACKAGE_NAME}'],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True)
+
+    # Lines are formatted as "import time: <self us> | <cumulative us> | <module>", with the
+    # module name indented by its nesting level, after a header line.
+    for line in completed_process.stderr.splitlines()[1:]:
+        _, cumulative_us, module_name = line.split('|')
+        if module_name.rstrip() == f' {_PACKAGE_NAME}':
+            return int(cumulative_us) / 1000
+
+    raise AssertionError(f'{_PACKAGE_NAME} was not imported.')
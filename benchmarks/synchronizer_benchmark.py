@@ -0,0 +1,87 @@
+"""
+Benchmark full synchronizations against an in-process ``FakeDataCatalogBackend``.
+
+The cleanup step of each Entry Group deletes the Entries of the whole system that are not in the
+Entry Group, so the synchronized glossary has a single Entry Group per system, with as many
+Entries as the glossary of the other suites.
+
+Set ``BENCHMARK_LATENCY_SECONDS`` to delay each request, which makes the concurrency of the
+engines show up in the results.
+"""
+import os
+
+import pytest
+
+from datacatalog_custom_entries_manager import custom_entries_async_synchronizer, \
+    custom_entries_synchronizer, datacatalog_fake_backend
+
+import glossary_generator
+
+_PROJECT_ID = 'bench-project'
+_LOCATION_ID = 'us'
+_ENGINES = ('threads', 'asyncio')
+
+
+@pytest.fixture(scope='module')
+def sync_glossary_spec(glossary_spec) -> glossary_generator.GlossarySpec:
+    return glossary_spec._replace(systems=glossary_spec.systems * glossary_spec.groups_per_system,
+                                  groups_per_system=1)
+
+
+@pytest.fixture(scope='module')
+def sync_csv_file_path(sync_glossary_spec, tmp_path_factory) -> str:
+    file_path = str(tmp_path_factory.mktemp('glossary') / 'sync-glossary.csv')
+    glossary_generator.write_csv_file(file_path, sync_glossary_spec)
+    return file_path
+
+
+def _make_backend() -> datacatalog_fake_backend.FakeDataCatalogBackend:
+    return datacatalog_fake_backend.FakeDataCatalogBackend(
+        latency_seconds=float(os.environ.get('BENCHMARK_LATENCY_SECONDS', 0)))
+
+
+def _make_synchronizer(engine: str, max_workers: int,
+                       backend: datacatalog_fake_backend.FakeDataCatalogBackend):
+    if engine == 'asyncio':
+        return custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer(
+            _PROJECT_ID,
+            _LOCATION_ID,
+            max_concurrency=max_workers,
+            client_factory=backend.make_client)
+
+    return custom_entries_synchronizer.CustomEntriesSynchronizer(
+        _PROJECT_ID, _LOCATION_ID, max_workers=max_workers, client_factory=backend.make_client)
+
+
+@pytest.mark.parametrize('max_workers', (1, 8))
+@pytest.mark.parametrize('engine', _ENGINES)
+def test_sync_to_empty_catalog(benchmark, sync_csv_file_path, sync_glossary_spec, engine,
+                               max_workers):
+
+    def setup():
+        backend = _make_backend()
+        return (_make_synchronizer(engine, max_workers, backend), backend), {}
+
+    def sync(synchronizer, backend):
+        synchronizer.sync_to_file(csv_file_path=sync_csv_file_path, raise_on_failure=True)
+        return backend
+
+    backend = benchmark.pedantic(sync, setup=setup, rounds=3)
+
+    assert len(backend.get_entries()) == sync_glossary_spec.entries_count
+
+
+@pytest.mark.parametrize('engine', _ENGINES)
+def test_sync_to_up_to_date_catalog(benchmark, sync_csv_file_path, sync_glossary_spec, engine):
+    backend = _make_backend()
+    synchronizer = _make_synchronizer(engine, 8, backend)
+    synchronizer.sync_to_file(csv_file_path=sync_csv_file_path, raise_on_failure=True)
+
+    benchmark.pedantic(synchronizer.sync_to_file,
+                       kwargs={
+                           'csv_file_path': sync_csv_file_path,
+                           'raise_on_failure': True
+                       },
+                       rounds=3)
+
+    assert len(backend.get_entries()) == sync_glossary_spec.entries_count
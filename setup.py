@@ -19,11 +19,16 @@ setuptools.setup(
     include_package_data=True,
     install_requires=(
         'google-datacatalog-connectors-commons ~= 0.5.1',
+        'ijson ~= 3.1',
         'numpy >= 1.19.0, <= 1.19.3',
         'pandas ~= 1.1.4',
     ),
+    extras_require={
+        'parquet': ('pyarrow >= 3.0.0', ),
+    },
     setup_requires=('pytest-runner', ),
     tests_require=(
+        'pyarrow >= 3.0.0',
         'pytest-cov',
         'tomli ~= 1.2.2',
     ),
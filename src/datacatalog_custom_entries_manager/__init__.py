@@ -1,4 +1,32 @@
-from .custom_entries_synchronizer import CustomEntriesSynchronizer
+import importlib
+import sys
+
 from .custom_entries_manager_cli import main
 
-__all__ = ('CustomEntriesSynchronizer', 'main')
+__all__ = ('AsyncCustomEntriesSynchronizer', 'CustomEntriesFilter', 'CustomEntriesSyncState',
+           'CustomEntriesSynchronizer', 'EntryGroupSyncResult', 'main')
+
+# The synchronizers import pandas and the Data Catalog client, which take most of the startup
+# time of the CLI, so they are only imported when first accessed. Module attributes cannot be
+# computed before Python 3.7 (PEP 562).
+_LAZY_ATTRIBUTE_MODULES = {
+    'AsyncCustomEntriesSynchronizer': '.custom_entries_async_synchronizer',
+    'CustomEntriesFilter': '.custom_entries_filter',
+    'CustomEntriesSyncState': '.custom_entries_sync_state',
+    'CustomEntriesSynchronizer': '.custom_entries_synchronizer',
+    'EntryGroupSyncResult': '.custom_entries_synchronizer',
+}
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    from .custom_entries_async_synchronizer import AsyncCustomEntriesSynchronizer  # noqa: F401
+    from .custom_entries_filter import CustomEntriesFilter  # noqa: F401
+    from .custom_entries_sync_state import CustomEntriesSyncState  # noqa: F401
+    from .custom_entries_synchronizer import CustomEntriesSynchronizer, \
+        EntryGroupSyncResult  # noqa: F401
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTE_MODULES.get(name)
+    if not module_name:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    return getattr(importlib.import_module(module_name, __name__), name)
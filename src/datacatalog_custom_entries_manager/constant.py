@@ -28,6 +28,8 @@ ENTRIES_DS_NON_FILLABLE_COLUMNS = [
     ENTRIES_DS_UPDATED_AT_COLUMN_LABEL,
 ]
 
+ENTRIES_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
 ENTRIES_JSON_CREATED_AT_FIELD_NAME = 'createdAt'
 ENTRIES_JSON_DESCRIPTION_FIELD_NAME = 'description'
 ENTRIES_JSON_DISPLAY_NAME_FIELD_NAME = 'displayName'
@@ -0,0 +1,337 @@
+import asyncio
+from concurrent import futures
+import logging
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from google.cloud import datacatalog
+from google.cloud.datacatalog import types
+
+from . import custom_entries_change_detector as change_detector, custom_entries_filter, \
+    custom_entries_sync_checkpoint, custom_entries_sync_hooks, custom_entries_sync_metrics, \
+    custom_entries_sync_state, custom_entries_sync_steps, datacatalog_client_pool, \
+    datacatalog_entry_factory, datacatalog_rate_limiter
+
+InputFilePaths = custom_entries_sync_steps.InputFilePaths
+
+
+class AsyncCustomEntriesSynchronizer:
+    """
+    Synchronize Custom Entries using an ``asyncio`` event loop instead of a worker pool.
+
+    Each Entry Group is synchronized by a coroutine that awaits its cleanup and ingest steps in
+    order, while a semaphore bounds the number of Entry Groups in flight. Entry Groups that
+    share a source system are synchronized one after another, since the cleanup step deletes
+    the obsolete Entries of the whole system. The Data Catalog client is blocking, so its calls
+    run in an executor sized to the same bound; Entries deleted from an Entry Group are
+    deleted concurrently.
+    """
+
+    def __init__(self,
+                 project_id,
+                 location_id,
+                 max_concurrency=10,
+                 sync_state: custom_entries_sync_state.CustomEntriesSyncState = None,
+                 disambiguate_ids: bool = False,
+                 rate_limiter: datacatalog_rate_limiter.DataCatalogRateLimiter = None,
+                 client_pool_size: int = 1,
+                 client_factory: Callable[[], datacatalog.DataCatalogClient] = None,
+                 metrics: custom_entries_sync_metrics.CustomEntriesSyncMetrics = None,
+                 hooks: custom_entries_sync_hooks.CustomEntriesSyncHooks = None,
+                 parse_workers: int = None):
+        """
+        :param project_id: The Google Cloud Project ID.
+        :param location_id: The Google Cloud Location ID.
+        :param max_concurrency: The maximum number of Entry Groups synchronized concurrently.
+        :param sync_state: The state of previous synchronizations, used to send only the
+            Entries created, modified, or deleted since then.
+        :param disambiguate_ids: Rename Entries whose generated IDs are duplicated, instead
+            of failing their Entry Groups before any API call is made.
+        :param rate_limiter: A rate limiter for the Data Catalog API requests, shared by all
+            the Entry Groups synchronized concurrently.
+        :param client_pool_size: The number of Data Catalog clients, each with its own gRPC
+            channel, shared by all the Entry Groups.
+        :param client_factory: A callable that makes the Data Catalog clients, such as
+            ``FakeDataCatalogBackend.make_client`` to synchronize with no Google Cloud project.
+        :param metrics: Where to record the per-phase timing and throughput of each run.
+        :param hooks: The callbacks invoked at the key points of each run, such as the start
+            and end of each Entry Group and phase, to attach tracing or profiling.
+        :param parse_workers: The maximum number of sharded input files parsed concurrently,
+            each in its own process. Defaults to the number of CPUs.
+        """
+        self.__project_id = project_id
+        self.__location_id = location_id
+        self.__max_concurrency = max_concurrency
+        self.__parse_workers = parse_workers
+        self.__entry_factory = datacatalog_entry_factory.DataCatalogEntryFactory(
+            project_id, location_id)
+        self.__sync_steps = custom_entries_sync_steps.CustomEntriesSyncSteps(
+            project_id,
+            location_id,
+            self.__entry_factory,
+            sync_state=sync_state,
+            disambiguate_ids=disambiguate_ids,
+            metrics=metrics,
+            hooks=hooks,
+            client_pool=datacatalog_client_pool.DataCatalogClientPool(
+                project_id,
+                location_id,
+                size=client_pool_size,
+                rate_limiter=rate_limiter,
+                client_factory=client_factory,
+                metrics=metrics))
+
+    def sync_to_file(
+        self,
+        csv_file_path: InputFilePaths = None,
+        json_file_path: InputFilePaths = None,
+        parquet_file_path: InputFilePaths = None,
+        stream: bool = False,
+        checkpoint_file_path: str = None,
+        resume: bool = False,
+        raise_on_failure: bool = False,
+        entries_filter: custom_entries_filter.CustomEntriesFilter = None
+    ) -> List[List[types.Entry]]:
+        """
+        Synchronize Custom Entries to the provided file contents, running a new event loop
+        until all Entry Groups are synchronized.
+
+        :param
+            csv_file_path: Path of a CSV file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded CSV files.
+            json_file_path: Path of a JSON file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded JSON files.
+            parquet_file_path: Path of a Parquet file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded Parquet files.
+            stream: Read the file incrementally, never reading further than ``max_concurrency``
+                Entry Groups ahead of the ones being synchronized.
+            checkpoint_file_path: Path of a file to record each Entry Group as soon as it is
+                synchronized.
+            resume: Skip the Entry Groups recorded in the checkpoint file by a previous run with
+                the same input file contents.
+            raise_on_failure: Raise an ``EntryGroupSyncError`` at the end of the run if any
+                Entry Group failed.
+            entries_filter: The User Specified Systems and Entry Groups to synchronize, if not
+                all of them. The others are skipped by the reader.
+        :return: A list with the up to date Custom Entries.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(
+                self.async_sync_to_file(csv_file_path, json_file_path, parquet_file_path, stream,
+                                        checkpoint_file_path, resume, raise_on_failure,
+                                        entries_filter))
+        finally:
+            loop.close()
+
+        return [result.entries for result in results]
+
+    async def async_sync_to_file(
+        self,
+        csv_file_path: InputFilePaths = None,
+        json_file_path: InputFilePaths = None,
+        parquet_file_path: InputFilePaths = None,
+        stream: bool = False,
+        checkpoint_file_path: str = None,
+        resume: bool = False,
+        raise_on_failure: bool = False,
+        entries_filter: custom_entries_filter.CustomEntriesFilter = None
+    ) -> List[custom_entries_sync_steps.EntryGroupSyncResult]:
+        """
+        Coroutine version of ``sync_to_file``, to be awaited from a running event loop.
+
+        :return: A list of ``EntryGroupSyncResult``, in the same order the Entry Groups are
+            read.
+        """
+        file_path = self.__sync_steps.list_input_files(csv_file_path, json_file_path,
+                                                       parquet_file_path)
+        read_file = self.__sync_steps.get_file_reader(csv_file_path, json_file_path, stream,
+                                                      parquet_file_path, entries_filter,
+                                                      self.__parse_workers)
+
+        logging.info('')
+        logging.info('==== Synchronize Custom Entries to file [STARTED] =====')
+
+        checkpoint = custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint(
+            checkpoint_file_path, file_path, resume) \
+            if checkpoint_file_path and file_path else None
+
+        with futures.ThreadPoolExecutor(max_workers=self.__max_concurrency) as executor:
+            loop = asyncio.get_event_loop()
+            assembled_entry_groups = await loop.run_in_executor(
+                executor, self.__sync_steps.read_entry_groups, read_file, file_path)
+            if not stream:
+                await loop.run_in_executor(executor, self.__sync_steps.resolve_entry_groups,
+                                           assembled_entry_groups, checkpoint,
+                                           self.__max_concurrency)
+
+            logging.info('')
+            logging.info('>> Synchronizing file :: Data Catalog metadata...')
+
+            results = await self.__synchronize_entry_groups(executor, iter(assembled_entry_groups),
+                                                            checkpoint)
+
+            read_group_ids = {}
+            for result in results:
+                read_group_ids.setdefault(result.system_name, set()).add(result.group_id)
+            removed_failed_results = await loop.run_in_executor(
+                executor, self.__sync_steps.delete_removed_entry_groups, read_group_ids,
+                entries_filter)
+
+        self.__sync_steps.report_failed_entry_groups(
+            [result for result in results if result.error] + removed_failed_results,
+            raise_on_failure)
+
+        logging.info('')
+        logging.info('==== Synchronize Custom Entries to file [FINISHED] ====')
+
+        return results
+
+    async def __synchronize_entry_groups(
+        self, executor: futures.Executor,
+        assembled_entry_groups: Iterable[Tuple[str, List[Dict[str, object]]]],
+        checkpoint: custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint
+    ) -> List[custom_entries_sync_steps.EntryGroupSyncResult]:
+        """
+        Start a coroutine for each Entry Group as soon as a slot is available. Reading the
+        input waits for the slots as well, so lazily read inputs are not fully materialized.
+        Each Entry Group waits for the previous one of the same system before calling any API,
+        so they are synchronized one at a time, in the order they were read. It also waits for
+        the previous one with the same ID, from another system, since the cleanup may delete
+        the Entry Group the other one is ingesting into.
+        """
+        loop = asyncio.get_event_loop()
+        semaphore = asyncio.Semaphore(self.__max_concurrency)
+        last_system_tasks = {}
+        last_group_tasks = {}
+
+        tasks = []
+        while True:
+            # Blocking reads run in the executor as well, so they do not stall the event loop.
+            system_entry_groups = await loop.run_in_executor(executor, next,
+                                                             assembled_entry_groups, None)
+            if system_entry_groups is None:
+                break
+
+            system_name, entry_groups = system_entry_groups
+            for entry_group in entry_groups:
+                group_id = entry_group.get('id')
+                if checkpoint and checkpoint.is_completed(system_name, group_id):
+                    logging.info('')
+                    logging.info('Skipping Entry Group already synchronized: %s...', group_id)
+                    tasks.append(
+                        self.__make_skipped_result(
+                            custom_entries_sync_steps.EntryGroupSyncResult(system_name,
+                                                                           group_id, [],
+                                                                           skipped=True)))
+                    continue
+
+                previous_tasks = [
+                    previous_task for previous_task in (last_system_tasks.get(system_name),
+                                                        last_group_tasks.get(group_id))
+                    if previous_task
+                ]
+                await semaphore.acquire()
+                task = asyncio.ensure_future(
+                    self.__synchronize_entry_group_safely(executor, semaphore, previous_tasks,
+                                                          entry_group, system_name, checkpoint))
+                last_system_tasks[system_name] = task
+                last_group_tasks[group_id] = task
+                tasks.append(task)
+
+        return list(await asyncio.gather(*tasks))
+
+    @classmethod
+    def __make_skipped_result(cls, result: custom_entries_sync_steps.EntryGroupSyncResult) \
+            -> asyncio.Future:
+
+        skipped_result = asyncio.get_event_loop().create_future()
+        skipped_result.set_result(result)
+        return skipped_result
+
+    async def __synchronize_entry_group_safely(
+        self, executor: futures.Executor, semaphore: asyncio.Semaphore,
+        previous_tasks: List[asyncio.Future], entry_group: Dict[str, object], system_name: str,
+        checkpoint: custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint
+    ) -> custom_entries_sync_steps.EntryGroupSyncResult:
+
+        group_id = entry_group.get('id')
+        self.__sync_steps.start_entry_group(system_name, group_id)
+        try:
+            entries = await self.__synchronize_entry_group(executor, entry_group, system_name,
+                                                           previous_tasks)
+            if checkpoint:
+                await asyncio.get_event_loop().run_in_executor(executor, checkpoint.mark_completed,
+                                                               system_name, group_id)
+            return self.__sync_steps.finish_entry_group(
+                custom_entries_sync_steps.EntryGroupSyncResult(system_name, group_id, entries))
+        except Exception as e:
+            logging.exception('Failed to synchronize Entry Group: %s (system=%s)', group_id,
+                              system_name)
+            return self.__sync_steps.finish_entry_group(
+                custom_entries_sync_steps.EntryGroupSyncResult(system_name, group_id, [], e))
+        finally:
+            # Keep the chains of the system and the Entry Group ID intact when this Entry Group
+            # ends early.
+            if previous_tasks:
+                await asyncio.wait(previous_tasks)
+            semaphore.release()
+
+    async def __synchronize_entry_group(self, executor: futures.Executor,
+                                        entry_group: Dict[str, object], system_name: str,
+                                        previous_tasks: List[asyncio.Future]) \
+            -> List[types.Entry]:
+
+        group_id = entry_group.get('id')
+        if not group_id:
+            return []
+
+        logging.info('')
+        logging.info('Processing Entry Group: %s...', group_id)
+
+        loop = asyncio.get_event_loop()
+        sync_steps = self.__sync_steps
+
+        # Prepare: convert raw metadata into Data Catalog entries.
+        assembled_entries = await loop.run_in_executor(executor, sync_steps.prepare_entries,
+                                                       group_id, system_name,
+                                                       entry_group.get('entries'))
+
+        if previous_tasks:
+            await asyncio.wait(previous_tasks)
+
+        changes = await loop.run_in_executor(executor, sync_steps.get_changes, group_id,
+                                             system_name, assembled_entries)
+        if changes is None:
+            # The cleanup and ingest steps run in order, in a single executor call.
+            failed_entry_ids = await loop.run_in_executor(executor, sync_steps.cleanup_and_ingest,
+                                                          group_id, system_name, assembled_entries)
+        else:
+            failed_entry_ids = await self.__apply_changes(executor, group_id, system_name, changes)
+
+        await loop.run_in_executor(executor, sync_steps.save_state, group_id, system_name,
+                                   assembled_entries, changes, failed_entry_ids)
+
+        return [assembled_entry.entry for assembled_entry in assembled_entries]
+
+    async def __apply_changes(self, executor: futures.Executor, group_id: str, system_name: str,
+                              changes: change_detector.EntryGroupChanges) -> List[str]:
+
+        loop = asyncio.get_event_loop()
+
+        # Data Catalog cleanup: delete the Entries removed since the last synchronization,
+        # keeping all the requests in flight at once.
+        deleted = await asyncio.gather(*[
+            loop.run_in_executor(executor, self.__sync_steps.delete_entry, group_id, system_name,
+                                 entry_id) for entry_id in changes.deleted_entry_ids
+        ])
+        failed_entry_ids = [
+            entry_id for entry_id, is_deleted in zip(changes.deleted_entry_ids, deleted)
+            if not is_deleted
+        ]
+
+        # Ingest only the created and modified Entries into Data Catalog.
+        failed_entry_ids.extend(await
+                                loop.run_in_executor(executor, self.__sync_steps.ingest_entries,
+                                                     group_id, system_name,
+                                                     changes.created + changes.modified))
+        return failed_entry_ids
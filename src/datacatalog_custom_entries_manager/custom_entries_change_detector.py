@@ -0,0 +1,83 @@
+import hashlib
+from typing import Dict, List, NamedTuple
+
+from google.cloud.datacatalog import types
+from google.datacatalog_connectors.commons import prepare
+
+
+class EntryGroupChanges(NamedTuple):
+    created: List[prepare.AssembledEntryData]
+    modified: List[prepare.AssembledEntryData]
+    unchanged: List[prepare.AssembledEntryData]
+    deleted_entry_ids: List[str]
+    fingerprints: Dict[str, str]
+
+
+class CustomEntriesChangeDetector:
+    __FIELDS_SEPARATOR = '\x1f'
+
+    @classmethod
+    def detect_changes(cls, assembled_entries: List[prepare.AssembledEntryData],
+                       previous_fingerprints: Dict[str, str]) -> EntryGroupChanges:
+        """
+        Compare the fingerprints of an Entry Group's Entries with the ones from a previous
+        synchronization.
+
+        :param assembled_entries: The up to date Entries of the Entry Group.
+        :param previous_fingerprints: The Entry fingerprints of the previous synchronization,
+            indexed by Entry ID.
+        :return: The created, modified, and unchanged Entries, the IDs of the deleted ones,
+            and the fingerprints of the up to date Entries.
+        """
+        fingerprints = cls.fingerprint_entries(assembled_entries)
+
+        created, modified, unchanged = [], [], []
+        for assembled_entry in assembled_entries:
+            fingerprint = fingerprints[assembled_entry.entry_id]
+            previous_fingerprint = previous_fingerprints.get(assembled_entry.entry_id)
+            if previous_fingerprint is None:
+                created.append(assembled_entry)
+            elif previous_fingerprint != fingerprint:
+                modified.append(assembled_entry)
+            else:
+                unchanged.append(assembled_entry)
+
+        deleted_entry_ids = [
+            entry_id for entry_id in previous_fingerprints if entry_id not in fingerprints
+        ]
+
+        return EntryGroupChanges(created, modified, unchanged, deleted_entry_ids, fingerprints)
+
+    @classmethod
+    def fingerprint_entries(cls, assembled_entries: List[prepare.AssembledEntryData]) \
+            -> Dict[str, str]:
+
+        return {
+            assembled_entry.entry_id: cls.fingerprint_entry(assembled_entry.entry)
+            for assembled_entry in assembled_entries
+        }
+
+    @classmethod
+    def fingerprint_entry(cls, entry: types.Entry) -> str:
+        """
+        Compute a stable fingerprint of the Entry fields managed by this package.
+
+        :param entry: The Data Catalog Entry.
+        :return: A hex digest.
+        """
+        timestamps = entry.source_system_timestamps
+        return cls.fingerprint_fields(entry.linked_resource, entry.display_name, entry.description,
+                                      entry.user_specified_type, entry.user_specified_system,
+                                      timestamps.create_time.seconds,
+                                      timestamps.update_time.seconds)
+
+    @classmethod
+    def fingerprint_fields(cls, linked_resource: str, display_name: str, description: str,
+                           user_specified_type: str, user_specified_system: str,
+                           create_time_seconds: int, update_time_seconds: int) -> str:
+
+        fields = (linked_resource, display_name, description, user_specified_type,
+                  user_specified_system, create_time_seconds, update_time_seconds)
+        serialized_fields = cls.__FIELDS_SEPARATOR.join('' if field is None else str(field)
+                                                        for field in fields)
+        return hashlib.sha256(serialized_fields.encode('utf-8')).hexdigest()
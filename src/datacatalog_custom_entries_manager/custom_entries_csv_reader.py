@@ -1,57 +1,199 @@
+from datetime import datetime
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from . import constant
+from . import constant, custom_entries_filter, custom_entries_record
 
 
 class CustomEntriesCSVReader:
+    FILE_EXTENSION = '.csv'
+    __DEFAULT_CHUNK_SIZE = 10000
+    __MANDATORY_ENTRY_COLUMNS = (constant.ENTRIES_DS_LINKED_RESOURCE_COLUMN_LABEL,
+                                 constant.ENTRIES_DS_DISPLAY_NAME_COLUMN_LABEL,
+                                 constant.ENTRIES_DS_USER_SPECIFIED_TYPE_COLUMN_LABEL)
+    __TIMESTAMP_COLUMNS = (constant.ENTRIES_DS_CREATED_AT_COLUMN_LABEL,
+                           constant.ENTRIES_DS_UPDATED_AT_COLUMN_LABEL)
+    # Rows are numbered from 1, counting the header, as shown by spreadsheet editors.
+    __FIRST_ROW_NUMBER = 2
+    __TIMESTAMP_PATTERN = r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{4}'
 
     @classmethod
-    def read_file(cls, file_path: str) -> List[Tuple[str, List[Dict[str, object]]]]:
+    def read_file(cls,
+                  file_path: str,
+                  entries_filter: custom_entries_filter.CustomEntriesFilter = None) \
+            -> List[Tuple[str, List[Dict[str, object]]]]:
         """
-        Read Custom Entries from a JSON file.
+        Read Custom Entries from a CSV file.
 
-        :param file_path: The JSON file path.
+        :param file_path: The CSV file path.
+        :param entries_filter: The User Specified Systems and Entry Groups to read, if not all
+            of them. The rows of the others are dropped before any Entry is made.
         :return: A list with Entry Group ``dicts`` assembled
-            by their parent User Specified Systems.
+            by their parent User Specified Systems. The Entries of each Entry Group are
+            ``CustomEntryColumns``, sliced from the parsed file.
+        :raises ValueError: If a timestamp does not match ``constant.ENTRIES_DATETIME_FORMAT``.
         """
         logging.info('')
         logging.info('>> Reading the CSV file: %s...', file_path)
 
-        dataframe = pd.read_csv(file_path)
+        dataframe = cls.__normalize_dataframe(pd.read_csv(file_path))
+        if entries_filter:
+            dataframe = dataframe[cls.__select_rows(dataframe, entries_filter)]
 
-        return cls.__assemble_entry_groups_from_system_indexable_dataframe(dataframe)
+        return cls.assemble_entry_groups(dataframe, cls.__FIRST_ROW_NUMBER)
 
     @classmethod
-    def __assemble_entry_groups_from_system_indexable_dataframe(cls, dataframe) \
+    def stream_file(cls,
+                    file_path: str,
+                    entries_filter: custom_entries_filter.CustomEntriesFilter = None,
+                    chunk_size: int = __DEFAULT_CHUNK_SIZE) \
+            -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Read Custom Entries from a CSV file in chunks, never loading the whole file.
+
+        The rows belonging to an Entry Group must be contiguous in the file, which is always
+        the case when the User Specified System and Group ID columns are left empty to be
+        forward-filled. Each Entry Group is yielded as soon as its last row is read.
+
+        :param file_path: The CSV file path.
+        :param entries_filter: The User Specified Systems and Entry Groups to read, if not all
+            of them. The rows of the others are dropped from each chunk before any Entry is
+            made.
+        :param chunk_size: The number of rows read from the file at a time.
+        :return: An iterator of single Entry Group ``dicts`` assembled
+            by their parent User Specified Systems.
+        :raises ValueError: If the rows of an Entry Group are not contiguous.
+        """
+        logging.info('')
+        logging.info('>> Streaming the CSV file: %s...', file_path)
+
+        fill_values = {}
+        completed_keys = set()
+        current_key = None
+        current_records = []
+        for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+            if chunk.empty:
+                continue
+
+            normalized_chunk = cls.__normalize_dataframe(chunk, fill_values)
+
+            # Carry the forward-fill state over to the next chunk.
+            last_values = normalized_chunk[constant.ENTRIES_DS_FILLABLE_COLUMNS].iloc[-1]
+            fill_values = last_values.dropna().to_dict()
+
+            if entries_filter:
+                normalized_chunk = normalized_chunk[cls.__select_rows(
+                    normalized_chunk, entries_filter)]
+
+            for row_index, record in zip(normalized_chunk.index,
+                                         normalized_chunk.to_dict(orient='records')):
+                key = cls.__make_entry_group_key(record)
+                if key != current_key:
+                    if current_records:
+                        yield cls.__make_streamed_entry_group(current_key, current_records)
+                    if key in completed_keys:
+                        raise ValueError(f'The rows of Entry Group {key[1]} (system={key[0]})'
+                                         f' are not contiguous in the CSV file.')
+                    completed_keys.add(key)
+                    current_key = key
+                    current_records = []
+                current_records.append((row_index, record))
+
+        if current_records:
+            yield cls.__make_streamed_entry_group(current_key, current_records)
+
+    @classmethod
+    def __make_entry_group_key(cls, record: Dict[str, object]) -> Tuple[str, str]:
+        system = record[constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL]
+        group_id = record[constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL]
+        # Missing keys are read as NaN, which is not equal to itself.
+        return None if pd.isna(system) else system, None if pd.isna(group_id) else group_id
+
+    @classmethod
+    def __make_streamed_entry_group(cls, key: Tuple[str, str],
+                                    records: List[Tuple[int, Dict[str, object]]]) \
+            -> Tuple[str, List[Dict[str, object]]]:
+
+        system_name, group_id = key
+        return system_name, [{
+            'id':
+            group_id,
+            'entries':
+            [cls.__make_entry(record, system_name, row_index) for row_index, record in records]
+        }]
+
+    @classmethod
+    def assemble_entry_groups(cls, dataframe, first_row_number: int) \
             -> List[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Assemble the Entry Groups of a dataframe, as read from a CSV or Parquet file.
+
+        :param dataframe: The dataframe, with the ``constant.ENTRIES_DS_COLUMNS_ORDER`` columns
+            and the User Specified System and Group ID set in every row. Its index is the
+            0-based row of each Entry in the data.
+        :param first_row_number: The row number of the first Entry, as shown to the users.
+        :return: A list with Entry Group ``dicts`` assembled
+            by their parent User Specified Systems. The Entries of each Entry Group are
+            ``CustomEntryColumns``.
+        :raises KeyError: If the User Specified System or Group ID is missing in any row,
+            naming the column and the first row it is missing at.
+        :raises ValueError: If a timestamp does not match ``constant.ENTRIES_DATETIME_FORMAT``.
+        """
+        key_columns = [
+            constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL,
+            constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL
+        ]
+        keys_df = dataframe[key_columns]
+        if keys_df.empty:
+            return []
+        # The (row, column) positions of the missing keys, sorted by row.
+        missing_keys = np.argwhere(keys_df.isna().to_numpy())
+        if missing_keys.size:
+            row_index, column_index = missing_keys[0]
+            row_number = dataframe.index[row_index] + first_row_number
+            raise KeyError(f'{key_columns[column_index]} is missing at row {row_number}.')
 
-        normalized_df = cls.__normalize_dataframe(dataframe)
-        normalized_df.set_index(constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL,
-                                inplace=True)
+        # Number the (system, group) pairs in order of first appearance. Each Entry Group must be
+        # a contiguous slice of the columns, so the rows are sorted once if they are not already.
+        group_codes, group_keys = pd.MultiIndex.from_frame(keys_df).factorize()
+        rows_order = None
+        if (np.diff(group_codes) < 0).any():
+            rows_order = np.argsort(group_codes, kind='stable')
+            group_codes = group_codes[rows_order]
+        group_bounds = np.searchsorted(group_codes, np.arange(len(group_keys) + 1))
 
-        assembled_entry_groups = []
-        for system in normalized_df.index.unique().tolist():
-            entry_groups_subset = \
-                normalized_df.loc[[system], constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL:]
+        columns = cls.__get_entries_columns(dataframe, first_row_number, rows_order)
 
-            # Save memory by deleting data already copied to a subset.
-            normalized_df.drop(system, inplace=True)
+        assembled_entry_groups = []
+        entry_groups_by_system = {}
+        for index, (system, group_id) in enumerate(group_keys):
+            entry_groups = entry_groups_by_system.get(system)
+            if entry_groups is None:
+                entry_groups = entry_groups_by_system[system] = []
+                assembled_entry_groups.append((system, entry_groups))
 
-            assembled_entry_groups.append(
-                (system, cls.__make_entry_groups(entry_groups_subset, system)))
+            entry_groups.append({
+                'id':
+                group_id,
+                'entries':
+                cls.__make_entries(columns, group_bounds[index], group_bounds[index + 1], system)
+            })
 
         return assembled_entry_groups
 
     @classmethod
-    def __normalize_dataframe(cls, dataframe):
+    def __normalize_dataframe(cls, dataframe, fill_values: Dict[str, object] = None):
         # Reorder dataframe columns.
         ordered_df = dataframe.reindex(columns=constant.ENTRIES_DS_COLUMNS_ORDER, copy=False)
 
         # Fill NA/NaN values by propagating the last valid observation forward to next valid.
         filled_subset = ordered_df[constant.ENTRIES_DS_FILLABLE_COLUMNS].fillna(method='pad')
+        # Leading NA/NaN values are filled with the last valid observations of previous chunks.
+        if fill_values:
+            filled_subset = filled_subset.fillna(value=fill_values)
 
         # Rebuild the dataframe by concatenating the fillable and non-fillable columns.
         rebuilt_df = pd.concat(
@@ -60,52 +202,114 @@ class CustomEntriesCSVReader:
         return rebuilt_df
 
     @classmethod
-    def __make_entry_groups(cls, dataframe, system_name: str) -> List[Dict[str, object]]:
-        dataframe.set_index(constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL, inplace=True)
+    def __select_rows(cls, dataframe,
+                      entries_filter: custom_entries_filter.CustomEntriesFilter) -> np.ndarray:
 
-        entry_groups = []
-        for group_id in dataframe.index.unique().tolist():
-            entries_subset = \
-                dataframe.loc[[group_id], constant.ENTRIES_DS_DISPLAY_NAME_COLUMN_LABEL:]
+        # The patterns are matched once per distinct name instead of once per row. The rows with
+        # no name are kept, so the missing keys are reported.
+        systems = dataframe[constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL]
+        group_ids = dataframe[constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL]
+        selected_systems = systems.isin(entries_filter.select_systems(systems.dropna().unique()))
+        selected_groups = group_ids.isin(entries_filter.select_groups(group_ids.dropna().unique()))
+        return ((selected_systems | systems.isna()) &
+                (selected_groups | group_ids.isna())).to_numpy()
 
-            # Save memory by deleting data already copied to a subset.
-            dataframe.drop(group_id, inplace=True)
+    @classmethod
+    def __get_entries_columns(cls,
+                              dataframe,
+                              first_row_number: int,
+                              rows_order: np.ndarray = None) -> List[np.ndarray]:
 
-            entry_groups.append({
-                'id': group_id,
-                'entries': cls.__make_entries(entries_subset, system_name)
-            })
+        row_numbers = dataframe.index.to_numpy() + first_row_number
+        columns = [
+            dataframe[column].to_numpy(dtype=object) for column in cls.__MANDATORY_ENTRY_COLUMNS
+        ]
+        columns.append(
+            cls.__get_optional_strings(dataframe[constant.ENTRIES_DS_DESCRIPTION_COLUMN_LABEL]))
+        columns.extend(
+            cls.__get_epoch_seconds(column, dataframe[column], row_numbers)
+            for column in cls.__TIMESTAMP_COLUMNS)
+        columns.append(row_numbers)
 
-        return entry_groups
+        if rows_order is None:
+            return columns
+        return [column[rows_order] for column in columns]
 
     @classmethod
-    def __make_entries(cls, dataframe, system_name: str) -> List[Dict[str, object]]:
-        records = dataframe.to_dict(orient='records')
-        return [cls.__make_entry(record, system_name) for record in records]
+    def __get_optional_strings(cls, series) -> np.ndarray:
+        values = series.to_numpy(dtype=object)
+        # Pandas is not aware of the field types and reads empty values as NaN (float),
+        # hence the type check.
+        is_set = np.fromiter((bool(value) and isinstance(value, str) for value in values),
+                             dtype=bool,
+                             count=len(values))
+        return np.where(is_set, values, None)
 
     @classmethod
-    def __make_entry(cls, record: Dict[str, object], system_name: str) -> Dict[str, object]:
-        # Mandatory fields
-        entry = {
-            'linked_resource': record[constant.ENTRIES_DS_LINKED_RESOURCE_COLUMN_LABEL],
-            'display_name': record[constant.ENTRIES_DS_DISPLAY_NAME_COLUMN_LABEL],
-            'user_specified_type': record[constant.ENTRIES_DS_USER_SPECIFIED_TYPE_COLUMN_LABEL],
-            'user_specified_system': system_name,
-        }
-
-        # Optional fields
-        cls.__set_optional_string_field(entry, 'description',
-                                        record[constant.ENTRIES_DS_DESCRIPTION_COLUMN_LABEL])
-        cls.__set_optional_string_field(entry, 'created_at',
-                                        record[constant.ENTRIES_DS_CREATED_AT_COLUMN_LABEL])
-        cls.__set_optional_string_field(entry, 'updated_at',
-                                        record[constant.ENTRIES_DS_UPDATED_AT_COLUMN_LABEL])
-
-        return entry
+    def __get_epoch_seconds(cls, column: str, series, row_numbers: np.ndarray) -> np.ndarray:
+        if pd.api.types.is_datetime64_any_dtype(series):
+            # Columnar files may hold actual timestamps, which are UTC if no time zone is set.
+            return cls.__to_epoch_seconds(series)
+
+        strings = pd.Series(cls.__get_optional_strings(series))
+
+        # Pandas parses ISO 8601 strings leniently, accepting dates with no time or time zone,
+        # so only the ones shaped as the format are parsed in bulk, with the others left to
+        # strptime, as done for the JSON files.
+        is_canonical = strings.str.fullmatch(cls.__TIMESTAMP_PATTERN, na=False)
+        timestamps = pd.to_datetime(strings.where(is_canonical),
+                                    format=constant.ENTRIES_DATETIME_FORMAT,
+                                    utc=True)
+        seconds = cls.__to_epoch_seconds(timestamps)
+
+        for index in np.flatnonzero(strings.notna().to_numpy() & ~is_canonical.to_numpy()):
+            try:
+                seconds[index] = int(
+                    datetime.strptime(strings[index],
+                                      constant.ENTRIES_DATETIME_FORMAT).timestamp())
+            except ValueError:
+                source = custom_entries_record.CustomEntryColumns.make_row_source(
+                    row_numbers[index])
+                raise ValueError(f'Invalid {column} in {source}: {strings[index]}')
+
+        return seconds
+
+    @classmethod
+    def __to_epoch_seconds(cls, timestamps) -> np.ndarray:
+        if timestamps.dt.tz:
+            timestamps = timestamps.dt.tz_convert(None)
+        # NaT is converted to the minimum int64, hence the mask. 0 means not set.
+        return np.where(timestamps.isna().to_numpy(), 0,
+                        timestamps.to_numpy().astype('datetime64[s]').astype(np.int64))
+
+    @classmethod
+    def __make_entries(cls, columns: List[np.ndarray], start: int, stop: int,
+                       system_name: str) -> custom_entries_record.CustomEntryColumns:
+
+        # Slicing the arrays makes views of them, with no copy.
+        return custom_entries_record.CustomEntryColumns(
+            system_name, *[column[start:stop] for column in columns])
+
+    @classmethod
+    def __make_entry(cls, record: Dict[str, object], system_name: str,
+                     row_index: int) -> custom_entries_record.CustomEntryRecord:
+
+        return custom_entries_record.CustomEntryRecord(
+            record[constant.ENTRIES_DS_LINKED_RESOURCE_COLUMN_LABEL],
+            record[constant.ENTRIES_DS_DISPLAY_NAME_COLUMN_LABEL],
+            record[constant.ENTRIES_DS_USER_SPECIFIED_TYPE_COLUMN_LABEL],
+            system_name,
+            custom_entries_record.CustomEntryColumns.make_row_source(row_index +
+                                                                     cls.__FIRST_ROW_NUMBER),
+            description=cls.__get_optional_string(
+                record[constant.ENTRIES_DS_DESCRIPTION_COLUMN_LABEL]),
+            created_at=cls.__get_optional_string(
+                record[constant.ENTRIES_DS_CREATED_AT_COLUMN_LABEL]),
+            updated_at=cls.__get_optional_string(
+                record[constant.ENTRIES_DS_UPDATED_AT_COLUMN_LABEL]))
 
     @classmethod
-    def __set_optional_string_field(cls, entry: Dict[str, object], field_id: str, value: object):
+    def __get_optional_string(cls, value: object) -> str:
         # Pandas is not aware of the field types and reads empty values as NaN (float),
         # hence the type check.
-        if value and isinstance(value, str):
-            entry[field_id] = value
+        return value if value and isinstance(value, str) else None
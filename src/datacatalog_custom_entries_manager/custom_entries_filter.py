@@ -0,0 +1,59 @@
+import fnmatch
+import re
+from typing import Iterable, List, NamedTuple, Tuple
+
+
+class CustomEntriesFilter(NamedTuple):
+    """
+    Select the User Specified Systems and Entry Groups read from the input files, by include and
+    exclude glob patterns, as supported by ``fnmatch``: ``*``, ``?``, and ``[seq]``.
+
+    A name is selected if it matches any of the include patterns, or there are none, and none of
+    the exclude patterns. Names are matched case-sensitively. The readers apply the filter before
+    any Entry is made, so the Entries of the skipped Entry Groups are never parsed.
+    """
+    include_systems: Tuple[str, ...] = ()
+    exclude_systems: Tuple[str, ...] = ()
+    include_groups: Tuple[str, ...] = ()
+    exclude_groups: Tuple[str, ...] = ()
+
+    def matches_system(self, system_name: str) -> bool:
+        return self.__matches(system_name, self.include_systems, self.exclude_systems)
+
+    def matches_group(self, group_id: str) -> bool:
+        return self.__matches(group_id, self.include_groups, self.exclude_groups)
+
+    def matches(self, system_name: str, group_id: str) -> bool:
+        return self.matches_system(system_name) and self.matches_group(group_id)
+
+    def select_systems(self, system_names: Iterable[str]) -> List[str]:
+        """
+        :return: The given User Specified Systems that match the filter.
+        """
+        return [system_name for system_name in system_names if self.matches_system(system_name)]
+
+    def select_groups(self, group_ids: Iterable[str]) -> List[str]:
+        """
+        :return: The given Entry Group IDs that match the filter.
+        """
+        return [group_id for group_id in group_ids if self.matches_group(group_id)]
+
+    @classmethod
+    def get_literal_prefix(cls, pattern: str) -> str:
+        """
+        Get the part of a pattern before its first wildcard, shared by all the names it matches.
+        """
+        return re.split(r'[*?[]', pattern, maxsplit=1)[0]
+
+    @classmethod
+    def __matches(cls, name: str, include_patterns: Tuple[str, ...],
+                  exclude_patterns: Tuple[str, ...]) -> bool:
+
+        # Missing names are left to the readers, which report them. NaN is not equal to itself.
+        if name is None or name != name:
+            return True
+        name = str(name)
+        if include_patterns and not any(
+                fnmatch.fnmatchcase(name, pattern) for pattern in include_patterns):
+            return False
+        return not any(fnmatch.fnmatchcase(name, pattern) for pattern in exclude_patterns)
@@ -0,0 +1,158 @@
+import hashlib
+import logging
+from typing import Dict, List, NamedTuple, Tuple
+
+from google.datacatalog_connectors.commons import prepare
+
+
+class EntryIDIssue(NamedTuple):
+    entry_id: str
+    reason: str
+    sources: List[str]
+
+
+class CustomEntriesIDValidator:
+    """
+    Check the IDs generated for the Entries of an Entry Group before any API call is made.
+
+    Entry IDs are derived from display names, so different display names may collapse into the
+    same ID, and the last Entry sent to Data Catalog would silently overwrite the others. That
+    includes the long display names whose IDs are truncated to 64 characters by the commons
+    factory.
+    """
+    ENTRY_ID_MAX_LENGTH = 64
+
+    __DUPLICATE_REASON = 'duplicated'
+    __TOO_LONG_REASON = f'longer than {ENTRY_ID_MAX_LENGTH} characters'
+    __SUFFIX_LENGTH = 8
+
+    @classmethod
+    def find_issues(cls, assembled_entries: List[prepare.AssembledEntryData],
+                    sources: List[str]) -> List[EntryIDIssue]:
+        """
+        Find duplicate and over-length Entry IDs, in a single pass over the Entries.
+
+        :param assembled_entries: The Entries of an Entry Group.
+        :param sources: The source location of each Entry, such as a CSV row or a JSON path,
+            in the same order as ``assembled_entries``.
+        :return: A list with the issues found, in the order their Entry IDs first appear.
+        """
+        positions = cls.__index_entry_ids(assembled_entries)
+
+        issues = []
+        for entry_id, indexes in positions.items():
+            issue_sources = [cls.__get_source(sources, index) for index in indexes]
+            if len(indexes) > 1:
+                issues.append(EntryIDIssue(entry_id, cls.__DUPLICATE_REASON, issue_sources))
+            if len(entry_id) > cls.ENTRY_ID_MAX_LENGTH:
+                issues.append(EntryIDIssue(entry_id, cls.__TOO_LONG_REASON, issue_sources))
+
+        return issues
+
+    @classmethod
+    def validate_entries(cls,
+                         group_id: str,
+                         assembled_entries: List[prepare.AssembledEntryData],
+                         sources: List[str],
+                         disambiguate: bool = False) -> List[prepare.AssembledEntryData]:
+        """
+        Validate the Entry IDs of an Entry Group.
+
+        :param group_id: The Entry Group id.
+        :param assembled_entries: The Entries of the Entry Group.
+        :param sources: The source location of each Entry, in the same order as
+            ``assembled_entries``.
+        :param disambiguate: Rename the offending Entries instead of failing. Among the
+            Entries with a given ID, the one with the lowest linked resource keeps it; the
+            others, as well as over-length IDs, are truncated and suffixed with a hash of their
+            linked resource, so the new IDs do not depend on the order of the input.
+        :return: The Entries, renamed if ``disambiguate`` is set.
+        :raises ValueError: If there are issues that could not be disambiguated.
+        """
+        cls.__warn_truncated_ids(assembled_entries, sources)
+
+        issues = cls.find_issues(assembled_entries, sources)
+        if issues and disambiguate:
+            assembled_entries = cls.__disambiguate(assembled_entries)
+            for issue in issues:
+                logging.warning('Entry ID %s is %s (%s): disambiguated.', issue.entry_id,
+                                issue.reason, ', '.join(issue.sources))
+            issues = cls.find_issues(assembled_entries, sources)
+
+        if issues:
+            raise ValueError(cls.__format_issues(group_id, issues))
+
+        return assembled_entries
+
+    @classmethod
+    def __warn_truncated_ids(cls, assembled_entries: List[prepare.AssembledEntryData],
+                             sources: List[str]):
+
+        # The IDs that reach the maximum length were likely truncated: they are valid, and the
+        # collisions caused by truncation are reported as duplicates.
+        for index, assembled_entry in enumerate(assembled_entries):
+            if len(assembled_entry.entry_id) == cls.ENTRY_ID_MAX_LENGTH:
+                logging.warning('Entry ID %s may have been truncated to %d characters (%s).',
+                                assembled_entry.entry_id, cls.ENTRY_ID_MAX_LENGTH,
+                                cls.__get_source(sources, index))
+
+    @classmethod
+    def __index_entry_ids(cls, assembled_entries: List[prepare.AssembledEntryData]) \
+            -> Dict[str, List[int]]:
+
+        positions = {}
+        for index, assembled_entry in enumerate(assembled_entries):
+            positions.setdefault(assembled_entry.entry_id, []).append(index)
+        return positions
+
+    @classmethod
+    def __disambiguate(cls, assembled_entries: List[prepare.AssembledEntryData]) \
+            -> List[prepare.AssembledEntryData]:
+
+        positions = cls.__index_entry_ids(assembled_entries)
+        owner_indexes = {
+            entry_id:
+            min(indexes, key=lambda index: cls.__get_owner_sort_key(assembled_entries[index]))
+            for entry_id, indexes in positions.items()
+        }
+
+        disambiguated_entries = []
+        for index, assembled_entry in enumerate(assembled_entries):
+            entry_id = assembled_entry.entry_id
+            is_duplicate = owner_indexes[entry_id] != index
+            if is_duplicate or len(entry_id) > cls.ENTRY_ID_MAX_LENGTH:
+                assembled_entry = cls.__rename_entry(assembled_entry)
+            disambiguated_entries.append(assembled_entry)
+
+        return disambiguated_entries
+
+    @classmethod
+    def __get_owner_sort_key(cls, assembled_entry: prepare.AssembledEntryData) -> Tuple[str, str]:
+        entry = assembled_entry.entry
+        return entry.linked_resource, entry.display_name
+
+    @classmethod
+    def __rename_entry(cls, assembled_entry: prepare.AssembledEntryData) \
+            -> prepare.AssembledEntryData:
+
+        entry = assembled_entry.entry
+        suffix = hashlib.sha256(entry.linked_resource.encode()).hexdigest()[:cls.__SUFFIX_LENGTH]
+        prefix_length = cls.ENTRY_ID_MAX_LENGTH - len(suffix) - 1
+        entry_id = f'{assembled_entry.entry_id[:prefix_length]}_{suffix}'
+
+        entry_group_name = entry.name.rsplit('/entries/', 1)[0]
+        entry.name = f'{entry_group_name}/entries/{entry_id}'
+
+        return prepare.AssembledEntryData(entry_id, entry)
+
+    @classmethod
+    def __get_source(cls, sources: List[str], index: int) -> str:
+        source = sources[index] if index < len(sources) else None
+        return source or f'entries[{index}]'
+
+    @classmethod
+    def __format_issues(cls, group_id: str, issues: List[EntryIDIssue]) -> str:
+        lines = [f'Invalid Entry IDs in Entry Group {group_id}:']
+        lines.extend(f'  - {issue.entry_id} is {issue.reason}: {", ".join(issue.sources)}'
+                     for issue in issues)
+        return '\n'.join(lines)
@@ -1,18 +1,32 @@
 import json
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
-from . import constant
+import ijson
+
+from . import constant, custom_entries_filter, custom_entries_record
 
 
 class CustomEntriesJSONReader:
+    FILE_EXTENSION = '.json'
+    __SYSTEM_PREFIX = f'{constant.ENTRIES_JSON_USER_SPECIFIED_SYSTEMS_FIELD_NAME}.item'
+    __SYSTEM_NAME_PREFIX = \
+        f'{__SYSTEM_PREFIX}.{constant.ENTRIES_JSON_USER_SPECIFIED_SYSTEM_FIELD_NAME}'
+    __GROUP_PREFIX = f'{__SYSTEM_PREFIX}.{constant.ENTRIES_JSON_ENTRY_GROUPS_FIELD_NAME}.item'
+    __GROUP_ID_PREFIX = f'{__GROUP_PREFIX}.{constant.ENTRIES_JSON_ENTRY_GROUP_ID_FIELD_NAME}'
+    __ENTRY_PREFIX = f'{__GROUP_PREFIX}.{constant.ENTRIES_JSON_ENTRIES_FIELD_NAME}.item'
 
     @classmethod
-    def read_file(cls, file_path: str) -> List[Tuple[str, List[Dict[str, object]]]]:
+    def read_file(cls,
+                  file_path: str,
+                  entries_filter: custom_entries_filter.CustomEntriesFilter = None) \
+            -> List[Tuple[str, List[Dict[str, object]]]]:
         """
         Read Custom Entries from a JSON file.
 
         :param file_path: The JSON file path.
+        :param entries_filter: The User Specified Systems and Entry Groups to read, if not all
+            of them. No Entry is made for the others.
         :return: A list with Entry Group ``dicts`` assembled
             by their parent User Specified Systems.
         """
@@ -22,59 +36,184 @@ class CustomEntriesJSONReader:
         with open(file_path) as json_file:
             json_data = json.load(json_file)
 
-        return cls.__assemble_entry_groups_from_system_indexed_data(json_data)
+        return cls.__assemble_entry_groups_from_system_indexed_data(json_data, entries_filter)
+
+    @classmethod
+    def stream_file(cls,
+                    file_path: str,
+                    entries_filter: custom_entries_filter.CustomEntriesFilter = None) \
+            -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Read Custom Entries from a JSON file incrementally, never loading the whole file.
+
+        The file is parsed as a stream of events, and each Entry Group is yielded as soon as
+        its closing bracket is read, so the peak memory usage is bound to the largest Entry
+        Group rather than to the file size.
+
+        :param file_path: The JSON file path.
+        :param entries_filter: The User Specified Systems and Entry Groups to read, if not all
+            of them. The Entries of the others are skipped as they are parsed, unless they are
+            read before the names of their Entry Groups and systems.
+        :return: An iterator of single Entry Group ``dicts`` assembled
+            by their parent User Specified Systems.
+        """
+        logging.info('')
+        logging.info('>> Streaming the JSON file: %s...', file_path)
+
+        with open(file_path, 'rb') as json_file:
+            yield from cls.__assemble_entry_groups_from_system_indexed_events(
+                ijson.parse(json_file), entries_filter)
+
+    @classmethod
+    def __assemble_entry_groups_from_system_indexed_events(
+            cls, events, entries_filter: custom_entries_filter.CustomEntriesFilter) \
+            -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+
+        has_systems = False
+        system_index = -1
+        group_index = -1
+        system_name = None
+        # Entry Groups read before their parent System name, which is allowed by the JSON
+        # spec since object keys are not ordered.
+        pending_groups_json = []
+        group_json = None
+        skip_entries = False
+        entry_builder = None
+
+        for prefix, event, value in events:
+            if entry_builder:
+                entry_builder.event(event, value)
+                if prefix == cls.__ENTRY_PREFIX and event == 'end_map':
+                    group_json[constant.ENTRIES_JSON_ENTRIES_FIELD_NAME].append(
+                        entry_builder.value)
+                    entry_builder = None
+            elif prefix == cls.__ENTRY_PREFIX and event == 'start_map' and not skip_entries:
+                entry_builder = ijson.ObjectBuilder()
+                entry_builder.event(event, value)
+            elif prefix == cls.__GROUP_PREFIX:
+                if event == 'start_map':
+                    group_index += 1
+                    group_json = {}
+                    skip_entries = bool(entries_filter and system_name is not None
+                                        and not entries_filter.matches_system(system_name))
+                elif event == 'map_key' and value == constant.ENTRIES_JSON_ENTRIES_FIELD_NAME:
+                    group_json[value] = []
+                elif event == 'end_map':
+                    pending_groups_json.append((cls.__make_group_path(system_index,
+                                                                      group_index), group_json))
+                    group_json = None
+                    if system_name is not None:
+                        yield from cls.__make_pending_entry_groups(pending_groups_json,
+                                                                   system_name, entries_filter)
+            elif prefix == cls.__GROUP_ID_PREFIX:
+                group_json[constant.ENTRIES_JSON_ENTRY_GROUP_ID_FIELD_NAME] = value
+                # The Entries read so far are dropped along with their Entry Group.
+                skip_entries = skip_entries or bool(entries_filter
+                                                    and not entries_filter.matches_group(value))
+            elif prefix == cls.__SYSTEM_NAME_PREFIX:
+                system_name = value
+                yield from cls.__make_pending_entry_groups(pending_groups_json, system_name,
+                                                           entries_filter)
+            elif prefix == cls.__SYSTEM_PREFIX and event == 'start_map':
+                system_index += 1
+                group_index = -1
+            elif prefix == cls.__SYSTEM_PREFIX and event == 'end_map':
+                if system_name is None:
+                    raise KeyError(constant.ENTRIES_JSON_USER_SPECIFIED_SYSTEM_FIELD_NAME)
+                system_name = None
+            elif prefix == constant.ENTRIES_JSON_USER_SPECIFIED_SYSTEMS_FIELD_NAME:
+                has_systems = True
+
+        if not has_systems:
+            raise KeyError(constant.ENTRIES_JSON_USER_SPECIFIED_SYSTEMS_FIELD_NAME)
+
+    @classmethod
+    def __make_pending_entry_groups(cls, pending_groups_json: List[Tuple[str, Dict[str, object]]],
+                                    system_name: str,
+                                    entries_filter: custom_entries_filter.CustomEntriesFilter) \
+            -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+
+        while pending_groups_json:
+            group_path, group_json = pending_groups_json.pop(0)
+            if cls.__is_selected(group_json, system_name, entries_filter):
+                yield system_name, [cls.__make_entry_group(group_json, system_name, group_path)]
 
     @classmethod
-    def __assemble_entry_groups_from_system_indexed_data(cls, json_object: Dict[str, object]) \
+    def __assemble_entry_groups_from_system_indexed_data(
+            cls, json_object: Dict[str, object],
+            entries_filter: custom_entries_filter.CustomEntriesFilter) \
             -> List[Tuple[str, List[Dict[str, object]]]]:
 
         systems_json = json_object[constant.ENTRIES_JSON_USER_SPECIFIED_SYSTEMS_FIELD_NAME]
-        return [cls.__assemble_entry_groups_by_system(system_json) for system_json in systems_json]
+        assembled_entry_groups = [
+            cls.__assemble_entry_groups_by_system(system_json, system_index, entries_filter)
+            for system_index, system_json in enumerate(systems_json)
+        ]
+        if not entries_filter:
+            return assembled_entry_groups
+        # The systems with no Entry Group left are dropped.
+        return [(system_name, entry_groups) for system_name, entry_groups in assembled_entry_groups
+                if entry_groups]
 
     @classmethod
-    def __assemble_entry_groups_by_system(cls, json_object: Dict[str, object]) \
+    def __assemble_entry_groups_by_system(
+            cls, json_object: Dict[str, object], system_index: int,
+            entries_filter: custom_entries_filter.CustomEntriesFilter) \
             -> Tuple[str, List[Dict[str, object]]]:
 
         system_name = json_object[constant.ENTRIES_JSON_USER_SPECIFIED_SYSTEM_FIELD_NAME]
         groups_json = json_object[constant.ENTRIES_JSON_ENTRY_GROUPS_FIELD_NAME]
         return \
             system_name, \
-            [cls.__make_entry_group(group_json, system_name) for group_json in groups_json]
+            [cls.__make_entry_group(group_json, system_name,
+                                    cls.__make_group_path(system_index, group_index))
+             for group_index, group_json in enumerate(groups_json)
+             if cls.__is_selected(group_json, system_name, entries_filter)]
 
     @classmethod
-    def __make_entry_group(cls, json_object: Dict[str, object], system_name: str) \
-            -> Dict[str, object]:
+    def __is_selected(cls, group_json: Dict[str, object], system_name: str,
+                      entries_filter: custom_entries_filter.CustomEntriesFilter) -> bool:
 
-        entries_json = json_object[constant.ENTRIES_JSON_ENTRIES_FIELD_NAME]
-        return {
-            'id': json_object.get(constant.ENTRIES_JSON_ENTRY_GROUP_ID_FIELD_NAME),
-            'entries': [cls.__make_entry(entry_json, system_name) for entry_json in entries_json]
-        }
+        return not entries_filter or entries_filter.matches(
+            system_name, group_json.get(constant.ENTRIES_JSON_ENTRY_GROUP_ID_FIELD_NAME))
 
     @classmethod
-    def __make_entry(cls, json_object: Dict[str, object], system_name: str) -> Dict[str, object]:
-        # Mandatory fields
-        entry = {
-            'linked_resource': json_object[constant.ENTRIES_JSON_LINKED_RESOURCE_FIELD_NAME],
-            'display_name': json_object[constant.ENTRIES_JSON_DISPLAY_NAME_FIELD_NAME],
-            'user_specified_type':
-            json_object[constant.ENTRIES_JSON_USER_SPECIFIED_TYPE_FIELD_NAME],
-            'user_specified_system': system_name,
-        }
+    def __make_group_path(cls, system_index: int, group_index: int) -> str:
+        return f'$.{constant.ENTRIES_JSON_USER_SPECIFIED_SYSTEMS_FIELD_NAME}[{system_index}]' \
+               f'.{constant.ENTRIES_JSON_ENTRY_GROUPS_FIELD_NAME}[{group_index}]'
 
-        # Optional fields
-        cls.__set_optional_string_field(
-            entry, 'description', json_object.get(constant.ENTRIES_JSON_DESCRIPTION_FIELD_NAME))
+    @classmethod
+    def __make_entry_group(cls, json_object: Dict[str, object], system_name: str,
+                           group_path: str) -> Dict[str, object]:
 
-        cls.__set_optional_string_field(
-            entry, 'created_at', json_object.get(constant.ENTRIES_JSON_CREATED_AT_FIELD_NAME))
+        entries_json = json_object[constant.ENTRIES_JSON_ENTRIES_FIELD_NAME]
+        entries_path = f'{group_path}.{constant.ENTRIES_JSON_ENTRIES_FIELD_NAME}'
+        return {
+            'id':
+            json_object.get(constant.ENTRIES_JSON_ENTRY_GROUP_ID_FIELD_NAME),
+            'entries': [
+                cls.__make_entry(entry_json, system_name, f'{entries_path}[{entry_index}]')
+                for entry_index, entry_json in enumerate(entries_json)
+            ]
+        }
 
-        cls.__set_optional_string_field(
-            entry, 'updated_at', json_object.get(constant.ENTRIES_JSON_UPDATED_AT_FIELD_NAME))
+    @classmethod
+    def __make_entry(cls, json_object: Dict[str, object], system_name: str,
+                     entry_path: str) -> custom_entries_record.CustomEntryRecord:
 
-        return entry
+        return custom_entries_record.CustomEntryRecord(
+            json_object[constant.ENTRIES_JSON_LINKED_RESOURCE_FIELD_NAME],
+            json_object[constant.ENTRIES_JSON_DISPLAY_NAME_FIELD_NAME],
+            json_object[constant.ENTRIES_JSON_USER_SPECIFIED_TYPE_FIELD_NAME],
+            system_name,
+            entry_path,
+            description=cls.__get_optional_string(
+                json_object.get(constant.ENTRIES_JSON_DESCRIPTION_FIELD_NAME)),
+            created_at=cls.__get_optional_string(
+                json_object.get(constant.ENTRIES_JSON_CREATED_AT_FIELD_NAME)),
+            updated_at=cls.__get_optional_string(
+                json_object.get(constant.ENTRIES_JSON_UPDATED_AT_FIELD_NAME)))
 
     @classmethod
-    def __set_optional_string_field(cls, entry: Dict[str, object], field_id: str, value: object):
-        if value and isinstance(value, str):
-            entry[field_id] = value
+    def __get_optional_string(cls, value: object) -> str:
+        return value if value and isinstance(value, str) else None
@@ -1,11 +1,27 @@
 import argparse
+import contextlib
 import logging
+import os
 import sys
 
-from . import custom_entries_synchronizer
+from . import custom_entries_filter, lazy_module
+
+# The synchronizers and the planner import pandas and the Data Catalog client, which take
+# most of the startup time, so they are only imported when a command needs them.
+custom_entries_async_synchronizer = lazy_module.load('.custom_entries_async_synchronizer',
+                                                     __package__)
+custom_entries_planner = lazy_module.load('.custom_entries_planner', __package__)
+custom_entries_sync_hooks = lazy_module.load('.custom_entries_sync_hooks', __package__)
+custom_entries_sync_metrics = lazy_module.load('.custom_entries_sync_metrics', __package__)
+custom_entries_sync_state = lazy_module.load('.custom_entries_sync_state', __package__)
+custom_entries_sync_steps = lazy_module.load('.custom_entries_sync_steps', __package__)
+custom_entries_synchronizer = lazy_module.load('.custom_entries_synchronizer', __package__)
+datacatalog_rate_limiter = lazy_module.load('.datacatalog_rate_limiter', __package__)
 
 
 class CustomEntriesManagerCLI:
+    # Same convention as ``terraform plan -detailed-exitcode``.
+    __PLAN_CHANGES_EXIT_CODE = 2
 
     @classmethod
     def run(cls, argv):
@@ -26,24 +42,314 @@ class CustomEntriesManagerCLI:
         subparsers = parser.add_subparsers()
 
         sync_entries_parser = subparsers.add_parser('sync', help='Synchronize Custom Entries')
-        sync_entries_parser.add_argument('--csv-file',
-                                         help='CSV file with metadata for the Custom Entries')
-        sync_entries_parser.add_argument('--json-file',
-                                         help='JSON file with metadata for the Custom Entries')
+        cls.__add_input_file_arguments(sync_entries_parser)
+        cls.__add_filter_arguments(sync_entries_parser)
         sync_entries_parser.add_argument('--project-id',
                                          help='Google Cloud Project ID',
                                          required=True)
         sync_entries_parser.add_argument('--location-id',
                                          help='Google Cloud Location ID',
                                          required=True)
+        sync_entries_parser.add_argument(
+            '--max-workers',
+            help='Maximum number of Entry Groups synchronized concurrently (default: 1)',
+            type=cls.__parse_positive_int,
+            default=1)
+        sync_entries_parser.add_argument(
+            '--engine',
+            help='Synchronization engine: a pool of worker threads, or an asyncio event loop'
+            ' (default: threads)',
+            choices=['threads', 'asyncio'],
+            default='threads')
+        sync_entries_parser.add_argument(
+            '--requests-per-second',
+            help='Maximum rate of Data Catalog API requests, shared by all the Entry Groups'
+            ' synchronized concurrently and lowered while the quota is exceeded',
+            type=float)
+        sync_entries_parser.add_argument(
+            '--client-pool-size',
+            help='Number of Data Catalog clients, each with its own connection, shared by all the'
+            ' Entry Groups (default: 1)',
+            type=cls.__parse_positive_int,
+            default=1)
+        sync_entries_parser.add_argument(
+            '--stream',
+            help='Read the input file incrementally, synchronizing each Entry Group as soon as'
+            ' it is read',
+            action='store_true')
+        sync_entries_parser.add_argument(
+            '--state-file',
+            help='Local file to keep the state of previous synchronizations, so unchanged'
+            ' Entries are skipped')
+        sync_entries_parser.add_argument(
+            '--checkpoint-file',
+            help='Local file to record each Entry Group as soon as it is synchronized')
+        sync_entries_parser.add_argument(
+            '--resume',
+            help='Skip the Entry Groups recorded in the checkpoint file by a previous run with'
+            ' the same input file',
+            action='store_true')
+        sync_entries_parser.add_argument(
+            '--disambiguate-ids',
+            help='Rename Entries whose generated IDs are duplicated, instead of failing'
+            ' their Entry Groups',
+            action='store_true')
+        sync_entries_parser.add_argument(
+            '--metrics-file',
+            help='Local file to write the per-phase timing and throughput of the run to, also'
+            ' when it fails')
+        sync_entries_parser.add_argument(
+            '--metrics-format',
+            help='Format of the metrics file: a JSON object per line for each Entry Group and'
+            ' the run summary, or the Prometheus text format for the run summary (default:'
+            ' jsonl)',
+            choices=['jsonl', 'prometheus'],
+            default='jsonl')
+        sync_entries_parser.add_argument(
+            '--profile',
+            help='Profile the run with cProfile, writing the profile next to the metrics file,'
+            ' with the .prof extension',
+            action='store_true')
         sync_entries_parser.set_defaults(func=cls.__synchronize_custom_entries)
 
-        return parser.parse_args(argv)
+        plan_entries_parser = subparsers.add_parser(
+            'plan', help='Show the changes a synchronization would make, without calling any API')
+        cls.__add_input_file_arguments(plan_entries_parser)
+        cls.__add_filter_arguments(plan_entries_parser)
+        plan_entries_parser.add_argument(
+            '--snapshot-file',
+            help='JSON file with the current Data Catalog Entries, as exported by'
+            ' `gcloud data-catalog entries list --format=json`',
+            required=True)
+        plan_entries_parser.add_argument('--project-id',
+                                         help='Google Cloud Project ID',
+                                         required=True)
+        plan_entries_parser.add_argument('--location-id',
+                                         help='Google Cloud Location ID',
+                                         required=True)
+        plan_entries_parser.add_argument(
+            '--disambiguate-ids',
+            help='Rename Entries whose generated IDs are duplicated, instead of failing',
+            action='store_true')
+        plan_entries_parser.add_argument(
+            '--detailed-exitcode',
+            help='Exit with status code 2 when there are changes to synchronize, instead of 0',
+            action='store_true')
+        plan_entries_parser.set_defaults(func=cls.__plan_custom_entries)
+
+        args = parser.parse_args(argv)
+        if getattr(args, 'resume', False) and not args.checkpoint_file:
+            sync_entries_parser.error('--resume requires --checkpoint-file')
+        if getattr(args, 'profile', False) and not args.metrics_file:
+            sync_entries_parser.error('--profile requires --metrics-file')
+
+        return args
+
+    @classmethod
+    def __add_input_file_arguments(cls, parser):
+        parser.add_argument(
+            '--csv-file',
+            help='CSV file with metadata for the Custom Entries; also accepts several files,'
+            ' directories, and glob patterns of sharded files',
+            nargs='+')
+        parser.add_argument(
+            '--json-file',
+            help='JSON file with metadata for the Custom Entries; also accepts several files,'
+            ' directories, and glob patterns of sharded files',
+            nargs='+')
+        parser.add_argument(
+            '--parquet-file',
+            help='Parquet file with metadata for the Custom Entries, in the CSV columns layout;'
+            ' requires pyarrow; also accepts several files, directories, and glob patterns of'
+            ' sharded files',
+            nargs='+')
+        parser.add_argument(
+            '--parse-workers',
+            help='Maximum number of sharded input files parsed concurrently, each in its own'
+            ' process (default: the number of CPUs)',
+            type=cls.__parse_positive_int)
+
+    @classmethod
+    def __parse_positive_int(cls, value):
+        try:
+            number = int(value)
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise argparse.ArgumentTypeError(f'must be a positive integer: {value}')
+        return number
+
+    @classmethod
+    def __add_filter_arguments(cls, parser):
+        parser.add_argument(
+            '--system',
+            help='Only read the User Specified Systems that match this glob pattern; may be'
+            ' repeated',
+            action='append',
+            default=[])
+        parser.add_argument(
+            '--exclude-system',
+            help='Skip the User Specified Systems that match this glob pattern; may be repeated',
+            action='append',
+            default=[])
+        parser.add_argument(
+            '--group',
+            help='Only read the Entry Groups whose IDs match this glob pattern; may be repeated',
+            action='append',
+            default=[])
+        parser.add_argument(
+            '--exclude-group',
+            help='Skip the Entry Groups whose IDs match this glob pattern; may be repeated',
+            action='append',
+            default=[])
+
+    @classmethod
+    def __make_entries_filter(cls, args):
+        entries_filter = custom_entries_filter.CustomEntriesFilter(tuple(args.system),
+                                                                   tuple(args.exclude_system),
+                                                                   tuple(args.group),
+                                                                   tuple(args.exclude_group))
+        # Nothing is filtered out with no patterns.
+        return entries_filter if any(entries_filter) else None
 
     @classmethod
     def __synchronize_custom_entries(cls, args):
-        custom_entries_synchronizer.CustomEntriesSynchronizer(args.project_id, args.location_id)\
-            .sync_to_file(csv_file_path=args.csv_file, json_file_path=args.json_file)
+        sync_state = custom_entries_sync_state.CustomEntriesSyncState(args.state_file) \
+            if args.state_file else None
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(
+            args.requests_per_second) if args.requests_per_second else None
+
+        metrics = custom_entries_sync_metrics.CustomEntriesSyncMetrics() \
+            if args.metrics_file else None
+        profiler = custom_entries_sync_hooks.CustomEntriesSyncProfiler() \
+            if args.profile else None
+
+        try:
+            # A no-op context manager when not profiling: contextlib.nullcontext requires
+            # Python 3.7.
+            with profiler.profile() if profiler else contextlib.ExitStack():
+                if args.engine == 'asyncio':
+                    cls.__run_async_synchronizer(sync_state, rate_limiter, metrics, profiler, args)
+                else:
+                    cls.__run_synchronizer(sync_state, rate_limiter, metrics, profiler, args)
+        except custom_entries_sync_steps.EntryGroupSyncError as e:
+            # The failed Entry Groups have already been reported.
+            sys.exit(str(e))
+        finally:
+            if sync_state:
+                sync_state.close()
+            if metrics:
+                cls.__write_metrics(metrics, args.metrics_file, args.metrics_format)
+            if profiler:
+                cls.__write_profile(profiler, args.metrics_file)
+
+    @classmethod
+    def __run_synchronizer(cls, sync_state, rate_limiter, metrics, hooks, args):
+        synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
+            args.project_id,
+            args.location_id,
+            max_workers=args.max_workers,
+            sync_state=sync_state,
+            disambiguate_ids=args.disambiguate_ids,
+            rate_limiter=rate_limiter,
+            client_pool_size=args.client_pool_size,
+            metrics=metrics,
+            hooks=hooks,
+            parse_workers=args.parse_workers)
+
+        if not args.stream:
+            synchronizer.sync_to_file(csv_file_path=args.csv_file,
+                                      json_file_path=args.json_file,
+                                      parquet_file_path=args.parquet_file,
+                                      checkpoint_file_path=args.checkpoint_file,
+                                      resume=args.resume,
+                                      raise_on_failure=True,
+                                      entries_filter=cls.__make_entries_filter(args))
+            return
+
+        # Results are discarded as soon as each Entry Group is synchronized.
+        for _ in synchronizer.stream_sync_to_file(csv_file_path=args.csv_file,
+                                                  json_file_path=args.json_file,
+                                                  parquet_file_path=args.parquet_file,
+                                                  checkpoint_file_path=args.checkpoint_file,
+                                                  resume=args.resume,
+                                                  raise_on_failure=True,
+                                                  entries_filter=cls.__make_entries_filter(args)):
+            pass
+
+    @classmethod
+    def __run_async_synchronizer(cls, sync_state, rate_limiter, metrics, hooks, args):
+        synchronizer = custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer(
+            args.project_id,
+            args.location_id,
+            max_concurrency=args.max_workers,
+            sync_state=sync_state,
+            disambiguate_ids=args.disambiguate_ids,
+            rate_limiter=rate_limiter,
+            client_pool_size=args.client_pool_size,
+            metrics=metrics,
+            hooks=hooks,
+            parse_workers=args.parse_workers)
+
+        synchronizer.sync_to_file(csv_file_path=args.csv_file,
+                                  json_file_path=args.json_file,
+                                  parquet_file_path=args.parquet_file,
+                                  stream=args.stream,
+                                  checkpoint_file_path=args.checkpoint_file,
+                                  resume=args.resume,
+                                  raise_on_failure=True,
+                                  entries_filter=cls.__make_entries_filter(args))
+
+    @classmethod
+    def __write_metrics(cls, metrics, file_path, file_format):
+        if file_format == 'prometheus':
+            metrics.write_prometheus_text(file_path)
+        else:
+            metrics.write_json_lines(file_path)
+        logging.info('Metrics written to: %s', file_path)
+
+    @classmethod
+    def __write_profile(cls, profiler, metrics_file_path):
+        if not profiler.get_stats():
+            logging.warning('Nothing was profiled.')
+            return
+
+        file_path = f'{os.path.splitext(metrics_file_path)[0]}.prof'
+        profiler.write_stats(file_path)
+        logging.info('Profile written to: %s', file_path)
+
+    @classmethod
+    def __plan_custom_entries(cls, args):
+        planner = custom_entries_planner.CustomEntriesPlanner(
+            args.project_id, args.location_id, disambiguate_ids=args.disambiguate_ids)
+        entry_group_plans = planner.plan_file(args.snapshot_file,
+                                              csv_file_path=args.csv_file,
+                                              json_file_path=args.json_file,
+                                              parquet_file_path=args.parquet_file,
+                                              entries_filter=cls.__make_entries_filter(args),
+                                              parse_workers=args.parse_workers)
+
+        created_count = updated_count = deleted_count = 0
+        for plan in entry_group_plans:
+            print(f'Entry Group: {plan.group_id} (system={plan.system_name}):'
+                  f' {len(plan.created_entry_ids)} to create,'
+                  f' {len(plan.updated_entry_ids)} to update,'
+                  f' {len(plan.deleted_entry_ids)} to delete,'
+                  f' {plan.unchanged_count} unchanged')
+            for marker, entry_ids in (('+', plan.created_entry_ids), ('~', plan.updated_entry_ids),
+                                      ('-', plan.deleted_entry_ids)):
+                for entry_id in entry_ids:
+                    print(f'  {marker} {entry_id}')
+
+            created_count += len(plan.created_entry_ids)
+            updated_count += len(plan.updated_entry_ids)
+            deleted_count += len(plan.deleted_entry_ids)
+
+        print(f'Plan: {created_count} to create, {updated_count} to update,'
+              f' {deleted_count} to delete.')
+
+        if args.detailed_exitcode and any(plan.has_changes() for plan in entry_group_plans):
+            sys.exit(cls.__PLAN_CHANGES_EXIT_CODE)
 
 
 def main():
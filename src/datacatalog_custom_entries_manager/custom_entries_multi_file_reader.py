@@ -0,0 +1,210 @@
+import collections
+from concurrent import futures
+import glob
+import itertools
+import logging
+import os
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from . import custom_entries_filter, custom_entries_record
+
+
+class CustomEntriesMultiFileReader:
+    """
+    Read Custom Entries from input files sharded into several files of the same format, with
+    any of the single file readers, such as ``CustomEntriesCSVReader``.
+
+    Each file is self-contained: CSV rows do not take the User Specified System and Group ID of
+    a previous file. The Entry Groups read from more than one file are merged, so an Entry Group
+    split across files is synchronized once, as a whole, and the source of each Entry, used to
+    report errors, is prefixed with its file path.
+    """
+
+    @classmethod
+    def list_files(cls, file_paths: Iterable[str], extension: str) -> List[str]:
+        """
+        List the input files matched by the given paths.
+
+        :param file_paths: File paths, directories, whose files with the given extension are
+            listed, not recursively, and glob patterns, such as ``exports/*.csv``.
+        :param extension: The extension of the files to list in directories, such as ``.csv``.
+        :return: The matched file paths, in the given order, each sorted by name. The files
+            matched more than once are listed once.
+        :raises FileNotFoundError: If a directory or glob pattern matches no file.
+        """
+        listed_file_paths = []
+        for file_path in file_paths:
+            if os.path.isdir(file_path):
+                matched_file_paths = sorted(
+                    entry.path for entry in os.scandir(file_path)
+                    if entry.is_file() and entry.name.lower().endswith(extension))
+            elif glob.escape(file_path) != file_path:
+                matched_file_paths = sorted(path for path in glob.glob(file_path)
+                                            if os.path.isfile(path))
+            else:
+                matched_file_paths = [file_path]
+
+            if not matched_file_paths:
+                raise FileNotFoundError(f'No {extension} file found at: {file_path}')
+            listed_file_paths.extend(matched_file_paths)
+
+        # Dicts keep the insertion order only from Python 3.7.
+        return list(collections.OrderedDict.fromkeys(listed_file_paths))
+
+    @classmethod
+    def read_files(cls,
+                   reader,
+                   file_paths: Sequence[str],
+                   entries_filter: custom_entries_filter.CustomEntriesFilter = None,
+                   max_workers: int = None) -> List[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Read Custom Entries from several files, parsing them in parallel in a pool of
+        processes.
+
+        :param reader: The reader of the files format, such as ``CustomEntriesCSVReader``.
+        :param file_paths: The file paths, as listed by ``list_files``.
+        :param entries_filter: The User Specified Systems and Entry Groups to read, if not all
+            of them.
+        :param max_workers: The maximum number of files parsed concurrently, each in its own
+            process. Defaults to the number of CPUs.
+        :return: A list with Entry Group ``dicts`` assembled
+            by their parent User Specified Systems, in the order they are first read.
+        """
+        if len(file_paths) == 1:
+            return reader.read_file(file_paths[0], entries_filter)
+
+        max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        logging.info('')
+        logging.info('>> Reading %d files with %d worker process(es)...', len(file_paths),
+                     max_workers)
+
+        if max_workers == 1:
+            shards = [
+                cls.read_shard(reader, file_path, entries_filter) for file_path in file_paths
+            ]
+        else:
+            with futures.ProcessPoolExecutor(max_workers) as executor:
+                shards = list(
+                    executor.map(cls.read_shard, itertools.repeat(reader), file_paths,
+                                 itertools.repeat(entries_filter)))
+
+        return cls.__merge_entry_groups(shards)
+
+    @classmethod
+    def read_shard(cls, reader, file_path: str,
+                   entries_filter: custom_entries_filter.CustomEntriesFilter) \
+            -> List[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Read Custom Entries from one of several files, tagging each Entry with the file path.
+
+        It runs in the worker processes of ``read_files``, so it must not be private: private
+        methods cannot be pickled.
+        """
+        assembled_entry_groups = reader.read_file(file_path, entries_filter)
+        for _, entry_groups in assembled_entry_groups:
+            for entry_group in entry_groups:
+                cls.__tag_entries(entry_group.get('entries'), file_path)
+        return assembled_entry_groups
+
+    @classmethod
+    def stream_files(cls,
+                     reader,
+                     file_paths: Sequence[str],
+                     entries_filter: custom_entries_filter.CustomEntriesFilter = None) \
+            -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Read Custom Entries from several files incrementally, one file after another, never
+        loading a whole file.
+
+        The rows belonging to an Entry Group must be contiguous, though they may continue at
+        the start of the next file. Each Entry Group is yielded as soon as its last row is read.
+
+        :param reader: The reader of the files format, such as ``CustomEntriesCSVReader``.
+        :param file_paths: The file paths, as listed by ``list_files``.
+        :param entries_filter: The User Specified Systems and Entry Groups to read, if not all
+            of them.
+        :return: An iterator of single Entry Group ``dicts`` assembled
+            by their parent User Specified Systems.
+        :raises ValueError: If the rows of an Entry Group are not contiguous.
+        """
+        if len(file_paths) == 1:
+            yield from reader.stream_file(file_paths[0], entries_filter)
+            return
+
+        completed_keys = set()
+        current = None
+        for file_path in file_paths:
+            for system_name, entry_groups in reader.stream_file(file_path, entries_filter):
+                entry_group = entry_groups[0]
+                cls.__tag_entries(entry_group.get('entries'), file_path)
+                key = system_name, entry_group.get('id')
+                if current and key == current[0]:
+                    current[1].append(entry_group)
+                    continue
+                if current:
+                    yield cls.__make_merged_entry_group(*current)
+                if key in completed_keys:
+                    raise ValueError(f'The rows of Entry Group {key[1]} (system={key[0]})'
+                                     f' are not contiguous in the input files.')
+                completed_keys.add(key)
+                current = key, [entry_group]
+
+        if current:
+            yield cls.__make_merged_entry_group(*current)
+
+    @classmethod
+    def __tag_entries(cls, entries: Sequence[Dict[str, object]], file_path: str):
+        if isinstance(entries, custom_entries_record.CustomEntryColumns):
+            # Only the CSV and Parquet readers, which already import numpy, read Entry columns.
+            import numpy as np
+            entries.file_paths = np.full(len(entries), file_path, dtype=object)
+            return
+        for entry in entries or []:
+            entry.source = custom_entries_record.CustomEntryColumns.make_file_source(
+                file_path, entry.source)
+
+    @classmethod
+    def __merge_entry_groups(cls, shards: List[List[Tuple[str, List[Dict[str, object]]]]]) \
+            -> List[Tuple[str, List[Dict[str, object]]]]:
+
+        # The parts of each Entry Group, by system, in the order they are first read.
+        systems_entry_groups = collections.OrderedDict()
+        for assembled_entry_groups in shards:
+            for system_name, entry_groups in assembled_entry_groups:
+                system_entry_groups = systems_entry_groups.setdefault(
+                    system_name, collections.OrderedDict())
+                for entry_group in entry_groups:
+                    system_entry_groups.setdefault(entry_group.get('id'), []).append(entry_group)
+
+        return [(system_name, [
+            cls.__make_merged_entry_group((system_name, group_id), entry_group_parts)[1][0]
+            for group_id, entry_group_parts in system_entry_groups.items()
+        ]) for system_name, system_entry_groups in systems_entry_groups.items()]
+
+    @classmethod
+    def __make_merged_entry_group(cls, key: Tuple[str, str],
+                                  entry_group_parts: List[Dict[str, object]]) \
+            -> Tuple[str, List[Dict[str, object]]]:
+
+        system_name, group_id = key
+        entries_parts = [
+            entry_group['entries'] for entry_group in entry_group_parts if entry_group['entries']
+        ]
+        if len(entries_parts) < 2:
+            entries = entries_parts[0] if entries_parts else entry_group_parts[0]['entries']
+        elif isinstance(entries_parts[0], custom_entries_record.CustomEntryColumns):
+            import numpy as np
+            entries = custom_entries_record.CustomEntryColumns(
+                system_name,
+                *[
+                    np.concatenate([getattr(entries, column) for entries in entries_parts])
+                    for column in custom_entries_record.CustomEntryColumns.COLUMNS
+                ],
+                file_paths=np.concatenate([entries.file_paths for entries in entries_parts]))
+        else:
+            entries = list(itertools.chain.from_iterable(entries_parts))
+
+        if len(entry_group_parts) > 1:
+            logging.info('Merged Entry Group %s (system=%s) from %d files.', group_id, system_name,
+                         len(entry_group_parts))
+        return system_name, [{'id': group_id, 'entries': entries}]
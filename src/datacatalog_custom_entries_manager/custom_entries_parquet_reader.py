@@ -0,0 +1,240 @@
+import logging
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import constant, custom_entries_csv_reader, custom_entries_filter, custom_entries_record
+
+try:
+    import pyarrow as pa
+    from pyarrow import compute as pc, parquet as pq
+except ImportError:  # pragma: no cover
+    pq = None
+
+
+class CustomEntriesParquetReader:
+    """
+    Read Custom Entries from Parquet files, in the column layout of the CSV files.
+
+    Only the ``constant.ENTRIES_DS_COLUMNS_ORDER`` columns are read, and the Entry Groups are
+    assembled by ``CustomEntriesCSVReader``, so their Entries are ``CustomEntryColumns`` too.
+    Unlike in CSV files, the User Specified System and Group ID must be set in every row, as
+    their statistics are used to skip the row groups that do not match the filter.
+
+    Requires pyarrow, installed with the ``parquet`` extra.
+    """
+    FILE_EXTENSION = '.parquet'
+    # Rows are numbered from 1, with no header.
+    __FIRST_ROW_NUMBER = 1
+
+    @classmethod
+    def read_file(cls,
+                  file_path: str,
+                  entries_filter: custom_entries_filter.CustomEntriesFilter = None) \
+            -> List[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Read Custom Entries from a Parquet file.
+
+        :param file_path: The Parquet file path.
+        :param entries_filter: The User Specified Systems and Entry Groups to read, if not all
+            of them. The row groups that cannot match it are not read.
+        :return: A list with Entry Group ``dicts`` assembled
+            by their parent User Specified Systems.
+        :raises KeyError: If the User Specified System or Group ID is missing in any row,
+            naming the column and the first row it is missing at.
+        """
+        logging.info('')
+        logging.info('>> Reading the Parquet file: %s...', file_path)
+
+        parquet_file = cls.__open_file(file_path)
+        dataframe = cls.__read_row_groups(parquet_file,
+                                          cls.__select_row_groups(parquet_file, entries_filter),
+                                          entries_filter)
+
+        return custom_entries_csv_reader.CustomEntriesCSVReader.assemble_entry_groups(
+            dataframe, cls.__FIRST_ROW_NUMBER)
+
+    @classmethod
+    def stream_file(cls,
+                    file_path: str,
+                    entries_filter: custom_entries_filter.CustomEntriesFilter = None) \
+            -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Read Custom Entries from a Parquet file one row group at a time, never loading the
+        whole file.
+
+        The rows belonging to an Entry Group must be contiguous in the file, though they may
+        span row groups. Each Entry Group is yielded as soon as its last row is read.
+
+        :param file_path: The Parquet file path.
+        :param entries_filter: The User Specified Systems and Entry Groups to read, if not all
+            of them. The row groups that cannot match it are not read.
+        :return: An iterator of single Entry Group ``dicts`` assembled
+            by their parent User Specified Systems.
+        :raises ValueError: If the rows of an Entry Group are not contiguous.
+        """
+        logging.info('')
+        logging.info('>> Streaming the Parquet file: %s...', file_path)
+
+        parquet_file = cls.__open_file(file_path)
+        completed_keys = set()
+        current_key = None
+        current_columns = []
+        for row_group in cls.__select_row_groups(parquet_file, entries_filter):
+            dataframe = cls.__read_row_groups(parquet_file, [row_group], entries_filter)
+            for key, entries in cls.__list_entry_groups_in_file_order(dataframe):
+                if key != current_key:
+                    if current_columns:
+                        yield cls.__make_streamed_entry_group(current_key, current_columns)
+                    if key in completed_keys:
+                        raise ValueError(f'The rows of Entry Group {key[1]} (system={key[0]})'
+                                         f' are not contiguous in the Parquet file.')
+                    completed_keys.add(key)
+                    current_key = key
+                    current_columns = []
+                current_columns.append(entries)
+
+        if current_columns:
+            yield cls.__make_streamed_entry_group(current_key, current_columns)
+
+    @classmethod
+    def __open_file(cls, file_path: str):
+        if not pq:
+            raise ImportError('Reading Parquet files requires pyarrow, installed with the'
+                              ' parquet extra: pip install datacatalog-custom-entries-manager'
+                              '[parquet]')
+        return pq.ParquetFile(file_path)
+
+    @classmethod
+    def __get_key_filters(cls, entries_filter: custom_entries_filter.CustomEntriesFilter) \
+            -> List[Tuple[str, Tuple[str, ...], Callable[[str], bool]]]:
+        """
+        Get the include patterns and the matching function of each key column.
+        """
+        if not entries_filter:
+            return []
+        return [(constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL,
+                 entries_filter.include_systems, entries_filter.matches_system),
+                (constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL, entries_filter.include_groups,
+                 entries_filter.matches_group)]
+
+    @classmethod
+    def __select_row_groups(
+            cls, parquet_file,
+            entries_filter: custom_entries_filter.CustomEntriesFilter) -> List[int]:
+        metadata = parquet_file.metadata
+        if not entries_filter:
+            return list(range(metadata.num_row_groups))
+
+        column_indexes = {
+            metadata.schema.column(index).name: index
+            for index in range(metadata.num_columns)
+        }
+
+        row_groups = [
+            row_group for row_group in range(metadata.num_row_groups)
+            if cls.__may_match(metadata.row_group(row_group), column_indexes, entries_filter)
+        ]
+        if len(row_groups) < metadata.num_row_groups:
+            logging.info('Skipping %d of %d row groups, by their statistics.',
+                         metadata.num_row_groups - len(row_groups), metadata.num_row_groups)
+        return row_groups
+
+    @classmethod
+    def __may_match(cls, row_group_metadata, column_indexes: Dict[str, int],
+                    entries_filter: custom_entries_filter.CustomEntriesFilter) -> bool:
+
+        for column, include_patterns, matches in cls.__get_key_filters(entries_filter):
+            index = column_indexes.get(column)
+            statistics = row_group_metadata.column(index).statistics if index is not None else None
+            # Row groups with no string statistics must be read to be filtered.
+            if not (statistics and statistics.has_min_max and isinstance(statistics.min, str)):
+                continue
+            # A single name is matched as is, for the exclude patterns too.
+            if statistics.min == statistics.max:
+                if not matches(statistics.min):
+                    return False
+                continue
+            # Otherwise, the names matched by an include pattern start with its literal prefix.
+            if include_patterns and not any(
+                    cls.__may_start_with(
+                        statistics,
+                        custom_entries_filter.CustomEntriesFilter.get_literal_prefix(pattern))
+                    for pattern in include_patterns):
+                return False
+        return True
+
+    @classmethod
+    def __may_start_with(cls, statistics, prefix: str) -> bool:
+        # The names between min and max may start with the prefix if neither is beyond it.
+        return statistics.max >= prefix and statistics.min[:len(prefix)] <= prefix
+
+    @classmethod
+    def __read_row_groups(cls, parquet_file, row_groups: List[int],
+                          entries_filter: custom_entries_filter.CustomEntriesFilter) \
+            -> pd.DataFrame:
+
+        schema = parquet_file.schema_arrow
+        columns = [
+            column for column in constant.ENTRIES_DS_COLUMNS_ORDER if column in schema.names
+        ]
+        if row_groups:
+            table = parquet_file.read_row_groups(row_groups, columns=columns)
+        else:
+            table = schema.empty_table().select(columns)
+
+        # The 0-based rows of the file, kept through the filters to report errors.
+        metadata = parquet_file.metadata
+        row_group_offsets = np.cumsum(
+            [0] + [metadata.row_group(index).num_rows for index in range(metadata.num_row_groups)])
+        row_indexes = np.concatenate([
+            np.arange(row_group_offsets[index], row_group_offsets[index + 1])
+            for index in row_groups
+        ]) if row_groups else np.arange(0)
+
+        mask = None
+        for column, _, matches in cls.__get_key_filters(entries_filter):
+            if column not in table.column_names:
+                continue
+            # The patterns are matched once per distinct name instead of once per row. The rows
+            # with no name are kept, so the missing keys are reported.
+            values = table[column]
+            matching_values = [value for value in pc.unique(values).to_pylist() if matches(value)]
+            column_mask = pc.or_(
+                pc.is_in(values, value_set=pa.array(matching_values, type=values.type)),
+                pc.is_null(values))
+            mask = column_mask if mask is None else pc.and_(mask, column_mask)
+        if mask is not None:
+            table = table.filter(mask)
+            row_indexes = row_indexes[mask.to_numpy()]
+
+        dataframe = table.to_pandas().reindex(columns=constant.ENTRIES_DS_COLUMNS_ORDER)
+        dataframe.index = row_indexes
+        return dataframe
+
+    @classmethod
+    def __list_entry_groups_in_file_order(cls, dataframe) \
+            -> List[Tuple[Tuple[str, str], custom_entries_record.CustomEntryColumns]]:
+
+        entry_groups = [
+            ((system_name, entry_group['id']), entry_group['entries'])
+            for system_name, system_entry_groups in custom_entries_csv_reader.
+            CustomEntriesCSVReader.assemble_entry_groups(dataframe, cls.__FIRST_ROW_NUMBER)
+            for entry_group in system_entry_groups
+        ]
+        # Entry Groups are assembled by system, so they are sorted back by their first rows.
+        return sorted(entry_groups, key=lambda entry_group: entry_group[1].row_numbers[0])
+
+    @classmethod
+    def __make_streamed_entry_group(cls, key: Tuple[str, str],
+                                    columns: List[custom_entries_record.CustomEntryColumns]) \
+            -> Tuple[str, List[Dict[str, object]]]:
+
+        system_name, group_id = key
+        entries = columns[0] if len(columns) == 1 else \
+            custom_entries_record.CustomEntryColumns(system_name, *[
+                np.concatenate([getattr(entry_columns, column) for entry_columns in columns])
+                for column in custom_entries_record.CustomEntryColumns.COLUMNS
+            ])
+        return system_name, [{'id': group_id, 'entries': entries}]
@@ -0,0 +1,191 @@
+import datetime
+import json
+import logging
+import re
+from typing import Dict, List, NamedTuple, Sequence, Union
+
+from google.datacatalog_connectors.commons import prepare
+
+from . import custom_entries_change_detector as change_detector, custom_entries_filter, \
+    custom_entries_id_validator, custom_entries_record, custom_entries_sync_steps, \
+    datacatalog_entry_factory
+
+
+class EntryGroupPlan(NamedTuple):
+    system_name: str
+    group_id: str
+    created_entry_ids: List[str]
+    updated_entry_ids: List[str]
+    deleted_entry_ids: List[str]
+    unchanged_count: int
+
+    def has_changes(self) -> bool:
+        return bool(self.created_entry_ids or self.updated_entry_ids or self.deleted_entry_ids)
+
+
+class CustomEntriesPlanner:
+    """
+    Compute the changes a synchronization would make to Data Catalog, based on a local snapshot
+    of the catalog contents instead of API calls.
+
+    The snapshot is a JSON array of Entry resources, as exported by
+    ``gcloud data-catalog entries list --format=json``.
+
+    The synchronization cleanup looks for obsolete Entries with a ``system=<name>`` query, which
+    matches the Entries of the system in every Entry Group of the project. So the snapshot
+    Entries of each input system that are not in the input are planned for deletion, including
+    the ones that belong to Entry Groups missing from the input.
+    """
+    __ENTRY_NAME_PATTERN = re.compile(
+        r'^projects/(?P<project>[^/]+)/locations/(?P<location>[^/]+)/'
+        r'entryGroups/(?P<group>[^/]+)/entries/(?P<entry>[^/]+)$')
+    __TIMESTAMP_PATTERN = re.compile(r'^(?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?'
+                                     r'(?P<offset>Z|[+-]\d{2}:?\d{2})$')
+
+    def __init__(self, project_id, location_id, disambiguate_ids: bool = False):
+        self.__project_id = project_id
+        self.__location_id = location_id
+        self.__disambiguate_ids = disambiguate_ids
+        self.__entry_factory = datacatalog_entry_factory.DataCatalogEntryFactory(
+            project_id, location_id)
+
+    def plan_file(self,
+                  snapshot_file_path: str,
+                  csv_file_path: Union[str, Sequence[str]] = None,
+                  json_file_path: Union[str, Sequence[str]] = None,
+                  parquet_file_path: Union[str, Sequence[str]] = None,
+                  entries_filter: custom_entries_filter.CustomEntriesFilter = None,
+                  parse_workers: int = None) -> List[EntryGroupPlan]:
+        """
+        Plan the synchronization of Custom Entries to the provided file contents.
+
+        :param
+            snapshot_file_path: Path of a JSON file with the current Data Catalog Entries.
+            csv_file_path: Path of a CSV file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded CSV files.
+            json_file_path: Path of a JSON file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded JSON files.
+            parquet_file_path: Path of a Parquet file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded Parquet files.
+            entries_filter: The User Specified Systems and Entry Groups to plan, if not all of
+                them.
+            parse_workers: The maximum number of sharded input files parsed concurrently,
+                each in its own process. Defaults to the number of CPUs.
+        :return: A list with the planned changes of each Entry Group, in the same order the
+            Entry Groups are read, followed by the snapshot Entry Groups of the same systems that
+            are missing from the input.
+        """
+        # Read the input as the synchronization does, so the plan matches its changes.
+        sync_steps = custom_entries_sync_steps.CustomEntriesSyncSteps
+        read_file = sync_steps.get_file_reader(csv_file_path,
+                                               json_file_path,
+                                               False,
+                                               parquet_file_path,
+                                               entries_filter=entries_filter,
+                                               parse_workers=parse_workers)
+        assembled_entry_groups = read_file(
+            sync_steps.list_input_files(csv_file_path, json_file_path, parquet_file_path))
+
+        snapshot_fingerprints = self.__load_snapshot(snapshot_file_path)
+
+        logging.info('')
+        logging.info('>> Planning changes :: Data Catalog metadata...')
+
+        plans = []
+        planned_group_ids = {}
+        for system_name, entry_groups in assembled_entry_groups:
+            system_fingerprints = snapshot_fingerprints.get(system_name, {})
+            for entry_group in entry_groups:
+                group_id = entry_group.get('id')
+                if not group_id:
+                    continue
+                plans.append(
+                    self.__plan_entry_group(entry_group, system_name,
+                                            system_fingerprints.get(group_id, {})))
+                planned_group_ids.setdefault(system_name, set()).add(group_id)
+
+        # The cleanup also deletes the Entries of the planned systems from other Entry Groups.
+        for system_name, group_ids in planned_group_ids.items():
+            for group_id, group_fingerprints in snapshot_fingerprints.get(system_name, {}).items():
+                if group_id not in group_ids:
+                    plans.append(
+                        EntryGroupPlan(system_name, group_id, [], [], sorted(group_fingerprints),
+                                       0))
+
+        return plans
+
+    def __plan_entry_group(self, entry_group: Dict[str, object], system_name: str,
+                           previous_fingerprints: Dict[str, str]) -> EntryGroupPlan:
+
+        group_id = entry_group.get('id')
+        entries = entry_group.get('entries') or []
+        assembled_entries = [
+            prepare.AssembledEntryData(entry_id, entry)
+            for entry_id, entry in self.__entry_factory.make_entries_from_dicts(group_id, entries)
+        ]
+        assembled_entries = custom_entries_id_validator.CustomEntriesIDValidator.validate_entries(
+            group_id,
+            assembled_entries,
+            custom_entries_record.CustomEntryColumns.get_sources(entries),
+            disambiguate=self.__disambiguate_ids)
+
+        changes = change_detector.CustomEntriesChangeDetector.detect_changes(
+            assembled_entries, previous_fingerprints)
+
+        return EntryGroupPlan(system_name, group_id,
+                              [assembled_entry.entry_id for assembled_entry in changes.created],
+                              [assembled_entry.entry_id
+                               for assembled_entry in changes.modified], changes.deleted_entry_ids,
+                              len(changes.unchanged))
+
+    def __load_snapshot(self, snapshot_file_path: str) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """
+        Index the snapshot Entry fingerprints by User Specified System, which is how the
+        synchronization scopes its cleanup, and then by Entry Group ID.
+        """
+        logging.info('')
+        logging.info('>> Reading the snapshot file: %s...', snapshot_file_path)
+
+        with open(snapshot_file_path) as snapshot_file:
+            entries_json = json.load(snapshot_file)
+
+        snapshot_fingerprints = {}
+        for entry_json in entries_json:
+            name_match = self.__ENTRY_NAME_PATTERN.match(entry_json.get('name', ''))
+            if not name_match or name_match.group('project') != self.__project_id \
+                    or name_match.group('location') != self.__location_id:
+                continue
+
+            system_name = entry_json.get('userSpecifiedSystem')
+            group_fingerprints = snapshot_fingerprints.setdefault(system_name, {}).setdefault(
+                name_match.group('group'), {})
+            group_fingerprints[name_match.group('entry')] = self.__fingerprint_entry_json(
+                entry_json)
+
+        return snapshot_fingerprints
+
+    @classmethod
+    def __fingerprint_entry_json(cls, entry_json: Dict[str, object]) -> str:
+        timestamps_json = entry_json.get('sourceSystemTimestamps') or {}
+        return change_detector.CustomEntriesChangeDetector.fingerprint_fields(
+            entry_json.get('linkedResource', ''), entry_json.get('displayName', ''),
+            entry_json.get('description', ''), entry_json.get('userSpecifiedType', ''),
+            entry_json.get('userSpecifiedSystem', ''),
+            cls.__convert_timestamp_str_to_seconds(timestamps_json.get('createTime')),
+            cls.__convert_timestamp_str_to_seconds(timestamps_json.get('updateTime')))
+
+    @classmethod
+    def __convert_timestamp_str_to_seconds(cls, timestamp_string: str) -> int:
+        # Unset timestamps are read as zero from the Entry protos.
+        if not timestamp_string:
+            return 0
+
+        timestamp_match = cls.__TIMESTAMP_PATTERN.match(timestamp_string)
+        if not timestamp_match:
+            raise ValueError(f'Invalid RFC 3339 timestamp: {timestamp_string}')
+
+        offset = timestamp_match.group('offset')
+        offset = '+0000' if offset == 'Z' else offset.replace(':', '')
+        datetime_object = datetime.datetime.strptime(
+            f'{timestamp_match.group("datetime")}{offset}', '%Y-%m-%dT%H:%M:%S%z')
+        return int(datetime_object.timestamp())
@@ -0,0 +1,175 @@
+from collections import abc
+import sys
+from typing import Dict, Iterator, List, Sequence, Union
+
+
+class CustomEntryRecord(abc.Mapping):
+    """
+    The raw metadata of a Custom Entry, as read from the input files.
+
+    Its fields are stored in slots, with no per-instance ``dict``, and the system and type
+    strings, shared by many Entries, are interned, so millions of records take a fraction of the
+    memory of the equivalent ``dicts``. It is still a read-only ``Mapping`` of the fields that
+    are set, so it can be read with ``get``, ``[]``, and ``in``, and compares equal to the
+    equivalent ``dict``: the optional fields set to ``None`` are left out of it.
+
+    The timestamps are strings, as read from the input files, or epoch seconds, when the record
+    is taken from ``CustomEntryColumns``.
+    """
+    __slots__ = ('linked_resource', 'display_name', 'user_specified_type', 'user_specified_system',
+                 'source', 'description', 'created_at', 'updated_at')
+    __OPTIONAL_FIELDS = frozenset(('source', 'description', 'created_at', 'updated_at'))
+
+    def __init__(self,
+                 linked_resource: str,
+                 display_name: str,
+                 user_specified_type: str,
+                 user_specified_system: str,
+                 source: str = None,
+                 description: str = None,
+                 created_at: Union[str, int] = None,
+                 updated_at: Union[str, int] = None):
+        """
+        :param source: Where the Entry was read from, such as a CSV row or a JSON path, to
+            report errors.
+        """
+        self.linked_resource = linked_resource
+        self.display_name = display_name
+        self.user_specified_type = self.__intern(user_specified_type)
+        self.user_specified_system = self.__intern(user_specified_system)
+        self.source = source
+        self.description = description
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> 'CustomEntryRecord':
+        """
+        Make a record from an Entry ``dict``, keyed by the field names.
+
+        :param data: The Entry ``dict``, or a record, which is returned as is.
+        :return: The record.
+        """
+        if isinstance(data, cls):
+            return data
+        return cls(**{field: data.get(field) for field in cls.__slots__})
+
+    def __getitem__(self, key: str) -> object:
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None or key not in self.__OPTIONAL_FIELDS:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self.__slots__
+                if field not in self.__OPTIONAL_FIELDS or getattr(self, field) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self)!r})'
+
+    @classmethod
+    def __intern(cls, value: object) -> object:
+        # Missing CSV values are read as NaN (float), which cannot be interned.
+        return sys.intern(value) if type(value) is str else value
+
+
+class CustomEntryColumns(abc.Sequence):
+    """
+    The raw metadata of the Custom Entries of an Entry Group, as column arrays.
+
+    The CSV and Parquet readers slice the columns from the parsed file with no per-Entry object,
+    and the ``DataCatalogEntryFactory`` builds the Entries straight from them. The timestamps are
+    int64 epoch seconds, 0 meaning not set, and the optional string fields are ``None`` when not
+    set.
+    It is still a ``Sequence`` of ``CustomEntryRecords``, made on access, for the code that
+    reads Entries one at a time.
+    """
+    COLUMNS = ('linked_resources', 'display_names', 'user_specified_types', 'descriptions',
+               'created_at', 'updated_at', 'row_numbers')
+    __slots__ = ('user_specified_system', 'file_paths') + COLUMNS
+
+    def __init__(self,
+                 user_specified_system: str,
+                 linked_resources: Sequence[str],
+                 display_names: Sequence[str],
+                 user_specified_types: Sequence[str],
+                 descriptions: Sequence[str],
+                 created_at: Sequence[int],
+                 updated_at: Sequence[int],
+                 row_numbers: Sequence[int],
+                 file_paths: Sequence[str] = None):
+        """
+        The columns are numpy arrays, all of the same length.
+
+        :param user_specified_system: The User Specified System shared by the Entries.
+        :param row_numbers: The 1-based row of each Entry in the input file, as shown by
+            spreadsheet editors, to report errors.
+        :param file_paths: The input file of each Entry, when reading several files, to report
+            errors.
+        """
+        self.user_specified_system = user_specified_system
+        self.linked_resources = linked_resources
+        self.display_names = display_names
+        self.user_specified_types = user_specified_types
+        self.descriptions = descriptions
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.row_numbers = row_numbers
+        self.file_paths = file_paths
+
+    @classmethod
+    def make_row_source(cls, row_number: int, file_path: str = None) -> str:
+        """
+        Make the source of an Entry read from a row of a CSV or Parquet file.
+
+        :param row_number: The 1-based row.
+        :param file_path: The input file, when reading several files.
+        :return: The source.
+        """
+        source = f'row {row_number}'
+        return cls.make_file_source(file_path, source) if file_path else source
+
+    @classmethod
+    def make_file_source(cls, file_path: str, source: str) -> str:
+        """
+        Prefix the source of an Entry with its input file, when reading several files.
+        """
+        return f'{file_path}: {source}'
+
+    @classmethod
+    def get_sources(cls, entries: Sequence[Dict[str, object]]) -> List[str]:
+        """
+        Get the source of each Entry, such as a CSV row or a JSON path, to report errors.
+
+        :param entries: The Entry records, ``dicts``, or columns.
+        :return: The sources, in the same order as ``entries``.
+        """
+        if not isinstance(entries, cls):
+            return [entry.get('source') for entry in entries]
+        if entries.file_paths is None:
+            return [cls.make_row_source(row_number) for row_number in entries.row_numbers.tolist()]
+        return [
+            cls.make_row_source(row_number, file_path)
+            for row_number, file_path in zip(entries.row_numbers.tolist(), entries.file_paths)
+        ]
+
+    def __getitem__(self, index: int) -> CustomEntryRecord:
+        file_path = self.file_paths[index] if self.file_paths is not None else None
+        return CustomEntryRecord(self.linked_resources[index],
+                                 self.display_names[index],
+                                 self.user_specified_types[index],
+                                 self.user_specified_system,
+                                 self.make_row_source(int(self.row_numbers[index]), file_path),
+                                 description=self.descriptions[index],
+                                 created_at=int(self.created_at[index]) or None,
+                                 updated_at=int(self.updated_at[index]) or None)
+
+    def __len__(self) -> int:
+        return len(self.row_numbers)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self)!r})'
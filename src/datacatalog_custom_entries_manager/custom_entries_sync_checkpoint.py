@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Sequence, Set, Tuple, Union
+
+
+class CustomEntriesSyncCheckpoint:
+    """
+    Record the Entry Groups successfully synchronized from an input file, or a list of sharded
+    input files, so an interrupted run can be resumed from where it stopped.
+
+    The checkpoint file is written in the JSON Lines format: the first line holds a fingerprint
+    of the input file contents, and a new line is appended as soon as each Entry Group is
+    synchronized. A checkpoint whose fingerprint does not match the input file is stale and is
+    not used to skip anything.
+    """
+    __FILE_READ_BLOCK_SIZE = 1024 * 1024
+    __INPUT_FINGERPRINT_FIELD_NAME = 'inputFingerprint'
+    __SYSTEM_FIELD_NAME = 'system'
+    __GROUP_ID_FIELD_NAME = 'groupId'
+
+    def __init__(self,
+                 file_path: str,
+                 input_file_path: Union[str, Sequence[str]],
+                 resume: bool = False):
+        """
+        :param file_path: The checkpoint file path.
+        :param input_file_path: Path of the file the Custom Entries are synchronized to, or a
+            list of sharded input file paths.
+        :param resume: Keep the Entry Groups recorded by a previous run with the same input,
+            instead of starting a new checkpoint.
+        """
+        self.__file_path = file_path
+        self.__input_fingerprint = self.compute_input_fingerprint(input_file_path)
+        self.__completed_entry_groups: Set[Tuple[str, str]] = set()
+        self.__lock = threading.Lock()
+
+        if resume:
+            self.__load()
+
+        # Start over with the completed Entry Groups that are still valid.
+        with open(self.__file_path, 'w') as checkpoint_file:
+            self.__write_line(checkpoint_file,
+                              {self.__INPUT_FINGERPRINT_FIELD_NAME: self.__input_fingerprint})
+            for system_name, group_id in self.__completed_entry_groups:
+                self.__write_line(checkpoint_file, {
+                    self.__SYSTEM_FIELD_NAME: system_name,
+                    self.__GROUP_ID_FIELD_NAME: group_id
+                })
+
+    def __load(self):
+        if not os.path.isfile(self.__file_path):
+            logging.info('No checkpoint found at %s. Starting from the beginning...',
+                         self.__file_path)
+            return
+
+        with open(self.__file_path) as checkpoint_file:
+            lines = [json.loads(line) for line in checkpoint_file if line.strip()]
+
+        if not lines or lines[0].get(
+                self.__INPUT_FINGERPRINT_FIELD_NAME) != self.__input_fingerprint:
+            logging.warning(
+                'The checkpoint at %s does not match the input file contents and'
+                ' will be discarded.', self.__file_path)
+            return
+
+        self.__completed_entry_groups = {(line[self.__SYSTEM_FIELD_NAME],
+                                          line[self.__GROUP_ID_FIELD_NAME])
+                                         for line in lines[1:]}
+        logging.info('Resuming from checkpoint: %d Entry Group(s) already synchronized.',
+                     len(self.__completed_entry_groups))
+
+    @classmethod
+    def compute_input_fingerprint(cls, input_file_path: Union[str, Sequence[str]]) -> str:
+        """
+        Compute a fingerprint of a file contents.
+
+        :param input_file_path: The file path, or a list of file paths, fingerprinted along
+            with their order, since it is the order the Entry Groups are read in.
+        :return: A hex digest.
+        """
+        if not isinstance(input_file_path, str):
+            if len(input_file_path) == 1:
+                return cls.compute_input_fingerprint(input_file_path[0])
+            digest = hashlib.sha256()
+            for file_path in input_file_path:
+                digest.update(cls.compute_input_fingerprint(file_path).encode())
+            return digest.hexdigest()
+
+        digest = hashlib.sha256()
+        with open(input_file_path, 'rb') as input_file:
+            for block in iter(lambda: input_file.read(cls.__FILE_READ_BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def is_completed(self, system_name: str, group_id: str) -> bool:
+        with self.__lock:
+            return (system_name, group_id) in self.__completed_entry_groups
+
+    def mark_completed(self, system_name: str, group_id: str):
+        """
+        Durably record an Entry Group as synchronized.
+
+        :param system_name: The User Specified System of the Entry Group.
+        :param group_id: The Entry Group ID.
+        """
+        with self.__lock:
+            self.__completed_entry_groups.add((system_name, group_id))
+            with open(self.__file_path, 'a') as checkpoint_file:
+                self.__write_line(checkpoint_file, {
+                    self.__SYSTEM_FIELD_NAME: system_name,
+                    self.__GROUP_ID_FIELD_NAME: group_id
+                })
+
+    @classmethod
+    def __write_line(cls, checkpoint_file, data):
+        checkpoint_file.write(json.dumps(data))
+        checkpoint_file.write('\n')
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
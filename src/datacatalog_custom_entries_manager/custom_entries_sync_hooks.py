@@ -0,0 +1,141 @@
+import contextlib
+import cProfile
+import pstats
+import threading
+from typing import Dict, List
+
+from google.cloud.datacatalog import types
+
+
+class CustomEntriesSyncHooks:
+    """
+    Callbacks invoked at the key points of a synchronization run, to attach tracing, profiling,
+    or logging with no change to the library, e.g. an OpenTelemetry span per Entry Group.
+
+    Subclass it and override the callbacks of interest: all of them do nothing by default.
+    Hooks are opt-in: when none are given, the synchronizers make no calls at all.
+
+    The callbacks may be called from different threads, but each one is called from the thread
+    that does the work it reports: the Entry Group callbacks from the thread that schedules the
+    Entry Group — a worker thread, or the event loop thread with the asyncio engine — and the
+    phase and Entry callbacks from the thread that runs the phase.
+    """
+
+    def on_entry_group_read(self, system_name: str, group_id: str, entries: List[Dict]):
+        """
+        Called for each Entry Group read from the input file: right after reading the whole
+        file, or as soon as each Entry Group is consumed when streaming it.
+
+        :param system_name: The Entry Group system.
+        :param group_id: The Entry Group id.
+        :param entries: The raw metadata of the Entry Group's Entries.
+        """
+
+    def on_group_start(self, system_name: str, group_id: str):
+        """
+        Called before an Entry Group is synchronized. Entry Groups skipped because they were
+        already synchronized by a previous run are not reported.
+        """
+
+    def on_phase_start(self, group_id: str, phase: str):
+        """
+        Called before a phase of an Entry Group runs.
+
+        :param group_id: The Entry Group id.
+        :param phase: One of ``custom_entries_sync_metrics.PHASES``.
+        """
+
+    def on_entry_built(self, group_id: str, entry_id: str, entry: types.Entry):
+        """
+        Called for each Entry built from the raw metadata, with its final ID, during the
+        ``prepare`` phase.
+        """
+
+    def on_phase_end(self, group_id: str, phase: str, seconds: float, error: Exception = None):
+        """
+        Called after a phase of an Entry Group runs, even if it fails.
+
+        :param seconds: The time the phase took.
+        :param error: The error raised by the phase, if any.
+        """
+
+    def on_group_end(self, result):
+        """
+        Called after an Entry Group is synchronized, even if it fails.
+
+        :param result: The ``EntryGroupSyncResult`` of the Entry Group.
+        """
+
+
+class CustomEntriesSyncProfiler(CustomEntriesSyncHooks):
+    """
+    Deterministic profile of a synchronization run, made with ``cProfile``.
+
+    A profiler only sees the thread it is enabled in, so the run is profiled in two parts,
+    merged into a single profile: ``profile`` covers the calling thread for the whole run —
+    reading the input file with the threads engine, or the event loop with the asyncio engine —
+    and the phase hooks cover each phase of each Entry Group, in the thread that runs it.
+    """
+
+    def __init__(self):
+        self.__stats = None
+        self.__profiled_thread_id = None
+        self.__current = threading.local()
+        self.__lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def profile(self):
+        """
+        Profile the calling thread until the context is exited.
+        """
+        profile = self.__enable_profile()
+        self.__profiled_thread_id = threading.get_ident() if profile else None
+        try:
+            yield
+        finally:
+            self.__profiled_thread_id = None
+            if profile:
+                self.__add_stats(profile)
+
+    def on_phase_start(self, group_id: str, phase: str):
+        # The calling thread is already profiled as a whole.
+        if threading.get_ident() != self.__profiled_thread_id:
+            self.__current.profile = self.__enable_profile()
+
+    def on_phase_end(self, group_id: str, phase: str, seconds: float, error: Exception = None):
+        profile = getattr(self.__current, 'profile', None)
+        if profile:
+            self.__current.profile = None
+            self.__add_stats(profile)
+
+    def get_stats(self) -> pstats.Stats:
+        """
+        :return: The merged profile, or ``None`` if nothing was profiled.
+        """
+        with self.__lock:
+            return self.__stats
+
+    def write_stats(self, file_path: str):
+        """
+        Write the merged profile in the ``pstats`` format, which can be read by
+        ``python -m pstats`` or visualization tools such as SnakeViz.
+        """
+        self.get_stats().dump_stats(file_path)
+
+    @classmethod
+    def __enable_profile(cls) -> cProfile.Profile:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows a single active profiler at a time.
+            return None
+        return profile
+
+    def __add_stats(self, profile: cProfile.Profile):
+        profile.disable()
+        with self.__lock:
+            if self.__stats:
+                self.__stats.add(profile)
+            else:
+                self.__stats = pstats.Stats(profile)
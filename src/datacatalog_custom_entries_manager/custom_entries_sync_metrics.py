@@ -0,0 +1,391 @@
+import collections
+from collections import abc
+import contextlib
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, \
+    Union
+
+from google.api_core import exceptions
+
+PHASES = ('prepare', 'cleanup', 'ingest', 'state')
+
+
+class EntryGroupMetrics(NamedTuple):
+    system_name: str
+    group_id: str
+    # From the start of the first phase to the end of the last one.
+    duration_seconds: float
+    phase_seconds: Dict[str, float]
+    entries: int
+    written_entries: int
+    failed_entries: int
+    api_requests: Dict[str, int]
+    throttled_requests: int
+    request_bytes: int
+    failed: bool
+
+
+class SyncRunSummary(NamedTuple):
+    duration_seconds: float
+    entry_groups: int
+    failed_entry_groups: int
+    entries: int
+    entries_per_second: float
+    group_duration_p50_seconds: float
+    group_duration_p95_seconds: float
+    read_seconds: float
+    input_bytes: int
+    phase_seconds: Dict[str, float]
+    api_requests: Dict[str, int]
+    throttled_requests: int
+    request_bytes: int
+
+
+class CustomEntriesSyncMetrics:
+    """
+    Per-phase timing and throughput of a synchronization run.
+
+    The time of each phase of each Entry Group is measured by the sync steps, which run in a
+    single thread per call: the Data Catalog requests sent by a thread while it measures a
+    phase are attributed to that phase's Entry Group, and the other ones to the run only. The
+    Entry Groups are identified by system and ID, since systems may share Entry Group IDs. When
+    a phase runs concurrent calls for the same Entry Group, such as the deletion of its removed
+    Entries by the asyncio engine, their times are summed.
+
+    Reading the input file is measured for the whole run, since streamed Entry Groups are read
+    in between the synchronization of the previous ones.
+    """
+    __PROMETHEUS_PREFIX = 'datacatalog_sync'
+
+    def __init__(self):
+        self.__groups = collections.OrderedDict()
+        self.__read_seconds = 0.0
+        self.__input_bytes = 0
+        self.__api_requests = collections.Counter()
+        self.__throttled_requests = 0
+        self.__request_bytes = 0
+        self.__started_at = time.monotonic()
+        self.__finished_at = None
+        self.__current = threading.local()
+        self.__lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def measure_phase(self, system_name: str, group_id: str, phase: str):
+        """
+        Measure a phase of an Entry Group, attributing the Data Catalog requests sent by the
+        current thread in the meantime to the Entry Group.
+
+        :param system_name: The User Specified System of the Entry Group.
+        :param group_id: The Entry Group id.
+        :param phase: One of ``PHASES``.
+        """
+        previous_group_key = getattr(self.__current, 'group_key', None)
+        self.__current.group_key = system_name, group_id
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            finished_at = time.monotonic()
+            self.__current.group_key = previous_group_key
+            with self.__lock:
+                group = self.__get_group((system_name, group_id))
+                group['phase_seconds'][phase] += finished_at - started_at
+                if group['started_at'] is None:
+                    group['started_at'] = started_at
+                group['finished_at'] = max(group['finished_at'] or finished_at, finished_at)
+
+    def add_entries(self,
+                    system_name: str,
+                    group_id: str,
+                    entries: int = 0,
+                    written: int = 0,
+                    failed: int = 0):
+        """
+        Count the Entries of an Entry Group: the ones prepared from the input, and the ones
+        sent to or failed to be written to Data Catalog.
+        """
+        with self.__lock:
+            group = self.__get_group((system_name, group_id))
+            group['entries'] += entries
+            group['written_entries'] += written
+            group['failed_entries'] += failed
+
+    def measure_read(self, read_file: Callable[[Union[str, Sequence[str]]], Iterable],
+                     file_path: Union[str, Sequence[str]]) -> Iterable:
+        """
+        Read the input file, measuring the time spent by the reader. Lazily read Entry Groups
+        are measured as they are consumed.
+
+        :param read_file: The reader function.
+        :param file_path: The input file path, or a list of sharded input file paths.
+        :return: The reader result, wrapped if it is an iterator.
+        """
+        file_paths = [file_path] if isinstance(file_path, str) else file_path or []
+        self.__input_bytes = sum(
+            os.path.getsize(path) for path in file_paths if os.path.isfile(path))
+
+        started_at = time.monotonic()
+        assembled_entry_groups = read_file(file_path)
+        self.__add_read_seconds(time.monotonic() - started_at)
+
+        if isinstance(assembled_entry_groups, abc.Iterator):
+            return self.__measure_iterator(assembled_entry_groups)
+        return assembled_entry_groups
+
+    def record_request(self, method_name: str, request_bytes: int, throttled: bool):
+        """
+        Count a Data Catalog request sent by the current thread.
+        """
+        group_key = getattr(self.__current, 'group_key', None)
+        with self.__lock:
+            self.__api_requests[method_name] += 1
+            self.__throttled_requests += throttled
+            self.__request_bytes += request_bytes
+            if group_key:
+                group = self.__get_group(group_key)
+                group['api_requests'][method_name] += 1
+                group['throttled_requests'] += throttled
+                group['request_bytes'] += request_bytes
+
+    def meter(self, client) -> 'MeteredDataCatalogClient':
+        """
+        Make a Data Catalog client count its requests in these metrics.
+
+        :param client: A Data Catalog client.
+        :return: A proxy to the client.
+        """
+        return MeteredDataCatalogClient(client, self)
+
+    def finish_run(self, failed_entry_groups: Iterable[Tuple[str, str]] = ()):
+        """
+        Stop the run clock and flag the failed Entry Groups.
+
+        :param failed_entry_groups: The ``(system_name, group_id)`` pairs of the failed Entry
+            Groups.
+        """
+        with self.__lock:
+            self.__finished_at = time.monotonic()
+            for system_name, group_id in failed_entry_groups:
+                if group_id:
+                    self.__get_group((system_name, group_id))['failed'] = True
+
+    def get_entry_group_metrics(self) -> List[EntryGroupMetrics]:
+        with self.__lock:
+            return [self.__make_entry_group_metrics(group) for group in self.__groups.values()]
+
+    def summarize(self) -> SyncRunSummary:
+        entry_group_metrics = self.get_entry_group_metrics()
+        with self.__lock:
+            duration_seconds = (self.__finished_at or time.monotonic()) - self.__started_at
+            entries = sum(group.entries for group in entry_group_metrics)
+            group_durations = sorted(group.duration_seconds for group in entry_group_metrics)
+            phase_seconds = collections.OrderedDict(
+                (phase, sum(group.phase_seconds[phase] for group in entry_group_metrics))
+                for phase in PHASES)
+
+            return SyncRunSummary(
+                duration_seconds=duration_seconds,
+                entry_groups=len(entry_group_metrics),
+                failed_entry_groups=sum(group.failed for group in entry_group_metrics),
+                entries=entries,
+                entries_per_second=entries / duration_seconds if duration_seconds else 0.0,
+                group_duration_p50_seconds=self.__get_percentile(group_durations, 50),
+                group_duration_p95_seconds=self.__get_percentile(group_durations, 95),
+                read_seconds=self.__read_seconds,
+                input_bytes=self.__input_bytes,
+                phase_seconds=phase_seconds,
+                api_requests=dict(sorted(self.__api_requests.items())),
+                throttled_requests=self.__throttled_requests,
+                request_bytes=self.__request_bytes)
+
+    def log_summary(self):
+        summary = self.summarize()
+
+        logging.info('')
+        logging.info(
+            'Synchronized %d Entry Groups (%d failed), %d Entries in %.2fs:'
+            ' %.1f Entries/s.', summary.entry_groups, summary.failed_entry_groups, summary.entries,
+            summary.duration_seconds, summary.entries_per_second)
+        logging.info('Entry Group duration: p50 %.2fs, p95 %.2fs.',
+                     summary.group_duration_p50_seconds, summary.group_duration_p95_seconds)
+        logging.info(
+            'Time per phase: read %.2fs, %s.', summary.read_seconds,
+            ', '.join(f'{phase} {seconds:.2f}s'
+                      for phase, seconds in summary.phase_seconds.items()))
+        logging.info('Data Catalog requests: %d (%d throttled), %d bytes sent.',
+                     sum(summary.api_requests.values()), summary.throttled_requests,
+                     summary.request_bytes)
+
+    def write_json_lines(self, file_path: str):
+        """
+        Write a JSON object per Entry Group, followed by the run summary, one per line. Each
+        object has a ``type`` key: ``entry_group`` or ``summary``.
+        """
+        with open(file_path, 'w') as json_lines_file:
+            for group in self.get_entry_group_metrics():
+                json_lines_file.write(json.dumps({'type': 'entry_group', **group._asdict()}))
+                json_lines_file.write('\n')
+            json_lines_file.write(json.dumps({'type': 'summary', **self.summarize()._asdict()}))
+            json_lines_file.write('\n')
+
+    def write_prometheus_text(self, file_path: str):
+        """
+        Write the run summary in the Prometheus text exposition format, as expected by the
+        node exporter textfile collector or a Pushgateway. Entry Groups are aggregated, to keep
+        the number of series bounded.
+        """
+        with open(file_path, 'w') as prometheus_file:
+            prometheus_file.write(self.to_prometheus_text())
+
+    def to_prometheus_text(self) -> str:
+        summary = self.summarize()
+        lines = []
+
+        def add_metric(name, metric_type, help_text, samples):
+            lines.append(f'# HELP {self.__PROMETHEUS_PREFIX}_{name} {help_text}')
+            lines.append(f'# TYPE {self.__PROMETHEUS_PREFIX}_{name} {metric_type}')
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{label}"' for key, label in labels.items())
+                lines.append(f'{self.__PROMETHEUS_PREFIX}_{name}{suffix}'
+                             f'{{{label_text}}} {value}' if label_text else
+                             f'{self.__PROMETHEUS_PREFIX}_{name}{suffix} {value}')
+
+        add_metric('duration_seconds', 'gauge', 'Duration of the synchronization run.',
+                   [('', {}, summary.duration_seconds)])
+        add_metric('entry_groups', 'gauge', 'Entry Groups synchronized, by status.',
+                   [('', {
+                       'status': 'succeeded'
+                   }, summary.entry_groups - summary.failed_entry_groups),
+                    ('', {
+                        'status': 'failed'
+                    }, summary.failed_entry_groups)])
+        add_metric('entries', 'gauge', 'Entries prepared from the input file.',
+                   [('', {}, summary.entries)])
+        add_metric('entries_per_second', 'gauge', 'Entries synchronized per second.',
+                   [('', {}, summary.entries_per_second)])
+        add_metric(
+            'entry_group_duration_seconds', 'summary', 'Duration of each Entry Group.',
+            [('', {
+                'quantile': '0.5'
+            }, summary.group_duration_p50_seconds),
+             ('', {
+                 'quantile': '0.95'
+             }, summary.group_duration_p95_seconds),
+             ('_sum', {}, sum(group.duration_seconds for group in self.get_entry_group_metrics())),
+             ('_count', {}, summary.entry_groups)])
+        add_metric('read_seconds', 'gauge', 'Time spent reading the input file.',
+                   [('', {}, summary.read_seconds)])
+        add_metric('input_bytes', 'gauge', 'Size of the input file.',
+                   [('', {}, summary.input_bytes)])
+        add_metric('phase_seconds', 'gauge', 'Time spent in each phase, over all Entry Groups.',
+                   [('', {
+                       'phase': phase
+                   }, seconds) for phase, seconds in summary.phase_seconds.items()])
+        add_metric('api_requests', 'gauge', 'Data Catalog requests sent, by method.',
+                   [('', {
+                       'method': method
+                   }, count) for method, count in summary.api_requests.items()])
+        add_metric('throttled_requests', 'gauge',
+                   'Data Catalog requests rejected with RESOURCE_EXHAUSTED.',
+                   [('', {}, summary.throttled_requests)])
+        add_metric('request_bytes', 'gauge', 'Serialized size of the Data Catalog requests.',
+                   [('', {}, summary.request_bytes)])
+
+        return '\n'.join(lines) + '\n'
+
+    def __measure_iterator(self, iterator: Iterator) -> Iterator:
+        while True:
+            started_at = time.monotonic()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.__add_read_seconds(time.monotonic() - started_at)
+            yield item
+
+    def __add_read_seconds(self, seconds: float):
+        with self.__lock:
+            self.__read_seconds += seconds
+
+    def __get_group(self, key: Tuple[str, str]) -> Dict[str, object]:
+        group = self.__groups.get(key)
+        if not group:
+            system_name, group_id = key
+            group = self.__groups[key] = {
+                'system_name': system_name,
+                'group_id': group_id,
+                'started_at': None,
+                'finished_at': None,
+                'phase_seconds': collections.OrderedDict((phase, 0.0) for phase in PHASES),
+                'entries': 0,
+                'written_entries': 0,
+                'failed_entries': 0,
+                'api_requests': collections.Counter(),
+                'throttled_requests': 0,
+                'request_bytes': 0,
+                'failed': False,
+            }
+        return group
+
+    @classmethod
+    def __make_entry_group_metrics(cls, group: Dict[str, object]) -> EntryGroupMetrics:
+        duration_seconds = group['finished_at'] - group['started_at'] \
+            if group['started_at'] is not None else 0.0
+        return EntryGroupMetrics(system_name=group['system_name'],
+                                 group_id=group['group_id'],
+                                 duration_seconds=duration_seconds,
+                                 phase_seconds=dict(group['phase_seconds']),
+                                 entries=group['entries'],
+                                 written_entries=group['written_entries'],
+                                 failed_entries=group['failed_entries'],
+                                 api_requests=dict(sorted(group['api_requests'].items())),
+                                 throttled_requests=group['throttled_requests'],
+                                 request_bytes=group['request_bytes'],
+                                 failed=group['failed'])
+
+    @classmethod
+    def __get_percentile(cls, sorted_values: List[float], percentile: float) -> float:
+        # Nearest-rank method.
+        if not sorted_values:
+            return 0.0
+        rank = math.ceil(percentile / 100 * len(sorted_values))
+        return sorted_values[max(rank, 1) - 1]
+
+
+class MeteredDataCatalogClient:
+    """
+    Proxy to a Data Catalog client that counts its requests, along with their serialized size,
+    in the metrics of a synchronization run.
+    """
+
+    def __init__(self, client, metrics: CustomEntriesSyncMetrics):
+        self.__client = client
+        self.__metrics = metrics
+
+    def __getattr__(self, name):
+        attribute = getattr(self.__client, name)
+        # Resource path helpers do not send requests.
+        if not callable(attribute) or name.endswith('_path'):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call_metered(*args, **kwargs):
+            request_bytes = sum(value.ByteSize() for value in list(args) + list(kwargs.values())
+                                if hasattr(value, 'ByteSize'))
+            throttled = False
+            try:
+                return attribute(*args, **kwargs)
+            except exceptions.TooManyRequests:
+                throttled = True
+                raise
+            finally:
+                self.__metrics.record_request(name, request_bytes, throttled)
+
+        return call_metered
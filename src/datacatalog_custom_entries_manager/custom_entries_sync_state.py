@@ -0,0 +1,117 @@
+import datetime
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+
+class CustomEntriesSyncState:
+    """
+    Keep track of the Entries pushed to Data Catalog by previous synchronizations, so the
+    unchanged ones can be skipped.
+
+    The state is stored in a SQLite database, which is kept in memory unless a file path is
+    provided. The state of each Entry Group is committed as soon as its synchronization
+    succeeds, so the Entry Groups finished before a crash are not pushed again by the next run.
+    """
+    __IN_MEMORY_DATABASE = ':memory:'
+
+    def __init__(self, file_path: str = __IN_MEMORY_DATABASE):
+        """
+        :param file_path: Path of the SQLite database file. It is created if it does not exist.
+        """
+        # The connection is shared by the synchronization workers and guarded by a lock.
+        self.__connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.__lock = threading.Lock()
+        self.__create_tables()
+
+    def __create_tables(self):
+        with self.__lock, self.__connection:
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS entry_groups ('
+                                      ' entry_group_name TEXT NOT NULL,'
+                                      ' system_name TEXT NOT NULL,'
+                                      ' synced_at TEXT NOT NULL,'
+                                      ' PRIMARY KEY (entry_group_name, system_name))')
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS entries ('
+                                      ' entry_group_name TEXT NOT NULL,'
+                                      ' system_name TEXT NOT NULL,'
+                                      ' entry_id TEXT NOT NULL,'
+                                      ' fingerprint TEXT NOT NULL,'
+                                      ' PRIMARY KEY (entry_group_name, system_name, entry_id))')
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def get_entry_fingerprints(self, entry_group_name: str, system_name: str) \
+            -> Optional[Dict[str, str]]:
+        """
+        Get the Entry fingerprints of the last successful synchronization of an Entry Group.
+
+        :param entry_group_name: The Entry Group resource name.
+        :param system_name: The User Specified System of the Entries.
+        :return: The fingerprints indexed by Entry ID, or ``None`` if the Entry Group was never
+            synchronized.
+        """
+        key = (entry_group_name, system_name)
+        with self.__lock:
+            synced_entry_group = self.__connection.execute(
+                'SELECT 1 FROM entry_groups WHERE entry_group_name = ? AND system_name = ?',
+                key).fetchone()
+            if not synced_entry_group:
+                return None
+
+            return dict(
+                self.__connection.execute(
+                    'SELECT entry_id, fingerprint FROM entries'
+                    ' WHERE entry_group_name = ? AND system_name = ?', key))
+
+    def set_entry_fingerprints(self, entry_group_name: str, system_name: str,
+                               fingerprints: Dict[str, str]):
+        """
+        Record the Entry fingerprints of a successful Entry Group synchronization.
+
+        :param entry_group_name: The Entry Group resource name.
+        :param system_name: The User Specified System of the Entries.
+        :param fingerprints: The fingerprints indexed by Entry ID.
+        """
+        key = (entry_group_name, system_name)
+        synced_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        # The connection context manager commits the transaction, or rolls it back on errors.
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                'DELETE FROM entries WHERE entry_group_name = ? AND system_name = ?', key)
+            self.__connection.executemany(
+                'INSERT INTO entries (entry_group_name, system_name, entry_id, fingerprint)'
+                ' VALUES (?, ?, ?, ?)', ((entry_group_name, system_name, entry_id, fingerprint)
+                                         for entry_id, fingerprint in fingerprints.items()))
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO entry_groups (entry_group_name, system_name, synced_at)'
+                ' VALUES (?, ?, ?)', key + (synced_at, ))
+
+    def list_entry_group_names(self, system_name: str) -> List[str]:
+        """
+        List the Entry Groups synchronized for a User Specified System.
+
+        :param system_name: The User Specified System.
+        :return: The Entry Group resource names, sorted.
+        """
+        with self.__lock:
+            return [
+                entry_group_name for entry_group_name, in self.__connection.execute(
+                    'SELECT entry_group_name FROM entry_groups WHERE system_name = ?'
+                    ' ORDER BY entry_group_name', (system_name, ))
+            ]
+
+    def delete_entry_fingerprints(self, entry_group_name: str, system_name: str):
+        """
+        Forget an Entry Group, after its Entries are deleted from Data Catalog.
+
+        :param entry_group_name: The Entry Group resource name.
+        :param system_name: The User Specified System of the Entries.
+        """
+        key = (entry_group_name, system_name)
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                'DELETE FROM entries WHERE entry_group_name = ? AND system_name = ?', key)
+            self.__connection.execute(
+                'DELETE FROM entry_groups WHERE entry_group_name = ? AND system_name = ?', key)
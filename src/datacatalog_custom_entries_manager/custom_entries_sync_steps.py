@@ -0,0 +1,565 @@
+from collections import abc
+import contextlib
+import functools
+import logging
+import time
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, NamedTuple, \
+    Optional, Sequence, Set, Tuple, Union
+
+from google.api_core import exceptions
+from google.cloud import datacatalog
+from google.cloud.datacatalog import types
+from google.datacatalog_connectors.commons import prepare
+
+from . import custom_entries_change_detector as change_detector, custom_entries_filter, \
+    custom_entries_id_validator, custom_entries_json_reader, custom_entries_record, \
+    custom_entries_sync_checkpoint, custom_entries_sync_hooks, custom_entries_sync_metrics, \
+    custom_entries_sync_state, datacatalog_client_pool, datacatalog_entry_factory, lazy_module
+
+# Import pandas and pyarrow, which are only needed to read CSV and Parquet files.
+custom_entries_csv_reader = lazy_module.load('.custom_entries_csv_reader', __package__)
+custom_entries_parquet_reader = lazy_module.load('.custom_entries_parquet_reader', __package__)
+custom_entries_multi_file_reader = lazy_module.load('.custom_entries_multi_file_reader',
+                                                    __package__)
+
+# A single file path, or file paths, directories, and glob patterns of sharded input files.
+InputFilePaths = Union[str, Sequence[str]]
+
+
+class EntryGroupSyncResult(NamedTuple):
+    system_name: str
+    group_id: str
+    entries: List[types.Entry]
+    error: Exception = None
+    skipped: bool = False
+
+
+class EntryGroupSyncError(Exception):
+    """
+    Raised at the end of a synchronization in which one or more Entry Groups failed.
+    """
+
+    def __init__(self, failed_results: List[EntryGroupSyncResult]):
+        super().__init__(f'{len(failed_results)} Entry Group(s) failed to synchronize.')
+        self.failed_results = failed_results
+
+
+class CustomEntriesSyncSteps:
+    """
+    Blocking steps to synchronize a single Entry Group, shared by the synchronization engines,
+    which only decide how the steps are scheduled.
+    """
+
+    def __init__(self,
+                 project_id: str,
+                 location_id: str,
+                 entry_factory: datacatalog_entry_factory.DataCatalogEntryFactory,
+                 sync_state: custom_entries_sync_state.CustomEntriesSyncState = None,
+                 disambiguate_ids: bool = False,
+                 client_pool: datacatalog_client_pool.DataCatalogClientPool = None,
+                 metrics: custom_entries_sync_metrics.CustomEntriesSyncMetrics = None,
+                 hooks: custom_entries_sync_hooks.CustomEntriesSyncHooks = None):
+        """
+        :param project_id: The Google Cloud Project ID.
+        :param location_id: The Google Cloud Location ID.
+        :param entry_factory: The factory used to convert raw metadata into Entries.
+        :param sync_state: The state of previous synchronizations, if any.
+        :param disambiguate_ids: Rename Entries whose generated IDs are duplicated, instead
+            of failing their Entry Groups.
+        :param client_pool: The Data Catalog clients shared by the Entry Groups. A pool with a
+            single client is created if not provided.
+        :param metrics: The metrics of the run, if any, where the time of each step is added.
+        :param hooks: The callbacks invoked at the key points of the run, if any.
+        """
+        self.__project_id = project_id
+        self.__location_id = location_id
+        self.__entry_factory = entry_factory
+        self.__sync_state = sync_state
+        self.__disambiguate_ids = disambiguate_ids
+        self.__client_pool = client_pool or datacatalog_client_pool.DataCatalogClientPool(
+            project_id, location_id)
+        self.__metrics = metrics
+        self.__hooks = hooks
+
+    @classmethod
+    def list_input_files(cls,
+                         csv_file_path: InputFilePaths,
+                         json_file_path: InputFilePaths,
+                         parquet_file_path: InputFilePaths = None) -> InputFilePaths:
+        """
+        List the input files to be read by the reader picked by ``get_file_reader``.
+
+        :return: The given file path, if a single one, or the files matched by the given file
+            paths, directories, and glob patterns.
+        """
+        reader, file_path = cls.__get_reader(csv_file_path, json_file_path, parquet_file_path)
+        if isinstance(file_path, str):
+            return file_path
+        return custom_entries_multi_file_reader.CustomEntriesMultiFileReader.list_files(
+            file_path, reader.FILE_EXTENSION)
+
+    @classmethod
+    def get_file_reader(cls,
+                        csv_file_path: InputFilePaths,
+                        json_file_path: InputFilePaths,
+                        stream: bool,
+                        parquet_file_path: InputFilePaths = None,
+                        entries_filter: custom_entries_filter.CustomEntriesFilter = None,
+                        parse_workers: int = None) \
+            -> Callable[[InputFilePaths], Iterable[Tuple[str, List[Dict[str, object]]]]]:
+        """
+        Pick the reader of the input file format. Several input files, as listed by
+        ``list_input_files``, are read by ``CustomEntriesMultiFileReader``.
+
+        :param parse_workers: The maximum number of input files parsed concurrently, when
+            fully reading several files.
+        """
+        reader, file_path = cls.__get_reader(csv_file_path, json_file_path, parquet_file_path)
+
+        if isinstance(file_path, str):
+            read_file = reader.stream_file if stream else reader.read_file
+            return functools.partial(read_file, entries_filter=entries_filter) \
+                if entries_filter else read_file
+
+        multi_file_reader = custom_entries_multi_file_reader.CustomEntriesMultiFileReader
+        if stream:
+            return functools.partial(multi_file_reader.stream_files,
+                                     reader,
+                                     entries_filter=entries_filter)
+        return functools.partial(multi_file_reader.read_files,
+                                 reader,
+                                 entries_filter=entries_filter,
+                                 max_workers=parse_workers)
+
+    def read_entry_groups(self, read_file: Callable[[InputFilePaths], Iterable],
+                          file_path: InputFilePaths) \
+            -> Iterable[Tuple[str, List[Dict[str, object]]]]:
+        """
+        Read the input file, or files, with a reader picked by ``get_file_reader``.
+        """
+        assembled_entry_groups = self.__metrics.measure_read(read_file, file_path) \
+            if self.__metrics else read_file(file_path)
+        if not self.__hooks:
+            return assembled_entry_groups
+
+        if isinstance(assembled_entry_groups, abc.Iterator):
+            return self.__notify_entry_groups_read(assembled_entry_groups)
+        # Fully read Entry Groups may be iterated more than once.
+        for system_name, entry_groups in assembled_entry_groups:
+            self.__notify_entry_group_read(system_name, entry_groups)
+        return assembled_entry_groups
+
+    def start_entry_group(self, system_name: str, group_id: str):
+        """
+        Report an Entry Group is about to be synchronized to the hooks, if any.
+        """
+        if self.__hooks:
+            self.__hooks.on_group_start(system_name, group_id)
+
+    def finish_entry_group(self, result: EntryGroupSyncResult) -> EntryGroupSyncResult:
+        """
+        Report the result of an Entry Group to the hooks, if any.
+
+        :return: The given result.
+        """
+        if self.__hooks:
+            self.__hooks.on_group_end(result)
+        return result
+
+    def resolve_entry_groups(
+            self,
+            assembled_entry_groups: Iterable[Tuple[str, List[Dict[str, object]]]],
+            checkpoint: custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint = None,
+            max_workers: int = 1):
+        """
+        Make sure the Entry Groups with Entries to ingest exist, in a single bulk pass before
+        they are synchronized, so their ingestion goes straight to the Entries. Failures are
+        not fatal: the Entry Groups not resolved are created when their Entries are ingested.
+
+        :param assembled_entry_groups: The Entry Groups read from the input file.
+        :param checkpoint: The Entry Groups already synchronized, which are skipped.
+        :param max_workers: The maximum number of Entry Groups created concurrently.
+        """
+        group_ids = [
+            entry_group.get('id') for system_name, entry_groups in assembled_entry_groups
+            for entry_group in entry_groups if entry_group.get('id') and entry_group.get('entries')
+            and not (checkpoint and checkpoint.is_completed(system_name, entry_group.get('id')))
+        ]
+        if not group_ids:
+            return
+
+        try:
+            self.__client_pool.resolve_entry_groups(group_ids, max_workers)
+        except exceptions.GoogleAPICallError as e:
+            logging.warning('Entry Groups were not resolved: %s', e)
+
+    def prepare_entries(self, group_id: str, system_name: str,
+                        entries: List[Dict[str, object]]) -> List[prepare.AssembledEntryData]:
+        """
+        Convert raw metadata into Data Catalog Entries, failing fast on Entry ID collisions,
+        which would otherwise overwrite each other.
+
+        :param group_id: The Entry Group id.
+        :param system_name: The User Specified System of the Entries.
+        :param entries: The raw metadata of the Entry Group's Entries.
+        :return: The assembled Entries.
+        """
+        with self.__measure_phase(group_id, system_name, 'prepare'):
+            logging.info('')
+            logging.info('Converting raw metadata into Data Catalog entries...')
+
+            assembled_entries = [
+                prepare.AssembledEntryData(entry_id, entry)
+                for entry_id, entry in self.__entry_factory.make_entries_from_dicts(
+                    group_id, entries)
+            ] if entries else []
+            logging.info('==== DONE ====')
+
+            id_validator = custom_entries_id_validator.CustomEntriesIDValidator
+            assembled_entries = id_validator.validate_entries(
+                group_id,
+                assembled_entries,
+                custom_entries_record.CustomEntryColumns.get_sources(entries or []),
+                disambiguate=self.__disambiguate_ids)
+
+            if self.__hooks:
+                for assembled_entry in assembled_entries:
+                    self.__hooks.on_entry_built(group_id, assembled_entry.entry_id,
+                                                assembled_entry.entry)
+
+        if self.__metrics:
+            self.__metrics.add_entries(system_name, group_id, entries=len(assembled_entries))
+        return assembled_entries
+
+    def get_changes(self, group_id: str, system_name: str,
+                    assembled_entries: List[prepare.AssembledEntryData]) \
+            -> Optional[change_detector.EntryGroupChanges]:
+        """
+        Compare the assembled Entries with the state of the previous synchronization.
+
+        :return: The changes since the previous synchronization, or ``None`` if there is no
+            previous state and the Entry Group must be fully synchronized.
+        """
+        if not self.__sync_state:
+            return None
+
+        with self.__measure_phase(group_id, system_name, 'state'):
+            previous_fingerprints = self.__sync_state.get_entry_fingerprints(
+                self.__make_entry_group_name(group_id), system_name)
+            if previous_fingerprints is None:
+                return None
+
+            changes = change_detector.CustomEntriesChangeDetector.detect_changes(
+                assembled_entries, previous_fingerprints)
+
+        logging.info('')
+        logging.info(
+            'Changes since the last synchronization: %d created, %d modified,'
+            ' %d deleted, %d unchanged.', len(changes.created), len(changes.modified),
+            len(changes.deleted_entry_ids), len(changes.unchanged))
+
+        return changes
+
+    def cleanup_and_ingest(self, group_id: str, system_name: str,
+                           assembled_entries: List[prepare.AssembledEntryData]) -> List[str]:
+        """
+        Delete the obsolete Entries of the system and ingest the assembled ones.
+
+        :return: The IDs of the Entries that failed to be written to Data Catalog.
+        """
+        with self.__measure_phase(group_id, system_name, 'cleanup'):
+            # Data Catalog cleanup: delete obsolete data.
+            logging.info('')
+            logging.info('Deleting obsolete metadata from Data Catalog...')
+
+            cleaner = self.__client_pool.make_cleaner(group_id)
+            cleaner.delete_obsolete_metadata(assembled_entries, f'system={system_name}')
+            logging.info('==== DONE ====')
+
+        return self.ingest_entries(group_id, system_name, assembled_entries)
+
+    def delete_entry(self, group_id: str, system_name: str, entry_id: str) -> bool:
+        """
+        Delete an Entry from Data Catalog. Unlike the commons facade, errors are not swallowed,
+        so the sync state only records confirmed deletions.
+
+        :return: ``True`` if the Entry no longer exists in Data Catalog.
+        """
+        entry_name = datacatalog.DataCatalogClient.entry_path(self.__project_id,
+                                                              self.__location_id, group_id,
+                                                              entry_id)
+        with self.__measure_phase(group_id, system_name, 'cleanup'):
+            try:
+                self.__client_pool.get_client().delete_entry(name=entry_name)
+                logging.info('Entry deleted: %s', entry_name)
+            except (exceptions.NotFound, exceptions.PermissionDenied):
+                # Data Catalog denies access to Entries that do not exist.
+                logging.info('Entry does not exist: %s', entry_name)
+            except exceptions.GoogleAPICallError as e:
+                logging.warning('Entry was not deleted: %s', entry_name)
+                logging.warning('Error: %s', e)
+                return False
+
+        return True
+
+    def ingest_entries(self, group_id: str, system_name: str,
+                       assembled_entries: List[prepare.AssembledEntryData]) -> List[str]:
+        """
+        Ingest the assembled Entries into Data Catalog.
+
+        The commons ingestor swallows some of the write errors, which is fine for a full
+        synchronization. When a sync state is available, the Entries are written by the Data
+        Catalog client instead, so only the confirmed writes are recorded.
+
+        :return: The IDs of the Entries that failed to be written, when a sync state is
+            available.
+        """
+        logging.info('')
+        if not assembled_entries:
+            logging.info('No metadata to ingest...')
+            return []
+
+        with self.__measure_phase(group_id, system_name, 'ingest'):
+            # Ingest metadata into Data Catalog.
+            logging.info('Ingesting metadata into Data Catalog...')
+
+            failed_entry_ids = []
+            if self.__sync_state:
+                failed_entry_ids = self.__upsert_entries(group_id, assembled_entries)
+            else:
+                ingestor = self.__client_pool.make_ingestor(group_id)
+                ingestor.ingest_metadata(assembled_entries)
+            logging.info('==== DONE ====')
+
+        if self.__metrics:
+            self.__metrics.add_entries(system_name,
+                                       group_id,
+                                       written=len(assembled_entries) - len(failed_entry_ids),
+                                       failed=len(failed_entry_ids))
+        return failed_entry_ids
+
+    def save_state(self,
+                   group_id: str,
+                   system_name: str,
+                   assembled_entries: List[prepare.AssembledEntryData],
+                   changes: Optional[change_detector.EntryGroupChanges],
+                   failed_entry_ids: List[str] = None):
+        """
+        Record the fingerprints of the synchronized Entries, if a sync state is available.
+
+        The Entries that failed to be written keep their previous fingerprints, or none if they
+        were created, so they are synchronized again next time. In that case, the Entry Group
+        fails after its state is saved.
+
+        :param failed_entry_ids: The IDs of the Entries that failed to be written or deleted.
+        """
+        if not self.__sync_state:
+            return
+
+        with self.__measure_phase(group_id, system_name, 'state'):
+            entry_group_name = self.__make_entry_group_name(group_id)
+            fingerprints = dict(changes.fingerprints) if changes else \
+                change_detector.CustomEntriesChangeDetector.fingerprint_entries(assembled_entries)
+
+            if failed_entry_ids:
+                previous_fingerprints = self.__sync_state.get_entry_fingerprints(
+                    entry_group_name, system_name) or {}
+                for entry_id in failed_entry_ids:
+                    if entry_id in previous_fingerprints:
+                        fingerprints[entry_id] = previous_fingerprints[entry_id]
+                    else:
+                        fingerprints.pop(entry_id, None)
+
+            self.__sync_state.set_entry_fingerprints(entry_group_name, system_name, fingerprints)
+
+        if failed_entry_ids:
+            raise Exception(f'{len(failed_entry_ids)} Entries failed to synchronize:'
+                            f' {", ".join(sorted(failed_entry_ids))}.')
+
+    def delete_removed_entry_groups(
+            self,
+            read_group_ids: Dict[str, Set[str]],
+            entries_filter: custom_entries_filter.CustomEntriesFilter = None) \
+            -> List[EntryGroupSyncResult]:
+        """
+        Delete the Entries of the Entry Groups removed from the input, if a sync state is
+        available.
+
+        Without a sync state, they are deleted by the system-wide cleanup of the other Entry
+        Groups. With a sync state, the Entry Groups recorded for the systems read, but missing
+        from the input, are forgotten once all their Entries are deleted. The Entry Groups
+        excluded by the filter are not considered missing.
+
+        :param read_group_ids: The IDs of the Entry Groups read, by User Specified System.
+        :param entries_filter: The User Specified Systems and Entry Groups read, if not all of
+            them.
+        :return: The results of the removed Entry Groups whose Entries failed to be deleted.
+        """
+        if not self.__sync_state:
+            return []
+
+        entry_group_name_prefix = self.__make_entry_group_name('')
+        failed_results = []
+        for system_name, group_ids in read_group_ids.items():
+            for entry_group_name in self.__sync_state.list_entry_group_names(system_name):
+                if not entry_group_name.startswith(entry_group_name_prefix):
+                    continue
+                group_id = entry_group_name[len(entry_group_name_prefix):]
+                if group_id in group_ids or \
+                        entries_filter and not entries_filter.matches_group(group_id):
+                    continue
+
+                result = self.__delete_removed_entry_group(system_name, group_id, entry_group_name)
+                if result.error:
+                    failed_results.append(result)
+
+        return failed_results
+
+    def report_failed_entry_groups(self,
+                                   failed_results: List[EntryGroupSyncResult],
+                                   raise_on_failure: bool = False):
+        """
+        Log the Entry Groups that failed to synchronize, at the end of a run, along with the
+        run metrics summary, if any.
+
+        :param failed_results: The results of the failed Entry Groups.
+        :param raise_on_failure: Raise an ``EntryGroupSyncError`` if any Entry Group failed.
+        """
+        if self.__metrics:
+            self.__metrics.finish_run(
+                (result.system_name, result.group_id) for result in failed_results)
+            self.__metrics.log_summary()
+
+        if not failed_results:
+            return
+
+        logging.info('')
+        logging.error('%d Entry Group(s) failed to synchronize:', len(failed_results))
+        for result in failed_results:
+            logging.error('  - system=%s, group=%s: %r', result.system_name, result.group_id,
+                          result.error)
+
+        if raise_on_failure:
+            raise EntryGroupSyncError(failed_results)
+
+    def __delete_removed_entry_group(self, system_name: str, group_id: str,
+                                     entry_group_name: str) -> EntryGroupSyncResult:
+
+        logging.info('')
+        logging.info('Entry Group %s (system=%s) was removed from the input.', group_id,
+                     system_name)
+        logging.info('Deleting its Entries from Data Catalog...')
+
+        fingerprints = self.__sync_state.get_entry_fingerprints(entry_group_name,
+                                                                system_name) or {}
+        failed_entry_ids = [
+            entry_id for entry_id in sorted(fingerprints)
+            if not self.delete_entry(group_id, system_name, entry_id)
+        ]
+        if not failed_entry_ids:
+            self.__sync_state.delete_entry_fingerprints(entry_group_name, system_name)
+            logging.info('==== DONE ====')
+            return EntryGroupSyncResult(system_name, group_id, [])
+
+        # The Entries not deleted are kept, so they are deleted again next time.
+        self.__sync_state.set_entry_fingerprints(
+            entry_group_name, system_name,
+            {entry_id: fingerprints[entry_id]
+             for entry_id in failed_entry_ids})
+        return EntryGroupSyncResult(
+            system_name, group_id, [],
+            Exception(f'{len(failed_entry_ids)} Entries failed to be deleted:'
+                      f' {", ".join(failed_entry_ids)}.'))
+
+    @classmethod
+    def __get_reader(cls, csv_file_path: InputFilePaths, json_file_path: InputFilePaths,
+                     parquet_file_path: InputFilePaths) -> Tuple[type, InputFilePaths]:
+
+        if csv_file_path:
+            return custom_entries_csv_reader.CustomEntriesCSVReader, csv_file_path
+        if json_file_path:
+            return custom_entries_json_reader.CustomEntriesJSONReader, json_file_path
+        if parquet_file_path:
+            return custom_entries_parquet_reader.CustomEntriesParquetReader, parquet_file_path
+        raise Exception('Either a CSV, a JSON, or a Parquet file must be provided.')
+
+    def __measure_phase(self, group_id: str, system_name: str, phase: str) -> ContextManager:
+
+        # A no-op context manager, unless there are metrics or hooks: contextlib.nullcontext
+        # requires Python 3.7.
+        phase_context = contextlib.ExitStack()
+        # The hooks are entered first, so their own time is not measured.
+        if self.__hooks:
+            phase_context.enter_context(self.__run_phase_hooks(group_id, phase))
+        if self.__metrics:
+            phase_context.enter_context(self.__metrics.measure_phase(system_name, group_id, phase))
+        return phase_context
+
+    @contextlib.contextmanager
+    def __run_phase_hooks(self, group_id: str, phase: str):
+        self.__hooks.on_phase_start(group_id, phase)
+        started_at = time.monotonic()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.__hooks.on_phase_end(group_id, phase, time.monotonic() - started_at, error)
+
+    def __notify_entry_groups_read(
+        self, assembled_entry_groups: Iterator[Tuple[str, List[Dict[str, object]]]]
+    ) -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+
+        for system_name, entry_groups in assembled_entry_groups:
+            self.__notify_entry_group_read(system_name, entry_groups)
+            yield system_name, entry_groups
+
+    def __notify_entry_group_read(self, system_name: str, entry_groups: List[Dict[str, object]]):
+        for entry_group in entry_groups:
+            self.__hooks.on_entry_group_read(system_name, entry_group.get('id'),
+                                             entry_group.get('entries') or [])
+
+    def __make_entry_group_name(self, group_id: str) -> str:
+        return datacatalog.DataCatalogClient.entry_group_path(self.__project_id,
+                                                              self.__location_id, group_id)
+
+    def __upsert_entries(self, group_id: str,
+                         assembled_entries: List[prepare.AssembledEntryData]) -> List[str]:
+
+        client = self.__client_pool.get_client()
+        entry_group_name = self.__make_entry_group_name(group_id)
+        location_name = datacatalog.DataCatalogClient.location_path(self.__project_id,
+                                                                    self.__location_id)
+        try:
+            client.create_entry_group(parent=location_name,
+                                      entry_group_id=group_id,
+                                      entry_group=types.EntryGroup())
+        except exceptions.AlreadyExists:
+            logging.info('Entry Group already exists: %s', entry_group_name)
+
+        failed_entry_ids = []
+        for assembled_entry in assembled_entries:
+            try:
+                self.__upsert_entry(client, entry_group_name, assembled_entry)
+            except exceptions.GoogleAPICallError as e:
+                logging.warning('Entry was not written: %s', assembled_entry.entry.name)
+                logging.warning('Error: %s', e)
+                failed_entry_ids.append(assembled_entry.entry_id)
+
+        return failed_entry_ids
+
+    @classmethod
+    def __upsert_entry(cls, client: datacatalog.DataCatalogClient, entry_group_name: str,
+                       assembled_entry: prepare.AssembledEntryData):
+
+        try:
+            client.update_entry(entry=assembled_entry.entry, update_mask=None)
+            logging.info('Entry updated: %s', assembled_entry.entry.name)
+        except (exceptions.NotFound, exceptions.PermissionDenied):
+            # Data Catalog denies access to Entries that do not exist.
+            client.create_entry(parent=entry_group_name,
+                                entry_id=assembled_entry.entry_id,
+                                entry=assembled_entry.entry)
+            logging.info('Entry created: %s', assembled_entry.entry.name)
@@ -1,60 +1,284 @@
+import collections
+from concurrent import futures
 import logging
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
+from google.cloud import datacatalog
 from google.cloud.datacatalog import types
-from google.datacatalog_connectors.commons import cleanup, ingest, prepare
 
-from . import custom_entries_csv_reader, custom_entries_json_reader, datacatalog_entry_factory
+from . import custom_entries_change_detector as change_detector, custom_entries_filter, \
+    custom_entries_sync_checkpoint, custom_entries_sync_hooks, custom_entries_sync_metrics, \
+    custom_entries_sync_state, custom_entries_sync_steps, datacatalog_client_pool, \
+    datacatalog_entry_factory, datacatalog_rate_limiter
+
+EntryGroupSyncResult = custom_entries_sync_steps.EntryGroupSyncResult
+InputFilePaths = custom_entries_sync_steps.InputFilePaths
 
 
 class CustomEntriesSynchronizer:
 
-    def __init__(self, project_id, location_id):
+    def __init__(self,
+                 project_id,
+                 location_id,
+                 max_workers=1,
+                 sync_state: custom_entries_sync_state.CustomEntriesSyncState = None,
+                 disambiguate_ids: bool = False,
+                 rate_limiter: datacatalog_rate_limiter.DataCatalogRateLimiter = None,
+                 client_pool_size: int = 1,
+                 client_factory: Callable[[], datacatalog.DataCatalogClient] = None,
+                 metrics: custom_entries_sync_metrics.CustomEntriesSyncMetrics = None,
+                 hooks: custom_entries_sync_hooks.CustomEntriesSyncHooks = None,
+                 parse_workers: int = None):
+        """
+        :param project_id: The Google Cloud Project ID.
+        :param location_id: The Google Cloud Location ID.
+        :param max_workers: The maximum number of Entry Groups synchronized concurrently.
+        :param sync_state: The state of previous synchronizations. When provided, only the
+            Entries created, modified, or deleted since the last successful synchronization of
+            each Entry Group are sent to Data Catalog; Entry Groups with no previous state are
+            fully synchronized.
+        :param disambiguate_ids: Rename Entries whose generated IDs are duplicated, instead
+            of failing their Entry Groups before any API call is made.
+        :param rate_limiter: A rate limiter for the Data Catalog API requests, shared by all
+            the Entry Groups synchronized concurrently.
+        :param client_pool_size: The number of Data Catalog clients, each with its own gRPC
+            channel, shared by all the Entry Groups.
+        :param client_factory: A callable that makes the Data Catalog clients, such as
+            ``FakeDataCatalogBackend.make_client`` to synchronize with no Google Cloud project.
+        :param metrics: Where to record the per-phase timing and throughput of each run.
+        :param hooks: The callbacks invoked at the key points of each run, such as the start
+            and end of each Entry Group and phase, to attach tracing or profiling.
+        :param parse_workers: The maximum number of sharded input files parsed concurrently,
+            each in its own process. Defaults to the number of CPUs.
+        """
         self.__project_id = project_id
         self.__location_id = location_id
+        self.__max_workers = max_workers
+        self.__parse_workers = parse_workers
         self.__entry_factory = datacatalog_entry_factory.DataCatalogEntryFactory(
             project_id, location_id)
+        self.__sync_steps = custom_entries_sync_steps.CustomEntriesSyncSteps(
+            project_id,
+            location_id,
+            self.__entry_factory,
+            sync_state=sync_state,
+            disambiguate_ids=disambiguate_ids,
+            metrics=metrics,
+            hooks=hooks,
+            client_pool=datacatalog_client_pool.DataCatalogClientPool(
+                project_id,
+                location_id,
+                size=client_pool_size,
+                rate_limiter=rate_limiter,
+                client_factory=client_factory,
+                metrics=metrics))
 
-    def sync_to_file(self,
-                     csv_file_path: str = None,
-                     json_file_path: str = None) -> List[types.Entry]:
+    def sync_to_file(
+            self,
+            csv_file_path: InputFilePaths = None,
+            json_file_path: InputFilePaths = None,
+            parquet_file_path: InputFilePaths = None,
+            stream: bool = False,
+            checkpoint_file_path: str = None,
+            resume: bool = False,
+            raise_on_failure: bool = False,
+            entries_filter: custom_entries_filter.CustomEntriesFilter = None) -> List[types.Entry]:
         """
         Synchronize Custom Entries to the provided file contents.
 
+        Entry Groups are synchronized concurrently, using up to ``max_workers`` threads, except
+        for the ones that share a source system: the cleanup step deletes the obsolete Entries
+        of the whole system, so they are synchronized one after another, in the order they are
+        read. A failure in one Entry Group does not stop the others: it is reported at the end
+        of the run instead.
+
         :param
-            csv_file_path: Path of a CSV file with metadata for the Custom Entries.
-            json_file_path: Path of a JSON file with metadata for the Custom Entries.
+            csv_file_path: Path of a CSV file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded CSV files.
+            json_file_path: Path of a JSON file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded JSON files.
+            parquet_file_path: Path of a Parquet file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded Parquet files.
+            stream: Read the file incrementally and synchronize each Entry Group as soon as it
+                is read, instead of loading the whole file upfront. The Entry Groups are then
+                created one by one, instead of in a single bulk pass.
+            checkpoint_file_path: Path of a file to record each Entry Group as soon as it is
+                synchronized.
+            resume: Skip the Entry Groups recorded in the checkpoint file by a previous run with
+                the same input file contents.
+            raise_on_failure: Raise an ``EntryGroupSyncError`` at the end of the run if any
+                Entry Group failed.
+            entries_filter: The User Specified Systems and Entry Groups to synchronize, if not
+                all of them. The others are skipped by the reader.
         :return: A list with the up to date Custom Entries.
         """
-        file_path = csv_file_path if csv_file_path else json_file_path if json_file_path else None
+        return [
+            result.entries for result in
+            self.__sync_to_file(csv_file_path, json_file_path, parquet_file_path, stream,
+                                checkpoint_file_path, resume, raise_on_failure, entries_filter)
+        ]
+
+    def stream_sync_to_file(
+        self,
+        csv_file_path: InputFilePaths = None,
+        json_file_path: InputFilePaths = None,
+        parquet_file_path: InputFilePaths = None,
+        checkpoint_file_path: str = None,
+        resume: bool = False,
+        raise_on_failure: bool = False,
+        entries_filter: custom_entries_filter.CustomEntriesFilter = None
+    ) -> Iterator[EntryGroupSyncResult]:
+        """
+        Synchronize Custom Entries to the provided file contents, yielding the results of each
+        Entry Group as soon as it is synchronized.
+
+        The file is read incrementally and nothing is accumulated between Entry Groups, so
+        memory usage is bound to the largest Entry Group instead of the whole file.
+
+        :param
+            csv_file_path: Path of a CSV file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded CSV files.
+            json_file_path: Path of a JSON file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded JSON files.
+            parquet_file_path: Path of a Parquet file with metadata for the Custom Entries, or a
+                list of file paths, directories, and glob patterns of sharded Parquet files.
+            checkpoint_file_path: Path of a file to record each Entry Group as soon as it is
+                synchronized.
+            resume: Skip the Entry Groups recorded in the checkpoint file by a previous run with
+                the same input file contents.
+            raise_on_failure: Raise an ``EntryGroupSyncError`` after the last result if any
+                Entry Group failed.
+            entries_filter: The User Specified Systems and Entry Groups to synchronize, if not
+                all of them. The others are skipped by the reader.
+        :return: An iterator of ``EntryGroupSyncResult``, in the same order the Entry Groups
+            are read.
+        """
+        return self.__sync_to_file(csv_file_path, json_file_path, parquet_file_path, True,
+                                   checkpoint_file_path, resume, raise_on_failure, entries_filter)
+
+    def __sync_to_file(self, csv_file_path: InputFilePaths, json_file_path: InputFilePaths,
+                       parquet_file_path: InputFilePaths, stream: bool,
+                       checkpoint_file_path: str, resume: bool, raise_on_failure: bool,
+                       entries_filter: custom_entries_filter.CustomEntriesFilter) \
+            -> Iterator[EntryGroupSyncResult]:
+
+        file_path = self.__sync_steps.list_input_files(csv_file_path, json_file_path,
+                                                       parquet_file_path)
 
         logging.info('')
         logging.info('==== Synchronize Custom Entries to file [STARTED] =====')
 
-        read_file: Callable[[str], List[Tuple[str, List[Dict[str, object]]]]] = \
-            custom_entries_csv_reader.CustomEntriesCSVReader.read_file if csv_file_path \
-            else custom_entries_json_reader.CustomEntriesJSONReader.read_file if json_file_path \
-            else Exception('Either a CSV or a JSON file must be provided.')
+        checkpoint = custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint(
+            checkpoint_file_path, file_path, resume) \
+            if checkpoint_file_path and file_path else None
 
-        assembled_entry_groups = read_file(file_path)
+        read_file = self.__sync_steps.get_file_reader(csv_file_path, json_file_path, stream,
+                                                      parquet_file_path, entries_filter,
+                                                      self.__parse_workers)
+        assembled_entry_groups = self.__sync_steps.read_entry_groups(read_file, file_path)
+        if not stream:
+            self.__sync_steps.resolve_entry_groups(assembled_entry_groups, checkpoint,
+                                                   self.__max_workers)
 
         logging.info('')
         logging.info('>> Synchronizing file :: Data Catalog metadata...')
 
-        entries = []
-        for system_name, entry_groups in assembled_entry_groups:
-            entries.extend([
-                self.__synchronize_entry_group(entry_group, system_name)
-                for entry_group in entry_groups
-            ])
+        failed_results = []
+        read_group_ids = {}
+        for result in self.__synchronize_entry_groups(assembled_entry_groups, checkpoint):
+            read_group_ids.setdefault(result.system_name, set()).add(result.group_id)
+            if result.error:
+                failed_results.append(result)
+            yield result
+
+        failed_results.extend(
+            self.__sync_steps.delete_removed_entry_groups(read_group_ids, entries_filter))
+        self.__sync_steps.report_failed_entry_groups(failed_results, raise_on_failure)
 
         logging.info('')
         logging.info('==== Synchronize Custom Entries to file [FINISHED] ====')
 
-        return entries
+    def __synchronize_entry_groups(
+        self, assembled_entry_groups: Iterable[Tuple[str, List[Dict[str, object]]]],
+        checkpoint: custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint
+    ) -> Iterator[EntryGroupSyncResult]:
+        """
+        Submit the Entry Groups to a bounded worker pool and yield their results in the same
+        order they were read. At most ``max_workers`` groups are queued beyond the ones being
+        processed, so lazily read inputs are not fully materialized.
+
+        Each Entry Group waits for the previous one of the same system before calling any API,
+        since the cleanup of an Entry Group would otherwise delete the Entries its siblings are
+        ingesting. It also waits for the previous one with the same ID, from another system,
+        since the cleanup may delete the Entry Group the other one is ingesting into.
+        """
+        with futures.ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            pending_results = collections.deque()
+            last_system_results = {}
+            last_group_results = {}
+            for system_name, entry_groups in assembled_entry_groups:
+                for entry_group in entry_groups:
+                    group_id = entry_group.get('id')
+                    previous_results = [
+                        previous_result
+                        for previous_result in (last_system_results.get(system_name),
+                                                last_group_results.get(group_id))
+                        if previous_result
+                    ]
+                    result = self.__submit_entry_group(executor, entry_group, system_name,
+                                                       checkpoint, previous_results)
+                    last_system_results[system_name] = result
+                    last_group_results[group_id] = result
+                    pending_results.append(result)
+                    if len(pending_results) > self.__max_workers:
+                        yield pending_results.popleft().result()
+
+            while pending_results:
+                yield pending_results.popleft().result()
+
+    def __submit_entry_group(
+            self, executor: futures.Executor, entry_group: Dict[str, object], system_name: str,
+            checkpoint: custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint,
+            previous_results: List[futures.Future]) -> futures.Future:
+
+        group_id = entry_group.get('id')
+        if not (checkpoint and checkpoint.is_completed(system_name, group_id)):
+            return executor.submit(self.__synchronize_entry_group_safely, entry_group, system_name,
+                                   checkpoint, previous_results)
+
+        logging.info('')
+        logging.info('Skipping Entry Group already synchronized: %s...', group_id)
+
+        skipped_result = futures.Future()
+        skipped_result.set_result(EntryGroupSyncResult(system_name, group_id, [], skipped=True))
+        return skipped_result
+
+    def __synchronize_entry_group_safely(
+            self, entry_group: Dict[str, object], system_name: str,
+            checkpoint: custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint,
+            previous_results: List[futures.Future]) -> EntryGroupSyncResult:
 
-    def __synchronize_entry_group(self, entry_group: Dict[str, object], system_name: str) \
-            -> List[types.Entry]:
+        group_id = entry_group.get('id')
+        self.__sync_steps.start_entry_group(system_name, group_id)
+        try:
+            entries = self.__synchronize_entry_group(entry_group, system_name, previous_results)
+            if checkpoint:
+                checkpoint.mark_completed(system_name, group_id)
+            return self.__sync_steps.finish_entry_group(
+                EntryGroupSyncResult(system_name, group_id, entries))
+        except Exception as e:
+            logging.exception('Failed to synchronize Entry Group: %s (system=%s)', group_id,
+                              system_name)
+            return self.__sync_steps.finish_entry_group(
+                EntryGroupSyncResult(system_name, group_id, [], e))
+        finally:
+            # Keep the chains of the system and the Entry Group ID intact when this Entry Group
+            # ends early.
+            if previous_results:
+                futures.wait(previous_results)
+
+    def __synchronize_entry_group(self, entry_group: Dict[str, object], system_name: str,
+                                  previous_results: List[futures.Future]) -> List[types.Entry]:
 
         group_id = entry_group.get('id')
         if not group_id:
@@ -64,40 +288,42 @@ class CustomEntriesSynchronizer:
         logging.info('Processing Entry Group: %s...', group_id)
 
         # Prepare: convert raw metadata into Data Catalog entries.
-        logging.info('')
-        logging.info('Converting raw metadata into Data Catalog entries...')
+        assembled_entries = self.__sync_steps.prepare_entries(group_id, system_name,
+                                                              entry_group.get('entries'))
 
-        entries = entry_group.get('entries')
-        assembled_entries = self.__make_assembled_entries(group_id, entries) if entries else []
-        logging.info('==== DONE ====')
+        # The previous Entry Groups were submitted first, so they are never waiting for a worker.
+        if previous_results:
+            futures.wait(previous_results)
 
-        # Data Catalog cleanup: delete obsolete data.
-        logging.info('')
-        logging.info('Deleting obsolete metadata from Data Catalog...')
+        changes = self.__sync_steps.get_changes(group_id, system_name, assembled_entries)
+        if changes is None:
+            failed_entry_ids = self.__sync_steps.cleanup_and_ingest(group_id, system_name,
+                                                                    assembled_entries)
+        else:
+            failed_entry_ids = self.__apply_changes(group_id, system_name, changes)
 
-        cleaner = \
-            cleanup.DataCatalogMetadataCleaner(self.__project_id, self.__location_id, group_id)
-        cleaner.delete_obsolete_metadata(assembled_entries, f'system={system_name}')
-        logging.info('==== DONE ====')
+        self.__sync_steps.save_state(group_id, system_name, assembled_entries, changes,
+                                     failed_entry_ids)
 
-        logging.info('')
-        if not assembled_entries:
-            logging.info('No metadata to ingest...')
-            return []
+        return [assembled_entry.entry for assembled_entry in assembled_entries]
 
-        # Ingest metadata into Data Catalog.
-        logging.info('Ingesting metadata into Data Catalog...')
+    def __apply_changes(self, group_id: str, system_name: str,
+                        changes: change_detector.EntryGroupChanges) -> List[str]:
 
-        ingestor = \
-            ingest.DataCatalogMetadataIngestor(self.__project_id, self.__location_id, group_id)
-        ingestor.ingest_metadata(assembled_entries)
-        logging.info('==== DONE ====')
+        failed_entry_ids = []
 
-        return [assembled_entry.entry for assembled_entry in assembled_entries]
+        # Data Catalog cleanup: delete only the Entries removed since the last synchronization.
+        if changes.deleted_entry_ids:
+            logging.info('')
+            logging.info('Deleting removed Entries from Data Catalog...')
 
-    def __make_assembled_entries(self, group_id, data):
-        return [self.__make_assembled_entry(group_id, entry) for entry in data]
+            failed_entry_ids.extend(
+                entry_id for entry_id in changes.deleted_entry_ids
+                if not self.__sync_steps.delete_entry(group_id, system_name, entry_id))
+            logging.info('==== DONE ====')
 
-    def __make_assembled_entry(self, group_id, data):
-        entry_id, entry = self.__entry_factory.make_entry_from_dict(group_id, data)
-        return prepare.AssembledEntryData(entry_id, entry)
+        # Ingest only the created and modified Entries into Data Catalog.
+        failed_entry_ids.extend(
+            self.__sync_steps.ingest_entries(group_id, system_name,
+                                             changes.created + changes.modified))
+        return failed_entry_ids
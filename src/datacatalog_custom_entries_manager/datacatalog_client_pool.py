@@ -0,0 +1,123 @@
+import itertools
+import threading
+from typing import Callable, Iterable
+
+from google.cloud import datacatalog
+from google.datacatalog_connectors.commons import cleanup, datacatalog_facade, ingest
+
+from . import custom_entries_sync_metrics, \
+    datacatalog_entry_group_registry as entry_group_registry, datacatalog_rate_limiter
+
+
+class DataCatalogClientPool:
+    """
+    A fixed number of Data Catalog clients, shared by all the Entry Groups of a run.
+
+    The commons cleaner, ingestor, and facade create a new client, along with its gRPC channel
+    and credentials, every time they are instantiated. The ones made by the pool use its
+    clients instead, so connections are set up once per run. Each client has its own channel,
+    and they are handed out in turns, spreading concurrent requests across the channels.
+
+    The clients also share an Entry Group registry, so the Entry Groups resolved in bulk by
+    ``resolve_entry_groups`` are not created again by each ingestor.
+    """
+
+    def __init__(self,
+                 project_id: str,
+                 location_id: str,
+                 size: int = 1,
+                 rate_limiter: datacatalog_rate_limiter.DataCatalogRateLimiter = None,
+                 client_factory: Callable[[], datacatalog.DataCatalogClient] = None,
+                 metrics: custom_entries_sync_metrics.CustomEntriesSyncMetrics = None):
+        """
+        :param project_id: The Google Cloud Project ID.
+        :param location_id: The Google Cloud Location ID.
+        :param size: The number of clients, each with its own gRPC channel.
+        :param rate_limiter: A rate limiter for the requests of all the clients, if any.
+        :param client_factory: A callable that makes each client, such as
+            ``FakeDataCatalogBackend.make_client``. Defaults to ``DataCatalogClient``.
+        :param metrics: The metrics of the run, if any, where every request sent by the clients
+            is counted, including the throttled ones.
+        """
+        if size < 1:
+            raise ValueError('The pool size must be positive.')
+
+        self.__project_id = project_id
+        self.__location_id = location_id
+        self.__rate_limiter = rate_limiter
+        self.__client_factory = client_factory or datacatalog.DataCatalogClient
+        self.__metrics = metrics
+        self.__entry_group_registry = entry_group_registry.DataCatalogEntryGroupRegistry(
+            project_id, location_id)
+        self.__clients = [None] * size
+        self.__client_indexes = itertools.cycle(range(size))
+        self.__lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self.__clients)
+
+    def get_client(self) -> datacatalog.DataCatalogClient:
+        """
+        Get the next client of the pool, creating it on first use.
+
+        :return: A Data Catalog client, rate limited if the pool has a rate limiter.
+        """
+        with self.__lock:
+            index = next(self.__client_indexes)
+            if not self.__clients[index]:
+                self.__clients[index] = self.__make_client()
+            return self.__clients[index]
+
+    def resolve_entry_groups(self, group_ids: Iterable[str], max_workers: int = 1):
+        """
+        Make sure the given Entry Groups exist before their Entries are ingested, listing the
+        existing ones in a single pass and creating the missing ones concurrently.
+
+        :param group_ids: The Entry Group ids.
+        :param max_workers: The maximum number of Entry Groups created concurrently.
+        """
+        self.__entry_group_registry.resolve(self.get_client(), group_ids, max_workers)
+
+    def make_facade(self) -> datacatalog_facade.DataCatalogFacade:
+        facade = datacatalog_facade.DataCatalogFacade.__new__(datacatalog_facade.DataCatalogFacade)
+        self.__set_private_attributes(facade,
+                                      datacatalog=self.get_client(),
+                                      project_id=self.__project_id)
+        return facade
+
+    def make_cleaner(self, group_id: str) -> cleanup.DataCatalogMetadataCleaner:
+        cleaner = cleanup.DataCatalogMetadataCleaner.__new__(cleanup.DataCatalogMetadataCleaner)
+        self.__set_private_attributes(cleaner,
+                                      datacatalog_facade=self.make_facade(),
+                                      project_id=self.__project_id,
+                                      location_id=self.__location_id,
+                                      entry_group_id=group_id)
+        return cleaner
+
+    def make_ingestor(self, group_id: str) -> ingest.DataCatalogMetadataIngestor:
+        ingestor = ingest.DataCatalogMetadataIngestor.__new__(ingest.DataCatalogMetadataIngestor)
+        self.__set_private_attributes(ingestor,
+                                      datacatalog_facade=self.make_facade(),
+                                      project_id=self.__project_id,
+                                      location_id=self.__location_id,
+                                      entry_group_id=group_id)
+        return ingestor
+
+    def __make_client(self) -> datacatalog.DataCatalogClient:
+        client = self.__client_factory()
+        if self.__metrics:
+            client = self.__metrics.meter(client)
+        if self.__rate_limiter:
+            client = datacatalog_rate_limiter.RateLimitedDataCatalogClient(
+                client, self.__rate_limiter)
+        # Skipped Entry Group creations do not draw from the rate limiter.
+        return self.__entry_group_registry.track(client)
+
+    @classmethod
+    def __set_private_attributes(cls, api_object, **attributes):
+        # The commons classes keep their dependencies in name-mangled attributes, which are
+        # set as their constructors would do.
+        class_name = type(api_object).__name__
+        for name, value in attributes.items():
+            setattr(api_object, f'_{class_name}__{name}', value)
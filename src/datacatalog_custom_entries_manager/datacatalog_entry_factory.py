@@ -1,53 +1,142 @@
 from datetime import datetime
-from typing import Dict, Tuple
+import functools
+from typing import Dict, List, Tuple, Union
 
 from google.cloud import datacatalog
 from google.cloud.datacatalog import types
 from google.datacatalog_connectors.commons import prepare
 
+from . import constant, custom_entries_record
+
 
 class DataCatalogEntryFactory(prepare.BaseEntryFactory):
-    __DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+    # Bounds the per-process memoization of formatted IDs, display names, and timestamps.
+    __CACHE_MAX_SIZE = 65536
 
     def __init__(self, project_id, location_id):
         self.__project_id = project_id
         self.__location_id = location_id
 
     def make_entry_from_dict(self, group_id: str, data: Dict[str, str]) -> Tuple[str, types.Entry]:
+        """
+        Make an Entry from its raw metadata.
+
+        :param group_id: The Entry Group id.
+        :param data: The Entry ``CustomEntryRecord``, as made by the readers, or ``dict``.
+        :return: An ``(entry_id, entry)`` tuple.
+        """
+        entry_name_prefix = self.__make_entry_name_prefix(group_id)
+        return self.__make_entry(entry_name_prefix,
+                                 custom_entries_record.CustomEntryRecord.from_dict(data))
+
+    def make_entries_from_dicts(self, group_id: str, data_list: List[Dict[str, str]]) \
+            -> List[Tuple[str, types.Entry]]:
+        """
+        Make the Entries that belong to an Entry Group in a single call.
+
+        Formatted IDs, display names and timestamps are memoized, so repeated values
+        are converted only once. The Entries are identical to the ones returned by
+        ``make_entry_from_dict``.
+
+        :param group_id: The Entry Group id.
+        :param data_list: The Entry ``CustomEntryRecords`` or ``dicts`` that belong to the
+            Entry Group, or their ``CustomEntryColumns``, which are handed to
+            ``make_entries_from_columns``.
+        :return: A list of ``(entry_id, entry)`` tuples, in the same order as ``data_list``.
+        """
+        if isinstance(data_list, custom_entries_record.CustomEntryColumns):
+            return self.make_entries_from_columns(group_id, data_list)
+
+        entry_name_prefix = self.__make_entry_name_prefix(group_id)
+        from_dict = custom_entries_record.CustomEntryRecord.from_dict
+        return [self.__make_entry(entry_name_prefix, from_dict(data)) for data in data_list]
+
+    def make_entries_from_columns(self, group_id: str,
+                                  columns: custom_entries_record.CustomEntryColumns) \
+            -> List[Tuple[str, types.Entry]]:
+        """
+        Make the Entries that belong to an Entry Group straight from their column arrays,
+        with no per-Entry record. The timestamps are already epoch seconds.
+
+        :param group_id: The Entry Group id.
+        :param columns: The Entry Group's ``CustomEntryColumns``.
+        :return: A list of ``(entry_id, entry)`` tuples, in the same order as the columns.
+        """
+        entry_name_prefix = self.__make_entry_name_prefix(group_id)
+        system_name = columns.user_specified_system
+        return [
+            self.__make_entry_from_values(entry_name_prefix, linked_resource, display_name,
+                                          description, user_specified_type, system_name,
+                                          create_seconds, update_seconds)
+            for linked_resource, display_name, description, user_specified_type, create_seconds,
+            update_seconds in zip(columns.linked_resources.tolist(), columns.display_names.tolist(
+            ), columns.descriptions.tolist(), columns.user_specified_types.tolist(),
+                                  columns.created_at.tolist(), columns.updated_at.tolist())
+        ]
+
+    def __make_entry_name_prefix(self, group_id: str) -> str:
+        entry_group_name = datacatalog.DataCatalogClient.entry_group_path(
+            self.__project_id, self.__location_id, group_id)
+        return f'{entry_group_name}/entries/'
+
+    @classmethod
+    def __make_entry(cls, entry_name_prefix: str,
+                     record: custom_entries_record.CustomEntryRecord) -> Tuple[str, types.Entry]:
+
+        return cls.__make_entry_from_values(entry_name_prefix, record.linked_resource,
+                                            record.display_name, record.description,
+                                            record.user_specified_type,
+                                            record.user_specified_system,
+                                            cls.__get_seconds(record.created_at),
+                                            cls.__get_seconds(record.updated_at))
+
+    @classmethod
+    def __make_entry_from_values(cls, entry_name_prefix: str, linked_resource: str,
+                                 display_name: str, description: str, user_specified_type: str,
+                                 user_specified_system: str, create_seconds: int,
+                                 update_seconds: int) -> Tuple[str, types.Entry]:
+
         entry = types.Entry()
 
-        generated_id = self.__format_id(data.get('display_name'))
-        entry.name = datacatalog.DataCatalogClient.entry_path(self.__project_id,
-                                                              self.__location_id, group_id,
-                                                              generated_id)
+        generated_id = cls.__format_id(display_name)
+        entry.name = entry_name_prefix + generated_id
 
-        entry.linked_resource = data.get('linked_resource')
-        entry.display_name = self._format_display_name(data.get('display_name'))
+        entry.linked_resource = linked_resource
+        entry.display_name = cls.__format_display_name(display_name)
 
-        description = data.get('description')
         if description:
             entry.description = description
 
-        entry.user_specified_type = data.get('user_specified_type')
-        entry.user_specified_system = data.get('user_specified_system')
+        entry.user_specified_type = user_specified_type
+        entry.user_specified_system = user_specified_system
 
-        created_at = data.get('created_at')
-        if created_at:
-            entry.source_system_timestamps.create_time.seconds = \
-                self.__convert_datetime_str_to_seconds(created_at)
-        updated_at = data.get('updated_at')
-        if updated_at:
-            entry.source_system_timestamps.update_time.seconds = \
-                self.__convert_datetime_str_to_seconds(updated_at)
+        if create_seconds:
+            entry.source_system_timestamps.create_time.seconds = create_seconds
+        if update_seconds:
+            entry.source_system_timestamps.update_time.seconds = update_seconds
 
         return generated_id, entry
 
     @classmethod
+    def __get_seconds(cls, timestamp: Union[str, int]) -> int:
+        # Records taken from CustomEntryColumns already have epoch seconds.
+        if timestamp and isinstance(timestamp, str):
+            return cls.__convert_datetime_str_to_seconds(timestamp)
+        return timestamp
+
+    @classmethod
+    @functools.lru_cache(maxsize=__CACHE_MAX_SIZE)
     def __format_id(cls, not_formatted_id):
         lower_case_id = not_formatted_id.lower()
         return cls._format_id(lower_case_id)
 
     @classmethod
+    @functools.lru_cache(maxsize=__CACHE_MAX_SIZE)
+    def __format_display_name(cls, not_formatted_name):
+        return cls._format_display_name(not_formatted_name)
+
+    @classmethod
+    @functools.lru_cache(maxsize=__CACHE_MAX_SIZE)
     def __convert_datetime_str_to_seconds(cls, datetime_string):
-        datetime_object = datetime.strptime(datetime_string, cls.__DATETIME_FORMAT)
+        datetime_object = datetime.strptime(datetime_string, constant.ENTRIES_DATETIME_FORMAT)
         return int(datetime_object.timestamp())
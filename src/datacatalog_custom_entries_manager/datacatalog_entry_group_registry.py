@@ -0,0 +1,151 @@
+from concurrent import futures
+import logging
+import threading
+from typing import Iterable
+
+from google.api_core import exceptions
+from google.cloud import datacatalog
+from google.cloud.datacatalog import types
+
+
+class DataCatalogEntryGroupRegistry:
+    """
+    Keep track of the Entry Groups that exist in Data Catalog during a run.
+
+    The commons ingestor creates the Entry Group of each Entry Group it ingests, which costs a
+    round trip even when it already exists. The registry resolves all the Entry Groups of a run
+    up front instead: the existing ones are listed once, and the missing ones are created
+    concurrently. The clients it tracks then skip the creation of the known Entry Groups, and
+    forget the ones they delete, such as the Entry Groups emptied by the cleanup step.
+
+    The Entry Groups are tracked by name only, so the synchronization engines never run two
+    Entry Groups with the same ID at a time, even from different systems: the cleanup of one
+    would otherwise delete the Entry Group the other one skipped creating.
+    """
+
+    def __init__(self, project_id: str, location_id: str):
+        self.__project_id = project_id
+        self.__location_id = location_id
+        self.__entry_group_names = set()
+        self.__lock = threading.Lock()
+
+    def resolve(self,
+                client: datacatalog.DataCatalogClient,
+                group_ids: Iterable[str],
+                max_workers: int = 1):
+        """
+        Make sure the given Entry Groups exist, listing the existing ones in a single pass and
+        creating the missing ones concurrently.
+
+        :param client: The Data Catalog client.
+        :param group_ids: The Entry Group ids.
+        :param max_workers: The maximum number of Entry Groups created concurrently.
+        """
+        logging.info('')
+        logging.info('Resolving the Entry Groups...')
+
+        location_name = datacatalog.DataCatalogClient.location_path(self.__project_id,
+                                                                    self.__location_id)
+        existing_names = {
+            entry_group.name
+            for entry_group in client.list_entry_groups(parent=location_name)
+        }
+        self.__add_all(existing_names)
+
+        missing_group_ids = sorted({
+            group_id
+            for group_id in group_ids
+            if self.__make_entry_group_name(group_id) not in existing_names
+        })
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            errors = executor.map(
+                lambda group_id: self.__create_entry_group(client, location_name, group_id),
+                missing_group_ids)
+            for group_id, error in zip(missing_group_ids, errors):
+                if error:
+                    # The Entry Group is created again when its Entries are ingested.
+                    logging.warning('Entry Group was not created: %s', group_id)
+                    logging.warning('Error: %s', error)
+
+        logging.info('%d existing, %d created.', len(existing_names), len(missing_group_ids))
+        logging.info('==== DONE ====')
+
+    def contains(self, entry_group_name: str) -> bool:
+        with self.__lock:
+            return entry_group_name in self.__entry_group_names
+
+    def add(self, entry_group_name: str):
+        self.__add_all([entry_group_name])
+
+    def discard(self, entry_group_name: str):
+        with self.__lock:
+            self.__entry_group_names.discard(entry_group_name)
+
+    def track(self, client: datacatalog.DataCatalogClient) \
+            -> 'EntryGroupTrackingDataCatalogClient':
+        """
+        Make a client skip the creation of the Entry Groups known to exist.
+
+        :param client: A Data Catalog client.
+        :return: A proxy to the client.
+        """
+        return EntryGroupTrackingDataCatalogClient(client, self)
+
+    def __create_entry_group(self, client: datacatalog.DataCatalogClient, location_name: str,
+                             group_id: str) -> exceptions.GoogleAPICallError:
+
+        try:
+            entry_group = client.create_entry_group(parent=location_name,
+                                                    entry_group_id=group_id,
+                                                    entry_group=types.EntryGroup())
+            logging.info('Entry Group created: %s', entry_group.name)
+            self.add(entry_group.name)
+        except exceptions.AlreadyExists:
+            self.add(self.__make_entry_group_name(group_id))
+        except exceptions.GoogleAPICallError as e:
+            return e
+
+    def __add_all(self, entry_group_names: Iterable[str]):
+        with self.__lock:
+            self.__entry_group_names.update(entry_group_names)
+
+    def __make_entry_group_name(self, group_id: str) -> str:
+        return datacatalog.DataCatalogClient.entry_group_path(self.__project_id,
+                                                              self.__location_id, group_id)
+
+
+class EntryGroupTrackingDataCatalogClient:
+    """
+    Proxy to a Data Catalog client that keeps an Entry Group registry up to date.
+
+    Creating a known Entry Group fails right away with ``AlreadyExists``, which the callers
+    already handle, instead of sending a request.
+    """
+
+    def __init__(self, client, registry: DataCatalogEntryGroupRegistry):
+        self.__client = client
+        self.__registry = registry
+
+    def create_entry_group(self, parent: str, entry_group_id: str, entry_group=None, **kwargs):
+        entry_group_name = f'{parent}/entryGroups/{entry_group_id}'
+        if self.__registry.contains(entry_group_name):
+            raise exceptions.AlreadyExists(f'Entry Group already resolved: {entry_group_name}')
+
+        try:
+            entry_group = self.__client.create_entry_group(parent=parent,
+                                                           entry_group_id=entry_group_id,
+                                                           entry_group=entry_group,
+                                                           **kwargs)
+        except exceptions.AlreadyExists:
+            self.__registry.add(entry_group_name)
+            raise
+
+        self.__registry.add(entry_group_name)
+        return entry_group
+
+    def delete_entry_group(self, name: str, **kwargs):
+        self.__client.delete_entry_group(name=name, **kwargs)
+        self.__registry.discard(name)
+
+    def __getattr__(self, name):
+        return getattr(self.__client, name)
@@ -0,0 +1,264 @@
+import collections
+import random
+import threading
+import time
+from typing import Dict, List
+
+from google.api_core import exceptions
+from google.cloud import datacatalog
+from google.cloud.datacatalog import types
+
+
+class FakeDataCatalogBackend:
+    """
+    In-process stand-in for the Data Catalog Entries and Entry Groups API, used to benchmark
+    and test synchronizations with no Google Cloud project.
+
+    Its clients are made by ``make_client``, which is meant to be passed as the
+    ``client_factory`` of a synchronizer, so the whole synchronization runs against the backend
+    with the same request patterns as against Data Catalog. Like the real API, reading,
+    updating, or deleting an Entry that does not exist is denied with ``PERMISSION_DENIED``.
+
+    Each request may be delayed by a fixed latency, limited by a quota of requests per second,
+    which fails the excess requests with ``RESOURCE_EXHAUSTED``, or failed on purpose, either
+    at random or with the errors injected for its method.
+    """
+    __SYSTEM_QUERY_PREFIX = 'system='
+
+    def __init__(self,
+                 latency_seconds: float = 0.0,
+                 requests_per_second: float = None,
+                 error_rate: float = 0.0,
+                 seed: int = None):
+        """
+        :param latency_seconds: The time each request takes, during which it holds no lock.
+        :param requests_per_second: The quota of requests, counted per wall-clock second.
+            Unlimited if not provided.
+        :param error_rate: The probability of a request failing with ``UNAVAILABLE``.
+        :param seed: The seed of the random errors, to make them reproducible.
+        """
+        self.__latency_seconds = latency_seconds
+        self.__requests_per_second = requests_per_second
+        self.__error_rate = error_rate
+        self.__random = random.Random(seed)
+
+        self.__entry_groups = {}
+        self.__entries = {}
+        self.__injected_errors = collections.defaultdict(collections.deque)
+        self.__request_counts = collections.Counter()
+        self.__quota_window = None
+        self.__quota_window_count = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def request_counts(self) -> Dict[str, int]:
+        """The number of requests received, by method name, including the failed ones."""
+        with self.__lock:
+            return dict(self.__request_counts)
+
+    def make_client(self) -> 'FakeDataCatalogClient':
+        return FakeDataCatalogClient(self)
+
+    def inject_errors(self, method_name: str, *errors: exceptions.GoogleAPICallError):
+        """
+        Fail the next requests of a method, one for each given error, in order.
+
+        :param method_name: The client method name, such as ``create_entry``.
+        :param errors: The errors to raise.
+        """
+        with self.__lock:
+            self.__injected_errors[method_name].extend(errors)
+
+    def get_entry_group_names(self) -> List[str]:
+        with self.__lock:
+            return sorted(self.__entry_groups)
+
+    def get_entries(self, entry_group_name: str = None) -> List[types.Entry]:
+        """
+        :param entry_group_name: The name of an Entry Group, to get only its Entries.
+        :return: Copies of the stored Entries, sorted by name.
+        """
+        with self.__lock:
+            return [
+                self.__copy_entry(entry) for name, entry in sorted(self.__entries.items())
+                if not entry_group_name or name.startswith(f'{entry_group_name}/entries/')
+            ]
+
+    def handle_request(self, method_name: str):
+        """
+        Account for a request and wait for its latency, raising the error it fails with, if
+        any. Called by the clients before each request is served.
+
+        :param method_name: The client method name.
+        """
+        with self.__lock:
+            self.__request_counts[method_name] += 1
+            error = self.__get_request_error(method_name)
+
+        if self.__latency_seconds:
+            time.sleep(self.__latency_seconds)
+        if error:
+            raise error
+
+    def create_entry_group(self, parent: str, entry_group_id: str) -> types.EntryGroup:
+        name = f'{parent}/entryGroups/{entry_group_id}'
+        with self.__lock:
+            if name in self.__entry_groups:
+                raise exceptions.AlreadyExists(f'Entry Group already exists: {name}')
+            entry_group = types.EntryGroup()
+            entry_group.name = name
+            self.__entry_groups[name] = entry_group
+            return self.__copy_entry_group(entry_group)
+
+    def list_entry_groups(self, parent: str) -> List[types.EntryGroup]:
+        with self.__lock:
+            return [
+                self.__copy_entry_group(entry_group)
+                for name, entry_group in sorted(self.__entry_groups.items())
+                if name.startswith(f'{parent}/entryGroups/')
+            ]
+
+    def delete_entry_group(self, name: str, force: bool = False):
+        with self.__lock:
+            if name not in self.__entry_groups:
+                raise exceptions.PermissionDenied(f'Entry Group does not exist: {name}')
+            entry_names = [
+                entry_name for entry_name in self.__entries
+                if entry_name.startswith(f'{name}/entries/')
+            ]
+            if entry_names and not force:
+                raise exceptions.FailedPrecondition(f'Entry Group is not empty: {name}')
+            for entry_name in entry_names:
+                del self.__entries[entry_name]
+            del self.__entry_groups[name]
+
+    def create_entry(self, parent: str, entry_id: str, entry: types.Entry) -> types.Entry:
+        name = f'{parent}/entries/{entry_id}'
+        with self.__lock:
+            if parent not in self.__entry_groups:
+                raise exceptions.PermissionDenied(f'Entry Group does not exist: {parent}')
+            if name in self.__entries:
+                raise exceptions.AlreadyExists(f'Entry already exists: {name}')
+            stored_entry = self.__copy_entry(entry)
+            stored_entry.name = name
+            self.__entries[name] = stored_entry
+            return self.__copy_entry(stored_entry)
+
+    def get_entry(self, name: str) -> types.Entry:
+        with self.__lock:
+            return self.__copy_entry(self.__get_stored_entry(name))
+
+    def update_entry(self, entry: types.Entry) -> types.Entry:
+        with self.__lock:
+            self.__get_stored_entry(entry.name).CopyFrom(entry)
+            return self.__copy_entry(entry)
+
+    def delete_entry(self, name: str):
+        with self.__lock:
+            self.__get_stored_entry(name)
+            del self.__entries[name]
+
+    def search_entry_names(self, project_ids: List[str], query: str) -> List[str]:
+        """
+        Search the Entries of the given projects. Only the ``system=<name>`` queries made by the
+        synchronization cleanup are supported.
+
+        :return: The relative resource names of the matching Entries.
+        """
+        if not query.startswith(self.__SYSTEM_QUERY_PREFIX):
+            raise exceptions.InvalidArgument(f'Unsupported search query: {query}')
+
+        system = query[len(self.__SYSTEM_QUERY_PREFIX):].strip('"').casefold()
+        project_prefixes = tuple(f'projects/{project_id}/' for project_id in project_ids)
+        with self.__lock:
+            return [
+                name for name, entry in sorted(self.__entries.items())
+                if name.startswith(project_prefixes)
+                and entry.user_specified_system.casefold() == system
+            ]
+
+    def __get_request_error(self, method_name: str) -> exceptions.GoogleAPICallError:
+        if self.__requests_per_second:
+            window = int(time.monotonic())
+            if window != self.__quota_window:
+                self.__quota_window = window
+                self.__quota_window_count = 0
+            self.__quota_window_count += 1
+            if self.__quota_window_count > self.__requests_per_second:
+                return exceptions.ResourceExhausted(f'Quota exceeded: {method_name}')
+
+        injected_errors = self.__injected_errors.get(method_name)
+        if injected_errors:
+            return injected_errors.popleft()
+
+        if self.__error_rate and self.__random.random() < self.__error_rate:
+            return exceptions.ServiceUnavailable(f'Random error: {method_name}')
+
+    def __get_stored_entry(self, name: str) -> types.Entry:
+        entry = self.__entries.get(name)
+        if not entry:
+            # Data Catalog denies access to Entries that do not exist.
+            raise exceptions.PermissionDenied(f'Entry does not exist: {name}')
+        return entry
+
+    @classmethod
+    def __copy_entry(cls, entry: types.Entry) -> types.Entry:
+        entry_copy = types.Entry()
+        entry_copy.CopyFrom(entry)
+        return entry_copy
+
+    @classmethod
+    def __copy_entry_group(cls, entry_group: types.EntryGroup) -> types.EntryGroup:
+        entry_group_copy = types.EntryGroup()
+        entry_group_copy.CopyFrom(entry_group)
+        return entry_group_copy
+
+
+class FakeDataCatalogClient:
+    """
+    Data Catalog client backed by a ``FakeDataCatalogBackend``, with the same signatures as the
+    methods of ``DataCatalogClient`` used by the synchronization.
+    """
+    location_path = staticmethod(datacatalog.DataCatalogClient.location_path)
+    entry_group_path = staticmethod(datacatalog.DataCatalogClient.entry_group_path)
+    entry_path = staticmethod(datacatalog.DataCatalogClient.entry_path)
+
+    def __init__(self, backend: FakeDataCatalogBackend):
+        self.__backend = backend
+
+    def create_entry_group(self, parent, entry_group_id, entry_group=None, **kwargs):
+        self.__backend.handle_request('create_entry_group')
+        return self.__backend.create_entry_group(parent, entry_group_id)
+
+    def list_entry_groups(self, parent, page_size=None, **kwargs):
+        self.__backend.handle_request('list_entry_groups')
+        return self.__backend.list_entry_groups(parent)
+
+    def delete_entry_group(self, name, force=None, **kwargs):
+        self.__backend.handle_request('delete_entry_group')
+        self.__backend.delete_entry_group(name, bool(force))
+
+    def create_entry(self, parent, entry_id, entry, **kwargs):
+        self.__backend.handle_request('create_entry')
+        return self.__backend.create_entry(parent, entry_id, entry)
+
+    def get_entry(self, name, **kwargs):
+        self.__backend.handle_request('get_entry')
+        return self.__backend.get_entry(name)
+
+    def update_entry(self, entry, update_mask=None, **kwargs):
+        self.__backend.handle_request('update_entry')
+        return self.__backend.update_entry(entry)
+
+    def delete_entry(self, name, **kwargs):
+        self.__backend.handle_request('delete_entry')
+        self.__backend.delete_entry(name)
+
+    def search_catalog(self, scope, query, page_size=None, order_by=None, **kwargs):
+        self.__backend.handle_request('search_catalog')
+        results = []
+        for name in self.__backend.search_entry_names(scope.include_project_ids, query):
+            result = types.SearchCatalogResult()
+            result.relative_resource_name = name
+            results.append(result)
+        return results
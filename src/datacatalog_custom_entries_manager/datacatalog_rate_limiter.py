@@ -0,0 +1,154 @@
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Callable
+
+from google.api_core import exceptions
+
+
+class DataCatalogRateLimiter:
+    """
+    Token bucket shared by all the workers of a synchronization, that bounds the rate of Data
+    Catalog API requests and adapts it to quota errors.
+
+    When a request fails with ``RESOURCE_EXHAUSTED``, the rate is halved and the request is
+    retried after an exponential backoff with full jitter. Each successful request raises the
+    rate back linearly, so the throughput settles just under the quota instead of oscillating
+    between idle and throttled.
+    """
+    __BACKOFF_BASE_SECONDS = 0.5
+    __BACKOFF_MAX_SECONDS = 32.0
+    __DECREASE_FACTOR = 0.5
+    # The rate is decreased at most once per interval, since a single burst above the quota
+    # usually fails several concurrent requests.
+    __DECREASE_INTERVAL_SECONDS = 1.0
+    __MIN_RATE_FRACTION = 0.05
+    __RECOVERY_FRACTION_PER_SECOND = 0.05
+    # Refilling adds fractional tokens, so the bucket may stop a rounding error short of a
+    # whole one; waits shorter than the clock resolution would then never end.
+    __TOKEN_TOLERANCE = 1e-9
+    __MIN_WAIT_SECONDS = 0.001
+
+    def __init__(self, requests_per_second: float, max_retries: int = 5):
+        """
+        :param requests_per_second: The maximum rate of Data Catalog API requests.
+        :param max_retries: The maximum number of times a throttled request is retried.
+        """
+        if requests_per_second <= 0:
+            raise ValueError('The rate of requests must be a positive number.')
+
+        self.__max_rate = float(requests_per_second)
+        self.__min_rate = self.__max_rate * self.__MIN_RATE_FRACTION
+        self.__rate = self.__max_rate
+        # Allow bursts of up to one second worth of requests.
+        self.__capacity = max(1.0, self.__max_rate)
+        self.__tokens = self.__capacity
+        self.__max_retries = max_retries
+        self.__refilled_at = time.monotonic()
+        self.__decreased_at = None
+        self.__lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """The current rate of requests, in requests per second."""
+        return self.__rate
+
+    def acquire(self):
+        """
+        Wait until a request can be sent without exceeding the current rate.
+        """
+        while True:
+            with self.__lock:
+                self.__refill()
+                if self.__tokens >= 1 - self.__TOKEN_TOLERANCE:
+                    self.__tokens -= 1
+                    return
+                wait_seconds = max(self.__MIN_WAIT_SECONDS, (1 - self.__tokens) / self.__rate)
+            time.sleep(wait_seconds)
+
+    def call(self, function: Callable, *args, **kwargs):
+        """
+        Call a function that sends a Data Catalog API request, respecting the current rate and
+        retrying it when throttled.
+
+        :param function: The function to call.
+        :return: The function result.
+        :raises google.api_core.exceptions.TooManyRequests: If the request is still throttled
+            after ``max_retries`` retries.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                result = function(*args, **kwargs)
+            except exceptions.TooManyRequests:
+                self.__decrease_rate()
+                if attempt >= self.__max_retries:
+                    raise
+                backoff_seconds = self.__get_backoff_seconds(attempt)
+                logging.warning(
+                    'Data Catalog quota exceeded: retrying in %.2fs'
+                    ' (current rate: %.2f requests/s)...', backoff_seconds, self.__rate)
+                time.sleep(backoff_seconds)
+                attempt += 1
+                continue
+
+            self.__increase_rate()
+            return result
+
+    def __refill(self):
+        now = time.monotonic()
+        self.__tokens = min(self.__capacity,
+                            self.__tokens + (now - self.__refilled_at) * self.__rate)
+        self.__refilled_at = now
+
+    def __decrease_rate(self):
+        with self.__lock:
+            now = time.monotonic()
+            if self.__decreased_at is not None \
+                    and now - self.__decreased_at < self.__DECREASE_INTERVAL_SECONDS:
+                return
+
+            self.__refill()
+            self.__rate = max(self.__min_rate, self.__rate * self.__DECREASE_FACTOR)
+            # Drop the accumulated burst, so the new rate applies right away.
+            self.__tokens = min(self.__tokens, 0.0)
+            self.__decreased_at = now
+
+    def __increase_rate(self):
+        with self.__lock:
+            if self.__rate >= self.__max_rate:
+                return
+            # About ``rate`` requests succeed per second, so the rate grows by a fixed fraction
+            # of the maximum rate per second.
+            recovery = self.__max_rate * self.__RECOVERY_FRACTION_PER_SECOND / self.__rate
+            self.__rate = min(self.__max_rate, self.__rate + recovery)
+
+    @classmethod
+    def __get_backoff_seconds(cls, attempt: int) -> float:
+        return random.uniform(
+            0, min(cls.__BACKOFF_MAX_SECONDS, cls.__BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+class RateLimitedDataCatalogClient:
+    """
+    Proxy to a Data Catalog client that sends each API request through a rate limiter.
+    """
+
+    def __init__(self, client, rate_limiter: DataCatalogRateLimiter):
+        self.__client = client
+        self.__rate_limiter = rate_limiter
+
+    def __getattr__(self, name):
+        attribute = getattr(self.__client, name)
+        # Resource path helpers do not send requests.
+        if not callable(attribute) or name.endswith('_path'):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call_rate_limited(*args, **kwargs):
+            return self.__rate_limiter.call(attribute, *args, **kwargs)
+
+        return call_rate_limited
@@ -0,0 +1,40 @@
+import importlib
+from importlib import util
+import sys
+import types
+
+
+def load(name: str, package: str = None) -> types.ModuleType:
+    """
+    Import a module lazily: the returned module is only executed when one of its attributes is
+    first accessed, so the code paths that do not use it do not pay for its imports, such as
+    pandas or the Data Catalog client.
+
+    Like a regular import, the module is registered in ``sys.modules`` and in its parent
+    package, so it can still be patched by its full name. Python versions before 3.12 do not
+    lock the first attribute access, which should then be made by a single thread.
+
+    :param name: The module name, absolute or relative to ``package``.
+    :param package: The package to resolve relative names from, usually ``__package__``.
+    :return: The module, already executed if it was imported before.
+    """
+    absolute_name = util.resolve_name(name, package)
+    module = sys.modules.get(absolute_name)
+    if module:
+        return module
+
+    spec = util.find_spec(absolute_name)
+    if not spec:
+        raise ModuleNotFoundError(f'No module named {absolute_name!r}', name=absolute_name)
+
+    loader = util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = util.module_from_spec(spec)
+    sys.modules[absolute_name] = module
+    loader.exec_module(module)
+
+    parent_name, _, child_name = absolute_name.rpartition('.')
+    if parent_name:
+        setattr(importlib.import_module(parent_name), child_name, module)
+
+    return module
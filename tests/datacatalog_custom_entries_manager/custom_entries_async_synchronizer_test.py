@@ -0,0 +1,504 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud.datacatalog import types
+
+from datacatalog_custom_entries_manager import custom_entries_async_synchronizer, \
+    custom_entries_sync_state, custom_entries_sync_steps
+
+_MANAGER_PACKAGE = 'datacatalog_custom_entries_manager'
+
+
+@mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_csv_reader.CustomEntriesCSVReader')
+class AsyncCustomEntriesSynchronizerTest(unittest.TestCase):
+    __CLIENT_POOL = f'{_MANAGER_PACKAGE}.datacatalog_client_pool.DataCatalogClientPool'
+    __DATACATALOG_CLIENT = 'google.cloud.datacatalog.DataCatalogClient'
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory')
+    def setUp(self, mock_entry_factory):
+        self.__synchronizer = custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer(
+            'test-project', 'test-location', max_concurrency=4)
+        self.__entry_factory = mock_entry_factory.return_value
+        self.__entry_factory.make_entries_from_dicts.side_effect = self.__make_entries_from_dicts
+
+        # The Entry Groups are not resolved against a live Data Catalog.
+        resolve_patcher = mock.patch(f'{self.__CLIENT_POOL}.resolve_entry_groups')
+        self.__mock_resolve_entry_groups = resolve_patcher.start()
+        self.addCleanup(resolve_patcher.stop)
+
+    def test_constructor_should_set_instance_attributes(self, mock_csv_reader):
+        attrs = self.__synchronizer.__dict__
+
+        self.assertEqual('test-project', attrs['_AsyncCustomEntriesSynchronizer__project_id'])
+        self.assertEqual('test-location', attrs['_AsyncCustomEntriesSynchronizer__location_id'])
+        self.assertEqual(4, attrs['_AsyncCustomEntriesSynchronizer__max_concurrency'])
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_json_reader.CustomEntriesJSONReader')
+    def test_sync_to_file_json_file_path_should_call_json_reader(self, mock_json_reader,
+                                                                 mock_csv_reader):
+
+        mock_json_reader.read_file.return_value = []
+
+        self.__synchronizer.sync_to_file(json_file_path='file-path')
+
+        mock_csv_reader.read_file.assert_not_called()
+        mock_json_reader.read_file.assert_called_once_with('file-path')
+
+    def test_sync_to_file_stream_should_call_csv_reader_stream(self, mock_csv_reader):
+        mock_csv_reader.stream_file.return_value = iter([])
+
+        self.__synchronizer.sync_to_file(csv_file_path='file-path', stream=True)
+
+        mock_csv_reader.stream_file.assert_called_once_with('file-path')
+        mock_csv_reader.read_file.assert_not_called()
+
+    def test_sync_to_file_no_file_path_should_fail(self, mock_csv_reader):
+        self.assertRaises(Exception, self.__synchronizer.sync_to_file)
+
+    def test_sync_to_file_no_entry_group_id_should_do_nothing(self, mock_csv_reader):
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{}])]
+        self.assertEqual([[]], self.__synchronizer.sync_to_file(csv_file_path='file-path'))
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_should_resolve_entry_groups_upfront_unless_streaming(
+            self, mock_metadata_cleaner, mock_metadata_ingestor, mock_csv_reader):
+
+        entry_groups = [('TestSystem', [{
+            'id': 'testgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }])]
+        mock_csv_reader.read_file.return_value = entry_groups
+        mock_csv_reader.stream_file.return_value = iter(entry_groups)
+
+        self.__synchronizer.sync_to_file(csv_file_path='file-path')
+        self.__mock_resolve_entry_groups.assert_called_once_with(['testgroup'], 4)
+
+        self.__synchronizer.sync_to_file(csv_file_path='file-path', stream=True)
+        self.__mock_resolve_entry_groups.assert_called_once()
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_should_cleanup_before_ingesting(self, mock_metadata_cleaner,
+                                                          mock_metadata_ingestor, mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }])]
+
+        calls = []
+        cleaner = mock_metadata_cleaner.return_value
+        cleaner.delete_obsolete_metadata.side_effect = lambda *args: calls.append('cleanup')
+        ingestor = mock_metadata_ingestor.return_value
+        ingestor.ingest_metadata.side_effect = lambda *args: calls.append('ingest')
+
+        entries = self.__synchronizer.sync_to_file(csv_file_path='file-path')
+
+        self.assertEqual(['entry_1'], [entry.display_name for entry in entries[0]])
+        self.assertEqual(['cleanup', 'ingest'], calls)
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_no_entries_should_only_cleanup_catalog(self, mock_metadata_cleaner,
+                                                                 mock_metadata_ingestor,
+                                                                 mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{'id': 'testgroup'}])]
+
+        self.assertEqual([[]], self.__synchronizer.sync_to_file(csv_file_path='file-path'))
+
+        mock_metadata_cleaner.return_value.delete_obsolete_metadata.assert_called_once()
+        mock_metadata_ingestor.return_value.ingest_metadata.assert_not_called()
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_should_bound_concurrency_and_keep_order(self, mock_metadata_cleaner,
+                                                                  mock_metadata_ingestor,
+                                                                  mock_csv_reader):
+
+        mock_csv_reader.stream_file.return_value = iter([(f'TestSystem{index}', [{
+            'id':
+            f'testgroup{index}',
+            'entries': [{
+                'display_name': f'entry{index}'
+            }]
+        }]) for index in range(12)])
+
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def ingest_metadata(assembled_entries):
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+        mock_metadata_ingestor.return_value.ingest_metadata.side_effect = ingest_metadata
+
+        entries = self.__synchronizer.sync_to_file(csv_file_path='file-path', stream=True)
+
+        self.assertEqual([[f'entry{index}'] for index in range(12)],
+                         [[entry.display_name for entry in group] for group in entries])
+        self.assertLessEqual(max(max_in_flight), 4)
+        self.assertGreater(max(max_in_flight), 1)
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_same_system_should_not_overlap(self, mock_metadata_cleaner,
+                                                         mock_metadata_ingestor, mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup1',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }, {
+            'id':
+            'testgroup2',
+            'entries': [{
+                'display_name': 'entry_2'
+            }]
+        }])]
+
+        calls = []
+
+        def delete_obsolete_metadata(assembled_entries, query):
+            calls.append(('cleanup', assembled_entries[0].entry_id))
+            time.sleep(0.01)
+
+        mock_metadata_cleaner.return_value.delete_obsolete_metadata.side_effect = \
+            delete_obsolete_metadata
+        mock_metadata_ingestor.return_value.ingest_metadata.side_effect = \
+            lambda assembled_entries: calls.append(('ingest', assembled_entries[0].entry_id))
+
+        self.__synchronizer.sync_to_file(csv_file_path='file-path')
+
+        self.assertEqual([('cleanup', 'entry_1'), ('ingest', 'entry_1'), ('cleanup', 'entry_2'),
+                          ('ingest', 'entry_2')], calls)
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_same_entry_group_id_should_not_overlap(self, mock_metadata_cleaner,
+                                                                 mock_metadata_ingestor,
+                                                                 mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [
+            ('TestSystem1', [{
+                'id': 'testgroup',
+                'entries': [{
+                    'display_name': 'entry_1'
+                }]
+            }]),
+            ('TestSystem2', [{
+                'id': 'testgroup',
+                'entries': [{
+                    'display_name': 'entry_2'
+                }]
+            }]),
+        ]
+
+        calls = []
+
+        def delete_obsolete_metadata(assembled_entries, query):
+            calls.append(('cleanup', assembled_entries[0].entry_id))
+            time.sleep(0.01)
+
+        mock_metadata_cleaner.return_value.delete_obsolete_metadata.side_effect = \
+            delete_obsolete_metadata
+        mock_metadata_ingestor.return_value.ingest_metadata.side_effect = \
+            lambda assembled_entries: calls.append(('ingest', assembled_entries[0].entry_id))
+
+        self.__synchronizer.sync_to_file(csv_file_path='file-path')
+
+        self.assertEqual([('cleanup', 'entry_1'), ('ingest', 'entry_1'), ('cleanup', 'entry_2'),
+                          ('ingest', 'entry_2')], calls)
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_failed_entry_group_should_not_stop_others(self, mock_metadata_cleaner,
+                                                                    mock_metadata_ingestor,
+                                                                    mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup1',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }, {
+            'id':
+            'testgroup2',
+            'entries': [{
+                'display_name': 'entry_2'
+            }]
+        }])]
+
+        mock_metadata_cleaner.side_effect = self.__make_cleaner
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(
+                self.__synchronizer.async_sync_to_file(csv_file_path='file-path'))
+        finally:
+            loop.close()
+
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertIsNone(results[1].error)
+        mock_metadata_ingestor.return_value.ingest_metadata.assert_called_once()
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_failed_entry_group_after_wait_should_keep_system_order(
+            self, mock_metadata_cleaner, mock_metadata_ingestor, mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup1',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }, {
+            'id':
+            'testgroup2',
+            'entries': [{
+                'display_name': 'duplicated'
+            }, {
+                'display_name': 'duplicated'
+            }]
+        }, {
+            'id':
+            'testgroup3',
+            'entries': [{
+                'display_name': 'entry_3'
+            }]
+        }])]
+
+        calls = []
+
+        def delete_obsolete_metadata(assembled_entries, query):
+            time.sleep(0.01)
+            calls.append(('cleanup', assembled_entries[0].entry_id))
+
+        mock_metadata_cleaner.return_value.delete_obsolete_metadata.side_effect = \
+            delete_obsolete_metadata
+
+        entries = self.__synchronizer.sync_to_file(csv_file_path='file-path')
+
+        # The second Entry Group fails right away, but the third one still waits for the first.
+        self.assertEqual([], entries[1])
+        self.assertEqual([('cleanup', 'entry_1'), ('cleanup', 'entry_3')], calls)
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_raise_on_failure_should_raise_after_all_entry_groups(
+            self, mock_metadata_cleaner, mock_metadata_ingestor, mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [('TestSystem1', [{
+            'id':
+            'testgroup1',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }]), ('TestSystem2', [{
+            'id': 'testgroup2',
+            'entries': [{
+                'display_name': 'entry_2'
+            }]
+        }])]
+
+        mock_metadata_cleaner.side_effect = self.__make_cleaner
+
+        with self.assertRaises(custom_entries_sync_steps.EntryGroupSyncError) as context:
+            self.__synchronizer.sync_to_file(csv_file_path='file-path', raise_on_failure=True)
+
+        self.assertEqual(['testgroup1'],
+                         [result.group_id for result in context.exception.failed_results])
+        mock_metadata_ingestor.return_value.ingest_metadata.assert_called_once()
+
+    @mock.patch(f'{__DATACATALOG_CLIENT}.__init__', lambda self: None)
+    @mock.patch(f'{__DATACATALOG_CLIENT}.create_entry_group')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.update_entry')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.delete_entry')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_with_sync_state_should_only_send_changes(self, mock_metadata_cleaner,
+                                                                   mock_delete_entry,
+                                                                   mock_update_entry,
+                                                                   mock_create_entry_group,
+                                                                   mock_csv_reader):
+
+        with mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory',
+                        return_value=self.__entry_factory):
+            synchronizer = custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                sync_state=custom_entries_sync_state.CustomEntriesSyncState())
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }, {
+                'display_name': 'entry_2'
+            }, {
+                'display_name': 'entry_3'
+            }]
+        }])]
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        # Unchanged input: nothing is sent.
+        mock_update_entry.reset_mock()
+        synchronizer.sync_to_file(csv_file_path='file-path')
+        mock_update_entry.assert_not_called()
+
+        # Two Entries deleted, one of them failing.
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }])]
+        mock_delete_entry.side_effect = [None, exceptions.DeadlineExceeded('entry')]
+        entries = synchronizer.sync_to_file(csv_file_path='file-path')
+
+        self.assertEqual([], entries[0])
+        mock_update_entry.assert_not_called()
+        self.assertEqual(2, mock_delete_entry.call_count)
+
+        # One Entry created, and the failed deletion is sent again.
+        mock_delete_entry.reset_mock()
+        mock_delete_entry.side_effect = None
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }, {
+                'display_name': 'entry_4'
+            }]
+        }])]
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        mock_delete_entry.assert_called_once()
+        self.assertEqual('entry_4', mock_update_entry.call_args[1]['entry'].display_name)
+        mock_metadata_cleaner.return_value.delete_obsolete_metadata.assert_called_once()
+
+    @mock.patch(f'{__DATACATALOG_CLIENT}.__init__', lambda self: None)
+    @mock.patch(f'{__DATACATALOG_CLIENT}.create_entry_group')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.update_entry')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.delete_entry')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_with_sync_state_should_delete_removed_entry_groups(
+            self, mock_metadata_cleaner, mock_delete_entry, mock_update_entry,
+            mock_create_entry_group, mock_csv_reader):
+
+        with mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory',
+                        return_value=self.__entry_factory):
+            synchronizer = custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                sync_state=custom_entries_sync_state.CustomEntriesSyncState())
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup1',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }, {
+            'id':
+            'testgroup2',
+            'entries': [{
+                'display_name': 'entry_2'
+            }]
+        }])]
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        # The whole testgroup2 is dropped from the input.
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup1',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }])]
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        mock_delete_entry.assert_called_once_with(
+            name='projects/test-project/locations/test-location/'
+            'entryGroups/testgroup2/entries/entry_2')
+
+        # The removed Entry Group is forgotten, so its Entries are not deleted again.
+        mock_delete_entry.reset_mock()
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        mock_delete_entry.assert_not_called()
+        self.assertEqual(2, mock_metadata_cleaner.return_value.delete_obsolete_metadata.call_count)
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint')
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_resume_should_skip_completed_entry_groups(self, mock_metadata_cleaner,
+                                                                    mock_metadata_ingestor,
+                                                                    mock_checkpoint,
+                                                                    mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'completedgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }, {
+            'id':
+            'pendinggroup',
+            'entries': [{
+                'display_name': 'entry_2'
+            }]
+        }])]
+
+        checkpoint = mock_checkpoint.return_value
+        checkpoint.is_completed.side_effect = \
+            lambda system_name, group_id: group_id == 'completedgroup'
+
+        entries = self.__synchronizer.sync_to_file(csv_file_path='file-path',
+                                                   checkpoint_file_path='checkpoint-path',
+                                                   resume=True)
+
+        self.assertEqual([], entries[0])
+        self.assertEqual(1, len(entries[1]))
+        mock_checkpoint.assert_called_once_with('checkpoint-path', 'file-path', True)
+        checkpoint.mark_completed.assert_called_once_with('TestSystem', 'pendinggroup')
+
+    @classmethod
+    def __make_cleaner(cls, group_id):
+        cleaner = mock.MagicMock()
+        if group_id == 'testgroup1':
+            cleaner.delete_obsolete_metadata.side_effect = ValueError()
+        return cleaner
+
+    @classmethod
+    def __make_entries_from_dicts(cls, group_id, data_list):
+        entries = []
+        for data in data_list:
+            entry = types.Entry()
+            entry.name = f'projects/test-project/locations/test-location/' \
+                         f'entryGroups/{group_id}/entries/{data["display_name"]}'
+            entry.display_name = data['display_name']
+            entries.append((data['display_name'], entry))
+        return entries
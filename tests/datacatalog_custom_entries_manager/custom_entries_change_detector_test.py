@@ -0,0 +1,57 @@
+import unittest
+
+from google.cloud.datacatalog import types
+from google.datacatalog_connectors.commons import prepare
+
+from datacatalog_custom_entries_manager import custom_entries_change_detector
+
+
+class CustomEntriesChangeDetectorTest(unittest.TestCase):
+
+    def test_detect_changes_should_classify_entries(self):
+        unchanged_entry = self.__make_assembled_entry('unchanged', 'Unchanged')
+        modified_entry = self.__make_assembled_entry('modified', 'Modified')
+        created_entry = self.__make_assembled_entry('created', 'Created')
+
+        detector = custom_entries_change_detector.CustomEntriesChangeDetector
+        previous_fingerprints = {
+            'unchanged': detector.fingerprint_entry(unchanged_entry.entry),
+            'modified': 'outdated-fingerprint',
+            'deleted': 'deleted-fingerprint',
+        }
+
+        changes = detector.detect_changes([unchanged_entry, modified_entry, created_entry],
+                                          previous_fingerprints)
+
+        self.assertEqual([created_entry], changes.created)
+        self.assertEqual([modified_entry], changes.modified)
+        self.assertEqual([unchanged_entry], changes.unchanged)
+        self.assertEqual(['deleted'], changes.deleted_entry_ids)
+        self.assertEqual(['unchanged', 'modified', 'created'], list(changes.fingerprints))
+
+    def test_fingerprint_entry_should_be_stable(self):
+        detector = custom_entries_change_detector.CustomEntriesChangeDetector
+
+        entry_1 = self.__make_assembled_entry('test', 'Test').entry
+        entry_2 = self.__make_assembled_entry('test', 'Test').entry
+
+        self.assertEqual(detector.fingerprint_entry(entry_1), detector.fingerprint_entry(entry_2))
+
+    def test_fingerprint_entry_should_change_on_field_change(self):
+        detector = custom_entries_change_detector.CustomEntriesChangeDetector
+
+        entry = self.__make_assembled_entry('test', 'Test').entry
+        fingerprint = detector.fingerprint_entry(entry)
+
+        entry.source_system_timestamps.update_time.seconds = 1602361590
+
+        self.assertNotEqual(fingerprint, detector.fingerprint_entry(entry))
+
+    @classmethod
+    def __make_assembled_entry(cls, entry_id, display_name):
+        entry = types.Entry()
+        entry.linked_resource = f'//test/{entry_id}'
+        entry.display_name = display_name
+        entry.user_specified_type = 'test_type'
+        entry.user_specified_system = 'TestSystem'
+        return prepare.AssembledEntryData(entry_id, entry)
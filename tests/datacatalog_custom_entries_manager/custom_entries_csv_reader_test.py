@@ -4,7 +4,8 @@ from unittest import mock
 
 import pandas as pd
 
-from datacatalog_custom_entries_manager import custom_entries_csv_reader
+from datacatalog_custom_entries_manager import custom_entries_csv_reader, custom_entries_filter, \
+    custom_entries_record
 
 
 @mock.patch('datacatalog_custom_entries_manager.custom_entries_csv_reader.pd.read_csv')
@@ -64,8 +65,8 @@ class CustomEntriesCSVReaderTest(unittest.TestCase):
                 'linked_resource': ['//test/linked-resource-1', '//test/linked-resource-2'],
             })
 
-        self.assertRaises(KeyError, custom_entries_csv_reader.CustomEntriesCSVReader.read_file,
-                          'file-path')
+        with self.assertRaisesRegex(KeyError, 'user_specified_system is missing at row 2'):
+            custom_entries_csv_reader.CustomEntriesCSVReader.read_file('file-path')
 
     def test_read_file_missing_mandatory_column_should_set_nan_entry_field(self, mock_read_csv):
         mock_read_csv.return_value = pd.DataFrame(data={
@@ -130,3 +131,249 @@ class CustomEntriesCSVReaderTest(unittest.TestCase):
         entry = groups[0]['entries'][0]
 
         self.assertEqual('Test description', entry['description'])
+
+    def test_read_file_provided_timestamps_should_set_entry_fields(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'user_specified_system': ['TestSystem'],
+                'group_id': ['testgroup'],
+                'linked_resource': ['//test/linked-resource'],
+                'created_at': ['2020-09-04T16:19:43-0300'],
+                'updated_at': ['2020-09-04T16:25:26-03:00'],
+            })
+
+        assembled_entry_groups = \
+            custom_entries_csv_reader.CustomEntriesCSVReader.read_file('file-path')
+
+        _, groups = assembled_entry_groups[0]
+        entry = groups[0]['entries'][0]
+
+        self.assertEqual(1599247183, entry['created_at'])
+        self.assertEqual(1599247526, entry['updated_at'])
+
+    def test_read_file_invalid_timestamp_should_fail(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'user_specified_system': ['TestSystem', 'TestSystem'],
+                'group_id': ['testgroup', 'testgroup'],
+                'linked_resource': ['//test/linked-resource-1', '//test/linked-resource-2'],
+                'created_at': ['2020-09-04T16:19:43-0300', '2020-09-04'],
+            })
+
+        with self.assertRaisesRegex(ValueError, 'created_at in row 3'):
+            custom_entries_csv_reader.CustomEntriesCSVReader.read_file('file-path')
+
+    def test_read_file_should_slice_entry_group_columns(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'user_specified_system': ['TestSystem', 'TestSystem'],
+                'group_id': ['testgroup1', 'testgroup2'],
+                'linked_resource': ['//test/linked-resource-1', '//test/linked-resource-2'],
+            })
+
+        assembled_entry_groups = \
+            custom_entries_csv_reader.CustomEntriesCSVReader.read_file('file-path')
+
+        _, groups = assembled_entry_groups[0]
+        entries_1 = groups[0]['entries']
+        entries_2 = groups[1]['entries']
+        self.assertIsInstance(entries_1, custom_entries_record.CustomEntryColumns)
+        self.assertEqual(['//test/linked-resource-1'], entries_1.linked_resources.tolist())
+        self.assertEqual(['//test/linked-resource-2'], entries_2.linked_resources.tolist())
+        self.assertEqual([0], entries_1.created_at.tolist())
+        self.assertIs(entries_1.linked_resources.base, entries_2.linked_resources.base)
+
+    def test_read_file_non_contiguous_rows_should_keep_first_appearance_order(self, mock_read_csv):
+
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'user_specified_system': ['TestSystem1', 'TestSystem2', 'TestSystem1'],
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup3'],
+                'linked_resource': [
+                    '//test/linked-resource-1', '//test/linked-resource-2',
+                    '//test/linked-resource-3'
+                ],
+            })
+
+        assembled_entry_groups = \
+            custom_entries_csv_reader.CustomEntriesCSVReader.read_file('file-path')
+
+        self.assertEqual(['TestSystem1', 'TestSystem2'],
+                         [system for system, _ in assembled_entry_groups])
+
+        _, groups_system_1 = assembled_entry_groups[0]
+        self.assertEqual(['testgroup1', 'testgroup3'], [group['id'] for group in groups_system_1])
+        self.assertEqual('//test/linked-resource-3',
+                         groups_system_1[1]['entries'][0]['linked_resource'])
+        self.assertEqual('row 4', groups_system_1[1]['entries'][0]['source'])
+
+    def test_read_file_split_entry_group_should_gather_rows(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'user_specified_system': ['TestSystem1', 'TestSystem2', 'TestSystem1'],
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup1'],
+                'linked_resource': [
+                    '//test/linked-resource-1', '//test/linked-resource-2',
+                    '//test/linked-resource-3'
+                ],
+            })
+
+        assembled_entry_groups = \
+            custom_entries_csv_reader.CustomEntriesCSVReader.read_file('file-path')
+
+        _, groups_system_1 = assembled_entry_groups[0]
+        entries = groups_system_1[0]['entries']
+        self.assertEqual(['//test/linked-resource-1', '//test/linked-resource-3'],
+                         [entry['linked_resource'] for entry in entries])
+        self.assertEqual(['row 2', 'row 4'],
+                         custom_entries_record.CustomEntryColumns.get_sources(entries))
+
+    def test_read_file_entries_filter_should_drop_unselected_rows(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'user_specified_system': ['TestSystem1', math.nan, 'TestSystem2', math.nan],
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup3', math.nan],
+                'linked_resource': [f'//test/linked-resource-{index}' for index in range(4)],
+            })
+
+        assembled_entry_groups = custom_entries_csv_reader.CustomEntriesCSVReader.read_file(
+            'file-path',
+            custom_entries_filter.CustomEntriesFilter(include_systems=('TestSystem*', ),
+                                                      exclude_groups=('testgroup1', )))
+
+        self.assertEqual([('TestSystem1', ['testgroup2']), ('TestSystem2', ['testgroup3'])],
+                         [(system, [group['id'] for group in groups])
+                          for system, groups in assembled_entry_groups])
+        # The values are filled before the rows are dropped, and the rows keep their numbers.
+        _, groups_system_2 = assembled_entry_groups[1]
+        self.assertEqual(['row 4', 'row 5'],
+                         custom_entries_record.CustomEntryColumns.get_sources(
+                             groups_system_2[0]['entries']))
+
+    def test_stream_file_should_yield_one_entry_group_at_a_time(self, mock_read_csv):
+        mock_read_csv.return_value = [
+            pd.DataFrame(
+                data={
+                    'user_specified_system': ['TestSystem1', math.nan, 'TestSystem2'],
+                    'group_id': ['testgroup1', math.nan, 'testgroup2'],
+                    'linked_resource': [
+                        '//test/linked-resource-1', '//test/linked-resource-2',
+                        '//test/linked-resource-3'
+                    ],
+                    'description': ['Test description', math.nan, math.nan],
+                })
+        ]
+
+        assembled_entry_groups = \
+            custom_entries_csv_reader.CustomEntriesCSVReader.stream_file('file-path')
+
+        system_1, groups_system_1 = next(assembled_entry_groups)
+        self.assertEqual('TestSystem1', system_1)
+        self.assertEqual(1, len(groups_system_1))
+        self.assertEqual('testgroup1', groups_system_1[0]['id'])
+        self.assertEqual(2, len(groups_system_1[0]['entries']))
+        self.assertEqual('Test description', groups_system_1[0]['entries'][0]['description'])
+        self.assertFalse('description' in groups_system_1[0]['entries'][1])
+        self.assertEqual('row 3', groups_system_1[0]['entries'][1]['source'])
+
+        system_2, groups_system_2 = next(assembled_entry_groups)
+        self.assertEqual('TestSystem2', system_2)
+        self.assertEqual('testgroup2', groups_system_2[0]['id'])
+
+        self.assertRaises(StopIteration, next, assembled_entry_groups)
+
+    def test_stream_file_should_fill_values_across_chunks(self, mock_read_csv):
+        mock_read_csv.return_value = [
+            pd.DataFrame(
+                data={
+                    'user_specified_system': ['TestSystem'],
+                    'group_id': ['testgroup'],
+                    'linked_resource': ['//test/linked-resource-1'],
+                }),
+            pd.DataFrame(),
+            pd.DataFrame(
+                data={
+                    'user_specified_system': [math.nan],
+                    'group_id': [math.nan],
+                    'linked_resource': ['//test/linked-resource-2'],
+                }),
+        ]
+
+        assembled_entry_groups = list(
+            custom_entries_csv_reader.CustomEntriesCSVReader.stream_file('file-path',
+                                                                         chunk_size=1))
+
+        self.assertEqual(1, len(assembled_entry_groups))
+
+        system, groups = assembled_entry_groups[0]
+        entries = groups[0]['entries']
+
+        self.assertEqual('TestSystem', system)
+        self.assertEqual(2, len(entries))
+        self.assertEqual('TestSystem', entries[1]['user_specified_system'])
+        mock_read_csv.assert_called_once_with('file-path', chunksize=1)
+
+    def test_stream_file_entries_filter_should_skip_entry_groups(self, mock_read_csv):
+        mock_read_csv.return_value = [
+            pd.DataFrame(
+                data={
+                    'user_specified_system': ['TestSystem', math.nan],
+                    'group_id': ['testgroup1', 'testgroup2'],
+                    'linked_resource': ['//test/linked-resource-1', '//test/linked-resource-2'],
+                }),
+            pd.DataFrame(
+                data={
+                    'user_specified_system': [math.nan],
+                    'group_id': ['testgroup3'],
+                    'linked_resource': ['//test/linked-resource-3'],
+                },
+                # Chunks keep the row indexes of the file.
+                index=[2]),
+        ]
+
+        assembled_entry_groups = list(
+            custom_entries_csv_reader.CustomEntriesCSVReader.stream_file(
+                'file-path',
+                custom_entries_filter.CustomEntriesFilter(include_systems=('TestSystem', ),
+                                                          exclude_groups=('testgroup2', )),
+                chunk_size=2))
+
+        self.assertEqual([('TestSystem', 'testgroup1'), ('TestSystem', 'testgroup3')],
+                         [(system, groups[0]['id']) for system, groups in assembled_entry_groups])
+        self.assertEqual('row 4', assembled_entry_groups[1][1][0]['entries'][0]['source'])
+
+    def test_stream_file_non_contiguous_entry_group_should_fail(self, mock_read_csv):
+        mock_read_csv.return_value = [
+            pd.DataFrame(
+                data={
+                    'user_specified_system': ['TestSystem', 'TestSystem', 'TestSystem'],
+                    'group_id': ['testgroup1', 'testgroup2', 'testgroup1'],
+                    'linked_resource': [
+                        '//test/linked-resource-1', '//test/linked-resource-2',
+                        '//test/linked-resource-3'
+                    ],
+                })
+        ]
+
+        assembled_entry_groups = \
+            custom_entries_csv_reader.CustomEntriesCSVReader.stream_file('file-path')
+
+        self.assertRaises(ValueError, list, assembled_entry_groups)
+
+    def test_stream_file_missing_key_values_should_set_none(self, mock_read_csv):
+        mock_read_csv.return_value = [
+            pd.DataFrame(
+                data={
+                    'user_specified_system': [math.nan],
+                    'group_id': [math.nan],
+                    'linked_resource': ['//test/linked-resource'],
+                })
+        ]
+
+        assembled_entry_groups = list(
+            custom_entries_csv_reader.CustomEntriesCSVReader.stream_file('file-path'))
+
+        system, groups = assembled_entry_groups[0]
+
+        self.assertIsNone(system)
+        self.assertIsNone(groups[0]['id'])
@@ -0,0 +1,48 @@
+import math
+import unittest
+
+from datacatalog_custom_entries_manager import custom_entries_filter
+
+
+class CustomEntriesFilterTest(unittest.TestCase):
+
+    def test_no_patterns_should_match_everything(self):
+        entries_filter = custom_entries_filter.CustomEntriesFilter()
+
+        self.assertTrue(entries_filter.matches('TestSystem', 'testgroup'))
+        self.assertFalse(any(entries_filter))
+
+    def test_include_patterns_should_match_any_glob(self):
+        entries_filter = custom_entries_filter.CustomEntriesFilter(
+            include_systems=('Test*', 'Other'), include_groups=('testgroup[12]', ))
+
+        self.assertTrue(entries_filter.matches('TestSystem', 'testgroup1'))
+        self.assertTrue(entries_filter.matches('Other', 'testgroup2'))
+        self.assertFalse(entries_filter.matches('OtherSystem', 'testgroup1'))
+        self.assertFalse(entries_filter.matches('TestSystem', 'testgroup3'))
+        # Names are matched case-sensitively.
+        self.assertFalse(entries_filter.matches_system('testsystem'))
+
+    def test_exclude_patterns_should_take_precedence(self):
+        entries_filter = custom_entries_filter.CustomEntriesFilter(
+            include_systems=('Test*', ),
+            exclude_systems=('TestSystem2', ),
+            exclude_groups=('tmp_*', ))
+
+        self.assertEqual(['TestSystem1'],
+                         entries_filter.select_systems(['TestSystem1', 'TestSystem2', 'Other']))
+        self.assertEqual(['testgroup'], entries_filter.select_groups(['testgroup', 'tmp_group']))
+
+    def test_missing_names_should_be_selected(self):
+        entries_filter = custom_entries_filter.CustomEntriesFilter(include_systems=('Test*', ),
+                                                                   include_groups=('test*', ))
+
+        self.assertTrue(entries_filter.matches(None, math.nan))
+
+    def test_get_literal_prefix_should_stop_at_first_wildcard(self):
+        get_literal_prefix = custom_entries_filter.CustomEntriesFilter.get_literal_prefix
+
+        self.assertEqual('TestSystem', get_literal_prefix('TestSystem'))
+        self.assertEqual('Test', get_literal_prefix('Test*System?'))
+        self.assertEqual('testgroup', get_literal_prefix('testgroup[12]'))
+        self.assertEqual('', get_literal_prefix('?estSystem'))
@@ -0,0 +1,196 @@
+import unittest
+
+from google.cloud.datacatalog import types
+from google.datacatalog_connectors.commons import prepare
+
+from datacatalog_custom_entries_manager import custom_entries_id_validator, \
+    datacatalog_entry_factory
+
+
+class CustomEntriesIDValidatorTest(unittest.TestCase):
+    __ENTRY_GROUP_NAME = 'projects/test-project/locations/test-location/entryGroups/test-group'
+
+    def test_find_issues_unique_ids_should_return_empty_list(self):
+        assembled_entries = [
+            self.__make_assembled_entry('entry_1'),
+            self.__make_assembled_entry('entry_2'),
+        ]
+
+        issues = custom_entries_id_validator.CustomEntriesIDValidator.find_issues(
+            assembled_entries, ['row 2', 'row 3'])
+
+        self.assertEqual([], issues)
+
+    def test_find_issues_duplicate_ids_should_report_all_sources(self):
+        assembled_entries = [
+            self.__make_assembled_entry('entry_1'),
+            self.__make_assembled_entry('entry_2'),
+            self.__make_assembled_entry('entry_1'),
+        ]
+
+        issues = custom_entries_id_validator.CustomEntriesIDValidator.find_issues(
+            assembled_entries, ['row 2', 'row 3', 'row 4'])
+
+        self.assertEqual(1, len(issues))
+        self.assertEqual('entry_1', issues[0].entry_id)
+        self.assertEqual('duplicated', issues[0].reason)
+        self.assertEqual(['row 2', 'row 4'], issues[0].sources)
+
+    def test_find_issues_over_length_id_should_report_source(self):
+        entry_id = 'e' * 65
+        assembled_entries = [self.__make_assembled_entry(entry_id)]
+
+        issues = custom_entries_id_validator.CustomEntriesIDValidator.find_issues(
+            assembled_entries, ['$.userSpecifiedSystems[0].entryGroups[0].entries[0]'])
+
+        self.assertEqual(1, len(issues))
+        self.assertEqual('longer than 64 characters', issues[0].reason)
+        self.assertEqual(['$.userSpecifiedSystems[0].entryGroups[0].entries[0]'],
+                         issues[0].sources)
+
+    def test_find_issues_truncated_ids_should_report_duplicates(self):
+        assembled_entries = self.__make_factory_entries(
+            [f'Test display name {"x" * 64} 1', f'Test display name {"x" * 64} 2'])
+
+        issues = custom_entries_id_validator.CustomEntriesIDValidator.find_issues(
+            assembled_entries, ['row 2', 'row 3'])
+
+        self.assertEqual(1, len(issues))
+        self.assertEqual('duplicated', issues[0].reason)
+        self.assertEqual(['row 2', 'row 3'], issues[0].sources)
+
+    def test_find_issues_missing_sources_should_report_entry_indexes(self):
+        assembled_entries = [
+            self.__make_assembled_entry('entry_1'),
+            self.__make_assembled_entry('entry_1'),
+        ]
+
+        issues = custom_entries_id_validator.CustomEntriesIDValidator.find_issues(
+            assembled_entries, [])
+
+        self.assertEqual(['entries[0]', 'entries[1]'], issues[0].sources)
+
+    def test_validate_entries_with_issues_should_raise_value_error(self):
+        assembled_entries = [
+            self.__make_assembled_entry('entry_1'),
+            self.__make_assembled_entry('entry_1'),
+        ]
+
+        with self.assertRaises(ValueError) as context:
+            custom_entries_id_validator.CustomEntriesIDValidator.validate_entries(
+                'test-group', assembled_entries, ['row 2', 'row 3'])
+
+        self.assertIn('test-group', str(context.exception))
+        self.assertIn('entry_1 is duplicated: row 2, row 3', str(context.exception))
+
+    def test_validate_entries_truncated_id_should_only_log_warning(self):
+        assembled_entries = self.__make_factory_entries([f'Test display name {"x" * 64}'])
+
+        with self.assertLogs(level='WARNING') as logs:
+            validated_entries = \
+                custom_entries_id_validator.CustomEntriesIDValidator.validate_entries(
+                    'test-group', assembled_entries, ['row 2'])
+
+        self.assertEqual(assembled_entries, validated_entries)
+        self.assertIn('may have been truncated to 64 characters (row 2)', logs.output[0])
+
+    def test_validate_entries_disambiguate_should_rename_duplicates(self):
+        assembled_entries = [
+            self.__make_assembled_entry('entry_1', '//test/linked-resource-1'),
+            self.__make_assembled_entry('entry_1', '//test/linked-resource-2'),
+        ]
+
+        validated_entries = \
+            custom_entries_id_validator.CustomEntriesIDValidator.validate_entries(
+                'test-group', assembled_entries, ['row 2', 'row 3'], disambiguate=True)
+
+        self.assertEqual('entry_1', validated_entries[0].entry_id)
+
+        renamed_entry_id = validated_entries[1].entry_id
+        self.assertRegex(renamed_entry_id, r'^entry_1_[0-9a-f]{8}$')
+        self.assertEqual(f'{self.__ENTRY_GROUP_NAME}/entries/{renamed_entry_id}',
+                         validated_entries[1].entry.name)
+
+    def test_validate_entries_disambiguate_should_be_deterministic(self):
+
+        def make_assembled_entries():
+            return [
+                self.__make_assembled_entry('entry_1', '//test/linked-resource-1'),
+                self.__make_assembled_entry('entry_1', '//test/linked-resource-2'),
+            ]
+
+        validator = custom_entries_id_validator.CustomEntriesIDValidator
+        first_run = validator.validate_entries('test-group',
+                                               make_assembled_entries(), [],
+                                               disambiguate=True)
+        second_run = validator.validate_entries('test-group',
+                                                make_assembled_entries(), [],
+                                                disambiguate=True)
+
+        self.assertEqual([entry.entry_id for entry in first_run],
+                         [entry.entry_id for entry in second_run])
+
+    def test_validate_entries_disambiguate_should_not_depend_on_input_order(self):
+        assembled_entries = [
+            self.__make_assembled_entry('entry_1', '//test/linked-resource-2'),
+            self.__make_assembled_entry('entry_1', '//test/linked-resource-1'),
+        ]
+
+        validator = custom_entries_id_validator.CustomEntriesIDValidator
+        validated_entries = validator.validate_entries('test-group',
+                                                       assembled_entries, [],
+                                                       disambiguate=True)
+        reversed_entries = validator.validate_entries('test-group',
+                                                      list(reversed(assembled_entries)), [],
+                                                      disambiguate=True)
+
+        def index_by_linked_resource(entries):
+            return {entry.entry.linked_resource: entry.entry_id for entry in entries}
+
+        self.assertEqual(index_by_linked_resource(validated_entries),
+                         index_by_linked_resource(reversed_entries))
+        self.assertEqual('entry_1', validated_entries[1].entry_id)
+
+    def test_validate_entries_disambiguate_should_truncate_over_length_ids(self):
+        assembled_entries = [self.__make_assembled_entry('e' * 80)]
+
+        validated_entries = \
+            custom_entries_id_validator.CustomEntriesIDValidator.validate_entries(
+                'test-group', assembled_entries, [], disambiguate=True)
+
+        self.assertEqual(64, len(validated_entries[0].entry_id))
+
+    def test_validate_entries_disambiguate_same_linked_resource_should_raise_value_error(self):
+        assembled_entries = [
+            self.__make_assembled_entry('entry_1'),
+            self.__make_assembled_entry('entry_1'),
+            self.__make_assembled_entry('entry_1'),
+        ]
+
+        self.assertRaises(ValueError,
+                          custom_entries_id_validator.CustomEntriesIDValidator.validate_entries,
+                          'test-group',
+                          assembled_entries, [],
+                          disambiguate=True)
+
+    @classmethod
+    def __make_factory_entries(cls, display_names):
+        entry_factory = datacatalog_entry_factory.DataCatalogEntryFactory(
+            'test-project', 'test-location')
+        return [
+            prepare.AssembledEntryData(entry_id, entry)
+            for entry_id, entry in entry_factory.make_entries_from_dicts(
+                'test-group', [{
+                    'linked_resource': f'//test/linked-resource-{index}',
+                    'display_name': display_name,
+                    'user_specified_type': 'test_type',
+                    'user_specified_system': 'TestSystem',
+                } for index, display_name in enumerate(display_names)])
+        ]
+
+    @classmethod
+    def __make_assembled_entry(cls, entry_id, linked_resource='//test/linked-resource'):
+        entry = types.Entry()
+        entry.name = f'{cls.__ENTRY_GROUP_NAME}/entries/{entry_id}'
+        entry.linked_resource = linked_resource
+        return prepare.AssembledEntryData(entry_id, entry)
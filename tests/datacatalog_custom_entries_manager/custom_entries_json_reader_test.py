@@ -2,7 +2,9 @@ import io
 import unittest
 from unittest import mock
 
-from datacatalog_custom_entries_manager import custom_entries_json_reader
+import ijson
+
+from datacatalog_custom_entries_manager import custom_entries_filter, custom_entries_json_reader
 
 
 @mock.patch('datacatalog_custom_entries_manager.custom_entries_json_reader.open',
@@ -55,6 +57,7 @@ class CustomEntriesJSONReaderTest(unittest.TestCase):
 
         self.assertEqual('TestSystem1', entry_1['user_specified_system'])
         self.assertEqual('TestSystem2', entry_2['user_specified_system'])
+        self.assertEqual('$.userSpecifiedSystems[1].entryGroups[0].entries[0]', entry_2['source'])
 
     def test_read_file_missing_key_field_should_fail(self, mock_open):
         mock_open.return_value = io.StringIO('{ \"specifiedSystems\": [] }')
@@ -112,3 +115,182 @@ class CustomEntriesJSONReaderTest(unittest.TestCase):
         entry = groups[0]['entries'][0]
 
         self.assertEqual('Test description', entry['description'])
+
+    def test_read_file_entries_filter_should_skip_entry_groups(self, mock_open):
+        mock_open.return_value = io.StringIO('''
+            {
+              \"userSpecifiedSystems\": [{
+                \"name\": \"OtherSystem\",
+                \"entryGroups\": [{ \"id\": \"testgroup1\", \"entries\": [] }]
+              }, {
+                \"name\": \"TestSystem\",
+                \"entryGroups\": [{
+                  \"id\": \"testgroup2\",
+                  \"entries\": []
+                }, {
+                  \"id\": \"testgroup3\",
+                  \"entries\": [{
+                    \"linkedResource\": \"//test/linked-resource\",
+                    \"displayName\": \"Display name\",
+                    \"type\": \"test_type\"
+                  }]
+                }]
+              }]
+            }
+            ''')
+
+        assembled_entry_groups = custom_entries_json_reader.CustomEntriesJSONReader.read_file(
+            'file-path',
+            custom_entries_filter.CustomEntriesFilter(include_groups=('testgroup*', ),
+                                                      exclude_systems=('Other*', ),
+                                                      exclude_groups=('testgroup2', )))
+
+        self.assertEqual(1, len(assembled_entry_groups))
+        system, groups = assembled_entry_groups[0]
+        self.assertEqual('TestSystem', system)
+        self.assertEqual(['testgroup3'], [group['id'] for group in groups])
+        self.assertEqual('$.userSpecifiedSystems[1].entryGroups[1].entries[0]',
+                         groups[0]['entries'][0]['source'])
+
+    def test_stream_file_should_yield_one_entry_group_at_a_time(self, mock_open):
+        mock_open.return_value = io.BytesIO(b'''
+            {
+              \"userSpecifiedSystems\": [{
+                \"name\": \"TestSystem1\",
+                \"entryGroups\": [{
+                  \"id\": \"testgroup1\",
+                  \"entries\": [{
+                    \"linkedResource\": \"//test/linked-resource-1\",
+                    \"displayName\": \"Display name 1\",
+                    \"type\": \"test_type\",
+                    \"labels\": {\"test\": \"test\"}
+                  }]
+                }, {
+                  \"id\": \"testgroup2\",
+                  \"entries\": []
+                }]
+              }, {
+                \"name\": \"TestSystem2\",
+                \"entryGroups\": [{
+                  \"id\": \"testgroup3\",
+                  \"entries\": [{
+                    \"linkedResource\": \"//test/linked-resource-2\",
+                    \"displayName\": \"Display name 2\",
+                    \"description\": \"Test description\",
+                    \"type\": \"test_type\"
+                  }]
+                }]
+              }]
+            }
+            ''')
+
+        assembled_entry_groups = \
+            custom_entries_json_reader.CustomEntriesJSONReader.stream_file('file-path')
+
+        system_1, groups_1 = next(assembled_entry_groups)
+        self.assertEqual('TestSystem1', system_1)
+        self.assertEqual(1, len(groups_1))
+        self.assertEqual('testgroup1', groups_1[0]['id'])
+        self.assertEqual('TestSystem1', groups_1[0]['entries'][0]['user_specified_system'])
+
+        system_2, groups_2 = next(assembled_entry_groups)
+        self.assertEqual('TestSystem1', system_2)
+        self.assertEqual('testgroup2', groups_2[0]['id'])
+        self.assertEqual([], groups_2[0]['entries'])
+
+        system_3, groups_3 = next(assembled_entry_groups)
+        self.assertEqual('TestSystem2', system_3)
+        self.assertEqual('Test description', groups_3[0]['entries'][0]['description'])
+        self.assertEqual('$.userSpecifiedSystems[1].entryGroups[0].entries[0]',
+                         groups_3[0]['entries'][0]['source'])
+
+        self.assertRaises(StopIteration, next, assembled_entry_groups)
+
+    def test_stream_file_system_name_after_entry_groups_should_succeed(self, mock_open):
+        mock_open.return_value = io.BytesIO(b'''
+            {
+              \"userSpecifiedSystems\": [{
+                \"entryGroups\": [{
+                  \"entries\": [{
+                    \"linkedResource\": \"//test/linked-resource\",
+                    \"displayName\": \"Display name\",
+                    \"type\": \"test_type\"
+                  }],
+                  \"id\": \"testgroup\"
+                }],
+                \"name\": \"TestSystem\"
+              }]
+            }
+            ''')
+
+        assembled_entry_groups = list(
+            custom_entries_json_reader.CustomEntriesJSONReader.stream_file('file-path'))
+
+        self.assertEqual(1, len(assembled_entry_groups))
+
+        system, groups = assembled_entry_groups[0]
+        self.assertEqual('TestSystem', system)
+        self.assertEqual('testgroup', groups[0]['id'])
+        self.assertEqual('TestSystem', groups[0]['entries'][0]['user_specified_system'])
+
+    def test_stream_file_entries_filter_should_skip_entries_of_skipped_groups(self, mock_open):
+        mock_open.return_value = io.BytesIO(b'''
+            {
+              \"userSpecifiedSystems\": [{
+                \"entryGroups\": [{
+                  \"entries\": [{ \"linkedResource\": \"//test/linked-resource-1\" }],
+                  \"id\": \"testgroup1\"
+                }],
+                \"name\": \"TestSystem\"
+              }, {
+                \"name\": \"TestSystem\",
+                \"entryGroups\": [{
+                  \"id\": \"testgroup2\",
+                  \"entries\": [{ \"linkedResource\": \"//test/linked-resource-2\" }]
+                }, {
+                  \"id\": \"testgroup3\",
+                  \"entries\": [{
+                    \"linkedResource\": \"//test/linked-resource-3\",
+                    \"displayName\": \"Display name\",
+                    \"type\": \"test_type\"
+                  }]
+                }]
+              }, {
+                \"name\": \"OtherSystem\",
+                \"entryGroups\": [{
+                  \"id\": \"testgroup3\",
+                  \"entries\": [{ \"linkedResource\": \"//test/linked-resource-4\" }]
+                }]
+              }]
+            }
+            ''')
+
+        with mock.patch.object(custom_entries_json_reader.ijson,
+                               'ObjectBuilder',
+                               wraps=ijson.ObjectBuilder) as mock_object_builder:
+
+            assembled_entry_groups = list(
+                custom_entries_json_reader.CustomEntriesJSONReader.stream_file(
+                    'file-path',
+                    custom_entries_filter.CustomEntriesFilter(include_systems=('TestSystem', ),
+                                                              include_groups=('testgroup3', ))))
+
+        self.assertEqual(1, len(assembled_entry_groups))
+        system, groups = assembled_entry_groups[0]
+        self.assertEqual('TestSystem', system)
+        self.assertEqual('//test/linked-resource-3', groups[0]['entries'][0]['linked_resource'])
+        # Only the Entries read before the name of their Entry Group are built to be dropped.
+        self.assertEqual(2, mock_object_builder.call_count)
+
+    def test_stream_file_missing_key_field_should_fail(self, mock_open):
+        mock_open.return_value = io.BytesIO(b'{ \"specifiedSystems\": [] }')
+
+        self.assertRaises(KeyError, list,
+                          custom_entries_json_reader.CustomEntriesJSONReader.stream_file('path'))
+
+    def test_stream_file_missing_system_name_should_fail(self, mock_open):
+        mock_open.return_value = io.BytesIO(
+            b'{ \"userSpecifiedSystems\": [{ \"entryGroups\": [] }] }')
+
+        self.assertRaises(KeyError, list,
+                          custom_entries_json_reader.CustomEntriesJSONReader.stream_file('path'))
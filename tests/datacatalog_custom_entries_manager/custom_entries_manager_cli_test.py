@@ -2,7 +2,8 @@ import unittest
 from unittest import mock
 
 import datacatalog_custom_entries_manager
-from datacatalog_custom_entries_manager import custom_entries_manager_cli
+from datacatalog_custom_entries_manager import custom_entries_filter, custom_entries_manager_cli, \
+    custom_entries_planner, custom_entries_sync_steps
 
 
 class CustomEntriesManagerCLITest(unittest.TestCase):
@@ -48,14 +49,52 @@ class CustomEntriesManagerCLITest(unittest.TestCase):
             'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
             'test-location'
         ])
-        self.assertEqual('test.csv', args.csv_file)
+        self.assertEqual(['test.csv'], args.csv_file)
 
     def test_parse_args_sync_should_parse_optional_args_json(self):
         args = custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args([
             'sync', '--json-file', 'test.json', '--project-id', 'test-project', '--location-id',
             'test-location'
         ])
-        self.assertEqual('test.json', args.json_file)
+        self.assertEqual(['test.json'], args.json_file)
+
+    def test_parse_args_sync_should_parse_optional_args_max_workers(self):
+        args = custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args([
+            'sync', '--json-file', 'test.json', '--project-id', 'test-project', '--location-id',
+            'test-location', '--max-workers', '8'
+        ])
+        self.assertEqual(8, args.max_workers)
+
+    def test_parse_args_sync_non_positive_workers_should_raise_system_exit(self):
+        for option, value in (('--max-workers', '0'), ('--client-pool-size', '-1'),
+                              ('--parse-workers', 'many')):
+            self.assertRaises(SystemExit,
+                              custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args, [
+                                  'sync', '--csv-file', 'test.csv', '--project-id', 'test-project',
+                                  '--location-id', 'test-location', option, value
+                              ])
+
+    def test_parse_args_sync_should_parse_optional_args_stream(self):
+        args = custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--stream'
+        ])
+        self.assertTrue(args.stream)
+
+    def test_parse_args_sync_should_parse_optional_args_resume(self):
+        args = custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--checkpoint-file', 'test.checkpoint', '--resume'
+        ])
+        self.assertEqual('test.checkpoint', args.checkpoint_file)
+        self.assertTrue(args.resume)
+
+    def test_parse_args_sync_resume_missing_checkpoint_file_should_raise_system_exit(self):
+        self.assertRaises(SystemExit,
+                          custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args, [
+                              'sync', '--csv-file', 'test.csv', '--project-id', 'test-project',
+                              '--location-id', 'test-location', '--resume'
+                          ])
 
     @mock.patch(f'{__CLI_CLASS}._CustomEntriesManagerCLI__synchronize_custom_entries')
     def test_parse_args_sync_should_set_default_function(self, mock_synchronize_custom_entries):
@@ -69,9 +108,24 @@ class CustomEntriesManagerCLITest(unittest.TestCase):
             'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
             'test-location'
         ])
-        mock_custom_entries_synchronizer.assert_called_with('test-project', 'test-location')
+        mock_custom_entries_synchronizer.assert_called_with('test-project',
+                                                            'test-location',
+                                                            max_workers=1,
+                                                            sync_state=None,
+                                                            disambiguate_ids=False,
+                                                            rate_limiter=None,
+                                                            client_pool_size=1,
+                                                            metrics=None,
+                                                            hooks=None,
+                                                            parse_workers=None)
         mock_custom_entries_synchronizer.return_value.sync_to_file.assert_called_with(
-            csv_file_path='test.csv', json_file_path=None)
+            csv_file_path=['test.csv'],
+            json_file_path=None,
+            parquet_file_path=None,
+            checkpoint_file_path=None,
+            resume=False,
+            raise_on_failure=True,
+            entries_filter=None)
 
     @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
     def test_sync_should_sync_to_json_file(self, mock_custom_entries_synchronizer):
@@ -79,9 +133,378 @@ class CustomEntriesManagerCLITest(unittest.TestCase):
             'sync', '--json-file', 'test.json', '--project-id', 'test-project', '--location-id',
             'test-location'
         ])
-        mock_custom_entries_synchronizer.assert_called_with('test-project', 'test-location')
+        mock_custom_entries_synchronizer.assert_called_with('test-project',
+                                                            'test-location',
+                                                            max_workers=1,
+                                                            sync_state=None,
+                                                            disambiguate_ids=False,
+                                                            rate_limiter=None,
+                                                            client_pool_size=1,
+                                                            metrics=None,
+                                                            hooks=None,
+                                                            parse_workers=None)
         mock_custom_entries_synchronizer.return_value.sync_to_file.assert_called_with(
-            csv_file_path=None, json_file_path='test.json')
+            csv_file_path=None,
+            json_file_path=['test.json'],
+            parquet_file_path=None,
+            checkpoint_file_path=None,
+            resume=False,
+            raise_on_failure=True,
+            entries_filter=None)
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    def test_sync_should_sync_to_parquet_file(self, mock_custom_entries_synchronizer):
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--parquet-file', 'test.parquet', '--project-id', 'test-project',
+            '--location-id', 'test-location'
+        ])
+        mock_custom_entries_synchronizer.return_value.sync_to_file.assert_called_with(
+            csv_file_path=None,
+            json_file_path=None,
+            parquet_file_path=['test.parquet'],
+            checkpoint_file_path=None,
+            resume=False,
+            raise_on_failure=True,
+            entries_filter=None)
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    def test_sync_should_sync_to_sharded_csv_files(self, mock_custom_entries_synchronizer):
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test-1.csv', 'exports/', 'shards/*.csv', '--parse-workers', '4',
+            '--project-id', 'test-project', '--location-id', 'test-location'
+        ])
+
+        self.assertEqual(4, mock_custom_entries_synchronizer.call_args[1]['parse_workers'])
+        self.assertEqual(['test-1.csv', 'exports/', 'shards/*.csv'],
+                         mock_custom_entries_synchronizer.return_value.sync_to_file.call_args[1]
+                         ['csv_file_path'])
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    def test_sync_filter_options_should_make_entries_filter(self,
+                                                            mock_custom_entries_synchronizer):
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--system', 'Test*', '--system', 'Other', '--exclude-system',
+            'TestSystem2', '--group', 'testgroup?', '--exclude-group', 'testgroup0'
+        ])
+
+        entries_filter = mock_custom_entries_synchronizer.return_value.sync_to_file.call_args[1][
+            'entries_filter']
+        self.assertEqual(
+            custom_entries_filter.CustomEntriesFilter(include_systems=('Test*', 'Other'),
+                                                      exclude_systems=('TestSystem2', ),
+                                                      include_groups=('testgroup?', ),
+                                                      exclude_groups=('testgroup0', )),
+            entries_filter)
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    def test_sync_stream_should_stream_sync_to_file(self, mock_custom_entries_synchronizer):
+        synchronizer = mock_custom_entries_synchronizer.return_value
+        synchronizer.stream_sync_to_file.return_value = iter([{}, {}])
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--json-file', 'test.json', '--project-id', 'test-project', '--location-id',
+            'test-location', '--stream'
+        ])
+
+        synchronizer.stream_sync_to_file.assert_called_with(csv_file_path=None,
+                                                            json_file_path=['test.json'],
+                                                            parquet_file_path=None,
+                                                            checkpoint_file_path=None,
+                                                            resume=False,
+                                                            raise_on_failure=True,
+                                                            entries_filter=None)
+        synchronizer.sync_to_file.assert_not_called()
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_sync_state.CustomEntriesSyncState')
+    def test_sync_state_file_should_use_and_close_sync_state(self, mock_sync_state,
+                                                             mock_custom_entries_synchronizer):
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--state-file', 'state.db'
+        ])
+
+        mock_sync_state.assert_called_once_with('state.db')
+        mock_custom_entries_synchronizer.assert_called_with(
+            'test-project',
+            'test-location',
+            max_workers=1,
+            sync_state=mock_sync_state.return_value,
+            disambiguate_ids=False,
+            rate_limiter=None,
+            client_pool_size=1,
+            metrics=None,
+            hooks=None,
+            parse_workers=None)
+        mock_sync_state.return_value.close.assert_called_once()
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    def test_sync_disambiguate_ids_should_set_synchronizer_flag(self,
+                                                                mock_custom_entries_synchronizer):
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--disambiguate-ids'
+        ])
+
+        mock_custom_entries_synchronizer.assert_called_with('test-project',
+                                                            'test-location',
+                                                            max_workers=1,
+                                                            sync_state=None,
+                                                            disambiguate_ids=True,
+                                                            rate_limiter=None,
+                                                            client_pool_size=1,
+                                                            metrics=None,
+                                                            hooks=None,
+                                                            parse_workers=None)
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer')
+    def test_sync_asyncio_engine_should_use_async_synchronizer(
+            self, mock_async_custom_entries_synchronizer):
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--engine', 'asyncio', '--max-workers', '20', '--stream'
+        ])
+
+        mock_async_custom_entries_synchronizer.assert_called_with('test-project',
+                                                                  'test-location',
+                                                                  max_concurrency=20,
+                                                                  sync_state=None,
+                                                                  disambiguate_ids=False,
+                                                                  rate_limiter=None,
+                                                                  client_pool_size=1,
+                                                                  metrics=None,
+                                                                  hooks=None,
+                                                                  parse_workers=None)
+        mock_async_custom_entries_synchronizer.return_value.sync_to_file.assert_called_with(
+            csv_file_path=['test.csv'],
+            json_file_path=None,
+            parquet_file_path=None,
+            stream=True,
+            checkpoint_file_path=None,
+            resume=False,
+            raise_on_failure=True,
+            entries_filter=None)
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    @mock.patch(f'{__CLI_MODULE}.datacatalog_rate_limiter.DataCatalogRateLimiter')
+    def test_sync_requests_per_second_should_use_rate_limiter(self, mock_rate_limiter,
+                                                              mock_custom_entries_synchronizer):
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--requests-per-second', '2.5'
+        ])
+
+        mock_rate_limiter.assert_called_once_with(2.5)
+        mock_custom_entries_synchronizer.assert_called_with(
+            'test-project',
+            'test-location',
+            max_workers=1,
+            sync_state=None,
+            disambiguate_ids=False,
+            rate_limiter=mock_rate_limiter.return_value,
+            client_pool_size=1,
+            metrics=None,
+            hooks=None,
+            parse_workers=None)
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    def test_sync_client_pool_size_should_set_synchronizer_pool_size(
+            self, mock_custom_entries_synchronizer):
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--max-workers', '8', '--client-pool-size', '4'
+        ])
+
+        self.assertEqual(4, mock_custom_entries_synchronizer.call_args[1]['client_pool_size'])
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_sync_metrics.CustomEntriesSyncMetrics')
+    def test_sync_metrics_file_should_write_metrics_even_on_failure(
+            self, mock_metrics, mock_custom_entries_synchronizer):
+
+        synchronizer = mock_custom_entries_synchronizer.return_value
+        synchronizer.sync_to_file.side_effect = custom_entries_sync_steps.EntryGroupSyncError(
+            [mock.MagicMock()])
+
+        self.assertRaises(SystemExit, custom_entries_manager_cli.CustomEntriesManagerCLI.run, [
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--metrics-file', 'metrics.jsonl'
+        ])
+
+        self.assertEqual(mock_metrics.return_value,
+                         mock_custom_entries_synchronizer.call_args[1]['metrics'])
+        mock_metrics.return_value.write_json_lines.assert_called_once_with('metrics.jsonl')
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_sync_metrics.CustomEntriesSyncMetrics')
+    def test_sync_metrics_format_prometheus_should_write_prometheus_text(
+            self, mock_metrics, mock_async_synchronizer):
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--engine', 'asyncio', '--metrics-file', 'metrics.prom',
+            '--metrics-format', 'prometheus'
+        ])
+
+        self.assertEqual(mock_metrics.return_value,
+                         mock_async_synchronizer.call_args[1]['metrics'])
+        mock_metrics.return_value.write_prometheus_text.assert_called_once_with('metrics.prom')
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_sync_metrics.CustomEntriesSyncMetrics')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_sync_hooks.CustomEntriesSyncProfiler')
+    def test_sync_profile_should_write_profile_next_to_metrics(self, mock_profiler, mock_metrics,
+                                                               mock_custom_entries_synchronizer):
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--metrics-file', 'output/metrics.jsonl', '--profile'
+        ])
+
+        profiler = mock_profiler.return_value
+        self.assertEqual(profiler, mock_custom_entries_synchronizer.call_args[1]['hooks'])
+        profiler.profile.assert_called_once()
+        profiler.write_stats.assert_called_once_with('output/metrics.prof')
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_sync_metrics.CustomEntriesSyncMetrics')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_sync_hooks.CustomEntriesSyncProfiler')
+    def test_sync_profile_nothing_profiled_should_not_write_profile(self, mock_profiler,
+                                                                    mock_metrics,
+                                                                    mock_async_synchronizer):
+
+        profiler = mock_profiler.return_value
+        profiler.get_stats.return_value = None
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--engine', 'asyncio', '--metrics-file', 'metrics.jsonl', '--profile'
+        ])
+
+        self.assertEqual(profiler, mock_async_synchronizer.call_args[1]['hooks'])
+        profiler.write_stats.assert_not_called()
+
+    def test_parse_args_profile_without_metrics_file_should_raise_system_exit(self):
+        self.assertRaises(SystemExit,
+                          custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args, [
+                              'sync', '--csv-file', 'test.csv', '--project-id', 'test-project',
+                              '--location-id', 'test-location', '--profile'
+                          ])
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    def test_sync_failed_entry_groups_should_exit_with_error(self,
+                                                             mock_custom_entries_synchronizer):
+
+        synchronizer = mock_custom_entries_synchronizer.return_value
+        synchronizer.sync_to_file.side_effect = custom_entries_sync_steps.EntryGroupSyncError(
+            [mock.MagicMock()])
+
+        with self.assertRaises(SystemExit) as context:
+            custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+                'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+                'test-location'
+            ])
+
+        self.assertEqual('1 Entry Group(s) failed to synchronize.', context.exception.code)
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_synchronizer.CustomEntriesSynchronizer')
+    def test_sync_stream_failed_entry_groups_should_exit_with_error(
+            self, mock_custom_entries_synchronizer):
+
+        def stream_sync_to_file(**kwargs):
+            yield {}
+            raise custom_entries_sync_steps.EntryGroupSyncError([mock.MagicMock()])
+
+        synchronizer = mock_custom_entries_synchronizer.return_value
+        synchronizer.stream_sync_to_file.side_effect = stream_sync_to_file
+
+        self.assertRaises(SystemExit, custom_entries_manager_cli.CustomEntriesManagerCLI.run, [
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--stream'
+        ])
+
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_sync_state.CustomEntriesSyncState')
+    def test_sync_asyncio_engine_failed_entry_groups_should_exit_with_error(
+            self, mock_sync_state, mock_async_custom_entries_synchronizer):
+
+        synchronizer = mock_async_custom_entries_synchronizer.return_value
+        synchronizer.sync_to_file.side_effect = custom_entries_sync_steps.EntryGroupSyncError(
+            [mock.MagicMock()])
+
+        self.assertRaises(SystemExit, custom_entries_manager_cli.CustomEntriesManagerCLI.run, [
+            'sync', '--csv-file', 'test.csv', '--project-id', 'test-project', '--location-id',
+            'test-location', '--engine', 'asyncio', '--state-file', 'state.db'
+        ])
+        mock_sync_state.return_value.close.assert_called_once()
+
+    def test_parse_args_plan_missing_snapshot_file_should_raise_system_exit(self):
+        self.assertRaises(SystemExit,
+                          custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args, [
+                              'plan', '--csv-file', 'test.csv', '--project-id', 'test-project',
+                              '--location-id', 'test-location'
+                          ])
+
+    @mock.patch(f'{__CLI_MODULE}.print')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_planner.CustomEntriesPlanner')
+    def test_plan_should_print_planned_changes(self, mock_custom_entries_planner, mock_print):
+        mock_custom_entries_planner.return_value.plan_file.return_value = [
+            custom_entries_planner.EntryGroupPlan('TestSystem', 'testgroup', ['created_entry'],
+                                                  ['updated_entry'], ['deleted_entry'], 2)
+        ]
+
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run([
+            'plan', '--csv-file', 'test.csv', '--snapshot-file', 'snapshot.json', '--project-id',
+            'test-project', '--location-id', 'test-location'
+        ])
+
+        mock_custom_entries_planner.assert_called_with('test-project',
+                                                       'test-location',
+                                                       disambiguate_ids=False)
+        mock_custom_entries_planner.return_value.plan_file.assert_called_with(
+            'snapshot.json',
+            csv_file_path=['test.csv'],
+            json_file_path=None,
+            parquet_file_path=None,
+            entries_filter=None,
+            parse_workers=None)
+
+        printed_lines = [call[0][0] for call in mock_print.call_args_list]
+        self.assertIn('  + created_entry', printed_lines)
+        self.assertIn('  ~ updated_entry', printed_lines)
+        self.assertIn('  - deleted_entry', printed_lines)
+        self.assertEqual('Plan: 1 to create, 1 to update, 1 to delete.', printed_lines[-1])
+
+    @mock.patch(f'{__CLI_MODULE}.print')
+    @mock.patch(f'{__CLI_MODULE}.custom_entries_planner.CustomEntriesPlanner')
+    def test_plan_detailed_exitcode_should_exit_with_status_2_on_changes(
+            self, mock_custom_entries_planner, mock_print):
+
+        plan_file = mock_custom_entries_planner.return_value.plan_file
+        argv = [
+            'plan', '--csv-file', 'test.csv', '--snapshot-file', 'snapshot.json', '--project-id',
+            'test-project', '--location-id', 'test-location', '--detailed-exitcode'
+        ]
+
+        plan_file.return_value = [
+            custom_entries_planner.EntryGroupPlan('TestSystem', 'testgroup', [], [], [], 2)
+        ]
+        custom_entries_manager_cli.CustomEntriesManagerCLI.run(argv)
+
+        plan_file.return_value = [
+            custom_entries_planner.EntryGroupPlan('TestSystem', 'testgroup', [], [],
+                                                  ['deleted_entry'], 2)
+        ]
+        with self.assertRaises(SystemExit) as context:
+            custom_entries_manager_cli.CustomEntriesManagerCLI.run(argv)
+
+        self.assertEqual(2, context.exception.code)
 
     @mock.patch(f'{__CLI_CLASS}.run')
     def test_main_should_call_cli_run(self, mock_run):
@@ -0,0 +1,176 @@
+import json
+import os
+import tempfile
+import unittest
+
+from datacatalog_custom_entries_manager import custom_entries_csv_reader, \
+    custom_entries_filter, custom_entries_json_reader, custom_entries_multi_file_reader, \
+    custom_entries_record
+
+_CSV_HEADER = 'user_specified_system,group_id,linked_resource,display_name,user_specified_type\n'
+
+
+class CustomEntriesMultiFileReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    def test_list_files_should_expand_directories_and_glob_patterns(self):
+        shards_dir = os.path.join(self.__temp_dir.name, 'shards')
+        os.mkdir(shards_dir)
+        file_path_1 = self.__write_file('shards/entries-2.csv', _CSV_HEADER)
+        file_path_2 = self.__write_file('shards/entries-1.CSV', _CSV_HEADER)
+        self.__write_file('shards/README.md', '')
+        file_path_3 = self.__write_file('other-1.csv', _CSV_HEADER)
+        file_path_4 = self.__write_file('other-2.csv', _CSV_HEADER)
+
+        file_paths = custom_entries_multi_file_reader.CustomEntriesMultiFileReader.list_files([
+            file_path_4, shards_dir,
+            os.path.join(self.__temp_dir.name, 'other-*.csv'), 'missing.csv'
+        ], '.csv')
+
+        self.assertEqual([file_path_4, file_path_2, file_path_1, file_path_3, 'missing.csv'],
+                         file_paths)
+
+    def test_list_files_nothing_matched_should_fail(self):
+        list_files = custom_entries_multi_file_reader.CustomEntriesMultiFileReader.list_files
+
+        self.assertRaises(FileNotFoundError, list_files, [self.__temp_dir.name], '.csv')
+        self.assertRaises(FileNotFoundError, list_files,
+                          [os.path.join(self.__temp_dir.name, '*.csv')], '.csv')
+
+    def test_read_files_single_file_should_not_prefix_sources(self):
+        file_path = self.__write_file(
+            'entries.csv', _CSV_HEADER + 'TestSystem,testgroup,//test/linked-resource,'
+            'Test display name,test_type\n')
+
+        assembled_entry_groups = \
+            custom_entries_multi_file_reader.CustomEntriesMultiFileReader.read_files(
+                custom_entries_csv_reader.CustomEntriesCSVReader, [file_path])
+
+        self.assertEqual(['row 2'],
+                         custom_entries_record.CustomEntryColumns.get_sources(
+                             assembled_entry_groups[0][1][0]['entries']))
+
+    def test_read_files_should_merge_entry_groups_split_across_files(self):
+        file_path_1 = self.__write_file(
+            'entries-1.csv', _CSV_HEADER + 'TestSystem1,testgroup1,//test/linked-resource-1,'
+            'Test display name 1,test_type\n'
+            'TestSystem2,testgroup2,//test/linked-resource-2,Test display name 2,test_type\n')
+        file_path_2 = self.__write_file(
+            'entries-2.csv', _CSV_HEADER + 'TestSystem1,testgroup3,//test/linked-resource-3,'
+            'Test display name 3,test_type\n'
+            'TestSystem1,testgroup1,//test/linked-resource-4,Test display name 4,test_type\n')
+
+        assembled_entry_groups = \
+            custom_entries_multi_file_reader.CustomEntriesMultiFileReader.read_files(
+                custom_entries_csv_reader.CustomEntriesCSVReader, [file_path_1, file_path_2],
+                max_workers=1)
+
+        self.assertEqual(['TestSystem1', 'TestSystem2'],
+                         [system for system, _ in assembled_entry_groups])
+        _, groups_system_1 = assembled_entry_groups[0]
+        self.assertEqual(['testgroup1', 'testgroup3'], [group['id'] for group in groups_system_1])
+        entries = groups_system_1[0]['entries']
+        self.assertIsInstance(entries, custom_entries_record.CustomEntryColumns)
+        self.assertEqual(['//test/linked-resource-1', '//test/linked-resource-4'],
+                         [entry['linked_resource'] for entry in entries])
+        self.assertEqual([f'{file_path_1}: row 2', f'{file_path_2}: row 3'],
+                         custom_entries_record.CustomEntryColumns.get_sources(entries))
+
+    def test_read_files_should_merge_json_entry_groups(self):
+        file_path_1 = self.__write_json_file('entries-1.json', 'TestSystem', 'testgroup',
+                                             ['//test/linked-resource-1'])
+        file_path_2 = self.__write_json_file('entries-2.json', 'TestSystem', 'testgroup',
+                                             ['//test/linked-resource-2'])
+        file_path_3 = self.__write_json_file('entries-3.json', 'OtherSystem', 'othergroup',
+                                             ['//test/linked-resource-3'])
+
+        # The files are parsed in worker processes.
+        assembled_entry_groups = \
+            custom_entries_multi_file_reader.CustomEntriesMultiFileReader.read_files(
+                custom_entries_json_reader.CustomEntriesJSONReader,
+                [file_path_1, file_path_2, file_path_3],
+                custom_entries_filter.CustomEntriesFilter(include_systems=('Test*', )),
+                max_workers=2)
+
+        self.assertEqual(1, len(assembled_entry_groups))
+        _, groups = assembled_entry_groups[0]
+        self.assertEqual(1, len(groups))
+        self.assertEqual([
+            f'{file_path_1}: $.userSpecifiedSystems[0].entryGroups[0].entries[0]',
+            f'{file_path_2}: $.userSpecifiedSystems[0].entryGroups[0].entries[0]'
+        ], custom_entries_record.CustomEntryColumns.get_sources(groups[0]['entries']))
+
+    def test_stream_files_should_merge_entry_group_continued_in_next_file(self):
+        file_path_1 = self.__write_file(
+            'entries-1.csv', _CSV_HEADER + 'TestSystem,testgroup1,//test/linked-resource-1,'
+            'Test display name 1,test_type\n'
+            'TestSystem,testgroup2,//test/linked-resource-2,Test display name 2,test_type\n')
+        file_path_2 = self.__write_file(
+            'entries-2.csv', _CSV_HEADER + 'TestSystem,testgroup2,//test/linked-resource-3,'
+            'Test display name 3,test_type\n')
+
+        assembled_entry_groups = list(
+            custom_entries_multi_file_reader.CustomEntriesMultiFileReader.stream_files(
+                custom_entries_csv_reader.CustomEntriesCSVReader, [file_path_1, file_path_2]))
+
+        self.assertEqual(['testgroup1', 'testgroup2'],
+                         [groups[0]['id'] for _, groups in assembled_entry_groups])
+        self.assertEqual([f'{file_path_1}: row 3', f'{file_path_2}: row 2'],
+                         custom_entries_record.CustomEntryColumns.get_sources(
+                             assembled_entry_groups[1][1][0]['entries']))
+
+    def test_stream_files_single_file_should_stream_file(self):
+        file_path = self.__write_file(
+            'entries.csv', _CSV_HEADER + 'TestSystem,testgroup,//test/linked-resource,'
+            'Test display name,test_type\n')
+
+        assembled_entry_groups = list(
+            custom_entries_multi_file_reader.CustomEntriesMultiFileReader.stream_files(
+                custom_entries_csv_reader.CustomEntriesCSVReader, [file_path]))
+
+        self.assertEqual('row 2', assembled_entry_groups[0][1][0]['entries'][0]['source'])
+
+    def test_stream_files_non_contiguous_entry_group_should_fail(self):
+        file_path_1 = self.__write_file(
+            'entries-1.csv', _CSV_HEADER + 'TestSystem,testgroup1,//test/linked-resource-1,'
+            'Test display name 1,test_type\n')
+        file_path_2 = self.__write_file(
+            'entries-2.csv', _CSV_HEADER + 'TestSystem,testgroup2,//test/linked-resource-2,'
+            'Test display name 2,test_type\n'
+            'TestSystem,testgroup1,//test/linked-resource-3,Test display name 3,test_type\n')
+
+        assembled_entry_groups = \
+            custom_entries_multi_file_reader.CustomEntriesMultiFileReader.stream_files(
+                custom_entries_csv_reader.CustomEntriesCSVReader, [file_path_1, file_path_2])
+
+        self.assertRaises(ValueError, list, assembled_entry_groups)
+
+    def __write_file(self, file_name, contents):
+        file_path = os.path.join(self.__temp_dir.name, file_name)
+        with open(file_path, 'w') as output_file:
+            output_file.write(contents)
+        return file_path
+
+    def __write_json_file(self, file_name, system_name, group_id, linked_resources):
+        return self.__write_file(
+            file_name,
+            json.dumps({
+                'userSpecifiedSystems': [{
+                    'name':
+                    system_name,
+                    'entryGroups': [{
+                        'id':
+                        group_id,
+                        'entries': [{
+                            'linkedResource': linked_resource,
+                            'displayName': 'Test display name',
+                            'type': 'test_type'
+                        } for linked_resource in linked_resources]
+                    }]
+                }]
+            }))
@@ -0,0 +1,269 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from datacatalog_custom_entries_manager import custom_entries_filter, \
+    custom_entries_parquet_reader, custom_entries_record
+
+# pyarrow is an optional dependency, installed with the parquet extra.
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+class CustomEntriesParquetReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__file_path = os.path.join(self.__temp_dir.name, 'test.parquet')
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    def test_read_file_should_assemble_entry_groups(self):
+        self.__write_file(
+            {
+                'user_specified_system': ['TestSystem1', 'TestSystem2', 'TestSystem1'],
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup1'],
+                'linked_resource': [f'//test/linked-resource-{index}' for index in range(3)],
+                'display_name': [f'Display name {index}' for index in range(3)],
+                'description': ['Test description', None, ''],
+                'user_specified_type': ['test_type'] * 3,
+                'created_at': pd.to_datetime(['2020-09-04T16:19:43-0300', None, None], utc=True),
+                'updated_at': [None, '2020-09-04T16:25:26-0300', None],
+            },
+            row_group_size=2)
+
+        assembled_entry_groups = \
+            custom_entries_parquet_reader.CustomEntriesParquetReader.read_file(self.__file_path)
+
+        self.assertEqual(['TestSystem1', 'TestSystem2'],
+                         [system for system, _ in assembled_entry_groups])
+        _, groups_system_1 = assembled_entry_groups[0]
+        entries = groups_system_1[0]['entries']
+        self.assertIsInstance(entries, custom_entries_record.CustomEntryColumns)
+        self.assertEqual(
+            {
+                'linked_resource': '//test/linked-resource-0',
+                'display_name': 'Display name 0',
+                'user_specified_type': 'test_type',
+                'user_specified_system': 'TestSystem1',
+                'source': 'row 1',
+                'description': 'Test description',
+                'created_at': 1599247183,
+            }, entries[0])
+        self.assertEqual('row 3', entries[1]['source'])
+        self.assertNotIn('description', entries[1])
+
+        _, groups_system_2 = assembled_entry_groups[1]
+        self.assertEqual(1599247526, groups_system_2[0]['entries'][0]['updated_at'])
+
+    def test_read_file_should_read_entry_columns_only(self):
+        self.__write_file({
+            'user_specified_system': ['TestSystem'],
+            'group_id': ['testgroup'],
+            'linked_resource': ['//test/linked-resource'],
+            'payload': [b'not an entry field'],
+        })
+
+        with mock.patch.object(pq.ParquetFile,
+                               'read_row_groups',
+                               autospec=True,
+                               side_effect=pq.ParquetFile.read_row_groups) as mock_read:
+
+            custom_entries_parquet_reader.CustomEntriesParquetReader.read_file(self.__file_path)
+
+        self.assertEqual(['user_specified_system', 'group_id', 'linked_resource'],
+                         mock_read.call_args[1]['columns'])
+
+    def test_read_file_filters_should_skip_row_groups_by_statistics(self):
+        self.__write_file(
+            {
+                'user_specified_system': ['TestSystem1', 'TestSystem1', 'TestSystem2'],
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup3'],
+                'linked_resource': [f'//test/linked-resource-{index}' for index in range(3)],
+            },
+            row_group_size=2)
+
+        with mock.patch.object(pq.ParquetFile,
+                               'read_row_groups',
+                               autospec=True,
+                               side_effect=pq.ParquetFile.read_row_groups) as mock_read:
+
+            assembled_entry_groups = \
+                custom_entries_parquet_reader.CustomEntriesParquetReader.read_file(
+                    self.__file_path,
+                    custom_entries_filter.CustomEntriesFilter(include_systems=('TestSystem1', ),
+                                                              include_groups=('testgroup2', )))
+
+        self.assertEqual([0], mock_read.call_args[0][1])
+        self.assertEqual(1, len(assembled_entry_groups))
+        _, groups = assembled_entry_groups[0]
+        self.assertEqual(['testgroup2'], [group['id'] for group in groups])
+        self.assertEqual('row 2', groups[0]['entries'][0]['source'])
+
+    def test_read_file_filter_patterns_should_skip_row_groups_by_statistics(self):
+        self.__write_file(
+            {
+                'user_specified_system':
+                ['TestSystem1', 'TestSystem2', 'OtherSystem', 'TestSystem3'],
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup3', 'testgroup4'],
+                'linked_resource': [f'//test/linked-resource-{index}' for index in range(4)],
+            },
+            row_group_size=1)
+
+        with mock.patch.object(pq.ParquetFile,
+                               'read_row_groups',
+                               autospec=True,
+                               side_effect=pq.ParquetFile.read_row_groups) as mock_read:
+
+            assembled_entry_groups = \
+                custom_entries_parquet_reader.CustomEntriesParquetReader.read_file(
+                    self.__file_path,
+                    custom_entries_filter.CustomEntriesFilter(include_systems=('Test*', ),
+                                                              exclude_systems=('TestSystem2', )))
+
+        self.assertEqual([0, 3], mock_read.call_args[0][1])
+        self.assertEqual(['TestSystem1', 'TestSystem3'],
+                         [system for system, _ in assembled_entry_groups])
+
+    def test_read_file_filter_patterns_should_skip_row_groups_by_prefix(self):
+        self.__write_file(
+            {
+                'user_specified_system': ['Alpha', 'Beta', 'TestSystem1', 'TestSystem2'],
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup3', 'testgroup4'],
+                'linked_resource': [f'//test/linked-resource-{index}' for index in range(4)],
+            },
+            row_group_size=2)
+
+        with mock.patch.object(pq.ParquetFile,
+                               'read_row_groups',
+                               autospec=True,
+                               side_effect=pq.ParquetFile.read_row_groups) as mock_read:
+
+            custom_entries_parquet_reader.CustomEntriesParquetReader.read_file(
+                self.__file_path,
+                custom_entries_filter.CustomEntriesFilter(include_systems=('Test*', )))
+
+        self.assertEqual([1], mock_read.call_args[0][1])
+
+    def test_read_file_filter_should_match_rows_of_mixed_row_groups(self):
+        self.__write_file({
+            'user_specified_system': ['TestSystem'] * 3,
+            'group_id': ['testgroup1', 'testgroup2', 'othergroup'],
+            'linked_resource': [f'//test/linked-resource-{index}' for index in range(3)],
+        })
+
+        assembled_entry_groups = \
+            custom_entries_parquet_reader.CustomEntriesParquetReader.read_file(
+                self.__file_path,
+                custom_entries_filter.CustomEntriesFilter(exclude_groups=('testgroup?', )))
+
+        _, groups = assembled_entry_groups[0]
+        self.assertEqual(['othergroup'], [group['id'] for group in groups])
+        self.assertEqual('row 3', groups[0]['entries'][0]['source'])
+
+    def test_read_file_filters_matching_nothing_should_return_empty_list(self):
+        self.__write_file({
+            'user_specified_system': ['TestSystem'],
+            'group_id': ['testgroup'],
+            'linked_resource': ['//test/linked-resource'],
+        })
+
+        self.assertEqual(
+            [],
+            custom_entries_parquet_reader.CustomEntriesParquetReader.read_file(
+                self.__file_path,
+                custom_entries_filter.CustomEntriesFilter(include_systems=('OtherSystem', ))))
+
+    def test_read_file_missing_key_value_should_fail(self):
+        self.__write_file({
+            'user_specified_system': ['TestSystem', None],
+            'group_id': ['testgroup', 'testgroup'],
+            'linked_resource': ['//test/linked-resource-1', '//test/linked-resource-2'],
+        })
+
+        self.assertRaises(KeyError,
+                          custom_entries_parquet_reader.CustomEntriesParquetReader.read_file,
+                          self.__file_path)
+
+    def test_read_file_filter_missing_key_column_should_fail(self):
+        self.__write_file({
+            'user_specified_system': ['TestSystem'],
+            'linked_resource': ['//test/linked-resource'],
+        })
+
+        self.assertRaises(KeyError,
+                          custom_entries_parquet_reader.CustomEntriesParquetReader.read_file,
+                          self.__file_path,
+                          custom_entries_filter.CustomEntriesFilter(include_groups=('test*', )))
+
+    def test_stream_file_should_yield_entry_groups_in_file_order(self):
+        # Entry Groups of different systems are interleaved in the first row group, and the
+        # last one continues in the second row group.
+        self.__write_file(
+            {
+                'user_specified_system':
+                ['TestSystem1', 'TestSystem2', 'TestSystem1', 'TestSystem1'],
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup3', 'testgroup3'],
+                'linked_resource': [f'//test/linked-resource-{index}' for index in range(4)],
+            },
+            row_group_size=3)
+
+        assembled_entry_groups = list(
+            custom_entries_parquet_reader.CustomEntriesParquetReader.stream_file(self.__file_path))
+
+        self.assertEqual([('TestSystem1', 'testgroup1'), ('TestSystem2', 'testgroup2'),
+                          ('TestSystem1', 'testgroup3')],
+                         [(system, groups[0]['id']) for system, groups in assembled_entry_groups])
+        self.assertEqual(['row 3', 'row 4'],
+                         custom_entries_record.CustomEntryColumns.get_sources(
+                             assembled_entry_groups[2][1][0]['entries']))
+
+    def test_stream_file_entry_group_spanning_row_groups_should_be_yielded_once(self):
+        self.__write_file(
+            {
+                'user_specified_system': ['TestSystem'] * 3,
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup2'],
+                'linked_resource': [f'//test/linked-resource-{index}' for index in range(3)],
+            },
+            row_group_size=2)
+
+        assembled_entry_groups = \
+            custom_entries_parquet_reader.CustomEntriesParquetReader.stream_file(
+                self.__file_path,
+                custom_entries_filter.CustomEntriesFilter(include_systems=('Test*', )))
+
+        _, groups = next(assembled_entry_groups)
+        self.assertEqual('testgroup1', groups[0]['id'])
+        _, groups = next(assembled_entry_groups)
+        self.assertEqual('testgroup2', groups[0]['id'])
+        self.assertEqual(['//test/linked-resource-1', '//test/linked-resource-2'],
+                         [entry['linked_resource'] for entry in groups[0]['entries']])
+        self.assertEqual(['row 2', 'row 3'],
+                         custom_entries_record.CustomEntryColumns.get_sources(
+                             groups[0]['entries']))
+        self.assertRaises(StopIteration, next, assembled_entry_groups)
+
+    def test_stream_file_non_contiguous_entry_group_should_fail(self):
+        self.__write_file(
+            {
+                'user_specified_system': ['TestSystem'] * 3,
+                'group_id': ['testgroup1', 'testgroup2', 'testgroup1'],
+                'linked_resource': [f'//test/linked-resource-{index}' for index in range(3)],
+            },
+            row_group_size=1)
+
+        assembled_entry_groups = \
+            custom_entries_parquet_reader.CustomEntriesParquetReader.stream_file(
+                self.__file_path)
+
+        self.assertRaises(ValueError, list, assembled_entry_groups)
+
+    def __write_file(self, data, row_group_size=None):
+        pq.write_table(pa.Table.from_pandas(pd.DataFrame(data), preserve_index=False),
+                       self.__file_path,
+                       row_group_size=row_group_size)
@@ -0,0 +1,172 @@
+import io
+import json
+import unittest
+from unittest import mock
+
+from datacatalog_custom_entries_manager import custom_entries_planner
+
+_MANAGER_PACKAGE = 'datacatalog_custom_entries_manager'
+
+
+@mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_planner.open', new_callable=mock.mock_open())
+@mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_csv_reader.CustomEntriesCSVReader')
+class CustomEntriesPlannerTest(unittest.TestCase):
+    __ENTRY_GROUP_NAME_PREFIX = 'projects/test-project/locations/test-location/entryGroups'
+
+    def setUp(self):
+        self.__planner = custom_entries_planner.CustomEntriesPlanner('test-project',
+                                                                     'test-location')
+
+    def test_plan_file_should_classify_entries(self, mock_csv_reader, mock_open):
+        entries = [
+            self.__make_entry_dict('Unchanged entry'),
+            self.__make_entry_dict('Updated entry', description='New description'),
+            self.__make_entry_dict('Created entry'),
+        ]
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id': 'testgroup',
+            'entries': entries
+        }, {
+            'entries': []
+        }])]
+
+        mock_open.return_value = io.StringIO(
+            json.dumps([
+                self.__make_entry_json('unchanged_entry', 'Unchanged entry'),
+                self.__make_entry_json('updated_entry', 'Updated entry'),
+                self.__make_entry_json('deleted_entry', 'Deleted entry'),
+                # Entries from other systems and projects are not managed by the sync.
+                self.__make_entry_json('other_system_entry', 'Other', system='OtherSystem'),
+                {
+                    'name':
+                    'projects/other-project/locations/test-location/'
+                    'entryGroups/testgroup/entries/other_project_entry'
+                },
+            ]))
+
+        plans = self.__planner.plan_file('snapshot-path', csv_file_path='file-path')
+
+        self.assertEqual(1, len(plans))
+
+        plan = plans[0]
+        self.assertEqual('TestSystem', plan.system_name)
+        self.assertEqual('testgroup', plan.group_id)
+        self.assertEqual(['created_entry'], plan.created_entry_ids)
+        self.assertEqual(['updated_entry'], plan.updated_entry_ids)
+        self.assertEqual(['deleted_entry'], plan.deleted_entry_ids)
+        self.assertEqual(1, plan.unchanged_count)
+        self.assertTrue(plan.has_changes())
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_json_reader.CustomEntriesJSONReader')
+    def test_plan_file_json_file_path_should_call_json_reader(self, mock_json_reader,
+                                                              mock_csv_reader, mock_open):
+
+        mock_json_reader.read_file.return_value = []
+        mock_open.return_value = io.StringIO('[]')
+
+        self.assertEqual([], self.__planner.plan_file('snapshot-path', json_file_path='file-path'))
+
+        mock_json_reader.read_file.assert_called_once_with('file-path')
+        mock_csv_reader.read_file.assert_not_called()
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_parquet_reader.CustomEntriesParquetReader')
+    def test_plan_file_parquet_file_path_should_call_parquet_reader(self, mock_parquet_reader,
+                                                                    mock_csv_reader, mock_open):
+
+        mock_parquet_reader.read_file.return_value = []
+        mock_open.return_value = io.StringIO('[]')
+
+        self.assertEqual([],
+                         self.__planner.plan_file('snapshot-path', parquet_file_path='file-path'))
+
+        mock_parquet_reader.read_file.assert_called_once_with('file-path')
+        mock_csv_reader.read_file.assert_not_called()
+
+    @mock.patch(
+        f'{_MANAGER_PACKAGE}.custom_entries_multi_file_reader.CustomEntriesMultiFileReader')
+    def test_plan_file_file_path_list_should_call_multi_file_reader(self, mock_multi_file_reader,
+                                                                    mock_csv_reader, mock_open):
+
+        mock_multi_file_reader.read_files.return_value = []
+        mock_open.return_value = io.StringIO('[]')
+
+        self.assertEqual([],
+                         self.__planner.plan_file('snapshot-path',
+                                                  csv_file_path=['file-path', 'dir-path'],
+                                                  parse_workers=2))
+
+        mock_multi_file_reader.list_files.assert_called_once_with(['file-path', 'dir-path'],
+                                                                  mock_csv_reader.FILE_EXTENSION)
+        mock_multi_file_reader.read_files.assert_called_once_with(
+            mock_csv_reader,
+            mock_multi_file_reader.list_files.return_value,
+            entries_filter=None,
+            max_workers=2)
+        mock_csv_reader.read_file.assert_not_called()
+
+    def test_plan_file_should_plan_deletions_per_system(self, mock_csv_reader, mock_open):
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [self.__make_entry_dict('Test entry')]
+        }])]
+
+        mock_open.return_value = io.StringIO(
+            json.dumps([
+                self.__make_entry_json('test_entry', 'Test entry'),
+                # The cleanup query matches the system Entries of every Entry Group.
+                self.__make_entry_json('moved_entry', 'Moved entry', group_id='othergroup'),
+                # Entry Groups of systems missing from the input are not cleaned up.
+                self.__make_entry_json('other_system_entry',
+                                       'Other',
+                                       group_id='othergroup',
+                                       system='OtherSystem'),
+            ]))
+
+        plans = self.__planner.plan_file('snapshot-path', csv_file_path='file-path')
+
+        self.assertEqual(2, len(plans))
+        self.assertFalse(plans[0].has_changes())
+        self.assertEqual(
+            custom_entries_planner.EntryGroupPlan('TestSystem', 'othergroup', [], [],
+                                                  ['moved_entry'], 0), plans[1])
+
+    def test_plan_file_no_file_path_should_fail(self, mock_csv_reader, mock_open):
+        self.assertRaises(Exception, self.__planner.plan_file, 'snapshot-path')
+
+    def test_plan_file_invalid_snapshot_timestamp_should_fail(self, mock_csv_reader, mock_open):
+        mock_csv_reader.read_file.return_value = []
+
+        entry_json = self.__make_entry_json('test_entry', 'Test entry')
+        entry_json['sourceSystemTimestamps']['createTime'] = '2020-09-04 19:19:43'
+        mock_open.return_value = io.StringIO(json.dumps([entry_json]))
+
+        self.assertRaises(ValueError,
+                          self.__planner.plan_file,
+                          'snapshot-path',
+                          csv_file_path='file-path')
+
+    @classmethod
+    def __make_entry_dict(cls, display_name, description='Test description'):
+        return {
+            'linked_resource': '//test/linked-resource',
+            'display_name': display_name,
+            'description': description,
+            'user_specified_type': 'test_type',
+            'user_specified_system': 'TestSystem',
+            'created_at': '2020-09-04T16:19:43-0300',
+        }
+
+    @classmethod
+    def __make_entry_json(cls, entry_id, display_name, group_id='testgroup', system='TestSystem'):
+        return {
+            'name': f'{cls.__ENTRY_GROUP_NAME_PREFIX}/{group_id}/entries/{entry_id}',
+            'linkedResource': '//test/linked-resource',
+            'displayName': display_name,
+            'description': 'Test description',
+            'userSpecifiedType': 'test_type',
+            'userSpecifiedSystem': system,
+            'sourceSystemTimestamps': {
+                'createTime': '2020-09-04T19:19:43.000Z',
+            },
+        }
@@ -0,0 +1,130 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from datacatalog_custom_entries_manager import custom_entries_record
+
+
+class CustomEntryRecordTest(unittest.TestCase):
+
+    def test_record_should_be_a_mapping_of_the_set_fields(self):
+        record = custom_entries_record.CustomEntryRecord('//test/linked-resource',
+                                                         'Test display name',
+                                                         'test_type',
+                                                         'TestSystem',
+                                                         'row 2',
+                                                         description='Test description')
+
+        self.assertEqual('Test display name', record['display_name'])
+        self.assertEqual('Test description', record.get('description'))
+        self.assertIsNone(record.get('created_at'))
+        self.assertIn('source', record)
+        self.assertNotIn('updated_at', record)
+        self.assertNotIn(0, record)
+        self.assertRaises(KeyError, lambda: record['created_at'])
+        self.assertEqual(6, len(record))
+        self.assertEqual(
+            {
+                'linked_resource': '//test/linked-resource',
+                'display_name': 'Test display name',
+                'user_specified_type': 'test_type',
+                'user_specified_system': 'TestSystem',
+                'source': 'row 2',
+                'description': 'Test description',
+            }, record)
+        self.assertIn("'description': 'Test description'", repr(record))
+
+    def test_record_should_have_no_instance_dict(self):
+        record = custom_entries_record.CustomEntryRecord('//test/linked-resource',
+                                                         'Test display name', 'test_type',
+                                                         'TestSystem')
+
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertRaises(AttributeError, setattr, record, 'unknown_field', 'value')
+
+    def test_record_should_intern_system_and_type(self):
+        records = [
+            custom_entries_record.CustomEntryRecord(f'//test/linked-resource-{index}',
+                                                    f'Display name {index}',
+                                                    ''.join(['test_',
+                                                             'type']), ''.join(['Test', 'System']))
+            for index in range(2)
+        ]
+
+        self.assertIs(records[0].user_specified_type, records[1].user_specified_type)
+        self.assertIs(records[0].user_specified_system, records[1].user_specified_system)
+
+    def test_record_missing_values_should_not_be_interned(self):
+        record = custom_entries_record.CustomEntryRecord('//test/linked-resource',
+                                                         'Test display name', float('nan'), None)
+
+        self.assertNotEqual(record.user_specified_type, record.user_specified_type)
+        self.assertIsNone(record['user_specified_system'])
+
+    def test_from_dict_should_make_equal_record(self):
+        data = {
+            'linked_resource': '//test/linked-resource',
+            'display_name': 'Test display name',
+            'user_specified_type': 'test_type',
+            'user_specified_system': 'TestSystem',
+            'created_at': '2020-09-04T16:19:43-0300',
+        }
+
+        record = custom_entries_record.CustomEntryRecord.from_dict(data)
+
+        self.assertEqual(data, record)
+        self.assertIs(record, custom_entries_record.CustomEntryRecord.from_dict(record))
+
+    def test_record_should_be_picklable(self):
+        record = custom_entries_record.CustomEntryRecord('//test/linked-resource',
+                                                         'Test display name', 'test_type',
+                                                         'TestSystem', 'row 2')
+
+        self.assertEqual(record, pickle.loads(pickle.dumps(record)))
+
+
+class CustomEntryColumnsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__columns = custom_entries_record.CustomEntryColumns(
+            'TestSystem', np.array(['//test/linked-resource-1', '//test/linked-resource-2']),
+            np.array(['Test display name 1', 'Test display name 2']),
+            np.array(['test_type', 'test_type']), np.array(['Test description', None]),
+            np.array([1599247183, 0]), np.array([0, 1599247526]), np.array([2, 5]))
+
+    def test_columns_should_be_a_sequence_of_records(self):
+        self.assertEqual(2, len(self.__columns))
+        self.assertEqual(
+            {
+                'linked_resource': '//test/linked-resource-2',
+                'display_name': 'Test display name 2',
+                'user_specified_type': 'test_type',
+                'user_specified_system': 'TestSystem',
+                'source': 'row 5',
+                'updated_at': 1599247526,
+            }, self.__columns[-1])
+        self.assertEqual(1599247183, self.__columns[0]['created_at'])
+        self.assertIn('Test description', repr(self.__columns))
+
+    def test_get_sources_should_handle_columns_and_records(self):
+        self.assertEqual(['row 2', 'row 5'],
+                         custom_entries_record.CustomEntryColumns.get_sources(self.__columns))
+        self.assertEqual(['row 5', None],
+                         custom_entries_record.CustomEntryColumns.get_sources([{
+                             'source': 'row 5'
+                         }, {}]))
+
+    def test_columns_should_be_picklable(self):
+        columns = pickle.loads(pickle.dumps(self.__columns))
+
+        self.assertEqual(list(self.__columns), list(columns))
+
+    def test_file_paths_should_prefix_sources(self):
+        self.__columns.file_paths = np.array(['test-1.csv', 'test-2.csv'], dtype=object)
+
+        self.assertEqual(['test-1.csv: row 2', 'test-2.csv: row 5'],
+                         custom_entries_record.CustomEntryColumns.get_sources(self.__columns))
+        self.assertEqual('test-2.csv: row 5', self.__columns[1]['source'])
+        self.assertEqual(['test-1.csv', 'test-2.csv'],
+                         list(pickle.loads(pickle.dumps(self.__columns)).file_paths))
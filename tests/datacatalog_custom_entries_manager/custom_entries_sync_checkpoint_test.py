@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+
+from datacatalog_custom_entries_manager import custom_entries_sync_checkpoint
+
+
+class CustomEntriesSyncCheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__input_file_path = os.path.join(self.__temp_dir.name, 'input.csv')
+        self.__checkpoint_file_path = os.path.join(self.__temp_dir.name, 'input.checkpoint')
+
+        with open(self.__input_file_path, 'w') as input_file:
+            input_file.write('user_specified_system,group_id\nTestSystem,testgroup\n')
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    def test_constructor_should_write_input_fingerprint(self):
+        custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint(self.__checkpoint_file_path,
+                                                                   self.__input_file_path)
+
+        with open(self.__checkpoint_file_path) as checkpoint_file:
+            header = json.loads(checkpoint_file.readline())
+
+        self.assertEqual(
+            custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint.compute_input_fingerprint(
+                self.__input_file_path), header['inputFingerprint'])
+
+    def test_resume_same_input_should_keep_completed_entry_groups(self):
+        checkpoint = self.__make_checkpoint()
+        checkpoint.mark_completed('TestSystem', 'testgroup')
+
+        checkpoint = self.__make_checkpoint(resume=True)
+
+        self.assertTrue(checkpoint.is_completed('TestSystem', 'testgroup'))
+        self.assertFalse(checkpoint.is_completed('TestSystem', 'othergroup'))
+
+        # Completed Entry Groups are kept when resuming more than once.
+        checkpoint = self.__make_checkpoint(resume=True)
+
+        self.assertTrue(checkpoint.is_completed('TestSystem', 'testgroup'))
+
+    def test_resume_changed_input_should_discard_completed_entry_groups(self):
+        checkpoint = self.__make_checkpoint()
+        checkpoint.mark_completed('TestSystem', 'testgroup')
+
+        with open(self.__input_file_path, 'a') as input_file:
+            input_file.write('TestSystem,othergroup\n')
+
+        checkpoint = self.__make_checkpoint(resume=True)
+
+        self.assertFalse(checkpoint.is_completed('TestSystem', 'testgroup'))
+
+    def test_resume_missing_checkpoint_file_should_start_from_the_beginning(self):
+        checkpoint = self.__make_checkpoint(resume=True)
+
+        self.assertFalse(checkpoint.is_completed('TestSystem', 'testgroup'))
+        self.assertTrue(os.path.isfile(self.__checkpoint_file_path))
+
+    def test_no_resume_should_discard_completed_entry_groups(self):
+        checkpoint = self.__make_checkpoint()
+        checkpoint.mark_completed('TestSystem', 'testgroup')
+
+        checkpoint = self.__make_checkpoint()
+
+        self.assertFalse(checkpoint.is_completed('TestSystem', 'testgroup'))
+
+    def test_input_fingerprint_should_cover_every_sharded_input_file(self):
+        other_input_file_path = os.path.join(self.__temp_dir.name, 'other-input.csv')
+        with open(other_input_file_path, 'w') as input_file:
+            input_file.write('user_specified_system,group_id\nTestSystem,othergroup\n')
+        compute_input_fingerprint = \
+            custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint.compute_input_fingerprint
+
+        self.assertEqual(compute_input_fingerprint(self.__input_file_path),
+                         compute_input_fingerprint([self.__input_file_path]))
+        fingerprint = compute_input_fingerprint([self.__input_file_path, other_input_file_path])
+        self.assertNotEqual(compute_input_fingerprint(self.__input_file_path), fingerprint)
+        self.assertNotEqual(
+            compute_input_fingerprint([other_input_file_path, self.__input_file_path]),
+            fingerprint)
+
+    def __make_checkpoint(self, resume=False):
+        return custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint(
+            self.__checkpoint_file_path, self.__input_file_path, resume)
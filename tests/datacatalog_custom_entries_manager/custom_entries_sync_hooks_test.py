@@ -0,0 +1,184 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from unittest import mock
+
+from datacatalog_custom_entries_manager import custom_entries_async_synchronizer, \
+    custom_entries_sync_hooks, custom_entries_sync_state, custom_entries_sync_steps, \
+    custom_entries_synchronizer, datacatalog_fake_backend
+
+
+class RecordingSyncHooks(custom_entries_sync_hooks.CustomEntriesSyncHooks):
+
+    def __init__(self):
+        self.calls = []
+
+    def on_entry_group_read(self, system_name, group_id, entries):
+        self.calls.append(('read', group_id, len(entries)))
+
+    def on_group_start(self, system_name, group_id):
+        self.calls.append(('group_start', group_id))
+
+    def on_phase_start(self, group_id, phase):
+        self.calls.append(('phase_start', group_id, phase))
+
+    def on_entry_built(self, group_id, entry_id, entry):
+        self.calls.append(('entry_built', group_id, entry_id))
+
+    def on_phase_end(self, group_id, phase, seconds, error=None):
+        self.calls.append(('phase_end', group_id, phase, type(error).__name__ if error else None))
+
+    def on_group_end(self, result):
+        self.calls.append(('group_end', result.group_id, result.error is None))
+
+
+class CustomEntriesSyncHooksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__backend = datacatalog_fake_backend.FakeDataCatalogBackend()
+        self.__hooks = RecordingSyncHooks()
+
+    def test_base_hooks_should_do_nothing(self):
+        hooks = custom_entries_sync_hooks.CustomEntriesSyncHooks()
+
+        hooks.on_entry_group_read('TestSystem', 'test_group', [])
+        hooks.on_group_start('TestSystem', 'test_group')
+        hooks.on_phase_start('test_group', 'prepare')
+        hooks.on_entry_built('test_group', 'entry_1', mock.MagicMock())
+        hooks.on_phase_end('test_group', 'prepare', 0.1)
+        hooks.on_group_end(mock.MagicMock())
+
+    def test_sync_to_file_should_call_hooks_in_order(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.json')
+            self.__write_json_file(file_path, ['entry_1', 'entry_2'])
+            synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                client_factory=self.__backend.make_client,
+                hooks=self.__hooks)
+
+            synchronizer.sync_to_file(json_file_path=file_path, raise_on_failure=True)
+
+        self.assertEqual([
+            ('read', 'test_group', 2),
+            ('group_start', 'test_group'),
+            ('phase_start', 'test_group', 'prepare'),
+            ('entry_built', 'test_group', 'entry_1'),
+            ('entry_built', 'test_group', 'entry_2'),
+            ('phase_end', 'test_group', 'prepare', None),
+            ('phase_start', 'test_group', 'cleanup'),
+            ('phase_end', 'test_group', 'cleanup', None),
+            ('phase_start', 'test_group', 'ingest'),
+            ('phase_end', 'test_group', 'ingest', None),
+            ('group_end', 'test_group', True),
+        ], self.__hooks.calls)
+
+    def test_stream_sync_to_file_should_report_streamed_entry_groups(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.json')
+            self.__write_json_file(file_path, ['entry_1'])
+            synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                client_factory=self.__backend.make_client,
+                hooks=self.__hooks)
+
+            list(synchronizer.stream_sync_to_file(json_file_path=file_path))
+
+        self.assertEqual(('read', 'test_group', 1), self.__hooks.calls[0])
+        self.assertEqual(('group_end', 'test_group', True), self.__hooks.calls[-1])
+
+    def test_async_sync_to_file_should_report_failed_phases(self):
+        self.__backend.inject_errors('update_entry', *[Exception('Test error')] * 2)
+        sync_state = custom_entries_sync_state.CustomEntriesSyncState()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.json')
+            self.__write_json_file(file_path, ['entry_1'])
+            synchronizer = custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                sync_state=sync_state,
+                client_factory=self.__backend.make_client,
+                hooks=self.__hooks)
+
+            self.assertRaises(custom_entries_sync_steps.EntryGroupSyncError,
+                              synchronizer.sync_to_file,
+                              json_file_path=file_path,
+                              raise_on_failure=True)
+        sync_state.close()
+
+        self.assertIn(('phase_end', 'test_group', 'ingest', 'Exception'), self.__hooks.calls)
+        self.assertEqual(('group_end', 'test_group', False), self.__hooks.calls[-1])
+
+    def test_profiler_should_merge_main_thread_and_phases(self):
+        profiler = custom_entries_sync_hooks.CustomEntriesSyncProfiler()
+        self.assertIsNone(profiler.get_stats())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.json')
+            self.__write_json_file(file_path, ['entry_1'])
+            synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                client_factory=self.__backend.make_client,
+                hooks=profiler)
+
+            with profiler.profile():
+                synchronizer.sync_to_file(json_file_path=file_path)
+
+            stats_file_path = os.path.join(temp_dir, 'metrics.prof')
+            profiler.write_stats(stats_file_path)
+            function_names = {
+                function_name
+                for _, _, function_name in pstats.Stats(stats_file_path).stats
+            }
+
+        # Read in the main thread.
+        self.assertIn('read_file', function_names)
+        # Prepared and ingested in a worker thread.
+        self.assertIn('make_entries_from_dicts', function_names)
+        self.assertIn('ingest_metadata', function_names)
+
+    def test_profiler_should_skip_phases_of_the_profiled_thread(self):
+        profiler = custom_entries_sync_hooks.CustomEntriesSyncProfiler()
+
+        with profiler.profile():
+            profiler.on_phase_start('test_group', 'prepare')
+            profiler.on_phase_end('test_group', 'prepare', 0.1)
+
+        self.assertIsNotNone(profiler.get_stats())
+
+    @mock.patch('cProfile.Profile')
+    def test_profiler_should_skip_profiles_not_enabled(self, mock_profile):
+        mock_profile.return_value.enable.side_effect = ValueError('Another profiler is active')
+        profiler = custom_entries_sync_hooks.CustomEntriesSyncProfiler()
+
+        with profiler.profile():
+            pass
+        profiler.on_phase_start('test_group', 'prepare')
+        profiler.on_phase_end('test_group', 'prepare', 0.1)
+
+        self.assertIsNone(profiler.get_stats())
+
+    @classmethod
+    def __write_json_file(cls, file_path, entry_names):
+        with open(file_path, 'w') as json_file:
+            json.dump(
+                {
+                    'userSpecifiedSystems': [{
+                        'name':
+                        'TestSystem',
+                        'entryGroups': [{
+                            'id':
+                            'test_group',
+                            'entries': [{
+                                'linkedResource': f'//test/{entry_name}',
+                                'displayName': entry_name,
+                                'type': 'test_type'
+                            } for entry_name in entry_names]
+                        }]
+                    }]
+                }, json_file)
@@ -0,0 +1,234 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud.datacatalog import types
+
+from datacatalog_custom_entries_manager import custom_entries_async_synchronizer, \
+    custom_entries_sync_metrics, custom_entries_sync_state, custom_entries_synchronizer, \
+    datacatalog_fake_backend
+
+
+class CustomEntriesSyncMetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__metrics = custom_entries_sync_metrics.CustomEntriesSyncMetrics()
+
+    def test_measure_phase_should_add_phase_time_and_attribute_requests(self):
+        client = self.__metrics.meter(mock.MagicMock())
+        entry = types.Entry()
+        entry.display_name = 'Entry 1'
+
+        client.get_entry(name='entry-name')
+        with self.__metrics.measure_phase('TestSystem', 'test-group', 'ingest'):
+            client.create_entry(parent='group-name', entry_id='entry_1', entry=entry)
+            client.entry_path('test-project', 'test-location', 'test-group', 'entry_1')
+        with self.__metrics.measure_phase('TestSystem', 'test-group', 'ingest'):
+            client.update_entry(entry=entry)
+
+        group, = self.__metrics.get_entry_group_metrics()
+        self.assertEqual('TestSystem', group.system_name)
+        self.assertGreater(group.phase_seconds['ingest'], 0)
+        self.assertEqual(0, group.phase_seconds['prepare'])
+        self.assertEqual({'create_entry': 1, 'update_entry': 1}, group.api_requests)
+        self.assertEqual(2 * entry.ByteSize(), group.request_bytes)
+
+        summary = self.__metrics.summarize()
+        self.assertEqual({
+            'create_entry': 1,
+            'get_entry': 1,
+            'update_entry': 1
+        }, summary.api_requests)
+
+    def test_entry_groups_with_same_id_in_different_systems_should_be_kept_apart(self):
+        with self.__metrics.measure_phase('TestSystem1', 'test-group', 'prepare'):
+            self.__metrics.add_entries('TestSystem1', 'test-group', entries=1)
+        with self.__metrics.measure_phase('TestSystem2', 'test-group', 'ingest'):
+            self.__metrics.add_entries('TestSystem2', 'test-group', entries=2)
+        self.__metrics.finish_run([('TestSystem2', 'test-group')])
+
+        group_1, group_2 = self.__metrics.get_entry_group_metrics()
+        self.assertEqual(('TestSystem1', 1, 0, False),
+                         (group_1.system_name, group_1.entries, group_1.phase_seconds['ingest'],
+                          group_1.failed))
+        self.assertEqual(('TestSystem2', 2, 0, True),
+                         (group_2.system_name, group_2.entries, group_2.phase_seconds['prepare'],
+                          group_2.failed))
+
+    def test_throttled_requests_should_be_counted(self):
+        wrapped_client = mock.MagicMock()
+        wrapped_client.delete_entry.side_effect = exceptions.ResourceExhausted('quota')
+        client = self.__metrics.meter(wrapped_client)
+
+        with self.__metrics.measure_phase('TestSystem', 'test-group', 'cleanup'):
+            self.assertRaises(exceptions.ResourceExhausted, client.delete_entry, name='entry-name')
+
+        self.assertEqual(1, self.__metrics.get_entry_group_metrics()[0].throttled_requests)
+        self.assertEqual(1, self.__metrics.summarize().throttled_requests)
+
+    def test_measure_read_should_measure_lazy_readers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.csv')
+            with open(file_path, 'w') as input_file:
+                input_file.write('0123456789')
+
+            entry_groups = self.__metrics.measure_read(lambda path: iter([('TestSystem', [])]),
+                                                       file_path)
+            self.assertEqual([('TestSystem', [])], list(entry_groups))
+            self.assertEqual([], self.__metrics.measure_read(lambda path: [], file_path))
+
+        summary = self.__metrics.summarize()
+        self.assertEqual(10, summary.input_bytes)
+        self.assertGreater(summary.read_seconds, 0)
+
+    def test_measure_read_should_sum_sharded_input_file_sizes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_paths = [os.path.join(temp_dir, f'entries-{index}.csv') for index in range(2)]
+            for file_path in file_paths:
+                with open(file_path, 'w') as input_file:
+                    input_file.write('0123456789')
+
+            self.__metrics.measure_read(lambda paths: [], file_paths)
+
+        self.assertEqual(20, self.__metrics.summarize().input_bytes)
+
+    @mock.patch('time.monotonic')
+    def test_summarize_should_compute_throughput_and_percentiles(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        metrics = custom_entries_sync_metrics.CustomEntriesSyncMetrics()
+        for index in range(20):
+            mock_monotonic.side_effect = [index, index + index + 1]
+            with metrics.measure_phase('TestSystem', f'group_{index}', 'prepare'):
+                metrics.add_entries('TestSystem', f'group_{index}', entries=10)
+        mock_monotonic.side_effect = None
+        mock_monotonic.return_value = 50
+        metrics.finish_run([('TestSystem', 'group_0'), ('TestSystem', None)])
+
+        summary = metrics.summarize()
+
+        self.assertEqual(20, summary.entry_groups)
+        self.assertEqual(1, summary.failed_entry_groups)
+        self.assertEqual(200, summary.entries)
+        self.assertEqual(50, summary.duration_seconds)
+        self.assertEqual(4, summary.entries_per_second)
+        self.assertEqual(10, summary.group_duration_p50_seconds)
+        self.assertEqual(19, summary.group_duration_p95_seconds)
+
+    def test_summarize_no_entry_groups_should_return_zeros(self):
+        self.__metrics.finish_run()
+        summary = self.__metrics.summarize()
+
+        self.assertEqual(0, summary.entry_groups)
+        self.assertEqual(0, summary.group_duration_p95_seconds)
+
+    def test_write_json_lines_should_write_entry_groups_and_summary(self):
+        with self.__metrics.measure_phase('TestSystem', 'test-group', 'prepare'):
+            self.__metrics.add_entries('TestSystem', 'test-group', entries=2)
+        self.__metrics.add_entries('TestSystem', 'test-group', written=1, failed=1)
+        self.__metrics.finish_run()
+        self.__metrics.log_summary()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'metrics.jsonl')
+            self.__metrics.write_json_lines(file_path)
+            with open(file_path) as json_lines_file:
+                lines = [json.loads(line) for line in json_lines_file]
+
+        self.assertEqual(['entry_group', 'summary'], [line['type'] for line in lines])
+        self.assertEqual('test-group', lines[0]['group_id'])
+        self.assertEqual(1, lines[0]['failed_entries'])
+        self.assertEqual(2, lines[1]['entries'])
+
+    def test_write_prometheus_text_should_aggregate_entry_groups(self):
+        with self.__metrics.measure_phase('TestSystem', 'test-group', 'cleanup'):
+            self.__metrics.meter(mock.MagicMock()).delete_entry(name='entry-name')
+        self.__metrics.finish_run([('TestSystem', 'test-group')])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'metrics.prom')
+            self.__metrics.write_prometheus_text(file_path)
+            with open(file_path) as prometheus_file:
+                lines = prometheus_file.read().splitlines()
+
+        self.assertIn('# TYPE datacatalog_sync_entry_group_duration_seconds summary', lines)
+        self.assertIn('datacatalog_sync_entry_groups{status="failed"} 1', lines)
+        self.assertIn('datacatalog_sync_api_requests{method="delete_entry"} 1', lines)
+        self.assertIn('datacatalog_sync_entry_group_duration_seconds_count 1', lines)
+        self.assertTrue(
+            any(
+                line.startswith('datacatalog_sync_phase_seconds{phase="cleanup"} ')
+                for line in lines))
+
+    def test_sync_to_file_should_measure_each_phase(self):
+        backend = datacatalog_fake_backend.FakeDataCatalogBackend()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.json')
+            self.__write_json_file(file_path, ['entry_1', 'entry_2'])
+
+            synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                client_factory=backend.make_client,
+                metrics=self.__metrics)
+            synchronizer.sync_to_file(json_file_path=file_path, stream=True)
+
+        group, = self.__metrics.get_entry_group_metrics()
+        self.assertEqual('TestSystem', group.system_name)
+        self.assertEqual(2, group.entries)
+        self.assertEqual(2, group.written_entries)
+        self.assertEqual(2, group.api_requests['create_entry'])
+        self.assertEqual(1, group.api_requests['search_catalog'])
+        for phase in ('prepare', 'cleanup', 'ingest'):
+            self.assertGreater(group.phase_seconds[phase], 0)
+
+        summary = self.__metrics.summarize()
+        self.assertGreater(summary.read_seconds, 0)
+        self.assertGreater(summary.input_bytes, 0)
+        self.assertEqual(sum(backend.request_counts.values()), sum(summary.api_requests.values()))
+
+    def test_async_sync_to_file_with_state_should_measure_each_phase(self):
+        backend = datacatalog_fake_backend.FakeDataCatalogBackend()
+        sync_state = custom_entries_sync_state.CustomEntriesSyncState()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.json')
+            synchronizer = custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                sync_state=sync_state,
+                client_factory=backend.make_client,
+                metrics=self.__metrics)
+
+            self.__write_json_file(file_path, ['entry_1', 'entry_2'])
+            synchronizer.sync_to_file(json_file_path=file_path)
+            self.__write_json_file(file_path, ['entry_1'])
+            synchronizer.sync_to_file(json_file_path=file_path)
+        sync_state.close()
+
+        group, = self.__metrics.get_entry_group_metrics()
+        self.assertEqual(3, group.entries)
+        self.assertEqual(1, group.api_requests['delete_entry'])
+        self.assertGreater(group.phase_seconds['state'], 0)
+        self.assertGreater(group.phase_seconds['cleanup'], 0)
+
+    @classmethod
+    def __write_json_file(cls, file_path, entry_names):
+        with open(file_path, 'w') as json_file:
+            json.dump(
+                {
+                    'userSpecifiedSystems': [{
+                        'name':
+                        'TestSystem',
+                        'entryGroups': [{
+                            'id':
+                            'test_group',
+                            'entries': [{
+                                'linkedResource': f'//test/{entry_name}',
+                                'displayName': entry_name,
+                                'type': 'test_type'
+                            } for entry_name in entry_names]
+                        }]
+                    }]
+                }, json_file)
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from datacatalog_custom_entries_manager import custom_entries_sync_state
+
+
+class CustomEntriesSyncStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__sync_state = custom_entries_sync_state.CustomEntriesSyncState()
+
+    def tearDown(self):
+        self.__sync_state.close()
+
+    def test_get_entry_fingerprints_never_synchronized_should_return_none(self):
+        self.assertIsNone(
+            self.__sync_state.get_entry_fingerprints('test-entry-group', 'TestSystem'))
+
+    def test_get_entry_fingerprints_no_entries_should_return_empty_dict(self):
+        self.__sync_state.set_entry_fingerprints('test-entry-group', 'TestSystem', {})
+
+        self.assertEqual({},
+                         self.__sync_state.get_entry_fingerprints('test-entry-group',
+                                                                  'TestSystem'))
+
+    def test_get_entry_fingerprints_should_return_last_set_values(self):
+        self.__sync_state.set_entry_fingerprints('test-entry-group', 'TestSystem',
+                                                 {'entry_1': 'fingerprint_1'})
+        self.__sync_state.set_entry_fingerprints('test-entry-group', 'TestSystem',
+                                                 {'entry_2': 'fingerprint_2'})
+
+        self.assertEqual({'entry_2': 'fingerprint_2'},
+                         self.__sync_state.get_entry_fingerprints('test-entry-group',
+                                                                  'TestSystem'))
+        self.assertIsNone(
+            self.__sync_state.get_entry_fingerprints('test-entry-group', 'OtherSystem'))
+
+    def test_list_entry_group_names_should_return_system_entry_groups(self):
+        self.__sync_state.set_entry_fingerprints('test-entry-group-2', 'TestSystem', {})
+        self.__sync_state.set_entry_fingerprints('test-entry-group-1', 'TestSystem', {})
+        self.__sync_state.set_entry_fingerprints('test-entry-group-3', 'OtherSystem', {})
+
+        self.assertEqual(['test-entry-group-1', 'test-entry-group-2'],
+                         self.__sync_state.list_entry_group_names('TestSystem'))
+
+    def test_delete_entry_fingerprints_should_forget_entry_group(self):
+        self.__sync_state.set_entry_fingerprints('test-entry-group', 'TestSystem',
+                                                 {'entry_1': 'fingerprint_1'})
+        self.__sync_state.set_entry_fingerprints('test-entry-group', 'OtherSystem', {})
+
+        self.__sync_state.delete_entry_fingerprints('test-entry-group', 'TestSystem')
+
+        self.assertIsNone(
+            self.__sync_state.get_entry_fingerprints('test-entry-group', 'TestSystem'))
+        self.assertEqual(['test-entry-group'],
+                         self.__sync_state.list_entry_group_names('OtherSystem'))
+
+    def test_state_file_should_persist_across_instances(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'state.db')
+
+            sync_state = custom_entries_sync_state.CustomEntriesSyncState(file_path)
+            sync_state.set_entry_fingerprints('test-entry-group', 'TestSystem',
+                                              {'entry_1': 'fingerprint_1'})
+            sync_state.close()
+
+            sync_state = custom_entries_sync_state.CustomEntriesSyncState(file_path)
+            fingerprints = sync_state.get_entry_fingerprints('test-entry-group', 'TestSystem')
+            sync_state.close()
+
+        self.assertEqual({'entry_1': 'fingerprint_1'}, fingerprints)
@@ -0,0 +1,233 @@
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud.datacatalog import types
+from google.datacatalog_connectors.commons import prepare
+
+from datacatalog_custom_entries_manager import custom_entries_filter, custom_entries_sync_state, \
+    custom_entries_sync_steps
+
+_MANAGER_PACKAGE = 'datacatalog_custom_entries_manager'
+
+
+class CustomEntriesSyncStepsTest(unittest.TestCase):
+    __DATACATALOG_CLIENT = 'google.cloud.datacatalog.DataCatalogClient'
+
+    def setUp(self):
+        self.__entry_factory = mock.MagicMock()
+        self.__sync_state = custom_entries_sync_state.CustomEntriesSyncState()
+        self.__sync_steps = custom_entries_sync_steps.CustomEntriesSyncSteps(
+            'test-project', 'test-location', self.__entry_factory, sync_state=self.__sync_state)
+
+    def tearDown(self):
+        self.__sync_state.close()
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_parquet_reader.CustomEntriesParquetReader')
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_json_reader.CustomEntriesJSONReader')
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_csv_reader.CustomEntriesCSVReader')
+    def test_get_file_reader_should_pick_reader_by_format_and_mode(self, mock_csv_reader,
+                                                                   mock_json_reader,
+                                                                   mock_parquet_reader):
+
+        get_file_reader = custom_entries_sync_steps.CustomEntriesSyncSteps.get_file_reader
+
+        self.assertEqual(mock_csv_reader.read_file, get_file_reader('file-path', None, False))
+        self.assertEqual(mock_csv_reader.stream_file, get_file_reader('file-path', None, True))
+        self.assertEqual(mock_json_reader.read_file, get_file_reader(None, 'file-path', False))
+        self.assertEqual(mock_json_reader.stream_file, get_file_reader(None, 'file-path', True))
+        self.assertEqual(mock_parquet_reader.read_file,
+                         get_file_reader(None, None, False, 'file-path'))
+        self.assertEqual(mock_parquet_reader.stream_file,
+                         get_file_reader(None, None, True, 'file-path'))
+        self.assertRaises(Exception, get_file_reader, None, None, False)
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_json_reader.CustomEntriesJSONReader')
+    def test_get_file_reader_entries_filter_should_be_passed_to_reader(self, mock_json_reader):
+        entries_filter = custom_entries_filter.CustomEntriesFilter(include_systems=('Test*', ))
+
+        read_file = custom_entries_sync_steps.CustomEntriesSyncSteps.get_file_reader(
+            None, 'file-path', True, entries_filter=entries_filter)
+        read_file('file-path')
+
+        mock_json_reader.stream_file.assert_called_once_with('file-path',
+                                                             entries_filter=entries_filter)
+
+    @mock.patch(
+        f'{_MANAGER_PACKAGE}.custom_entries_multi_file_reader.CustomEntriesMultiFileReader')
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_csv_reader.CustomEntriesCSVReader')
+    def test_get_file_reader_file_list_should_pick_multi_file_reader(self, mock_csv_reader,
+                                                                     mock_multi_file_reader):
+
+        get_file_reader = custom_entries_sync_steps.CustomEntriesSyncSteps.get_file_reader
+
+        get_file_reader(['file-path'], None, False, parse_workers=4)(['file-path-1'])
+        get_file_reader(['file-path'], None, True)(['file-path-1'])
+
+        mock_multi_file_reader.read_files.assert_called_once_with(mock_csv_reader, ['file-path-1'],
+                                                                  entries_filter=None,
+                                                                  max_workers=4)
+        mock_multi_file_reader.stream_files.assert_called_once_with(mock_csv_reader,
+                                                                    ['file-path-1'],
+                                                                    entries_filter=None)
+
+    @mock.patch(
+        f'{_MANAGER_PACKAGE}.custom_entries_multi_file_reader.CustomEntriesMultiFileReader')
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_parquet_reader.CustomEntriesParquetReader')
+    def test_list_input_files_should_list_files_of_the_input_format(self, mock_parquet_reader,
+                                                                    mock_multi_file_reader):
+
+        list_input_files = custom_entries_sync_steps.CustomEntriesSyncSteps.list_input_files
+        mock_parquet_reader.FILE_EXTENSION = '.parquet'
+
+        self.assertEqual('file-path', list_input_files(None, None, 'file-path'))
+        self.assertEqual(mock_multi_file_reader.list_files.return_value,
+                         list_input_files(None, None, ['file-path', 'dir-path']))
+        mock_multi_file_reader.list_files.assert_called_once_with(['file-path', 'dir-path'],
+                                                                  '.parquet')
+        self.assertRaises(Exception, list_input_files, None, None)
+
+    def test_resolve_entry_groups_should_resolve_pending_entry_groups_with_entries(self):
+        client_pool = mock.MagicMock()
+        checkpoint = mock.MagicMock()
+        checkpoint.is_completed.side_effect = \
+            lambda system_name, group_id: group_id == 'completed-group'
+        sync_steps = custom_entries_sync_steps.CustomEntriesSyncSteps('test-project',
+                                                                      'test-location',
+                                                                      self.__entry_factory,
+                                                                      client_pool=client_pool)
+
+        sync_steps.resolve_entry_groups([('TestSystem', [{
+            'id': 'test-group',
+            'entries': [{}]
+        }, {
+            'id': 'empty-group',
+            'entries': []
+        }, {
+            'id': 'completed-group',
+            'entries': [{}]
+        }, {
+            'entries': [{}]
+        }])],
+                                        checkpoint,
+                                        max_workers=4)
+
+        client_pool.resolve_entry_groups.assert_called_once_with(['test-group'], 4)
+
+    def test_resolve_entry_groups_api_error_should_not_fail(self):
+        client_pool = mock.MagicMock()
+        client_pool.resolve_entry_groups.side_effect = exceptions.PermissionDenied('list')
+        sync_steps = custom_entries_sync_steps.CustomEntriesSyncSteps('test-project',
+                                                                      'test-location',
+                                                                      self.__entry_factory,
+                                                                      client_pool=client_pool)
+
+        sync_steps.resolve_entry_groups([('TestSystem', [{'id': 'test-group', 'entries': [{}]}])])
+        sync_steps.resolve_entry_groups([('TestSystem', [{'id': 'empty-group'}])])
+
+        client_pool.resolve_entry_groups.assert_called_once()
+
+    def test_prepare_entries_no_entries_should_return_empty_list(self):
+        self.assertEqual([], self.__sync_steps.prepare_entries('test-group', 'TestSystem', None))
+        self.__entry_factory.make_entries_from_dicts.assert_not_called()
+
+    def test_get_changes_no_previous_state_should_return_none(self):
+        self.assertIsNone(
+            self.__sync_steps.get_changes('test-group', 'TestSystem',
+                                          [self.__make_assembled_entry('entry_1')]))
+
+    def test_save_state_should_allow_detecting_changes(self):
+        assembled_entries = [self.__make_assembled_entry('entry_1')]
+        self.__sync_steps.save_state('test-group', 'TestSystem', assembled_entries, None)
+
+        changes = self.__sync_steps.get_changes(
+            'test-group', 'TestSystem',
+            [self.__make_assembled_entry('entry_1'),
+             self.__make_assembled_entry('entry_2')])
+
+        self.assertEqual(['entry_2'], [entry.entry_id for entry in changes.created])
+        self.assertEqual(1, len(changes.unchanged))
+
+    @mock.patch(f'{__DATACATALOG_CLIENT}.__init__', return_value=None)
+    @mock.patch(f'{__DATACATALOG_CLIENT}.delete_entry')
+    def test_delete_entry_should_share_client(self, mock_delete_entry, mock_client_init):
+        self.assertTrue(self.__sync_steps.delete_entry('test-group', 'TestSystem', 'entry_1'))
+        self.assertTrue(self.__sync_steps.delete_entry('test-group', 'TestSystem', 'entry_2'))
+
+        mock_client_init.assert_called_once()
+        mock_delete_entry.assert_called_with(
+            name='projects/test-project/locations/'
+            'test-location/entryGroups/test-group/entries/entry_2')
+
+    @mock.patch(f'{__DATACATALOG_CLIENT}.__init__', lambda self: None)
+    @mock.patch(f'{__DATACATALOG_CLIENT}.delete_entry')
+    def test_delete_entry_should_only_confirm_deleted_entries(self, mock_delete_entry):
+        mock_delete_entry.side_effect = exceptions.PermissionDenied('entry')
+        self.assertTrue(self.__sync_steps.delete_entry('test-group', 'TestSystem', 'entry_1'))
+
+        mock_delete_entry.side_effect = exceptions.ServiceUnavailable('entry')
+        self.assertFalse(self.__sync_steps.delete_entry('test-group', 'TestSystem', 'entry_1'))
+
+    def test_delete_entry_should_use_client_pool(self):
+        client_pool = mock.MagicMock()
+        sync_steps = custom_entries_sync_steps.CustomEntriesSyncSteps('test-project',
+                                                                      'test-location',
+                                                                      self.__entry_factory,
+                                                                      client_pool=client_pool)
+
+        sync_steps.delete_entry('test-group', 'TestSystem', 'entry_1')
+
+        client_pool.get_client.return_value.delete_entry.assert_called_once()
+
+    @mock.patch(f'{__DATACATALOG_CLIENT}.__init__', lambda self: None)
+    @mock.patch(f'{__DATACATALOG_CLIENT}.create_entry_group')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.create_entry')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.update_entry')
+    def test_ingest_entries_with_sync_state_should_return_failed_entry_ids(
+            self, mock_update_entry, mock_create_entry, mock_create_entry_group):
+
+        mock_create_entry_group.side_effect = exceptions.AlreadyExists('test-group')
+        mock_update_entry.side_effect = [
+            None,
+            exceptions.PermissionDenied('entry_2'),
+            exceptions.FailedPrecondition('entry_3')
+        ]
+
+        failed_entry_ids = self.__sync_steps.ingest_entries('test-group', 'TestSystem', [
+            self.__make_assembled_entry('entry_1'),
+            self.__make_assembled_entry('entry_2'),
+            self.__make_assembled_entry('entry_3')
+        ])
+
+        self.assertEqual(['entry_3'], failed_entry_ids)
+        self.assertEqual('entry_2', mock_create_entry.call_args[1]['entry_id'])
+
+    def test_save_state_failed_entries_should_keep_previous_fingerprints(self):
+        self.__sync_steps.save_state(
+            'test-group', 'TestSystem',
+            [self.__make_assembled_entry('entry_1'),
+             self.__make_assembled_entry('entry_2')], None)
+
+        assembled_entries = [
+            self.__make_assembled_entry('entry_1', 'modified'),
+            self.__make_assembled_entry('entry_3')
+        ]
+        changes = self.__sync_steps.get_changes('test-group', 'TestSystem', assembled_entries)
+
+        self.assertRaises(Exception, self.__sync_steps.save_state, 'test-group', 'TestSystem',
+                          assembled_entries, changes, ['entry_1', 'entry_2', 'entry_3'])
+
+        changes = self.__sync_steps.get_changes('test-group', 'TestSystem', assembled_entries)
+        self.assertEqual(['entry_3'], [entry.entry_id for entry in changes.created])
+        self.assertEqual(['entry_1'], [entry.entry_id for entry in changes.modified])
+        self.assertEqual(['entry_2'], changes.deleted_entry_ids)
+
+    @classmethod
+    def __make_assembled_entry(cls, entry_id, description=None):
+        entry = types.Entry()
+        entry.name = f'projects/test-project/locations/test-location/entryGroups/test-group/' \
+                     f'entries/{entry_id}'
+        entry.display_name = entry_id
+        if description:
+            entry.description = description
+        return prepare.AssembledEntryData(entry_id, entry)
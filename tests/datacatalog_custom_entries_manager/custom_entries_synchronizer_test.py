@@ -1,20 +1,32 @@
+import threading
+import time
 import unittest
 from unittest import mock
 
-from datacatalog_custom_entries_manager import custom_entries_synchronizer
+from google.api_core import exceptions
+from google.cloud.datacatalog import types
+
+from datacatalog_custom_entries_manager import custom_entries_filter, custom_entries_sync_state, \
+    custom_entries_sync_steps, custom_entries_synchronizer
 
 _MANAGER_PACKAGE = 'datacatalog_custom_entries_manager'
 
 
 @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_csv_reader.CustomEntriesCSVReader')
 class CustomEntriesSynchronizer(unittest.TestCase):
-    __CONNECTORS_COMMONS_PACKAGE = 'google.datacatalog_connectors.commons'
+    __CLIENT_POOL = f'{_MANAGER_PACKAGE}.datacatalog_client_pool.DataCatalogClientPool'
+    __DATACATALOG_CLIENT = 'google.cloud.datacatalog.DataCatalogClient'
 
     @mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory')
     def setUp(self, mock_entry_factory):
         self.__synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
             'test-project', 'test-location')
 
+        # The Entry Groups are not resolved against a live Data Catalog.
+        resolve_patcher = mock.patch(f'{self.__CLIENT_POOL}.resolve_entry_groups')
+        self.__mock_resolve_entry_groups = resolve_patcher.start()
+        self.addCleanup(resolve_patcher.stop)
+
     def test_constructor_should_set_instance_attributes(self, mock_csv_reader):
         attrs = self.__synchronizer.__dict__
 
@@ -44,6 +56,27 @@ class CustomEntriesSynchronizer(unittest.TestCase):
         mock_csv_reader.read_file.assert_not_called()
         mock_json_reader.read_file.assert_called_once()
 
+    def test_sync_to_file_stream_csv_file_path_should_call_csv_reader_stream(
+            self, mock_csv_reader):
+
+        mock_csv_reader.stream_file.return_value = iter([])
+
+        self.__synchronizer.sync_to_file(csv_file_path='file-path', stream=True)
+
+        mock_csv_reader.stream_file.assert_called_once_with('file-path')
+        mock_csv_reader.read_file.assert_not_called()
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_json_reader.CustomEntriesJSONReader')
+    def test_sync_to_file_stream_json_file_path_should_call_json_reader_stream(
+            self, mock_json_reader, mock_csv_reader):
+
+        mock_json_reader.stream_file.return_value = iter([])
+
+        self.__synchronizer.sync_to_file(json_file_path='file-path', stream=True)
+
+        mock_json_reader.stream_file.assert_called_once_with('file-path')
+        mock_json_reader.read_file.assert_not_called()
+
     def test_sync_to_file_no_file_path_should_fail(self, mock_csv_reader):
         self.assertRaises(Exception, self.__synchronizer.sync_to_file)
 
@@ -55,7 +88,7 @@ class CustomEntriesSynchronizer(unittest.TestCase):
         mock_csv_reader.read_file.return_value = [('TestSystem', [{}])]
         self.assertIsNotNone(self.__synchronizer.sync_to_file(csv_file_path='file-path'))
 
-    @mock.patch(f'{__CONNECTORS_COMMONS_PACKAGE}.cleanup.DataCatalogMetadataCleaner')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
     def test_sync_to_file_no_entries_should_cleanup_catalog(self, mock_metadata_cleaner,
                                                             mock_csv_reader):
 
@@ -66,8 +99,8 @@ class CustomEntriesSynchronizer(unittest.TestCase):
         cleaner = mock_metadata_cleaner.return_value
         cleaner.delete_obsolete_metadata.assert_called_once()
 
-    @mock.patch(f'{__CONNECTORS_COMMONS_PACKAGE}.ingest.DataCatalogMetadataIngestor')
-    @mock.patch(f'{__CONNECTORS_COMMONS_PACKAGE}.cleanup.DataCatalogMetadataCleaner')
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
     def test_sync_to_file_with_entries_should_ingest_into_catalog(self, mock_metadata_cleaner,
                                                                   mock_metadata_ingestor,
                                                                   mock_csv_reader):
@@ -78,9 +111,509 @@ class CustomEntriesSynchronizer(unittest.TestCase):
         }])]
 
         entry_factory = self.__synchronizer.__dict__['_CustomEntriesSynchronizer__entry_factory']
-        entry_factory.make_entry_from_dict.return_value = ('entry_id', {})
+        entry_factory.make_entries_from_dicts.return_value = [('entry_id', {})]
 
         self.__synchronizer.sync_to_file(csv_file_path='file-path')
 
         ingestor = mock_metadata_ingestor.return_value
         ingestor.ingest_metadata.assert_called_once()
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_failed_entry_group_should_not_stop_others(self, mock_metadata_cleaner,
+                                                                    mock_metadata_ingestor,
+                                                                    mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id': 'testgroup1',
+            'entries': [{}]
+        }, {
+            'id': 'testgroup2',
+            'entries': [{}]
+        }])]
+
+        entry_factory = self.__synchronizer.__dict__['_CustomEntriesSynchronizer__entry_factory']
+        entry_factory.make_entries_from_dicts.side_effect = [ValueError(), [('entry_id', {})]]
+
+        entries = self.__synchronizer.sync_to_file(csv_file_path='file-path')
+
+        self.assertEqual([[], [{}]], entries)
+        ingestor = mock_metadata_ingestor.return_value
+        ingestor.ingest_metadata.assert_called_once()
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_duplicate_entry_ids_should_fail_before_api_calls(
+            self, mock_metadata_cleaner, mock_metadata_ingestor, mock_csv_reader):
+
+        mock_csv_reader.stream_file.return_value = iter([('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'source': 'row 2'
+            }, {
+                'source': 'row 3'
+            }]
+        }])])
+
+        entry_factory = self.__synchronizer.__dict__['_CustomEntriesSynchronizer__entry_factory']
+        entry_factory.make_entries_from_dicts.return_value = [('entry_id', {}), ('entry_id', {})]
+
+        results = list(self.__synchronizer.stream_sync_to_file(csv_file_path='file-path'))
+
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertIn('row 2, row 3', str(results[0].error))
+        mock_metadata_cleaner.assert_not_called()
+        mock_metadata_ingestor.assert_not_called()
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    @mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory')
+    def test_sync_to_file_multiple_workers_should_keep_entry_groups_order(
+            self, mock_entry_factory, mock_metadata_cleaner, mock_metadata_ingestor,
+            mock_csv_reader):
+
+        entry_groups = [{
+            'id': f'testgroup{index}',
+            'entries': [{
+                'display_name': f'entry{index}'
+            }]
+        } for index in range(10)]
+        mock_csv_reader.read_file.return_value = [('TestSystem', entry_groups)]
+
+        mock_entry_factory.return_value.make_entries_from_dicts.side_effect = \
+            lambda group_id, data_list: [(data['display_name'], data['display_name'])
+                                         for data in data_list]
+
+        synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer('test-project',
+                                                                             'test-location',
+                                                                             max_workers=4)
+        entries = synchronizer.sync_to_file(csv_file_path='file-path')
+
+        self.assertEqual([[f'entry{index}'] for index in range(10)], entries)
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    @mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory')
+    def test_sync_to_file_multiple_workers_should_serialize_entry_groups_of_same_system(
+            self, mock_entry_factory, mock_metadata_cleaner, mock_metadata_ingestor,
+            mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [
+            ('TestSystem1', [{
+                'id': 'testgroup1',
+                'entries': [{
+                    'display_name': 'entry_1'
+                }]
+            }, {
+                'id': 'testgroup2',
+                'entries': [{
+                    'display_name': 'entry_2'
+                }]
+            }]),
+            ('TestSystem2', [{
+                'id': 'testgroup3',
+                'entries': [{
+                    'display_name': 'entry_3'
+                }]
+            }]),
+        ]
+
+        mock_entry_factory.return_value.make_entries_from_dicts.side_effect = \
+            self.__make_entries_from_dicts
+
+        lock = threading.Lock()
+        calls = []
+
+        def delete_obsolete_metadata(assembled_entries, query):
+            with lock:
+                calls.append(('cleanup', assembled_entries[0].entry_id))
+            time.sleep(0.02)
+
+        def ingest_metadata(assembled_entries):
+            with lock:
+                calls.append(('ingest', assembled_entries[0].entry_id))
+
+        mock_metadata_cleaner.return_value.delete_obsolete_metadata.side_effect = \
+            delete_obsolete_metadata
+        mock_metadata_ingestor.return_value.ingest_metadata.side_effect = ingest_metadata
+
+        synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer('test-project',
+                                                                             'test-location',
+                                                                             max_workers=4)
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        system_1_calls = [call for call in calls if call[1] != 'entry_3']
+        self.assertEqual([('cleanup', 'entry_1'), ('ingest', 'entry_1'), ('cleanup', 'entry_2'),
+                          ('ingest', 'entry_2')], system_1_calls)
+        # Entry Groups of other systems do not wait.
+        self.assertLess(calls.index(('cleanup', 'entry_3')), calls.index(('cleanup', 'entry_2')))
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    @mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory')
+    def test_sync_to_file_multiple_workers_should_serialize_entry_groups_of_same_id(
+            self, mock_entry_factory, mock_metadata_cleaner, mock_metadata_ingestor,
+            mock_csv_reader):
+
+        mock_csv_reader.read_file.return_value = [
+            ('TestSystem1', [{
+                'id': 'testgroup',
+                'entries': [{
+                    'display_name': 'entry_1'
+                }]
+            }]),
+            ('TestSystem2', [{
+                'id': 'testgroup',
+                'entries': [{
+                    'display_name': 'entry_2'
+                }]
+            }]),
+        ]
+
+        mock_entry_factory.return_value.make_entries_from_dicts.side_effect = \
+            self.__make_entries_from_dicts
+
+        lock = threading.Lock()
+        calls = []
+
+        def delete_obsolete_metadata(assembled_entries, query):
+            with lock:
+                calls.append(('cleanup', assembled_entries[0].entry_id))
+            time.sleep(0.02)
+
+        def ingest_metadata(assembled_entries):
+            with lock:
+                calls.append(('ingest', assembled_entries[0].entry_id))
+
+        mock_metadata_cleaner.return_value.delete_obsolete_metadata.side_effect = \
+            delete_obsolete_metadata
+        mock_metadata_ingestor.return_value.ingest_metadata.side_effect = ingest_metadata
+
+        synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer('test-project',
+                                                                             'test-location',
+                                                                             max_workers=4)
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        # The cleanup of a system never runs while the other one ingests into the Entry Group.
+        self.assertEqual([('cleanup', 'entry_1'), ('ingest', 'entry_1'), ('cleanup', 'entry_2'),
+                          ('ingest', 'entry_2')], calls)
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_stream_sync_to_file_raise_on_failure_should_raise_after_last_result(
+            self, mock_metadata_cleaner, mock_metadata_ingestor, mock_csv_reader):
+
+        mock_csv_reader.stream_file.return_value = iter([('TestSystem', [{
+            'id': 'testgroup1',
+            'entries': [{}]
+        }, {
+            'id': 'testgroup2',
+            'entries': [{}]
+        }])])
+
+        entry_factory = self.__synchronizer.__dict__['_CustomEntriesSynchronizer__entry_factory']
+        entry_factory.make_entries_from_dicts.side_effect = [ValueError(), [('entry_id', {})]]
+
+        results = self.__synchronizer.stream_sync_to_file(csv_file_path='file-path',
+                                                          raise_on_failure=True)
+
+        self.assertIsInstance(next(results).error, ValueError)
+        self.assertIsNone(next(results).error)
+        self.assertRaises(custom_entries_sync_steps.EntryGroupSyncError, next, results)
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_sync_to_file_should_resolve_entry_groups_upfront_unless_streaming(
+            self, mock_metadata_cleaner, mock_metadata_ingestor, mock_csv_reader):
+
+        entry_groups = [('TestSystem', [{'id': 'testgroup', 'entries': [{}]}])]
+        mock_csv_reader.read_file.return_value = entry_groups
+        mock_csv_reader.stream_file.return_value = iter(entry_groups)
+        entry_factory = self.__synchronizer.__dict__['_CustomEntriesSynchronizer__entry_factory']
+        entry_factory.make_entries_from_dicts.return_value = [('entry_id', {})]
+
+        self.__synchronizer.sync_to_file(csv_file_path='file-path')
+        self.__mock_resolve_entry_groups.assert_called_once_with(['testgroup'], 1)
+
+        self.__synchronizer.sync_to_file(csv_file_path='file-path', stream=True)
+        self.__mock_resolve_entry_groups.assert_called_once()
+
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_stream_sync_to_file_should_yield_results_lazily(self, mock_metadata_cleaner,
+                                                             mock_metadata_ingestor,
+                                                             mock_csv_reader):
+
+        mock_csv_reader.stream_file.return_value = iter([
+            ('TestSystem', [{
+                'id': 'testgroup1',
+                'entries': [{}]
+            }]),
+            ('TestSystem', [{
+                'id': 'testgroup2',
+                'entries': [{}]
+            }]),
+        ])
+
+        entry_factory = self.__synchronizer.__dict__['_CustomEntriesSynchronizer__entry_factory']
+        entry_factory.make_entries_from_dicts.return_value = [('entry_id', {})]
+
+        results = self.__synchronizer.stream_sync_to_file(csv_file_path='file-path')
+
+        mock_csv_reader.stream_file.assert_not_called()
+
+        result_1 = next(results)
+        self.assertEqual('TestSystem', result_1.system_name)
+        self.assertEqual('testgroup1', result_1.group_id)
+        self.assertEqual([{}], result_1.entries)
+        self.assertIsNone(result_1.error)
+
+        self.assertEqual('testgroup2', next(results).group_id)
+        self.assertRaises(StopIteration, next, results)
+
+        mock_csv_reader.stream_file.assert_called_once_with('file-path')
+        mock_csv_reader.read_file.assert_not_called()
+
+    @mock.patch(f'{__DATACATALOG_CLIENT}.__init__', lambda self: None)
+    @mock.patch(f'{__DATACATALOG_CLIENT}.create_entry_group')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.create_entry')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.update_entry')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.delete_entry')
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    @mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory')
+    def test_sync_to_file_with_sync_state_should_only_send_changes(
+            self, mock_entry_factory, mock_metadata_cleaner, mock_metadata_ingestor,
+            mock_delete_entry, mock_update_entry, mock_create_entry, mock_create_entry_group,
+            mock_csv_reader):
+
+        mock_entry_factory.return_value.make_entries_from_dicts.side_effect = \
+            self.__make_entries_from_dicts
+
+        synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
+            'test-project',
+            'test-location',
+            sync_state=custom_entries_sync_state.CustomEntriesSyncState())
+
+        cleaner = mock_metadata_cleaner.return_value
+
+        # First run: no previous state, so the Entry Group is fully synchronized.
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }, {
+                'display_name': 'entry_2'
+            }]
+        }])]
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        cleaner.delete_obsolete_metadata.assert_called_once()
+        # The Entries are written by the client, so write errors are not swallowed.
+        mock_metadata_ingestor.return_value.ingest_metadata.assert_not_called()
+        mock_create_entry_group.assert_called_once()
+        self.assertEqual(2, mock_update_entry.call_count)
+
+        # Second run: unchanged input, nothing is sent.
+        mock_update_entry.reset_mock()
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        mock_update_entry.assert_not_called()
+        mock_delete_entry.assert_not_called()
+
+        # Third run: one Entry created and one deleted.
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }, {
+                'display_name': 'entry_3'
+            }]
+        }])]
+        mock_update_entry.side_effect = exceptions.PermissionDenied('entry_3')
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        cleaner.delete_obsolete_metadata.assert_called_once()
+        mock_delete_entry.assert_called_once_with(
+            name='projects/test-project/locations/test-location/'
+            'entryGroups/testgroup/entries/entry_2')
+        self.assertEqual('entry_3', mock_create_entry.call_args[1]['entry_id'])
+
+    @mock.patch(f'{__DATACATALOG_CLIENT}.__init__', lambda self: None)
+    @mock.patch(f'{__DATACATALOG_CLIENT}.create_entry_group')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.update_entry')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.delete_entry')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    @mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory')
+    def test_sync_to_file_with_sync_state_failed_writes_should_be_retried(
+            self, mock_entry_factory, mock_metadata_cleaner, mock_delete_entry, mock_update_entry,
+            mock_create_entry_group, mock_csv_reader):
+
+        mock_entry_factory.return_value.make_entries_from_dicts.side_effect = \
+            self.__make_entries_from_dicts
+
+        synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
+            'test-project',
+            'test-location',
+            sync_state=custom_entries_sync_state.CustomEntriesSyncState())
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }, {
+                'display_name': 'entry_2'
+            }]
+        }])]
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        # Both writes fail: the Entry Group fails and nothing is recorded as synchronized.
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'testgroup',
+            'entries': [{
+                'display_name': 'entry_3'
+            }]
+        }])]
+        mock_delete_entry.side_effect = exceptions.DeadlineExceeded('entry_1')
+        mock_update_entry.side_effect = exceptions.FailedPrecondition('entry_3')
+
+        with self.assertRaises(custom_entries_sync_steps.EntryGroupSyncError):
+            synchronizer.sync_to_file(csv_file_path='file-path', raise_on_failure=True)
+
+        # Next run: the failed deletions and writes are sent again.
+        mock_delete_entry.reset_mock()
+        mock_delete_entry.side_effect = None
+        mock_update_entry.reset_mock()
+        mock_update_entry.side_effect = None
+        synchronizer.sync_to_file(csv_file_path='file-path', raise_on_failure=True)
+
+        self.assertEqual(2, mock_delete_entry.call_count)
+        mock_update_entry.assert_called_once()
+        mock_metadata_cleaner.return_value.delete_obsolete_metadata.assert_called_once()
+
+    @mock.patch(f'{__DATACATALOG_CLIENT}.__init__', lambda self: None)
+    @mock.patch(f'{__DATACATALOG_CLIENT}.create_entry_group')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.update_entry')
+    @mock.patch(f'{__DATACATALOG_CLIENT}.delete_entry')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    @mock.patch(f'{_MANAGER_PACKAGE}.datacatalog_entry_factory.DataCatalogEntryFactory')
+    def test_sync_to_file_with_sync_state_should_delete_removed_entry_groups(
+            self, mock_entry_factory, mock_metadata_cleaner, mock_delete_entry, mock_update_entry,
+            mock_create_entry_group, mock_csv_reader):
+
+        mock_entry_factory.return_value.make_entries_from_dicts.side_effect = \
+            self.__make_entries_from_dicts
+
+        sync_state = custom_entries_sync_state.CustomEntriesSyncState()
+        synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer('test-project',
+                                                                             'test-location',
+                                                                             sync_state=sync_state)
+
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'keptgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }, {
+            'id':
+            'removedgroup',
+            'entries': [{
+                'display_name': 'entry_2'
+            }, {
+                'display_name': 'entry_3'
+            }]
+        }, {
+            'id':
+            'filteredgroup',
+            'entries': [{
+                'display_name': 'entry_4'
+            }]
+        }])]
+        synchronizer.sync_to_file(csv_file_path='file-path')
+
+        # The whole removedgroup is dropped from the input, filteredgroup is not read.
+        mock_csv_reader.read_file.return_value = [('TestSystem', [{
+            'id':
+            'keptgroup',
+            'entries': [{
+                'display_name': 'entry_1'
+            }]
+        }])]
+        mock_delete_entry.side_effect = [exceptions.DeadlineExceeded('entry_2'), None]
+        entries_filter = custom_entries_filter.CustomEntriesFilter(exclude_groups=('filtered*', ))
+
+        with self.assertRaises(custom_entries_sync_steps.EntryGroupSyncError):
+            synchronizer.sync_to_file(csv_file_path='file-path',
+                                      raise_on_failure=True,
+                                      entries_filter=entries_filter)
+
+        removed_entry_group_name = \
+            'projects/test-project/locations/test-location/entryGroups/removedgroup'
+        self.assertEqual({'entry_2'},
+                         set(
+                             sync_state.get_entry_fingerprints(removed_entry_group_name,
+                                                               'TestSystem')))
+
+        # Next run: the failed deletion is sent again, then the Entry Group is forgotten.
+        mock_delete_entry.reset_mock()
+        mock_delete_entry.side_effect = None
+        synchronizer.sync_to_file(csv_file_path='file-path',
+                                  raise_on_failure=True,
+                                  entries_filter=entries_filter)
+
+        mock_delete_entry.assert_called_once_with(
+            name=f'{removed_entry_group_name}/entries/entry_2')
+        self.assertIsNone(sync_state.get_entry_fingerprints(removed_entry_group_name,
+                                                            'TestSystem'))
+        self.assertEqual([
+            'projects/test-project/locations/test-location/entryGroups/filteredgroup',
+            'projects/test-project/locations/test-location/entryGroups/keptgroup'
+        ], sync_state.list_entry_group_names('TestSystem'))
+        self.assertEqual(3, mock_metadata_cleaner.return_value.delete_obsolete_metadata.call_count)
+
+    @classmethod
+    def __make_entries_from_dicts(cls, group_id, data_list):
+        entries = []
+        for data in data_list:
+            entry = types.Entry()
+            entry.display_name = data['display_name']
+            entries.append((data['display_name'], entry))
+        return entries
+
+    @mock.patch(f'{_MANAGER_PACKAGE}.custom_entries_sync_checkpoint.CustomEntriesSyncCheckpoint')
+    @mock.patch(f'{__CLIENT_POOL}.make_ingestor')
+    @mock.patch(f'{__CLIENT_POOL}.make_cleaner')
+    def test_stream_sync_to_file_resume_should_skip_completed_entry_groups(
+            self, mock_metadata_cleaner, mock_metadata_ingestor, mock_checkpoint, mock_csv_reader):
+
+        mock_csv_reader.stream_file.return_value = iter([('TestSystem', [{
+            'id': 'completedgroup',
+            'entries': [{}]
+        }, {
+            'id': 'pendinggroup',
+            'entries': [{}]
+        }])])
+
+        checkpoint = mock_checkpoint.return_value
+        checkpoint.is_completed.side_effect = \
+            lambda system_name, group_id: group_id == 'completedgroup'
+
+        entry_factory = self.__synchronizer.__dict__['_CustomEntriesSynchronizer__entry_factory']
+        entry_factory.make_entries_from_dicts.return_value = [('entry_id', {})]
+
+        results = list(
+            self.__synchronizer.stream_sync_to_file(csv_file_path='file-path',
+                                                    checkpoint_file_path='checkpoint-path',
+                                                    resume=True))
+
+        mock_checkpoint.assert_called_once_with('checkpoint-path', 'file-path', True)
+        self.assertTrue(results[0].skipped)
+        self.assertFalse(results[1].skipped)
+        mock_metadata_ingestor.return_value.ingest_metadata.assert_called_once()
+        checkpoint.mark_completed.assert_called_once_with('TestSystem', 'pendinggroup')
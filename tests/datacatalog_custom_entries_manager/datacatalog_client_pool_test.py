@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.datacatalog_connectors.commons import cleanup, datacatalog_facade, ingest
+
+from datacatalog_custom_entries_manager import datacatalog_client_pool
+
+
+@mock.patch('google.cloud.datacatalog.DataCatalogClient.__init__', return_value=None)
+class DataCatalogClientPoolTest(unittest.TestCase):
+
+    def test_constructor_non_positive_size_should_fail(self, mock_client_init):
+        self.assertRaises(ValueError, datacatalog_client_pool.DataCatalogClientPool,
+                          'test-project', 'test-location', 0)
+
+    def test_get_client_should_create_clients_once_and_hand_them_out_in_turns(
+            self, mock_client_init):
+
+        client_pool = datacatalog_client_pool.DataCatalogClientPool('test-project',
+                                                                    'test-location',
+                                                                    size=2)
+
+        clients = [client_pool.get_client() for _ in range(5)]
+
+        self.assertEqual(2, client_pool.size)
+        self.assertEqual(2, mock_client_init.call_count)
+        self.assertIsNot(clients[0], clients[1])
+        self.assertEqual([clients[0], clients[1]] * 2 + [clients[0]], clients)
+
+    @mock.patch('google.cloud.datacatalog.DataCatalogClient.get_entry')
+    def test_get_client_rate_limiter_should_limit_requests(self, mock_get_entry, mock_client_init):
+        rate_limiter = mock.MagicMock()
+        client_pool = datacatalog_client_pool.DataCatalogClientPool('test-project',
+                                                                    'test-location',
+                                                                    rate_limiter=rate_limiter)
+
+        client_pool.get_client().get_entry(name='entry-name')
+
+        rate_limiter.call.assert_called_once_with(mock_get_entry, name='entry-name')
+
+    @mock.patch('google.cloud.datacatalog.DataCatalogClient.create_entry_group')
+    @mock.patch('google.cloud.datacatalog.DataCatalogClient.list_entry_groups')
+    def test_resolve_entry_groups_should_skip_creating_them_again(self, mock_list_entry_groups,
+                                                                  mock_create_entry_group,
+                                                                  mock_client_init):
+
+        mock_list_entry_groups.return_value = []
+        client_pool = datacatalog_client_pool.DataCatalogClientPool('test-project',
+                                                                    'test-location',
+                                                                    size=2)
+
+        client_pool.resolve_entry_groups(['test-group'])
+        mock_create_entry_group.assert_called_once()
+
+        # The commons ingestor falls back to the Entry Group name on AlreadyExists.
+        self.assertRaises(exceptions.AlreadyExists,
+                          client_pool.make_facade().create_entry_group, 'test-location',
+                          'test-group')
+        mock_create_entry_group.assert_called_once()
+
+    def test_make_facade_should_use_pooled_client(self, mock_client_init):
+        client_pool = datacatalog_client_pool.DataCatalogClientPool('test-project',
+                                                                    'test-location')
+
+        facade = client_pool.make_facade()
+
+        self.assertIsInstance(facade, datacatalog_facade.DataCatalogFacade)
+        self.assertIs(client_pool.get_client(), facade.__dict__['_DataCatalogFacade__datacatalog'])
+
+    def test_make_cleaner_and_ingestor_should_share_pooled_client(self, mock_client_init):
+        client_pool = datacatalog_client_pool.DataCatalogClientPool('test-project',
+                                                                    'test-location')
+
+        cleaner = client_pool.make_cleaner('test-group-1')
+        ingestor = client_pool.make_ingestor('test-group-2')
+
+        self.assertIsInstance(cleaner, cleanup.DataCatalogMetadataCleaner)
+        self.assertIsInstance(ingestor, ingest.DataCatalogMetadataIngestor)
+        mock_client_init.assert_called_once()
+
+        attrs = ingestor.__dict__
+        self.assertEqual('test-project', attrs['_DataCatalogMetadataIngestor__project_id'])
+        self.assertEqual('test-location', attrs['_DataCatalogMetadataIngestor__location_id'])
+        self.assertEqual('test-group-2', attrs['_DataCatalogMetadataIngestor__entry_group_id'])
+
+    @mock.patch('google.cloud.datacatalog.DataCatalogClient.search_catalog')
+    @mock.patch('google.cloud.datacatalog.DataCatalogClient.delete_entry')
+    def test_make_cleaner_should_delete_obsolete_entries_with_pooled_client(
+            self, mock_delete_entry, mock_search_catalog, mock_client_init):
+
+        search_result = mock.MagicMock()
+        search_result.relative_resource_name = \
+            'projects/test-project/locations/test-location/entryGroups/test-group/entries/old'
+        mock_search_catalog.return_value = [search_result]
+
+        client_pool = datacatalog_client_pool.DataCatalogClientPool('test-project',
+                                                                    'test-location')
+        with mock.patch('google.cloud.datacatalog.DataCatalogClient.delete_entry_group'):
+            client_pool.make_cleaner('test-group').delete_obsolete_metadata([], 'system=Test')
+
+        mock_delete_entry.assert_called_once_with(name=search_result.relative_resource_name)
@@ -1,6 +1,12 @@
+from datetime import datetime
 import unittest
 
-from datacatalog_custom_entries_manager import datacatalog_entry_factory
+from google.cloud import datacatalog
+from google.cloud.datacatalog import types
+from google.datacatalog_connectors.commons import prepare
+import numpy as np
+
+from datacatalog_custom_entries_manager import custom_entries_record, datacatalog_entry_factory
 
 
 class DataCatalogEntryFactoryTest(unittest.TestCase):
@@ -27,6 +33,20 @@ class DataCatalogEntryFactoryTest(unittest.TestCase):
         self.assertEqual('//test/linked-resource', entry.linked_resource)
         self.assertEqual('Test display name', entry.display_name)
 
+    def test_make_entry_from_dict_over_length_display_name_should_truncate_id(self):
+        data = {
+            'linked_resource': '//test/linked-resource',
+            'display_name': f'Test display name {"x" * 64}',
+            'user_specified_type': 'Test specified type',
+            'user_specified_system': 'Test specified system',
+        }
+
+        entry_id, entry = self.__data_catalog_entry_factory.make_entry_from_dict(
+            'test-group', data)
+
+        self.assertEqual(f'test_display_name_{"x" * 64}'[:64], entry_id)
+        self.assertTrue(entry.name.endswith(f'/entries/{entry_id}'))
+
     def test_make_entry_from_dict_missing_display_name_should_fail(self):
         data = {
             'linked_resource': '//test/linked-resource',
@@ -86,3 +106,107 @@ class DataCatalogEntryFactoryTest(unittest.TestCase):
 
         self.assertRaises(ValueError, self.__data_catalog_entry_factory.make_entry_from_dict,
                           'test-group', data)
+
+    def test_make_entries_from_dicts_should_match_uncached_conversion(self):
+        # Repeated display names and timestamps are served from the caches.
+        data_list = [{
+            'linked_resource': f'//test/linked-resource-{index}',
+            'display_name': f'Test display name {index % 2}',
+            'description': 'Test description',
+            'user_specified_type': 'Test specified type',
+            'user_specified_system': 'Test specified system',
+            'created_at': '2020-10-10T17:25:00-0300',
+            'updated_at': f'2020-10-10T17:2{index % 2}:30-0300',
+        } for index in range(4)]
+
+        entries = self.__data_catalog_entry_factory.make_entries_from_dicts(
+            'test-group', data_list)
+
+        self.assertEqual(4, len(entries))
+        for data, (entry_id, entry) in zip(data_list, entries):
+            expected_entry_id, expected_entry = self.__make_uncached_entry('test-group', data)
+            self.assertEqual(expected_entry_id, entry_id)
+            self.assertEqual(expected_entry.SerializeToString(), entry.SerializeToString())
+
+        self.assertEqual(1602361500, entries[0][1].source_system_timestamps.create_time.seconds)
+
+    def test_make_entries_from_dicts_should_set_entry_names(self):
+        data_list = [{
+            'linked_resource': '//test/linked-resource',
+            'display_name': 'Test display name',
+            'user_specified_type': 'Test specified type',
+            'user_specified_system': 'Test specified system',
+        }]
+
+        entries = self.__data_catalog_entry_factory.make_entries_from_dicts(
+            'test-group', data_list)
+
+        entry_id, entry = entries[0]
+        self.assertEqual('test_display_name', entry_id)
+        self.assertEqual(
+            'projects/test-project/locations/test-location/'
+            'entryGroups/test-group/entries/test_display_name', entry.name)
+
+    def test_make_entries_from_dicts_invalid_timestamp_format_should_fail(self):
+        data_list = [{
+            'linked_resource': '//test/linked-resource',
+            'display_name': 'Test display name',
+            'user_specified_type': 'Test specified type',
+            'user_specified_system': 'Test specified system',
+            'updated_at': '2020-10-10-17:26:30-03:00',
+        }]
+
+        self.assertRaises(ValueError, self.__data_catalog_entry_factory.make_entries_from_dicts,
+                          'test-group', data_list)
+
+    def test_make_entries_from_columns_should_match_dicts_conversion(self):
+        data_list = [{
+            'linked_resource': f'//test/linked-resource-{index}',
+            'display_name': f'Test display name {index}',
+            'user_specified_type': 'Test specified type',
+            'user_specified_system': 'Test specified system',
+        } for index in range(2)]
+        data_list[0]['description'] = 'Test description'
+        data_list[0]['created_at'] = '2020-10-10T17:25:00-0300'
+        data_list[1]['updated_at'] = '2020-10-10T17:26:30-0300'
+
+        columns = custom_entries_record.CustomEntryColumns(
+            'Test specified system', np.array([data['linked_resource'] for data in data_list]),
+            np.array([data['display_name'] for data in data_list]),
+            np.array(['Test specified type'] * 2, dtype=object),
+            np.array(['Test description', None], dtype=object), np.array([1602361500, 0]),
+            np.array([0, 1602361590]), np.arange(2, 4))
+
+        entries = self.__data_catalog_entry_factory.make_entries_from_columns(
+            'test-group', columns)
+
+        self.assertEqual(
+            self.__data_catalog_entry_factory.make_entries_from_dicts('test-group', data_list),
+            entries)
+        self.assertEqual(
+            entries,
+            self.__data_catalog_entry_factory.make_entries_from_dicts('test-group', columns))
+        self.assertEqual(entries, [
+            self.__data_catalog_entry_factory.make_entry_from_dict('test-group', record)
+            for record in columns
+        ])
+
+    @classmethod
+    def __make_uncached_entry(cls, group_id, data):
+        """Build an Entry the way ``make_entry_from_dict`` did before the caches."""
+        entry = types.Entry()
+
+        generated_id = prepare.BaseEntryFactory._format_id(data['display_name'].lower())
+        entry.name = datacatalog.DataCatalogClient.entry_path('test-project', 'test-location',
+                                                              group_id, generated_id)
+        entry.linked_resource = data['linked_resource']
+        entry.display_name = prepare.BaseEntryFactory._format_display_name(data['display_name'])
+        entry.description = data['description']
+        entry.user_specified_type = data['user_specified_type']
+        entry.user_specified_system = data['user_specified_system']
+        entry.source_system_timestamps.create_time.seconds = int(
+            datetime.strptime(data['created_at'], '%Y-%m-%dT%H:%M:%S%z').timestamp())
+        entry.source_system_timestamps.update_time.seconds = int(
+            datetime.strptime(data['updated_at'], '%Y-%m-%dT%H:%M:%S%z').timestamp())
+
+        return generated_id, entry
@@ -0,0 +1,134 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud.datacatalog import types
+
+from datacatalog_custom_entries_manager import datacatalog_entry_group_registry
+
+
+class DataCatalogEntryGroupRegistryTest(unittest.TestCase):
+    __LOCATION_NAME = 'projects/test-project/locations/test-location'
+
+    def setUp(self):
+        self.__registry = datacatalog_entry_group_registry.DataCatalogEntryGroupRegistry(
+            'test-project', 'test-location')
+
+    def test_resolve_should_list_once_and_create_missing_entry_groups(self):
+        client = mock.MagicMock()
+        client.list_entry_groups.return_value = [self.__make_entry_group('existing-group')]
+        client.create_entry_group.side_effect = \
+            lambda parent, entry_group_id, entry_group: self.__make_entry_group(entry_group_id)
+
+        self.__registry.resolve(client, ['existing-group', 'new-group', 'new-group'])
+
+        client.list_entry_groups.assert_called_once_with(parent=self.__LOCATION_NAME)
+        client.create_entry_group.assert_called_once_with(parent=self.__LOCATION_NAME,
+                                                          entry_group_id='new-group',
+                                                          entry_group=types.EntryGroup())
+        self.assertTrue(self.__registry.contains(f'{self.__LOCATION_NAME}/entryGroups/new-group'))
+        self.assertTrue(
+            self.__registry.contains(f'{self.__LOCATION_NAME}/entryGroups/existing-group'))
+
+    def test_resolve_should_create_missing_entry_groups_concurrently(self):
+        client = mock.MagicMock()
+        client.list_entry_groups.return_value = []
+
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = [0]
+
+        def create_entry_group(parent, entry_group_id, entry_group):
+            with lock:
+                in_flight.append(entry_group_id)
+                max_in_flight[0] = max(max_in_flight[0], len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(entry_group_id)
+            return self.__make_entry_group(entry_group_id)
+
+        client.create_entry_group.side_effect = create_entry_group
+
+        self.__registry.resolve(client, [f'group-{index}' for index in range(8)], max_workers=4)
+
+        self.assertEqual(8, client.create_entry_group.call_count)
+        self.assertGreater(max_in_flight[0], 1)
+
+    def test_resolve_failed_creation_should_leave_entry_group_unknown(self):
+        client = mock.MagicMock()
+        client.list_entry_groups.return_value = []
+        client.create_entry_group.side_effect = [
+            exceptions.AlreadyExists('group-1'),
+            exceptions.ServiceUnavailable('group-2')
+        ]
+
+        self.__registry.resolve(client, ['group-1', 'group-2'])
+
+        self.assertTrue(self.__registry.contains(f'{self.__LOCATION_NAME}/entryGroups/group-1'))
+        self.assertFalse(self.__registry.contains(f'{self.__LOCATION_NAME}/entryGroups/group-2'))
+
+    def test_tracked_client_should_skip_known_entry_groups(self):
+        client = mock.MagicMock()
+        tracked_client = self.__registry.track(client)
+        self.__registry.add(f'{self.__LOCATION_NAME}/entryGroups/known-group')
+
+        self.assertRaises(exceptions.AlreadyExists,
+                          tracked_client.create_entry_group,
+                          parent=self.__LOCATION_NAME,
+                          entry_group_id='known-group')
+        client.create_entry_group.assert_not_called()
+
+        tracked_client.create_entry_group(parent=self.__LOCATION_NAME, entry_group_id='new-group')
+        client.create_entry_group.assert_called_once()
+        self.assertTrue(self.__registry.contains(f'{self.__LOCATION_NAME}/entryGroups/new-group'))
+
+    def test_tracked_client_already_existing_entry_group_should_be_known(self):
+        client = mock.MagicMock()
+        client.create_entry_group.side_effect = exceptions.AlreadyExists('test-group')
+        tracked_client = self.__registry.track(client)
+
+        self.assertRaises(exceptions.AlreadyExists,
+                          tracked_client.create_entry_group,
+                          parent=self.__LOCATION_NAME,
+                          entry_group_id='test-group')
+
+        self.assertTrue(self.__registry.contains(f'{self.__LOCATION_NAME}/entryGroups/test-group'))
+
+    def test_tracked_client_deleted_entry_group_should_be_created_again(self):
+        client = mock.MagicMock()
+        tracked_client = self.__registry.track(client)
+        entry_group_name = f'{self.__LOCATION_NAME}/entryGroups/test-group'
+        self.__registry.add(entry_group_name)
+
+        tracked_client.delete_entry_group(name=entry_group_name)
+        tracked_client.create_entry_group(parent=self.__LOCATION_NAME, entry_group_id='test-group')
+
+        client.delete_entry_group.assert_called_once_with(name=entry_group_name)
+        client.create_entry_group.assert_called_once()
+
+    def test_tracked_client_failed_deletion_should_keep_entry_group(self):
+        client = mock.MagicMock()
+        client.delete_entry_group.side_effect = exceptions.FailedPrecondition('not empty')
+        tracked_client = self.__registry.track(client)
+        entry_group_name = f'{self.__LOCATION_NAME}/entryGroups/test-group'
+        self.__registry.add(entry_group_name)
+
+        self.assertRaises(exceptions.FailedPrecondition,
+                          tracked_client.delete_entry_group,
+                          name=entry_group_name)
+
+        self.assertTrue(self.__registry.contains(entry_group_name))
+
+    def test_tracked_client_should_delegate_other_calls(self):
+        client = mock.MagicMock()
+        client.get_entry.return_value = 'entry'
+
+        self.assertEqual('entry', self.__registry.track(client).get_entry(name='entry-name'))
+
+    @classmethod
+    def __make_entry_group(cls, group_id):
+        entry_group = types.EntryGroup()
+        entry_group.name = f'{cls.__LOCATION_NAME}/entryGroups/{group_id}'
+        return entry_group
@@ -0,0 +1,214 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud.datacatalog import types
+
+from datacatalog_custom_entries_manager import constant, custom_entries_async_synchronizer, \
+    custom_entries_synchronizer, datacatalog_fake_backend
+
+
+class FakeDataCatalogBackendTest(unittest.TestCase):
+    __LOCATION_NAME = 'projects/test-project/locations/test-location'
+    __ENTRY_GROUP_NAME = f'{__LOCATION_NAME}/entryGroups/test-group'
+
+    def setUp(self):
+        self.__backend = datacatalog_fake_backend.FakeDataCatalogBackend()
+        self.__client = self.__backend.make_client()
+
+    def test_entries_should_be_created_read_updated_and_deleted(self):
+        self.__client.create_entry_group(parent=self.__LOCATION_NAME, entry_group_id='test-group')
+        self.__client.create_entry(parent=self.__ENTRY_GROUP_NAME,
+                                   entry_id='entry_1',
+                                   entry=self.__make_entry('entry_1', 'Entry 1'))
+
+        entry = self.__client.get_entry(name=f'{self.__ENTRY_GROUP_NAME}/entries/entry_1')
+        self.assertEqual('Entry 1', entry.display_name)
+
+        self.__client.update_entry(entry=self.__make_entry('entry_1', 'Updated'), update_mask=None)
+        self.assertEqual(
+            ['Updated'],
+            [entry.display_name for entry in self.__backend.get_entries(self.__ENTRY_GROUP_NAME)])
+
+        self.__client.delete_entry(name=f'{self.__ENTRY_GROUP_NAME}/entries/entry_1')
+        self.assertEqual([], self.__backend.get_entries())
+
+    def test_missing_entries_should_be_denied(self):
+        entry_name = f'{self.__ENTRY_GROUP_NAME}/entries/entry_1'
+
+        self.assertRaises(exceptions.PermissionDenied, self.__client.get_entry, name=entry_name)
+        self.assertRaises(exceptions.PermissionDenied,
+                          self.__client.update_entry,
+                          entry=self.__make_entry('entry_1', 'Entry 1'))
+        self.assertRaises(exceptions.PermissionDenied, self.__client.delete_entry, name=entry_name)
+        self.assertRaises(exceptions.PermissionDenied,
+                          self.__client.create_entry,
+                          parent=self.__ENTRY_GROUP_NAME,
+                          entry_id='entry_1',
+                          entry=self.__make_entry('entry_1', 'Entry 1'))
+
+    def test_existing_resources_should_not_be_created_again(self):
+        self.__client.create_entry_group(parent=self.__LOCATION_NAME, entry_group_id='test-group')
+        self.__client.create_entry(parent=self.__ENTRY_GROUP_NAME,
+                                   entry_id='entry_1',
+                                   entry=self.__make_entry('entry_1', 'Entry 1'))
+
+        self.assertRaises(exceptions.AlreadyExists,
+                          self.__client.create_entry_group,
+                          parent=self.__LOCATION_NAME,
+                          entry_group_id='test-group')
+        self.assertRaises(exceptions.AlreadyExists,
+                          self.__client.create_entry,
+                          parent=self.__ENTRY_GROUP_NAME,
+                          entry_id='entry_1',
+                          entry=self.__make_entry('entry_1', 'Entry 1'))
+
+    def test_delete_entry_group_should_require_force_if_not_empty(self):
+        self.__client.create_entry_group(parent=self.__LOCATION_NAME, entry_group_id='test-group')
+        self.__client.create_entry(parent=self.__ENTRY_GROUP_NAME,
+                                   entry_id='entry_1',
+                                   entry=self.__make_entry('entry_1', 'Entry 1'))
+
+        self.assertRaises(exceptions.FailedPrecondition,
+                          self.__client.delete_entry_group,
+                          name=self.__ENTRY_GROUP_NAME)
+
+        self.__client.delete_entry_group(name=self.__ENTRY_GROUP_NAME, force=True)
+        self.assertEqual([], self.__backend.get_entry_group_names())
+        self.assertEqual([], self.__backend.get_entries())
+        self.assertEqual([], self.__client.list_entry_groups(parent=self.__LOCATION_NAME))
+
+    def test_search_catalog_should_match_system_query(self):
+        self.__client.create_entry_group(parent=self.__LOCATION_NAME, entry_group_id='test-group')
+        self.__client.create_entry(parent=self.__ENTRY_GROUP_NAME,
+                                   entry_id='entry_1',
+                                   entry=self.__make_entry('entry_1', 'Entry 1', 'TestSystem'))
+        self.__client.create_entry(parent=self.__ENTRY_GROUP_NAME,
+                                   entry_id='entry_2',
+                                   entry=self.__make_entry('entry_2', 'Entry 2', 'OtherSystem'))
+
+        scope = types.SearchCatalogRequest.Scope()
+        scope.include_project_ids.append('test-project')
+        results = self.__client.search_catalog(scope=scope, query='system=testsystem')
+
+        self.assertEqual([f'{self.__ENTRY_GROUP_NAME}/entries/entry_1'],
+                         [result.relative_resource_name for result in results])
+        self.assertRaises(exceptions.InvalidArgument,
+                          self.__client.search_catalog,
+                          scope=scope,
+                          query='type=entry')
+
+    def test_injected_errors_should_fail_next_requests(self):
+        self.__backend.inject_errors('list_entry_groups', exceptions.ServiceUnavailable('1'),
+                                     exceptions.InternalServerError('2'))
+
+        self.assertRaises(exceptions.ServiceUnavailable,
+                          self.__client.list_entry_groups,
+                          parent=self.__LOCATION_NAME)
+        self.assertRaises(exceptions.InternalServerError,
+                          self.__client.list_entry_groups,
+                          parent=self.__LOCATION_NAME)
+        self.assertEqual([], self.__client.list_entry_groups(parent=self.__LOCATION_NAME))
+        self.assertEqual({'list_entry_groups': 3}, self.__backend.request_counts)
+
+    def test_random_errors_should_be_reproducible(self):
+        outcomes = []
+        for _ in range(2):
+            client = datacatalog_fake_backend.FakeDataCatalogBackend(error_rate=0.5,
+                                                                     seed=42).make_client()
+            outcomes.append([self.__list_entry_groups_fails(client) for _ in range(20)])
+
+        self.assertEqual(outcomes[0], outcomes[1])
+        self.assertIn(True, outcomes[0])
+        self.assertIn(False, outcomes[0])
+
+    @mock.patch('time.monotonic')
+    def test_quota_should_fail_excess_requests_per_second(self, mock_monotonic):
+        client = datacatalog_fake_backend.FakeDataCatalogBackend(
+            requests_per_second=2).make_client()
+
+        mock_monotonic.return_value = 100.2
+        client.list_entry_groups(parent=self.__LOCATION_NAME)
+        client.list_entry_groups(parent=self.__LOCATION_NAME)
+        self.assertRaises(exceptions.ResourceExhausted,
+                          client.list_entry_groups,
+                          parent=self.__LOCATION_NAME)
+
+        mock_monotonic.return_value = 101.1
+        client.list_entry_groups(parent=self.__LOCATION_NAME)
+
+    def test_sync_to_file_should_synchronize_with_backend(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.csv')
+            self.__write_csv_file(file_path, ['asset_1', 'asset_2', 'asset_3'])
+            synchronizer = custom_entries_synchronizer.CustomEntriesSynchronizer(
+                'test-project',
+                'test-location',
+                max_workers=2,
+                client_factory=self.__backend.make_client)
+
+            synchronizer.sync_to_file(csv_file_path=file_path, raise_on_failure=True)
+            self.assertEqual(['//test/asset_1', '//test/asset_2', '//test/asset_3'], [
+                entry.linked_resource
+                for entry in self.__backend.get_entries(self.__ENTRY_GROUP_NAME)
+            ])
+
+            self.__write_csv_file(file_path, ['asset_1'])
+            synchronizer.sync_to_file(csv_file_path=file_path, raise_on_failure=True)
+            self.assertEqual(['//test/asset_1'], [
+                entry.linked_resource
+                for entry in self.__backend.get_entries(self.__ENTRY_GROUP_NAME)
+            ])
+
+    def test_async_sync_to_file_should_synchronize_with_backend(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'entries.csv')
+            self.__write_csv_file(file_path, ['asset_1', 'asset_2'])
+            synchronizer = custom_entries_async_synchronizer.AsyncCustomEntriesSynchronizer(
+                'test-project', 'test-location', client_factory=self.__backend.make_client)
+
+            synchronizer.sync_to_file(csv_file_path=file_path, raise_on_failure=True)
+
+        self.assertEqual(2, len(self.__backend.get_entries(self.__ENTRY_GROUP_NAME)))
+
+    @classmethod
+    def __list_entry_groups_fails(cls, client) -> bool:
+        try:
+            client.list_entry_groups(parent=cls.__LOCATION_NAME)
+            return False
+        except exceptions.GoogleAPICallError:
+            return True
+
+    @classmethod
+    def __make_entry(cls, entry_id, display_name, system='TestSystem'):
+        entry = types.Entry()
+        entry.name = f'{cls.__ENTRY_GROUP_NAME}/entries/{entry_id}'
+        entry.display_name = display_name
+        entry.user_specified_system = system
+        return entry
+
+    @classmethod
+    def __write_csv_file(cls, file_path, asset_names):
+        with open(file_path, 'w', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=constant.ENTRIES_DS_COLUMNS_ORDER)
+            writer.writeheader()
+            for asset_name in asset_names:
+                writer.writerow({
+                    constant.ENTRIES_DS_USER_SPECIFIED_SYSTEM_COLUMN_LABEL:
+                    'TestSystem',
+                    constant.ENTRIES_DS_GROUP_ID_COLUMN_LABEL:
+                    'test-group',
+                    constant.ENTRIES_DS_DISPLAY_NAME_COLUMN_LABEL:
+                    f'Asset {asset_name}',
+                    constant.ENTRIES_DS_LINKED_RESOURCE_COLUMN_LABEL:
+                    f'//test/{asset_name}',
+                    constant.ENTRIES_DS_USER_SPECIFIED_TYPE_COLUMN_LABEL:
+                    'test_type',
+                    constant.ENTRIES_DS_CREATED_AT_COLUMN_LABEL:
+                    '2020-09-04T16:19:43-0300',
+                    constant.ENTRIES_DS_UPDATED_AT_COLUMN_LABEL:
+                    '2020-09-04T16:25:26-0300',
+                })
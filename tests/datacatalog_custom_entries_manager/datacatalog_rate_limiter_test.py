@@ -0,0 +1,138 @@
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+
+from datacatalog_custom_entries_manager import datacatalog_rate_limiter
+
+_RATE_LIMITER_MODULE = 'datacatalog_custom_entries_manager.datacatalog_rate_limiter'
+
+
+@mock.patch(f'{_RATE_LIMITER_MODULE}.time.sleep')
+class DataCatalogRateLimiterTest(unittest.TestCase):
+
+    def test_constructor_non_positive_rate_should_fail(self, mock_sleep):
+        self.assertRaises(ValueError, datacatalog_rate_limiter.DataCatalogRateLimiter, 0)
+
+    @mock.patch(f'{_RATE_LIMITER_MODULE}.time.monotonic')
+    def test_acquire_burst_above_rate_should_wait(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(2)
+
+        # The bucket starts full, with one second worth of requests.
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+        mock_sleep.assert_not_called()
+
+        mock_sleep.side_effect = lambda seconds: mock_monotonic.configure_mock(
+            return_value=mock_monotonic.return_value + seconds)
+        rate_limiter.acquire()
+
+        mock_sleep.assert_called_once_with(0.5)
+
+    @mock.patch(f'{_RATE_LIMITER_MODULE}.time.monotonic')
+    def test_acquire_rounding_error_below_one_token_should_not_wait(self, mock_monotonic,
+                                                                    mock_sleep):
+
+        mock_monotonic.return_value = 100.0
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(2)
+        rate_limiter._DataCatalogRateLimiter__tokens = 0.9999999999999744
+
+        rate_limiter.acquire()
+
+        mock_sleep.assert_not_called()
+
+    @mock.patch(f'{_RATE_LIMITER_MODULE}.time.monotonic')
+    def test_acquire_tiny_deficit_should_wait_minimum_interval(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        mock_sleep.side_effect = lambda seconds: mock_monotonic.configure_mock(
+            return_value=mock_monotonic.return_value + seconds)
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(2)
+        rate_limiter._DataCatalogRateLimiter__tokens = 0.99999
+
+        rate_limiter.acquire()
+
+        mock_sleep.assert_called_once_with(0.001)
+
+    def test_call_should_return_function_result(self, mock_sleep):
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(10)
+        function = mock.MagicMock(return_value='result')
+
+        self.assertEqual('result', rate_limiter.call(function, 'arg', key='value'))
+        function.assert_called_once_with('arg', key='value')
+
+    def test_call_resource_exhausted_should_retry_and_lower_rate(self, mock_sleep):
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(10)
+        function = mock.MagicMock(side_effect=[exceptions.ResourceExhausted('quota'), 'result'])
+
+        self.assertEqual('result', rate_limiter.call(function))
+        self.assertEqual(2, function.call_count)
+        self.assertLess(rate_limiter.rate, 10)
+
+        backoff_seconds = mock_sleep.call_args_list[0][0][0]
+        self.assertGreaterEqual(backoff_seconds, 0)
+        self.assertLessEqual(backoff_seconds, 0.5)
+
+    def test_call_resource_exhausted_should_lower_rate_once_per_interval(self, mock_sleep):
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(10)
+        function = mock.MagicMock(side_effect=[
+            exceptions.ResourceExhausted('quota'),
+            exceptions.ResourceExhausted('quota'), 'result'
+        ])
+
+        rate_limiter.call(function)
+
+        # Halved once, then slightly raised back by the successful call.
+        self.assertGreaterEqual(rate_limiter.rate, 5)
+        self.assertLess(rate_limiter.rate, 6)
+
+    def test_call_too_many_retries_should_fail(self, mock_sleep):
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(10, max_retries=2)
+        function = mock.MagicMock(side_effect=exceptions.ResourceExhausted('quota'))
+
+        self.assertRaises(exceptions.ResourceExhausted, rate_limiter.call, function)
+        self.assertEqual(3, function.call_count)
+
+    def test_call_other_errors_should_not_retry(self, mock_sleep):
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(10)
+        function = mock.MagicMock(side_effect=exceptions.NotFound('entry'))
+
+        self.assertRaises(exceptions.NotFound, rate_limiter.call, function)
+        function.assert_called_once()
+
+    @mock.patch(f'{_RATE_LIMITER_MODULE}.time.monotonic')
+    def test_call_successes_should_raise_rate_back_to_maximum(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        mock_sleep.side_effect = lambda seconds: mock_monotonic.configure_mock(
+            return_value=mock_monotonic.return_value + seconds)
+        rate_limiter = datacatalog_rate_limiter.DataCatalogRateLimiter(10)
+        rate_limiter.call(mock.MagicMock(side_effect=[exceptions.ResourceExhausted('quota'), 1]))
+
+        for _ in range(200):
+            rate_limiter.call(mock.MagicMock())
+
+        self.assertEqual(10, rate_limiter.rate)
+
+
+class RateLimitedDataCatalogClientTest(unittest.TestCase):
+
+    def test_path_helpers_should_not_draw_from_rate_limiter(self):
+        client = mock.MagicMock()
+        rate_limiter = mock.MagicMock()
+
+        limited_client = datacatalog_rate_limiter.RateLimitedDataCatalogClient(
+            client, rate_limiter)
+        limited_client.entry_path('project', 'location', 'group', 'entry')
+
+        rate_limiter.call.assert_not_called()
+        client.entry_path.assert_called_once_with('project', 'location', 'group', 'entry')
+
+    def test_requests_should_draw_from_rate_limiter(self):
+        client = mock.MagicMock()
+        rate_limiter = mock.MagicMock()
+
+        limited_client = datacatalog_rate_limiter.RateLimitedDataCatalogClient(
+            client, rate_limiter)
+        limited_client.delete_entry(name='entry-name')
+
+        rate_limiter.call.assert_called_once_with(client.delete_entry, name='entry-name')
@@ -0,0 +1,125 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List
+import unittest
+
+import datacatalog_custom_entries_manager
+from datacatalog_custom_entries_manager import lazy_module
+
+
+class LazyModuleTest(unittest.TestCase):
+    __PACKAGE_NAME = 'lazy_module_test_package'
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        package_dir = os.path.join(self.__temp_dir.name, self.__PACKAGE_NAME)
+        os.mkdir(package_dir)
+        with open(os.path.join(package_dir, '__init__.py'), 'w') as init_file:
+            init_file.write('executions = 0\n')
+        with open(os.path.join(package_dir, 'test_module.py'), 'w') as module_file:
+            module_file.write(f'import {self.__PACKAGE_NAME} as package\n'
+                              'package.executions += 1\n'
+                              'VALUE = 42\n')
+
+        sys.path.insert(0, self.__temp_dir.name)
+
+    def tearDown(self):
+        sys.path.remove(self.__temp_dir.name)
+        for module_name in list(sys.modules):
+            if module_name.startswith(self.__PACKAGE_NAME):
+                del sys.modules[module_name]
+        self.__temp_dir.cleanup()
+
+    def test_load_should_execute_module_on_first_attribute_access(self):
+        module = lazy_module.load('.test_module', self.__PACKAGE_NAME)
+
+        self.assertEqual(0, self.__get_executions())
+        self.assertIs(module, sys.modules[f'{self.__PACKAGE_NAME}.test_module'])
+        self.assertIs(module, sys.modules[self.__PACKAGE_NAME].test_module)
+
+        self.assertEqual(42, module.VALUE)
+        self.assertEqual(1, self.__get_executions())
+
+    def test_load_imported_module_should_return_it(self):
+        module = lazy_module.load(f'{self.__PACKAGE_NAME}.test_module')
+
+        self.assertIs(module, lazy_module.load('.test_module', self.__PACKAGE_NAME))
+        self.assertEqual(42, module.VALUE)
+        self.assertEqual(1, self.__get_executions())
+
+    def test_load_missing_module_should_raise_module_not_found_error(self):
+        self.assertRaises(ModuleNotFoundError, lazy_module.load, '.missing_module',
+                          self.__PACKAGE_NAME)
+
+    def test_package_attributes_should_be_imported_on_access(self):
+        from datacatalog_custom_entries_manager import custom_entries_synchronizer
+
+        self.assertIs(custom_entries_synchronizer.CustomEntriesSynchronizer,
+                      datacatalog_custom_entries_manager.CustomEntriesSynchronizer)
+        self.assertRaises(AttributeError, getattr, datacatalog_custom_entries_manager,
+                          'MissingAttribute')
+
+    def test_import_package_should_not_import_heavy_dependencies(self):
+        module_names = self.__run_and_list_modules(
+            'from datacatalog_custom_entries_manager import custom_entries_manager_cli\n'
+            'custom_entries_manager_cli.CustomEntriesManagerCLI._parse_args(\n'
+            '    ["sync", "--json-file", "test.json", "--project-id", "test-project",\n'
+            '     "--location-id", "test-location"])\n')
+
+        for module_name in ('asyncio', 'google.cloud.datacatalog',
+                            'google.datacatalog_connectors.commons', 'numpy', 'pandas'):
+            self.assertNotIn(module_name, module_names)
+
+    def test_sync_json_file_should_not_import_pandas_nor_numpy(self):
+        file_path = os.path.join(self.__temp_dir.name, 'entries.json')
+        with open(file_path, 'w') as json_file:
+            json.dump(
+                {
+                    'userSpecifiedSystems': [{
+                        'name':
+                        'TestSystem',
+                        'entryGroups': [{
+                            'id':
+                            'testgroup',
+                            'entries': [{
+                                'linkedResource': '//test/linked-resource',
+                                'displayName': 'Test display name',
+                                'type': 'test_type'
+                            }]
+                        }]
+                    }]
+                }, json_file)
+
+        # The CLI always passes a list of input file paths.
+        module_names = self.__run_and_list_modules(
+            'from datacatalog_custom_entries_manager import custom_entries_synchronizer, \\\n'
+            '    datacatalog_fake_backend\n'
+            'backend = datacatalog_fake_backend.FakeDataCatalogBackend()\n'
+            'custom_entries_synchronizer.CustomEntriesSynchronizer(\n'
+            '    "test-project", "test-location", client_factory=backend.make_client\n'
+            f').sync_to_file(json_file_path=[{file_path!r}], raise_on_failure=True)\n'
+            'assert len(backend.get_entries()) == 1\n')
+
+        self.assertIn('datacatalog_custom_entries_manager.custom_entries_multi_file_reader',
+                      module_names)
+        for module_name in ('numpy', 'pandas'):
+            self.assertNotIn(module_name, module_names)
+
+    @classmethod
+    def __run_and_list_modules(cls, code: str) -> List[str]:
+        package_dir = os.path.dirname(os.path.dirname(datacatalog_custom_entries_manager.__file__))
+        code += 'import json, sys\nprint(json.dumps(sorted(sys.modules)))\n'
+        completed_process = subprocess.run([sys.executable, '-c', code],
+                                           env={
+                                               **os.environ, 'PYTHONPATH': package_dir
+                                           },
+                                           stdout=subprocess.PIPE,
+                                           check=True)
+        return json.loads(completed_process.stdout)
+
+    @classmethod
+    def __get_executions(cls) -> int:
+        return sys.modules[cls.__PACKAGE_NAME].executions